@@ -0,0 +1,87 @@
+"""
+Add analytics rollup tables.
+
+Revision ID: 017_add_analytics_rollups
+Revises: 016_add_orphaned_orders
+Create Date: 2026-02-08
+
+Populate existing history afterwards with scripts/backfill_analytics.py.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision = '017_add_analytics_rollups'
+down_revision = '016_add_orphaned_orders'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'analytics_daily_pnl',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('user_id', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('day', sa.Date, nullable=False),
+        sa.Column('sport', sa.String(20), nullable=False),
+        sa.Column('trades', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('wins', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('losses', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('gross_profit', sa.Numeric(18, 6), nullable=False, server_default='0'),
+        sa.Column('gross_loss', sa.Numeric(18, 6), nullable=False, server_default='0'),
+        sa.Column('realized_pnl', sa.Numeric(18, 6), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+        sa.UniqueConstraint('user_id', 'day', 'sport', name='uq_analytics_daily_pnl_user_day_sport'),
+    )
+
+    op.create_table(
+        'analytics_trade_stats',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('user_id', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('sport', sa.String(20), nullable=False),
+        sa.Column('trades', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('wins', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('losses', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('gross_profit', sa.Numeric(18, 6), nullable=False, server_default='0'),
+        sa.Column('gross_loss', sa.Numeric(18, 6), nullable=False, server_default='0'),
+        sa.Column('largest_win', sa.Numeric(18, 6), nullable=False, server_default='0'),
+        sa.Column('largest_loss', sa.Numeric(18, 6), nullable=False, server_default='0'),
+        sa.Column('sum_pnl_squared', sa.Numeric(24, 6), nullable=False, server_default='0'),
+        sa.Column('total_hold_seconds', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('timed_trades', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('current_streak', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('max_win_streak', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('max_lose_streak', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('cumulative_pnl', sa.Numeric(18, 6), nullable=False, server_default='0'),
+        sa.Column('peak_pnl', sa.Numeric(18, 6), nullable=False, server_default='0'),
+        sa.Column('max_drawdown_pct', sa.Numeric(12, 4), nullable=False, server_default='0'),
+        sa.Column('last_closed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+        sa.UniqueConstraint('user_id', 'sport', name='uq_analytics_trade_stats_user_sport'),
+    )
+
+    op.create_table(
+        'analytics_equity_points',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('user_id', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('position_id', UUID(as_uuid=True), sa.ForeignKey('positions.id', ondelete='CASCADE'),
+                  nullable=False, unique=True),
+        sa.Column('sport', sa.String(20), nullable=False),
+        sa.Column('closed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('trade_number', sa.Integer, nullable=False),
+        sa.Column('pnl', sa.Numeric(18, 6), nullable=False),
+        sa.Column('hold_seconds', sa.Integer, nullable=True),
+        sa.Column('cumulative_pnl', sa.Numeric(18, 6), nullable=False),
+    )
+    op.create_index('idx_analytics_equity_points_user_closed', 'analytics_equity_points', ['user_id', 'closed_at'])
+    op.create_index('idx_analytics_equity_points_user_trade', 'analytics_equity_points', ['user_id', 'trade_number'])
+
+
+def downgrade():
+    op.drop_index('idx_analytics_equity_points_user_trade', table_name='analytics_equity_points')
+    op.drop_index('idx_analytics_equity_points_user_closed', table_name='analytics_equity_points')
+    op.drop_table('analytics_equity_points')
+    op.drop_table('analytics_trade_stats')
+    op.drop_table('analytics_daily_pnl')
@@ -0,0 +1,37 @@
+"""
+Add composite indexes for keyset pagination.
+
+Revision ID: 018_keyset_pagination_indexes
+Revises: 017_add_analytics_rollups
+Create Date: 2026-02-09
+
+Each index matches a (filter..., sort timestamp, id) keyset so cursor pages
+are a single index range scan (see src/db/pagination.py).
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '018_keyset_pagination_indexes'
+down_revision = '017_add_analytics_rollups'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('idx_activity_logs_user_created_id', 'activity_logs', ['user_id', 'created_at', 'id']),
+    ('idx_activity_logs_user_category_created_id', 'activity_logs', ['user_id', 'category', 'created_at', 'id']),
+    ('ix_positions_user_opened_id', 'positions', ['user_id', 'opened_at', 'id']),
+    ('ix_positions_user_status_opened_id', 'positions', ['user_id', 'status', 'opened_at', 'id']),
+    ('ix_trades_user_created_id', 'trades', ['user_id', 'created_at', 'id']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
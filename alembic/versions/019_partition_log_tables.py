@@ -0,0 +1,198 @@
+"""
+Convert activity_logs and audit_events to range-partitioned tables.
+
+Revision ID: 019_partition_log_tables
+Revises: 018_keyset_pagination_indexes
+Create Date: 2026-02-10
+
+PostgreSQL only; other dialects (SQLite dev databases) are left as plain
+tables and keep DELETE-based retention (see src/db/partitioning.py).
+
+Works on populated tables: each table is renamed aside, a partitioned
+table with the same columns is created in its place, the rows are copied
+and the old table is dropped, all in the migration transaction. Writers
+block on the table lock for the duration of the copy, so run it in a
+maintenance window (or after trimming old rows) on large installs.
+
+The partition key must be part of every unique constraint, so the primary
+keys become (id, <timestamp>) and audit_events.event_id is unique per
+(event_id, timestamp) (uq_audit_events_event_id_timestamp).
+
+History older than the table's retention window is copied into the
+DEFAULT partition rather than given partitions of its own; retention
+trims it on the first maintenance pass.
+"""
+
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '019_partition_log_tables'
+down_revision = '018_keyset_pagination_indexes'
+branch_labels = None
+depends_on = None
+
+
+# Partition layout and DDL as of this revision, copied from
+# src/db/partitioning.py so later changes there don't alter the migration
+Spec = namedtuple('Spec', 'table column interval premake retention_days')
+
+ACTIVITY_LOGS = Spec('activity_logs', 'created_at', 'day', 7, 30)
+AUDIT_EVENTS = Spec('audit_events', 'timestamp', 'month', 2, 90)
+
+SUFFIX_FORMATS = {'day': '%Y%m%d', 'month': '%Y%m'}
+
+
+def _partition_start(spec: Spec, moment: datetime) -> datetime:
+    moment = moment.astimezone(timezone.utc) if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+    start = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if spec.interval == 'month':
+        start = start.replace(day=1)
+    return start
+
+
+def _next_partition_start(spec: Spec, start: datetime) -> datetime:
+    if spec.interval == 'day':
+        return start + timedelta(days=1)
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def _create_partition_sql(spec: Spec, lower: datetime) -> str:
+    upper = _next_partition_start(spec, lower)
+    name = f'{spec.table}_p{lower.strftime(SUFFIX_FORMATS[spec.interval])}'
+    return (
+        f'CREATE TABLE IF NOT EXISTS {name} PARTITION OF {spec.table} '
+        f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+    )
+
+
+ACTIVITY_LOG_INDEXES = [
+    ('idx_activity_logs_user_created', ['user_id', 'created_at']),
+    ('idx_activity_logs_level', ['level']),
+    ('idx_activity_logs_user_created_id', ['user_id', 'created_at', 'id']),
+    ('idx_activity_logs_user_category_created_id', ['user_id', 'category', 'created_at', 'id']),
+]
+
+AUDIT_EVENT_INDEXES = [
+    ('ix_audit_events_event_type', ['event_type']),
+    ('ix_audit_events_severity', ['severity']),
+    ('ix_audit_events_user_id', ['user_id']),
+    ('ix_audit_events_timestamp', ['timestamp']),
+    ('ix_audit_events_correlation', ['correlation_id']),
+    ('ix_audit_events_user_timestamp', ['user_id', 'timestamp']),
+    ('ix_audit_events_type_timestamp', ['event_type', 'timestamp']),
+]
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def _set_aside(table: str, indexes: list[tuple[str, list[str]]], extra_indexes: list[str]) -> str:
+    """Renames table to <table>_legacy and frees its index names."""
+    legacy = f'{table}_legacy'
+    op.execute(f'ALTER TABLE {table} RENAME TO {legacy}')
+    op.execute(f'ALTER INDEX IF EXISTS {table}_pkey RENAME TO {legacy}_pkey')
+    for name in [name for name, _ in indexes] + extra_indexes:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+    return legacy
+
+
+def _create_partitions(spec, legacy: str) -> None:
+    now = datetime.now(timezone.utc)
+    oldest = op.get_bind().execute(sa.text(f'SELECT MIN({spec.column}) FROM {legacy}')).scalar()
+    start = max(oldest or now, now - timedelta(days=spec.retention_days))
+    end = _partition_start(spec, now)
+    for _ in range(spec.premake):
+        end = _next_partition_start(spec, end)
+    lower = _partition_start(spec, start)
+    while lower <= end:
+        op.execute(_create_partition_sql(spec, lower))
+        lower = _next_partition_start(spec, lower)
+    op.execute(f'CREATE TABLE IF NOT EXISTS {spec.table}_default PARTITION OF {spec.table} DEFAULT')
+
+
+def _create_indexes(table: str, indexes: list[tuple[str, list[str]]]) -> None:
+    # Indexes on the parent are created on every partition, present and future
+    for name, columns in indexes:
+        op.create_index(name, table, columns)
+
+
+def _upgrade_activity_logs() -> None:
+    legacy = _set_aside('activity_logs', ACTIVITY_LOG_INDEXES, [])
+    op.execute(f'UPDATE {legacy} SET created_at = NOW() WHERE created_at IS NULL')
+    op.execute(
+        f'CREATE TABLE activity_logs (LIKE {legacy} INCLUDING DEFAULTS) '
+        f'PARTITION BY RANGE (created_at)'
+    )
+    op.execute('ALTER TABLE activity_logs ADD PRIMARY KEY (id, created_at)')
+    op.execute(
+        'ALTER TABLE activity_logs ADD CONSTRAINT activity_logs_user_id_fkey '
+        'FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE'
+    )
+    _create_partitions(ACTIVITY_LOGS, legacy)
+    op.execute(f'INSERT INTO activity_logs SELECT * FROM {legacy}')
+    op.execute(f'DROP TABLE {legacy}')
+    _create_indexes('activity_logs', ACTIVITY_LOG_INDEXES)
+
+
+def _upgrade_audit_events() -> None:
+    legacy = _set_aside('audit_events', AUDIT_EVENT_INDEXES, ['ix_audit_events_event_id'])
+    op.execute(
+        f'CREATE TABLE audit_events (LIKE {legacy} INCLUDING DEFAULTS) '
+        f'PARTITION BY RANGE (timestamp)'
+    )
+    # The id sequence belongs to the old table's column; keep it alive
+    op.execute('ALTER SEQUENCE IF EXISTS audit_events_id_seq OWNED BY NONE')
+    op.execute('ALTER TABLE audit_events ADD PRIMARY KEY (id, timestamp)')
+    _create_partitions(AUDIT_EVENTS, legacy)
+    op.execute(f'INSERT INTO audit_events SELECT * FROM {legacy}')
+    op.execute(f'DROP TABLE {legacy}')
+    op.execute('ALTER SEQUENCE IF EXISTS audit_events_id_seq OWNED BY audit_events.id')
+    op.create_unique_constraint('uq_audit_events_event_id_timestamp', 'audit_events', ['event_id', 'timestamp'])
+    _create_indexes('audit_events', AUDIT_EVENT_INDEXES)
+
+
+def _downgrade_table(table: str, primary_key: str, indexes: list[tuple[str, list[str]]], extra_indexes: list[str]) -> str:
+    """Copies a partitioned table back into a plain one and returns the renamed original."""
+    partitioned = f'{table}_partitioned'
+    op.execute(f'ALTER TABLE {table} RENAME TO {partitioned}')
+    op.execute(f'ALTER INDEX IF EXISTS {table}_pkey RENAME TO {partitioned}_pkey')
+    for name in [name for name, _ in indexes] + extra_indexes:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+    op.execute(f'CREATE TABLE {table} (LIKE {partitioned} INCLUDING DEFAULTS)')
+    op.execute(f'ALTER TABLE {table} ADD PRIMARY KEY ({primary_key})')
+    op.execute(f'INSERT INTO {table} SELECT * FROM {partitioned}')
+    return partitioned
+
+
+def upgrade():
+    if not _is_postgresql():
+        return
+    _upgrade_activity_logs()
+    _upgrade_audit_events()
+
+
+def downgrade():
+    if not _is_postgresql():
+        return
+
+    partitioned = _downgrade_table('activity_logs', 'id', ACTIVITY_LOG_INDEXES, [])
+    op.execute(
+        'ALTER TABLE activity_logs ADD CONSTRAINT activity_logs_user_id_fkey '
+        'FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE'
+    )
+    op.execute(f'DROP TABLE {partitioned} CASCADE')
+    _create_indexes('activity_logs', ACTIVITY_LOG_INDEXES)
+
+    op.execute('ALTER SEQUENCE IF EXISTS audit_events_id_seq OWNED BY NONE')
+    partitioned = _downgrade_table('audit_events', 'id', AUDIT_EVENT_INDEXES, ['ix_audit_events_event_id'])
+    op.execute(f'DROP TABLE {partitioned} CASCADE')
+    op.execute('ALTER SEQUENCE IF EXISTS audit_events_id_seq OWNED BY audit_events.id')
+    op.create_index('ix_audit_events_event_id', 'audit_events', ['event_id'], unique=True)
+    _create_indexes('audit_events', AUDIT_EVENT_INDEXES)
@@ -726,9 +726,13 @@ class ApiClient {
   }
 
   // SSE Stream
-  createSSEConnection(): EventSource {
+  createSSEConnection(lastEventId?: string | null): EventSource {
+    const params = new URLSearchParams();
     const token = this.getToken();
-    const url = `${this.baseUrl}/dashboard/stream${token ? `?token=${token}` : ''}`;
+    if (token) params.set('token', token);
+    if (lastEventId) params.set('last_event_id', lastEventId);
+    const query = params.toString();
+    const url = `${this.baseUrl}/dashboard/stream${query ? `?${query}` : ''}`;
     return new EventSource(url);
   }
 
@@ -3,9 +3,34 @@ import apiClient from '@/api/client';
 import { useAppStore } from '@/stores/useAppStore';
 import { logger } from '@/lib/logger';
 
-interface SSEEvent {
-  type: 'status' | 'games' | 'positions' | 'heartbeat' | 'error';
-  data: unknown;
+interface StreamState {
+  status: StatusData;
+  games: Record<string, GameData>;
+  positions: Record<string, PositionData>;
+}
+
+interface PatchOp {
+  op: 'add' | 'remove' | 'replace';
+  path: string;
+  value?: unknown;
+}
+
+/** Apply JSON-Patch ops from a `patch` frame to a copy of the stream state. */
+function applyPatch(state: StreamState, ops: PatchOp[]): StreamState {
+  let root: unknown = JSON.parse(JSON.stringify(state));
+  for (const op of ops) {
+    const keys = op.path.split('/').slice(1).map((k) => k.replace(/~1/g, '/').replace(/~0/g, '~'));
+    if (keys.length === 0) {
+      root = op.value;
+      continue;
+    }
+    let target = root as Record<string, unknown>;
+    for (const key of keys.slice(0, -1)) target = target[key] as Record<string, unknown>;
+    const last = keys[keys.length - 1];
+    if (op.op === 'remove') delete target[last];
+    else target[last] = op.value;
+  }
+  return root as StreamState;
 }
 
 interface UseSSEOptions {
@@ -53,6 +78,9 @@ export function useSSE(options: UseSSEOptions = {}) {
   const reconnectTimeoutRef = useRef<ReturnType<typeof setTimeout> | null>(null);
   const heartbeatTimeoutRef = useRef<ReturnType<typeof setTimeout> | null>(null);
   const reconnectAttemptsRef = useRef(0);
+  // Last applied stream state and event id, for delta frames and resume
+  const streamStateRef = useRef<StreamState | null>(null);
+  const lastEventIdRef = useRef<string | null>(null);
   const [isConnected, setIsConnected] = useState(false);
 
   const { setSseConnected, setBotStatus, updateLastUpdate } = useAppStore();
@@ -90,7 +118,7 @@ export function useSSE(options: UseSSEOptions = {}) {
     clearHeartbeatTimeout();
 
     try {
-      const eventSource = apiClient.createSSEConnection();
+      const eventSource = apiClient.createSSEConnection(lastEventIdRef.current);
       eventSourceRef.current = eventSource;
 
       eventSource.onopen = () => {
@@ -101,41 +129,56 @@ export function useSSE(options: UseSSEOptions = {}) {
         resetHeartbeatTimeout(connect);
       };
 
-      eventSource.onmessage = (event) => {
+      const handleFrame = (type: 'snapshot' | 'patch') => (event: MessageEvent) => {
         try {
-          const parsed: SSEEvent = JSON.parse(event.data);
+          const frame = JSON.parse(event.data);
+          const previous = streamStateRef.current;
+          if (type === 'snapshot') {
+            streamStateRef.current = frame.state as StreamState;
+          } else if (previous) {
+            streamStateRef.current = applyPatch(previous, frame.ops as PatchOp[]);
+          } else {
+            return; // Patch without a base; a reconnect starts from a snapshot
+          }
+          lastEventIdRef.current = event.lastEventId || lastEventIdRef.current;
           updateLastUpdate();
           resetHeartbeatTimeout(connect);
 
-          switch (parsed.type) {
-            case 'status': {
-              const statusData = parsed.data as StatusData;
-              setBotStatus(statusData.state === 'running', statusData.tracked_games);
-              callbacksRef.current.onStatus?.(statusData);
-              break;
-            }
-            case 'games':
-              callbacksRef.current.onGames?.(parsed.data as GameData[]);
-              break;
-
-            case 'positions':
-              callbacksRef.current.onPositions?.(parsed.data as PositionData[]);
-              break;
-
-            case 'heartbeat':
-              // Heartbeat received - timeout already reset above
-              break;
-
-            case 'error':
-              logger.error('[SSE] Server error:', parsed.data);
-              callbacksRef.current.onError?.(new Error(String(parsed.data)));
-              break;
+          const state = streamStateRef.current;
+          const changed = (key: keyof StreamState) =>
+            !previous || JSON.stringify(previous[key]) !== JSON.stringify(state[key]);
+
+          if (changed('status')) {
+            setBotStatus(state.status.state === 'running', state.status.tracked_games);
+            callbacksRef.current.onStatus?.(state.status);
+          }
+          if (changed('games')) {
+            callbacksRef.current.onGames?.(Object.values(state.games));
+          }
+          if (changed('positions')) {
+            callbacksRef.current.onPositions?.(Object.values(state.positions));
           }
         } catch (e) {
-          logger.error('[SSE] Failed to parse message:', e);
+          logger.error('[SSE] Failed to apply frame:', e);
         }
       };
 
+      eventSource.addEventListener('snapshot', handleFrame('snapshot'));
+      eventSource.addEventListener('patch', handleFrame('patch'));
+
+      eventSource.addEventListener('heartbeat', () => {
+        updateLastUpdate();
+        resetHeartbeatTimeout(connect);
+      });
+
+      eventSource.addEventListener('error', (event) => {
+        // Server-sent error frames carry data; connection errors do not
+        const data = (event as MessageEvent).data;
+        if (!data) return;
+        logger.error('[SSE] Server error:', data);
+        callbacksRef.current.onError?.(new Error(String(data)));
+      });
+
       eventSource.onerror = () => {
         setIsConnected(false);
         setSseConnected(false);
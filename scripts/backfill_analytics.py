@@ -0,0 +1,65 @@
+"""
+Rebuild the analytics rollup tables from closed positions.
+
+Run once after migrating to 017_add_analytics_rollups, and again any time the
+rollups may have drifted (e.g. positions closed by a bulk reconciler update,
+which bypasses PositionCRUD.close_position). Each user is rebuilt in its own
+transaction, so the job can be re-run safely; prefer running it while that
+user's bot is stopped so no close lands mid-rebuild.
+
+Usage:
+    python scripts/backfill_analytics.py
+    python scripts/backfill_analytics.py --user-id 5f0c...
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import select
+
+import src.models  # noqa: F401  (registers all tables on Base.metadata)
+from src.db.crud.analytics_rollup import AnalyticsRollupCRUD
+from src.db.database import async_session_factory, engine
+from src.models.position import Position
+
+
+async def backfill(user_ids: list[uuid.UUID] | None, batch_size: int) -> None:
+    if user_ids is None:
+        async with async_session_factory() as db:
+            result = await db.execute(
+                select(Position.user_id).where(Position.status == "closed").distinct()
+            )
+            user_ids = list(result.scalars().all())
+
+    print(f"Rebuilding analytics rollups for {len(user_ids)} user(s)")
+    total = 0
+    started = time.perf_counter()
+    for user_id in user_ids:
+        async with async_session_factory() as db:
+            count = await AnalyticsRollupCRUD.rebuild_for_user(db, user_id, batch_size=batch_size)
+        total += count
+        print(f"  {user_id}: {count} closed positions")
+    print(f"Done: {total} positions in {time.perf_counter() - started:.1f}s")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild analytics rollups from closed positions")
+    parser.add_argument("--user-id", action="append", type=uuid.UUID, help="Only rebuild this user (repeatable)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    try:
+        await backfill(args.user_id, args.batch_size)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,185 @@
+"""
+Benchmark JSON serialization of representative API payloads and pushes.
+
+Compares the stdlib path (Starlette's JSONResponse.render, json.dumps with
+default=str for frames) against src.core.serialization, which uses orjson
+when installed. Response payloads are built from the response schemas and
+passed through jsonable_encoder first, as FastAPI does for routes without
+a response_model, so both renderers see the same content; the encoder's
+own cost is reported separately.
+
+Usage:
+    python scripts/bench_json_serialization.py [--rounds 50] [--scale 1]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Callable
+
+# Settings validation needs these even though no database is touched
+os.environ.setdefault("SECRET_KEY", "bench-secret-key-not-used-for-anything-real")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from src.core.serialization import BACKEND, FastJSONResponse, dumps
+from src.core.websocket import WebSocketEventType, WebSocketMessage
+from src.schemas.dashboard import DashboardStats, PositionSummary, RecentActivity
+from src.schemas.trading import PositionResponse, TrackedMarketResponse, TradeResponse
+
+
+NOW = datetime(2026, 2, 9, 20, 0, tzinfo=timezone.utc)
+
+
+def price(i: int) -> Decimal:
+    return Decimal(f"0.{10 + i % 89:02d}")
+
+
+def positions(count: int) -> list[PositionResponse]:
+    """Closed positions with two trades each (trading history page)."""
+    result = []
+    for i in range(count):
+        trades = [
+            TradeResponse(
+                id=uuid.uuid4(), polymarket_order_id=f"ord-{i}-{leg}", action=leg, side="YES",
+                price=price(i + n), size=Decimal("10"), total_usdc=price(i + n) * 10,
+                fee_usdc=Decimal("0.07"), status="filled", executed_at=NOW, created_at=NOW,
+            )
+            for n, leg in enumerate(("BUY", "SELL"))
+        ]
+        result.append(PositionResponse(
+            id=uuid.uuid4(), condition_id=f"KXNBAGAME-26FEB09-{i:04d}", token_id=f"tok-{i}",
+            side="YES", team=f"Team {i}", entry_price=price(i), entry_size=Decimal("10"),
+            entry_cost_usdc=price(i) * 10, entry_reason="threshold_drop", exit_price=price(i + 1),
+            exit_size=Decimal("10"), exit_proceeds_usdc=price(i + 1) * 10, exit_reason="take_profit",
+            realized_pnl_usdc=Decimal("0.10"), status="closed", opened_at=NOW - timedelta(hours=2),
+            closed_at=NOW, trades=trades,
+        ))
+    return result
+
+
+def markets(count: int) -> list[TrackedMarketResponse]:
+    """Tracked market listing."""
+    return [
+        TrackedMarketResponse(
+            id=uuid.uuid4(), condition_id=f"KXNBAGAME-26FEB09-{i:04d}", token_id_yes=f"y-{i}",
+            token_id_no=f"n-{i}", question=f"Will team {i} win?", sport="nba",
+            home_team=f"Home {i}", away_team=f"Away {i}", home_abbrev="HOM", away_abbrev="AWY",
+            game_start_time=NOW, baseline_price_yes=price(i), baseline_price_no=1 - price(i),
+            current_price_yes=price(i + 3), current_price_no=1 - price(i + 3), is_live=True,
+            is_finished=False, current_period=3, time_remaining_seconds=412, home_score=70,
+            away_score=66, match_confidence=Decimal("0.97"), last_updated_at=NOW,
+        )
+        for i in range(count)
+    ]
+
+
+def dashboard(count: int) -> DashboardStats:
+    """Dashboard stats with open positions and recent activity."""
+    return DashboardStats(
+        balance_usdc=Decimal("1234.56"), open_positions_count=count,
+        open_positions_value=Decimal("456.78"), total_pnl_today=Decimal("12.34"),
+        total_pnl_all_time=Decimal("345.67"), win_rate=61.5, active_markets_count=count,
+        bot_status="running",
+        open_positions=[
+            PositionSummary(
+                id=uuid.uuid4(), token_id=f"tok-{i}", side="YES", team=f"Team {i}",
+                entry_price=price(i), current_price=price(i + 2), unrealized_pnl=Decimal("0.20"),
+                size=Decimal("10"), opened_at=NOW,
+            )
+            for i in range(count)
+        ],
+        recent_activity=[
+            RecentActivity(id=uuid.uuid4(), level="INFO", category="TRADE",
+                           message=f"Opened position {i}", created_at=NOW)
+            for i in range(10)
+        ],
+    )
+
+
+def equity_points(count: int) -> list[dict[str, Any]]:
+    """Equity curve points as streamed by /analytics/equity-curve."""
+    return [
+        {"timestamp": (NOW + timedelta(minutes=i)).isoformat(), "equity": 1000 + i * 0.37,
+         "drawdown": (i % 17) * 0.01, "trade_id": str(uuid.uuid4())}
+        for i in range(count)
+    ]
+
+
+def push_frames(count: int) -> list[WebSocketMessage]:
+    """position_updated pushes with raw Decimal/UUID values in their data."""
+    return [
+        WebSocketMessage(
+            event_type=WebSocketEventType.POSITION_UPDATED,
+            data={"position_id": uuid.uuid4(), "current_price": price(i),
+                  "unrealized_pnl": Decimal("0.20"), "updated_at": NOW},
+        )
+        for i in range(count)
+    ]
+
+
+def stdlib_frame(message: WebSocketMessage) -> str:
+    return json.dumps({
+        "event": message.event_type.value,
+        "data": message.data,
+        "timestamp": message.timestamp,
+        "correlation_id": message.correlation_id,
+    }, default=str)
+
+
+def timed(func: Callable[[], Any], rounds: int) -> float:
+    """Mean milliseconds per call after one warm-up call."""
+    func()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--scale", type=int, default=1, help="Multiply payload sizes")
+    args = parser.parse_args()
+    n = args.scale
+
+    responses = {
+        f"positions x{500 * n}": positions(500 * n),
+        f"markets x{300 * n}": markets(300 * n),
+        f"dashboard x{50 * n}": dashboard(50 * n),
+    }
+    print(f"backend={BACKEND} rounds={args.rounds}")
+    print(f"  {'payload':<22}{'encoder':>10}{'stdlib':>10}{'fast':>10}{'speedup':>10}   (ms per response)")
+    for name, payload in responses.items():
+        content = jsonable_encoder(payload)
+        encode = timed(lambda: jsonable_encoder(payload), args.rounds)
+        stdlib = timed(lambda: JSONResponse(content), args.rounds)
+        fast = timed(lambda: FastJSONResponse(content), args.rounds)
+        print(f"  {name:<22}{encode:>10.2f}{stdlib:>10.2f}{fast:>10.2f}{stdlib / fast:>9.2f}x")
+
+    points = equity_points(5000 * n)
+    frames = push_frames(1000 * n)
+    print(f"  {'frames':<22}{'':>10}{'stdlib':>10}{'fast':>10}{'speedup':>10}   (ms per batch)")
+    for name, stdlib_func, fast_func in [
+        (f"equity points x{len(points)}",
+         lambda: [json.dumps(p) for p in points], lambda: [dumps(p) for p in points]),
+        (f"ws pushes x{len(frames)}",
+         lambda: [stdlib_frame(m) for m in frames], lambda: [m.to_json() for m in frames]),
+    ]:
+        stdlib = timed(stdlib_func, args.rounds)
+        fast = timed(fast_func, args.rounds)
+        print(f"  {name:<22}{'':>10}{stdlib:>10.2f}{fast:>10.2f}{stdlib / fast:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Benchmark the per-request cost of each HTTP middleware layer.
+
+Builds the production middleware stack one layer at a time (innermost
+first, in the order main.py installs them) and then the fused middleware
+with the same stages, and drives each app in-process straight through
+the ASGI interface (no network, no client). For every configuration it
+reports the mean latency (best of several rounds), the delta to the
+previous row (the cost of the layer just added) and the peak memory
+traced by tracemalloc while serving one request.
+
+Rate limits are raised so no request is throttled, and every request
+comes from a new client address so no row inherits the limiter state of
+the rows before it. Request log records go through the logging
+machinery but are not written anywhere.
+
+Usage:
+    python scripts/bench_middleware.py [--requests 1000] [--rounds 5]
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+# Settings validation needs these even though no database is touched
+os.environ.setdefault("SECRET_KEY", "bench-secret-key-not-used-for-anything-real")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+from src.core.logging_service import RequestLoggingMiddleware
+from src.core.middleware import FusedMiddleware
+from src.core.rate_limiter import RateLimitConfig, RateLimitMiddleware
+from src.core.security_headers import SecurityHeadersMiddleware, create_security_headers_config
+from src.core.validation import RequestValidationMiddleware, ValidationConfig
+
+
+CORS = dict(
+    allow_origins=["https://app.example.com"],
+    allow_credentials=True,
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type"],
+)
+MARKETS = {"markets": [{"id": i, "question": f"Will team {i} win?", "price": 0.55} for i in range(200)]}
+
+# (name, middleware class, kwargs factory), innermost first
+LAYERS = [
+    ("+ validation", RequestValidationMiddleware, lambda: {"config": ValidationConfig()}),
+    ("+ cors", CORSMiddleware, lambda: CORS),
+    ("+ security headers", SecurityHeadersMiddleware, lambda: {"config": create_security_headers_config()}),
+    ("+ rate limit", RateLimitMiddleware, lambda: {"config": rate_limit_config()}),
+    ("+ request logging", RequestLoggingMiddleware, lambda: {}),
+]
+
+REQUESTS = {
+    "GET /bot/status": ("GET", "/api/v1/bot/status", {}),
+    "GET /bot/status (CORS)": ("GET", "/api/v1/bot/status", {"origin": "https://app.example.com"}),
+    "POST /settings": ("POST", "/api/v1/settings", {}),
+    "GET /markets (gzip)": ("GET", "/api/v1/markets", {"accept-encoding": "gzip"}),
+}
+
+
+def rate_limit_config() -> RateLimitConfig:
+    return RateLimitConfig(requests_per_minute=10**9, requests_per_hour=10**9, burst_limit=10**9)
+
+
+def build_app(layers: int = 0, fused: bool = False, gzip_minimum_size: int | None = None) -> FastAPI:
+    """App with the innermost `layers` layers of the stack, or the fused middleware."""
+    app = FastAPI()
+
+    @app.get("/api/v1/bot/status")
+    async def status() -> dict:
+        return {"state": "running", "positions": 3}
+
+    @app.post("/api/v1/settings")
+    async def settings(body: dict) -> dict:
+        return {"updated": len(body)}
+
+    @app.get("/api/v1/markets")
+    async def markets() -> dict:
+        return MARKETS
+
+    if fused:
+        app.add_middleware(
+            FusedMiddleware,
+            rate_limit=rate_limit_config(),
+            security_headers=create_security_headers_config(),
+            cors=CORS,
+            validation=ValidationConfig(),
+            gzip_minimum_size=gzip_minimum_size,
+        )
+    else:
+        for _, cls, kwargs in LAYERS[:layers]:
+            app.add_middleware(cls, **kwargs())
+    return app
+
+
+_clients = itertools.count()
+
+
+async def call(app: FastAPI, method: str, path: str, headers: dict[str, str]) -> int:
+    """One request straight through the ASGI interface; returns the status."""
+    client = next(_clients)
+    body = b'{"entry_threshold_drop": 0.15, "notes": "tightened"}' if method == "POST" else b""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "server": ("testserver", 80), "client": (f"10.{client >> 16 & 255}.{client >> 8 & 255}.{client & 255}", 5000),
+        "headers": [
+            (b"host", b"testserver"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            *((name.encode(), value.encode()) for name, value in headers.items()),
+        ],
+    }
+    sent = False
+    status = 0
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def measure(app: FastAPI, request: tuple, count: int, rounds: int) -> tuple[float, float]:
+    """
+    Best mean microseconds per request over several rounds, and mean
+    peak KiB traced while serving one request.
+    """
+    assert await call(app, *request) == 200
+
+    latency = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(count):
+            await call(app, *request)
+        latency = min(latency, (time.perf_counter() - start) / count * 1e6)
+
+    samples = max(1, count // 10)
+    peak = 0
+    tracemalloc.start()
+    try:
+        for _ in range(samples):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            await call(app, *request)
+            peak += tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    return latency, peak / samples / 1024
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    logging.getLogger("api.requests").setLevel(logging.INFO)
+    logging.getLogger("api.requests").propagate = False
+
+    print(f"requests={args.requests} rounds={args.rounds}")
+    for request_name, request in REQUESTS.items():
+        configs = [("no middleware", build_app())]
+        configs += [(name, build_app(layers=i + 1)) for i, (name, _, _) in enumerate(LAYERS)]
+        configs += [
+            ("fused", build_app(fused=True)),
+            ("fused + gzip", build_app(fused=True, gzip_minimum_size=500)),
+        ]
+        print(f"\n{request_name}")
+        print(f"  {'configuration':<22}{'us/req':>10}{'delta':>10}{'peak KiB':>10}")
+        previous = None
+        stack = None
+        for name, app in configs:
+            latency, peak = await measure(app, request, args.requests, args.rounds)
+            if name.startswith("fused"):
+                delta = latency - stack  # against the full stack
+            else:
+                delta = latency - previous if previous is not None else 0.0
+                previous = stack = latency
+            print(f"  {name:<22}{latency:>10.1f}{delta:>+10.1f}{peak:>10.1f}")
+        print("  (fused rows: delta vs. the full stack)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
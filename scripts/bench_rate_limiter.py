@@ -0,0 +1,146 @@
+"""
+Benchmark RateLimiter.check_rate_limit with many distinct clients.
+
+Compares the previous limiter (reproduced below as LegacyRateLimiter:
+timestamp lists per window, rebuilt on every check under one global
+asyncio.Lock, and a sweep over all clients every minute) with the
+current sliding-window counters. Both start with --clients clients that
+have each made --history requests in the last hour, then serve checks
+from clients picked round-robin. The report gives the mean and p99
+microseconds per check, the slowest single check (where the periodic
+sweep lands) and the memory traced for the client states.
+
+Usage:
+    python scripts/bench_rate_limiter.py [--clients 10000] [--history 100] [--checks 100000]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from dataclasses import dataclass, field
+from unittest.mock import patch
+
+# Settings validation needs these even though no database is touched
+os.environ.setdefault("SECRET_KEY", "bench-secret-key-not-used-for-anything-real")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.rate_limiter import RateLimitConfig, RateLimiter
+
+
+@dataclass
+class LegacyState:
+    minute_requests: list[float] = field(default_factory=list)
+    hour_requests: list[float] = field(default_factory=list)
+    burst_requests: list[float] = field(default_factory=list)
+
+    def cleanup(self, now: float) -> None:
+        self.minute_requests = [t for t in self.minute_requests if t > now - 60]
+        self.hour_requests = [t for t in self.hour_requests if t > now - 3600]
+        self.burst_requests = [t for t in self.burst_requests if t > now - 1.0]
+
+
+class LegacyRateLimiter:
+    """The previous implementation's check path, condensed."""
+
+    def __init__(self, config: RateLimitConfig):
+        self.config = config
+        self._states: dict[str, LegacyState] = defaultdict(LegacyState)
+        self._lock = asyncio.Lock()
+        self._last_cleanup = time.time()
+
+    async def check_rate_limit(self, client_id: str) -> tuple[bool, dict]:
+        now = time.time()
+        async with self._lock:
+            if now - self._last_cleanup > 60.0:
+                idle = [c for c, s in self._states.items() if not s.hour_requests or max(s.hour_requests) < now - 3600]
+                for c in idle:
+                    del self._states[c]
+                self._last_cleanup = now
+            state = self._states[client_id]
+            state.cleanup(now)
+            counts = len(state.burst_requests), len(state.minute_requests), len(state.hour_requests)
+            limits = self.config.burst_limit, self.config.requests_per_minute, self.config.requests_per_hour
+            if any(count >= limit for count, limit in zip(counts, limits)):
+                return False, {}
+            state.minute_requests.append(now)
+            state.hour_requests.append(now)
+            state.burst_requests.append(now)
+            return True, {}
+
+
+class Clock:
+    """Simulated time, advanced by the benchmark instead of the wall clock."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def config() -> RateLimitConfig:
+    # High enough that no check is denied: the cost of counting is measured
+    return RateLimitConfig(requests_per_minute=10**6, requests_per_hour=10**6, burst_limit=10**6)
+
+
+async def warm(limiter, clock: Clock, clients: list[str], history: int) -> None:
+    """Spreads `history` requests per client over the last hour."""
+    step = 3600.0 / (history * len(clients))
+    for _ in range(history):
+        for client in clients:
+            clock.now += step
+            await limiter.check_rate_limit(client)
+
+
+async def run(limiter, clock: Clock, clients: list[str], checks: int, step: float) -> list[float]:
+    timings = []
+    for i in range(checks):
+        clock.now += step
+        start = time.perf_counter()
+        await limiter.check_rate_limit(clients[i % len(clients)])
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def bench(name: str, factory, args) -> None:
+    clients = [f"ip:10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(args.clients)]
+    clock = Clock()
+    with patch("time.time", clock):
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        limiter = factory(config())
+        await warm(limiter, clock, clients, args.history)
+        state_kib = (tracemalloc.get_traced_memory()[0] - before) / 1024
+        tracemalloc.stop()
+
+        # 120s of simulated traffic: both limiters hit their sweep
+        timings = await run(limiter, clock, clients, args.checks, 120.0 / args.checks)
+
+    timings.sort()
+    mean = sum(timings) / len(timings) * 1e6
+    p99 = timings[int(len(timings) * 0.99)] * 1e6
+    print(f"  {name:<10}{mean:>10.2f}{p99:>10.2f}{timings[-1] * 1e3:>12.2f}{state_kib:>14.0f}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=10_000)
+    parser.add_argument("--history", type=int, default=100, help="Requests per client in the last hour")
+    parser.add_argument("--checks", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"clients={args.clients} history={args.history} checks={args.checks}")
+    print(f"  {'limiter':<10}{'mean us':>10}{'p99 us':>10}{'max ms':>12}{'state KiB':>14}")
+    await bench("legacy", LegacyRateLimiter, args)
+    await bench("current", RateLimiter, args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
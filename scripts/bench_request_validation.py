@@ -0,0 +1,197 @@
+"""
+Benchmark the per-request overhead of RequestValidationMiddleware.
+
+Compares a bare FastAPI app against the same app behind the previous
+BaseHTTPMiddleware implementation (reproduced below as
+LegacyValidationMiddleware: full body buffering, stdlib json re-parse and
+three separate pattern lists per string) and behind the current pure-ASGI
+middleware. Requests are driven straight through the ASGI interface so no
+network or client overhead is included.
+
+Usage:
+    python scripts/bench_request_validation.py [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+
+# Settings validation needs these even though no database is touched
+os.environ.setdefault("SECRET_KEY", "bench-secret-key-not-used-for-anything-real")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi import APIRouter, FastAPI
+from pydantic import BaseModel
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+
+from src.core.validation import (
+    RequestValidationMiddleware,
+    ValidatedJSONRoute,
+    ValidationConfig,
+    check_json_depth,
+)
+
+
+class LeagueConfig(BaseModel):
+    league: str
+    enabled: bool
+    entry_threshold_drop: float
+    position_size_usdc: float
+    take_profit_pct: float
+    stop_loss_pct: float
+    notes: str | None = None
+
+
+class BulkConfig(BaseModel):
+    configs: list[LeagueConfig]
+
+
+class LegacyValidationMiddleware(BaseHTTPMiddleware):
+    """The previous implementation's request path, condensed."""
+
+    def __init__(self, app, config: ValidationConfig):
+        super().__init__(app)
+        self._config = config
+        self._lists = [
+            [re.compile(p, re.IGNORECASE) for p in patterns]
+            for patterns in (config.blocked_path_patterns, config.sql_injection_patterns, config.xss_patterns)
+        ]
+
+    def _issues(self, value: str) -> list[str]:
+        return [str(i) for i, patterns in enumerate(self._lists) if any(p.search(value) for p in patterns)]
+
+    def _walk(self, obj) -> list[str]:
+        issues = []
+        if isinstance(obj, str):
+            issues.extend(self._issues(obj))
+        elif isinstance(obj, dict):
+            for key, value in obj.items():
+                issues.extend(self._issues(key))
+                issues.extend(self._walk(value))
+        elif isinstance(obj, list):
+            for item in obj:
+                issues.extend(self._walk(item))
+        return issues
+
+    async def dispatch(self, request, call_next):
+        body = await request.body()
+        request.state._body = body
+        issues = [] if len(str(request.url)) <= self._config.max_url_length else ["url"]
+        issues.extend(self._issues(request.url.path))
+        for key, value in request.query_params.items():
+            issues.extend(self._issues(key) + self._issues(value))
+        if request.method in ("POST", "PUT", "PATCH") and body:
+            data = json.loads(body)
+            if not check_json_depth(data, self._config.max_json_depth):
+                issues.append("depth")
+            issues.extend(self._walk(data))
+        if issues:
+            return JSONResponse(status_code=400, content={"error": "INVALID_INPUT"})
+        return await call_next(request)
+
+
+def build_app(middleware: str) -> FastAPI:
+    app = FastAPI()
+    router = APIRouter(route_class=ValidatedJSONRoute)
+
+    @router.get("/api/v1/settings/sports")
+    async def list_sports(sport: str | None = None, limit: int = 50) -> dict:
+        return {"sport": sport, "limit": limit}
+
+    @router.post("/api/v1/settings/leagues/bulk")
+    async def bulk(config: BulkConfig) -> dict:
+        return {"configured": len(config.configs)}
+
+    app.include_router(router)
+    config = ValidationConfig()
+    if middleware == "legacy":
+        app.add_middleware(LegacyValidationMiddleware, config=config)
+    elif middleware == "asgi":
+        app.add_middleware(RequestValidationMiddleware, config=config)
+    return app
+
+
+def bulk_body(count: int) -> bytes:
+    return json.dumps({"configs": [
+        {"league": f"league-{i}", "enabled": True, "entry_threshold_drop": 0.15,
+         "position_size_usdc": 50.0, "take_profit_pct": 0.2, "stop_loss_pct": 0.1,
+         "notes": f"Configured from the settings page for league {i}"}
+        for i in range(count)
+    ]}).encode()
+
+
+REQUESTS = {
+    "GET ?sport=nba&limit=50": ("GET", "/api/v1/settings/sports", b"sport=nba&limit=50", b""),
+    "POST 5 configs": ("POST", "/api/v1/settings/leagues/bulk", b"", bulk_body(5)),
+    "POST 200 configs": ("POST", "/api/v1/settings/leagues/bulk", b"", bulk_body(200)),
+}
+
+
+async def call(app: FastAPI, method: str, path: str, query: bytes, body: bytes) -> int:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": query, "server": ("testserver", 80), "client": ("127.0.0.1", 5000),
+        "headers": [
+            (b"host", b"testserver"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    }
+    sent = False
+    status = 0
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def measure(app: FastAPI, request: tuple, count: int) -> float:
+    """Mean microseconds per request after a warm-up."""
+    assert await call(app, *request) == 200
+    start = time.perf_counter()
+    for _ in range(count):
+        await call(app, *request)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    apps = {name: build_app(name) for name in ("none", "legacy", "asgi")}
+    print(f"requests={args.requests} (us per request; overhead vs. no middleware)")
+    print(f"  {'request':<26}{'none':>10}{'legacy':>18}{'asgi':>18}")
+    for name, request in REQUESTS.items():
+        base = await measure(apps["none"], request, args.requests)
+        legacy = await measure(apps["legacy"], request, args.requests)
+        asgi = await measure(apps["asgi"], request, args.requests)
+        print(
+            f"  {name:<26}{base:>10.1f}"
+            f"{legacy:>10.1f} (+{legacy - base:>5.1f})"
+            f"{asgi:>10.1f} (+{asgi - base:>5.1f})"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
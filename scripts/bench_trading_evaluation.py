@@ -0,0 +1,181 @@
+"""
+Benchmark the BotRunner -> TradingEngine evaluation path.
+
+Compares the legacy adapter, which built a detached TrackedMarket ORM object
+with Decimal prices for every evaluation, against the float-based
+GameMarketView that wraps the TrackedGame directly.
+
+Database calls made by TradingEngine are replaced with constant stubs so only
+the in-process evaluation cost is measured.
+
+Usage:
+    python scripts/bench_trading_evaluation.py [--games 100] [--rounds 200]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+# Settings validation needs these even though no database is touched
+os.environ.setdefault("SECRET_KEY", "bench-secret-key-not-used-for-anything-real")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.db.crud.position import PositionCRUD
+from src.models.tracked_market import TrackedMarket
+from src.services.market_discovery import DiscoveredMarket
+from src.services.trading_engine import TradingEngine
+from src.services.types import TrackedGame, GameMarketView
+
+
+USER_ID = uuid.uuid4()
+
+
+def build_games(count: int) -> list[TrackedGame]:
+    """Create live NBA games whose prices alternate between entry and no-entry."""
+    games = []
+    for i in range(count):
+        market = DiscoveredMarket(
+            condition_id=f"cond-{i}",
+            token_id_yes=f"yes-{i}",
+            token_id_no=f"no-{i}",
+            question=f"Game {i}",
+            sport="nba",
+            volume_24h=0,
+            liquidity=0,
+            current_price_yes=0.6,
+            current_price_no=0.4,
+            spread=0.02,
+            ticker=f"KXNBAGAME-26FEB07T{i:03d}-HOME",
+        )
+        game = TrackedGame(
+            espn_event_id=f"evt-{i}",
+            sport="nba",
+            home_team=f"Home {i}",
+            away_team=f"Away {i}",
+            market=market,
+            baseline_price=0.6,
+            current_price=0.45 if i % 2 else 0.58,
+            game_status="in",
+            period=2,
+            clock="6:00",
+        )
+        game.refresh_clock()
+        games.append(game)
+    return games
+
+
+def legacy_market(game: TrackedGame) -> TrackedMarket:
+    """The per-evaluation ORM adapter BotRunner used before GameMarketView."""
+    baseline = game.baseline_price
+    if baseline is None:
+        baseline = game.market.current_price_yes
+    current = game.current_price
+    if current is None:
+        current = game.market.current_price_yes if game.market.current_price_yes is not None else baseline
+    return TrackedMarket(
+        id=game.position_id or uuid.uuid4(),
+        user_id=USER_ID,
+        condition_id=game.market.condition_id or game.market.ticker or "",
+        token_id_yes=game.market.token_id_yes or "",
+        token_id_no=game.market.token_id_no or "",
+        question=game.market.question or "",
+        sport=game.sport,
+        home_team=game.home_team,
+        away_team=game.away_team,
+        baseline_price_yes=Decimal(str(baseline)),
+        baseline_price_no=Decimal(str(1 - baseline)),
+        current_price_yes=Decimal(str(current)),
+        current_price_no=Decimal(str(1 - current)),
+        is_live=game.game_status == "in",
+        current_period=game.period,
+    )
+
+
+def build_engine() -> TradingEngine:
+    sport_config = SimpleNamespace(
+        sport="nba",
+        is_enabled=True,
+        entry_threshold_pct=Decimal("0.15"),
+        absolute_entry_price=Decimal("0.30"),
+        min_time_remaining_seconds=120,
+        take_profit_pct=Decimal("0.20"),
+        stop_loss_pct=Decimal("0.10"),
+        default_position_size_usdc=Decimal("50.00"),
+        max_positions_per_game=2,
+        allowed_entry_segments=["q1", "q2", "q3", "q4"],
+        min_entry_confidence_score=Decimal("0"),
+    )
+    settings = SimpleNamespace(
+        max_daily_loss_usdc=Decimal("100.00"),
+        max_portfolio_exposure_usdc=Decimal("500.00"),
+    )
+    return TradingEngine(
+        db=AsyncMock(),
+        user_id=str(USER_ID),
+        trading_client=AsyncMock(),
+        global_settings=settings,
+        sport_configs={"nba": sport_config},
+    )
+
+
+def game_state(game: TrackedGame) -> dict:
+    clock = game.clock_state
+    return {
+        "is_live": True,
+        "segment": clock.segment,
+        "time_remaining_seconds": clock.seconds_remaining or 0,
+    }
+
+
+async def run(engine: TradingEngine, games: list[TrackedGame], rounds: int, adapter) -> float:
+    """Run entry and exit evaluation for every game; return evaluations/sec."""
+    position = SimpleNamespace(side="YES", entry_price=Decimal("0.50"))
+    states = [game_state(g) for g in games]
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for game, state in zip(games, states):
+            market = adapter(game)
+            await engine.evaluate_entry(market, state)
+            await engine.evaluate_exit(position, market, state)
+    elapsed = time.perf_counter() - start
+    return (rounds * len(games) * 2) / elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    games = build_games(args.games)
+    engine = build_engine()
+
+    with patch.object(PositionCRUD, "count_open_for_market", AsyncMock(return_value=0)), \
+         patch.object(PositionCRUD, "get_daily_pnl", AsyncMock(return_value=Decimal("0"))), \
+         patch.object(PositionCRUD, "get_open_exposure", AsyncMock(return_value=Decimal("0"))), \
+         patch.object(PositionCRUD, "count_open_for_team", AsyncMock(return_value=0)):
+        # Warm up both paths once before timing
+        await run(engine, games, 1, legacy_market)
+        await run(engine, games, 1, GameMarketView)
+
+        legacy = await run(engine, games, args.rounds, legacy_market)
+        view = await run(engine, games, args.rounds, GameMarketView)
+
+    print(f"games={args.games} rounds={args.rounds}")
+    print(f"  TrackedMarket (ORM) : {legacy:>12,.0f} evals/sec")
+    print(f"  GameMarketView      : {view:>12,.0f} evals/sec")
+    print(f"  speedup             : {view / legacy:>12.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
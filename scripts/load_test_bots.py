@@ -0,0 +1,535 @@
+"""
+Multi-tenant load test for BotRunner.
+
+Starts N synthetic users, each running a full BotRunner (discovery, ESPN poll,
+price poll and trading loops) over M live games, all in one process the way
+production runs them through _bot_instances. External services are replaced
+with local stand-ins:
+
+- Kalshi: the in-process exchange simulator (signed requests, matching engine)
+- ESPN: a synthetic scoreboard whose games stay live with a running clock
+- Database: whatever DATABASE_URL points at (defaults to a local SQLite file)
+
+Recorded per scenario:
+- per-loop iteration latency (discovery, espn_poll, price_poll, trading)
+- event-loop lag
+- DB queries/sec and connection-pool checkout waits
+- RSS and CPU utilisation
+- exchange request rate and orders placed
+
+The JSON report can be compared against a previous run with --compare.
+
+Usage:
+    python scripts/load_test_bots.py --users 1,10,50 --games 10 --duration 60
+    python scripts/load_test_bots.py --users 200 --interval-scale 0.2 --output after.json --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+# Defaults for a self-contained run; real values in the environment win
+os.environ.setdefault("SECRET_KEY", "load-test-key-0123456789abcdef0123456789abcdef")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./loadtest.db")
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from sqlalchemy import event
+
+import src.models  # noqa: F401  (registers all tables on Base.metadata)
+from src.db.activity_log_writer import activity_log_writer
+from src.db.database import Base, engine, async_session_factory
+from src.db.crud.global_settings import GlobalSettingsCRUD
+from src.db.crud.sport_config import SportConfigCRUD
+from src.models.user import User
+from src.services import bot_runner as bot_runner_module
+from src.services.bot_runner import BotRunner, _bot_instances
+from src.services.espn_service import ESPNService
+from src.services.kalshi_simulator import KalshiExchangeSimulator, SimulatorConfig
+from src.services.market_discovery import DiscoveredMarket
+from src.services.trading_engine import TradingEngine
+from src.services.types import LoopMetrics
+
+LOOP_NAMES = ("discovery", "espn_poll", "price_poll", "trading")
+
+
+# =============================================================================
+# Stand-ins
+# =============================================================================
+
+class SyntheticSportsFeed:
+    """Shared state for M live NBA games and their Kalshi markets."""
+
+    QUARTER_WALL_SECONDS = 60.0
+
+    def __init__(self, games: int):
+        self.started = time.monotonic()
+        date_code = datetime.now(timezone.utc).strftime("%y%b%d").upper()
+        self.games = [
+            {
+                "id": f"load-{i}",
+                "ticker": f"KXNBAGAME-{date_code}LT{i:03d}-HOME",
+                "home": f"Home Team {i}",
+                "away": f"Away Team {i}",
+            }
+            for i in range(games)
+        ]
+        self._by_id = {g["id"]: g for g in self.games}
+
+    def _status(self) -> dict:
+        # Keep games live in Q2/Q3 so every loop has work to do
+        elapsed = time.monotonic() - self.started
+        period = 2 + int(elapsed // self.QUARTER_WALL_SECONDS) % 2
+        remaining = 720 - int((elapsed % self.QUARTER_WALL_SECONDS) / self.QUARTER_WALL_SECONDS * 720)
+        return {
+            "type": {"state": "in", "name": "STATUS_IN_PROGRESS"},
+            "period": period,
+            "displayClock": f"{remaining // 60}:{remaining % 60:02d}",
+        }
+
+    def event(self, game: dict) -> dict:
+        status = self._status()
+        return {
+            "id": game["id"],
+            "status": status,
+            "competitions": [{
+                "status": status,
+                "competitors": [
+                    {"homeAway": "home", "score": "50", "team": {"displayName": game["home"], "name": game["home"]}},
+                    {"homeAway": "away", "score": "48", "team": {"displayName": game["away"], "name": game["away"]}},
+                ],
+            }],
+        }
+
+    def summary(self, event_id: str) -> dict:
+        game = self._by_id.get(event_id)
+        return self.event(game) if game else {}
+
+    def markets(self) -> list[DiscoveredMarket]:
+        """Fresh market objects per call, as each bot mutates its own copy."""
+        return [
+            DiscoveredMarket(
+                condition_id=g["ticker"],
+                token_id_yes=f"{g['ticker']}-yes",
+                token_id_no=f"{g['ticker']}-no",
+                question=f"Will {g['home']} win?",
+                sport="nba",
+                volume_24h=100_000,
+                liquidity=10_000,
+                current_price_yes=0.50,
+                current_price_no=0.50,
+                spread=0.02,
+                home_team=g["home"],
+                away_team=g["away"],
+                game_start_time=datetime.now(timezone.utc) - timedelta(minutes=30),
+                ticker=g["ticker"],
+            )
+            for g in self.games
+        ]
+
+
+class SyntheticESPNService(ESPNService):
+    """ESPNService with the HTTP calls replaced by the synthetic feed."""
+
+    def __init__(self, feed: SyntheticSportsFeed, latency_ms: float = 0.0):
+        super().__init__()
+        self.feed = feed
+        self.latency = latency_ms / 1000
+
+    async def get_scoreboard(self, sport: str) -> list[dict]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return [self.feed.event(g) for g in self.feed.games] if sport.lower() == "nba" else []
+
+    async def get_game_summary(self, sport: str, event_id: str) -> dict:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.feed.summary(event_id)
+
+
+class SyntheticDiscovery:
+    """Replaces the module-level Kalshi market discovery used by BotRunner."""
+
+    def __init__(self, feed: SyntheticSportsFeed):
+        self.feed = feed
+
+    async def discover_kalshi_markets(self, *args, **kwargs) -> list[DiscoveredMarket]:
+        return self.feed.markets()
+
+
+async def move_prices(exchange: KalshiExchangeSimulator, feed: SyntheticSportsFeed, rng: random.Random) -> None:
+    """Random-walk every market's quote once a second."""
+    mids = {g["ticker"]: 50 for g in feed.games}
+    while True:
+        await asyncio.sleep(1.0)
+        for ticker, mid in mids.items():
+            mid = max(5, min(95, mid + rng.choice((-2, -1, 0, 1, 2))))
+            mids[ticker] = mid
+            exchange.set_quote(ticker, mid - 1, mid + 1)
+
+
+# =============================================================================
+# Measurement
+# =============================================================================
+
+class DatabaseProbe:
+    """Counts executed statements and times connection-pool checkouts."""
+
+    def __init__(self):
+        self.queries = 0
+        self.pool_waits = LoopMetrics()
+        self._sync_engine = engine.sync_engine
+        self._pool = self._sync_engine.pool
+        self._original_do_get = self._pool._do_get
+        self.backend = self._sync_engine.dialect.name
+        self.pool_class = type(self._pool).__name__
+
+    def _on_execute(self, *args) -> None:
+        self.queries += 1
+
+    def _timed_do_get(self):
+        started = time.perf_counter()
+        try:
+            return self._original_do_get()
+        finally:
+            self.pool_waits.record(time.perf_counter() - started)
+
+    def install(self) -> None:
+        event.listen(self._sync_engine, "before_cursor_execute", self._on_execute)
+        self._pool._do_get = self._timed_do_get
+
+    def remove(self) -> None:
+        event.remove(self._sync_engine, "before_cursor_execute", self._on_execute)
+        self._pool._do_get = self._original_do_get
+
+
+class LoopLagSampler:
+    """Measures how late the event loop wakes a fixed-interval sleeper."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.metrics = LoopMetrics()
+
+    async def run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.metrics.record(max(0.0, time.perf_counter() - started - self.interval))
+
+
+def rss_mb() -> float:
+    """Current resident set size in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def merge_metrics(runners: list[BotRunner], name: str) -> LoopMetrics:
+    merged = LoopMetrics()
+    merged.samples = []  # unbounded while aggregating across users
+    for runner in runners:
+        metrics = runner.loop_metrics.get(name)
+        if not metrics:
+            continue
+        merged.iterations += metrics.iterations
+        merged.total_seconds += metrics.total_seconds
+        merged.max_seconds = max(merged.max_seconds, metrics.max_seconds)
+        merged.samples.extend(metrics.samples)
+    return merged
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# =============================================================================
+# Scenario
+# =============================================================================
+
+async def create_user(run_id: str, index: int, feed: SyntheticSportsFeed) -> uuid.UUID:
+    async with async_session_factory() as db:
+        user = User(
+            username=f"load-{run_id}-{index}",
+            email=f"load-{run_id}-{index}@loadtest.local",
+            password_hash="!",
+            onboarding_completed=True,
+        )
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+
+        await GlobalSettingsCRUD.get_or_create(db, user.id)
+        # The column stores a 0-100 score while the engine compares 0-1
+        # confidence values, so any non-zero minimum would block every entry
+        await SportConfigCRUD.create(db, user.id, "nba", enabled=True, min_entry_confidence_score=0)
+        await GlobalSettingsCRUD.save_bot_config(db, user.id, {
+            "games": [
+                {
+                    "game_id": g["id"],
+                    "sport": "nba",
+                    "market_ticker": g["ticker"],
+                    "home_team": g["home"],
+                    "away_team": g["away"],
+                    "selected_side": "home",
+                }
+                for g in feed.games
+            ],
+            # Tight thresholds so the random walk produces entries and exits
+            "parameters": {
+                "position_size": 10,
+                "probability_drop": 2,
+                "take_profit": 3,
+                "stop_loss": 3,
+                "min_volume": 0,
+            },
+        })
+        return user.id
+
+
+async def run_scenario(args: argparse.Namespace, users: int, private_key_pem: str) -> dict:
+    run_id = uuid.uuid4().hex[:8]
+    rng = random.Random(args.seed)
+    feed = SyntheticSportsFeed(args.games)
+    exchange = KalshiExchangeSimulator(SimulatorConfig(
+        latency_ms=args.kalshi_latency_ms,
+        seed=args.seed,
+        default_balance_cents=10_000_000,
+    ))
+    for game in feed.games:
+        exchange.add_market(game["ticker"], 49, 51, title=f"{game['away']} at {game['home']}")
+
+    original_discovery = bot_runner_module.discovery_service
+    bot_runner_module.discovery_service = SyntheticDiscovery(feed)
+
+    probe = DatabaseProbe()
+    lag = LoopLagSampler()
+    background = [
+        asyncio.create_task(lag.run(), name="loop_lag"),
+        asyncio.create_task(move_prices(exchange, feed, rng), name="price_walk"),
+    ]
+    runners: list[BotRunner] = []
+    rss_samples: list[float] = []
+
+    try:
+        setup_started = time.perf_counter()
+        # Create every tenant before any bot starts writing
+        user_ids = [await create_user(run_id, i, feed) for i in range(users)]
+        for i, user_id in enumerate(user_ids):
+            client = exchange.create_client(f"load-{run_id}-{i}", private_key_pem)
+            async with async_session_factory() as db:
+                global_settings = await GlobalSettingsCRUD.get_or_create(db, user_id)
+                sport_configs = {c.sport: c for c in await SportConfigCRUD.get_all_for_user(db, user_id)}
+                engine_ = TradingEngine(
+                    db=db,
+                    user_id=str(user_id),
+                    trading_client=client,
+                    global_settings=global_settings,
+                    sport_configs=sport_configs,
+                )
+                runner = BotRunner(
+                    client, engine_, SyntheticESPNService(feed, args.espn_latency_ms), price_tape=None, snapshot_store=None
+                )
+                runner.ESPN_POLL_INTERVAL = BotRunner.ESPN_POLL_INTERVAL * args.interval_scale
+                runner.DISCOVERY_INTERVAL = BotRunner.DISCOVERY_INTERVAL * args.interval_scale
+                runner.PRICE_POLL_INTERVAL = BotRunner.PRICE_POLL_INTERVAL * args.interval_scale
+                runner.TRADING_LOOP_INTERVAL = BotRunner.TRADING_LOOP_INTERVAL * args.interval_scale
+                runner.order_fill_timeout = 5
+                await runner.initialize(db, user_id)
+                await runner.start(db)
+            _bot_instances[user_id] = runner
+            runners.append(runner)
+        setup_seconds = time.perf_counter() - setup_started
+
+        # Measure steady state only
+        probe.install()
+        requests_before = exchange.request_count
+        cpu_before = time.process_time()
+        wall_before = time.perf_counter()
+        deadline = wall_before + args.duration
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(1.0)
+            rss_samples.append(rss_mb())
+        wall = time.perf_counter() - wall_before
+        cpu = time.process_time() - cpu_before
+        requests = exchange.request_count - requests_before
+        probe.remove()
+    finally:
+        for runner in runners:
+            try:
+                async with async_session_factory() as db:
+                    await runner.stop(db)
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"Failed to stop runner: {e}")
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        bot_runner_module.discovery_service = original_discovery
+
+    orders = sum(
+        1 for account in exchange.accounts.values() if account.api_key.startswith("load-")
+        for _ in account.orders
+    )
+    tracked = sum(len(r.user_selected_games) for r in runners)
+    return {
+        "users": users,
+        "games_per_user": args.games,
+        "setup_seconds": round(setup_seconds, 2),
+        "duration_seconds": round(wall, 2),
+        "loops": {name: merge_metrics(runners, name).to_dict() for name in LOOP_NAMES},
+        "event_loop_lag": lag.metrics.to_dict(),
+        "db": {
+            "backend": probe.backend,
+            "pool": probe.pool_class,
+            "queries": probe.queries,
+            "qps": round(probe.queries / wall, 1) if wall else 0.0,
+            "pool_checkouts": probe.pool_waits.iterations,
+            "pool_wait": probe.pool_waits.to_dict(),
+        },
+        "process": {
+            "rss_mb_peak": round(max(rss_samples, default=rss_mb()), 1),
+            "rss_mb_end": round(rss_samples[-1] if rss_samples else rss_mb(), 1),
+            "cpu_seconds": round(cpu, 2),
+            "cpu_pct": round(cpu / wall * 100, 1) if wall else 0.0,
+        },
+        "exchange": {
+            "requests": requests,
+            "rps": round(requests / wall, 1) if wall else 0.0,
+            "orders": orders,
+        },
+        "selected_games": tracked,
+    }
+
+
+# =============================================================================
+# Reporting
+# =============================================================================
+
+# (label, path into a scenario, True if higher is worse)
+KEY_METRICS = [
+    ("trading p95 ms", ("loops", "trading", "p95_ms"), True),
+    ("espn_poll p95 ms", ("loops", "espn_poll", "p95_ms"), True),
+    ("price_poll p95 ms", ("loops", "price_poll", "p95_ms"), True),
+    ("discovery p95 ms", ("loops", "discovery", "p95_ms"), True),
+    ("loop lag p99 ms", ("event_loop_lag", "p99_ms"), True),
+    ("db qps", ("db", "qps"), False),
+    ("pool wait p99 ms", ("db", "pool_wait", "p99_ms"), True),
+    ("rss peak MB", ("process", "rss_mb_peak"), True),
+    ("cpu %", ("process", "cpu_pct"), True),
+]
+
+
+def _lookup(scenario: dict, path: tuple[str, ...]) -> float | None:
+    value = scenario
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def print_summary(report: dict, baseline: dict | None = None) -> None:
+    base_by_users = {s["users"]: s for s in (baseline or {}).get("scenarios", [])}
+    for scenario in report["scenarios"]:
+        print(f"\n=== users={scenario['users']} games/user={scenario['games_per_user']} "
+              f"({scenario['duration_seconds']}s) ===")
+        base = base_by_users.get(scenario["users"])
+        for label, path, higher_is_worse in KEY_METRICS:
+            value = _lookup(scenario, path)
+            line = f"  {label:<20} {value!s:>12}"
+            previous = _lookup(base, path) if base else None
+            if isinstance(value, (int, float)) and isinstance(previous, (int, float)) and previous:
+                change = (value - previous) / previous * 100
+                worse = change > 0 if higher_is_worse else change < 0
+                flag = "  REGRESSION" if worse and abs(change) >= 10 else ""
+                line += f"   was {previous:>10}  ({change:+.1f}%){flag}"
+            print(line)
+
+
+def generate_private_key() -> str:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.TraditionalOpenSSL,
+        serialization.NoEncryption(),
+    ).decode()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Multi-tenant BotRunner load test")
+    parser.add_argument("--users", default="1,10,50", help="Comma-separated user counts to run (e.g. 1,50,200)")
+    parser.add_argument("--games", type=int, default=10, help="Live games tracked by each user")
+    parser.add_argument("--duration", type=float, default=60.0, help="Steady-state seconds per scenario")
+    parser.add_argument("--interval-scale", type=float, default=1.0,
+                        help="Multiply BotRunner loop intervals (0.1 = 10x more frequent)")
+    parser.add_argument("--kalshi-latency-ms", type=float, default=0.0)
+    parser.add_argument("--espn-latency-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    parser.add_argument("--compare", help="Previous JSON report to compare against")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.WARNING))
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    # Same write-behind activity logging as the API process
+    await activity_log_writer.start()
+
+    private_key_pem = generate_private_key()
+    scenarios = []
+    for users in [int(u) for u in args.users.split(",") if u.strip()]:
+        print(f"Running {users} users x {args.games} games for {args.duration:.0f}s...", flush=True)
+        scenarios.append(await run_scenario(args, users, private_key_pem))
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "scenarios": scenarios,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_summary(report, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+    await activity_log_writer.stop()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
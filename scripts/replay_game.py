@@ -0,0 +1,210 @@
+"""
+Replay a recorded game through the real BotRunner in virtual time.
+
+Every BotRunner loop, the Kalshi client's fill polling and the game clock run
+on a VirtualClock, so a 3-hour game replays in seconds with the same event
+ordering it had live. ESPN state and Kalshi quotes come from the recording;
+orders go to the in-process exchange simulator and all bot writes go to the
+database in DATABASE_URL (defaults to a local SQLite file).
+
+Recording format: see src/services/game_replay.py.
+
+Usage:
+    python scripts/replay_game.py --recording incident.json
+    python scripts/replay_game.py --synthetic --seed 3 --save-recording sample.json
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+# Defaults for a self-contained run; real values in the environment win
+os.environ.setdefault("SECRET_KEY", "replay-key-0123456789abcdef0123456789abcdef")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./replay.db")
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+import src.models  # noqa: F401  (registers all tables on Base.metadata)
+from src.core.clock import VirtualClock
+from src.db.database import Base, engine, async_session_factory
+from src.db.crud.global_settings import GlobalSettingsCRUD
+from src.db.crud.sport_config import SportConfigCRUD
+from src.models.user import User
+from src.services import bot_runner as bot_runner_module
+from src.services.bot_runner import BotRunner
+from src.services.game_replay import GameRecording, GameReplay, ReplayESPNService
+from src.services.kalshi_simulator import KalshiExchangeSimulator, SimulatorConfig
+from src.services.market_discovery import DiscoveredMarket
+from src.services.trading_engine import TradingEngine
+
+
+class ReplayDiscovery:
+    """Replaces the module-level Kalshi market discovery used by BotRunner."""
+
+    def __init__(self, recording: GameRecording):
+        self.recording = recording
+
+    async def discover_kalshi_markets(self, *args, **kwargs) -> list[DiscoveredMarket]:
+        r = self.recording
+        quote = next((f.data for f in r.frames if f.kind == "quote"), {"yes_ask": 50})
+        price = quote.get("yes_ask", 50) / 100
+        return [DiscoveredMarket(
+            condition_id=r.ticker,
+            token_id_yes=f"{r.ticker}-yes",
+            token_id_no=f"{r.ticker}-no",
+            question=f"Will {r.home_team} win?",
+            sport=r.sport,
+            volume_24h=100_000,
+            liquidity=10_000,
+            current_price_yes=price,
+            current_price_no=1 - price,
+            spread=0.02,
+            home_team=r.home_team,
+            away_team=r.away_team,
+            game_start_time=r.start_time,
+            ticker=r.ticker,
+        )]
+
+
+async def create_user(recording: GameRecording, parameters: dict) -> uuid.UUID:
+    run_id = uuid.uuid4().hex[:8]
+    async with async_session_factory() as db:
+        user = User(
+            username=f"replay-{run_id}",
+            email=f"replay-{run_id}@replay.local",
+            password_hash="!",
+            onboarding_completed=True,
+        )
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+
+        await GlobalSettingsCRUD.get_or_create(db, user.id)
+        # The column stores a 0-100 score while the engine compares 0-1
+        # confidence values, so any non-zero minimum would block every entry
+        await SportConfigCRUD.create(db, user.id, recording.sport, enabled=True, min_entry_confidence_score=0)
+        await GlobalSettingsCRUD.save_bot_config(db, user.id, {
+            "games": [{
+                "game_id": recording.event_id,
+                "sport": recording.sport,
+                "market_ticker": recording.ticker,
+                "home_team": recording.home_team,
+                "away_team": recording.away_team,
+                "selected_side": "home",
+            }],
+            "parameters": parameters,
+        })
+        return user.id
+
+
+def generate_private_key() -> str:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.TraditionalOpenSSL,
+        serialization.NoEncryption(),
+    ).decode()
+
+
+async def replay(args: argparse.Namespace, recording: GameRecording) -> None:
+    clock = VirtualClock(recording.start_time - timedelta(minutes=args.lead_minutes))
+    exchange = KalshiExchangeSimulator(SimulatorConfig(seed=args.seed, default_balance_cents=1_000_000))
+    espn = ReplayESPNService()
+    game_replay = GameReplay(recording, clock, exchange, espn)
+    game_replay.schedule()
+
+    original_discovery = bot_runner_module.discovery_service
+    bot_runner_module.discovery_service = ReplayDiscovery(recording)
+
+    user_id = await create_user(recording, {
+        "position_size": args.position_size,
+        "probability_drop": args.probability_drop,
+        "take_profit": args.take_profit,
+        "stop_loss": args.stop_loss,
+        "min_volume": 0,
+    })
+    client = exchange.create_client(f"replay-{user_id}", generate_private_key(), clock=clock)
+
+    runner = None
+    started = time.perf_counter()
+    try:
+        async with async_session_factory() as db:
+            global_settings = await GlobalSettingsCRUD.get_or_create(db, user_id)
+            sport_configs = {c.sport: c for c in await SportConfigCRUD.get_all_for_user(db, user_id)}
+            trading_engine = TradingEngine(
+                db=db,
+                user_id=str(user_id),
+                trading_client=client,
+                global_settings=global_settings,
+                sport_configs=sport_configs,
+            )
+            runner = BotRunner(client, trading_engine, espn, clock=clock, price_tape=None, snapshot_store=None)
+            runner.order_fill_timeout = args.fill_timeout
+            await runner.initialize(db, user_id)
+            await runner.start(db)
+
+        await game_replay.run(until=recording.end_time + timedelta(minutes=args.tail_minutes))
+    finally:
+        if runner is not None:
+            async with async_session_factory() as db:
+                await runner.stop(db)
+        bot_runner_module.discovery_service = original_discovery
+    elapsed = time.perf_counter() - started
+
+    virtual = (clock.now() - recording.start_time).total_seconds() + args.lead_minutes * 60
+    account = exchange.accounts[f"replay-{user_id}"]
+    print(f"Replayed {len(recording.frames)} frames ({virtual / 3600:.2f}h virtual) in {elapsed:.1f}s "
+          f"({virtual / elapsed:,.0f}x), {clock.timers_fired} timers fired")
+    print(f"Orders: {len(account.orders)}  Fills: {len(account.fills)}  "
+          f"Balance: ${account.balance / 100:,.2f}")
+    for fill in account.fills:
+        print(f"  {fill['created_time']}  {fill['action']:<4} {fill['side']:<3} "
+              f"{fill['count']:>4} @ {fill['yes_price']}c")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay a recorded game through BotRunner in virtual time")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--recording", help="Path to a recorded game (JSON)")
+    source.add_argument("--synthetic", action="store_true", help="Generate a 3-hour NBA game instead")
+    parser.add_argument("--save-recording", help="Write the (synthetic) recording to this path")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--lead-minutes", type=float, default=5.0, help="Virtual minutes to run before tip-off")
+    parser.add_argument("--tail-minutes", type=float, default=5.0, help="Virtual minutes to run after the last frame")
+    parser.add_argument("--fill-timeout", type=int, default=30)
+    parser.add_argument("--position-size", type=float, default=10)
+    parser.add_argument("--probability-drop", type=float, default=5)
+    parser.add_argument("--take-profit", type=float, default=10)
+    parser.add_argument("--stop-loss", type=float, default=10)
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.WARNING))
+
+    if args.recording:
+        recording = GameRecording.load(args.recording)
+    else:
+        start = datetime.now(timezone.utc).replace(hour=0, minute=30, second=0, microsecond=0)
+        recording = GameRecording.synthetic(start, seed=args.seed)
+    if args.save_recording:
+        recording.save(args.save_recording)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        await replay(args, recording)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
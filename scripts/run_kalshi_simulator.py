@@ -0,0 +1,68 @@
+"""
+Serve the Kalshi exchange simulator on localhost for paper trading and load tests.
+
+Point the bot at it with:
+    KALSHI_SIMULATOR_URL=http://127.0.0.1:8765/trade-api/v2
+
+Markets can be seeded from a JSON file containing a list of objects with
+"ticker", "yes_bid", "yes_ask" and optional "depth", "title", "status".
+
+Usage:
+    python scripts/run_kalshi_simulator.py --markets markets.json --latency-ms 50
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import uvicorn
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.services.kalshi_simulator import KalshiExchangeSimulator, SimulatorConfig
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the local Kalshi exchange simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--markets", help="JSON file of markets to seed")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--partial-fill-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests/sec per API key")
+    parser.add_argument("--balance", type=int, default=100_000, help="Starting balance in cents")
+    args = parser.parse_args()
+
+    simulator = KalshiExchangeSimulator(SimulatorConfig(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        partial_fill_rate=args.partial_fill_rate,
+        rate_limit_per_second=args.rate_limit,
+        # Bot credentials are accepted on first use; their public keys are unknown
+        auto_create_accounts=True,
+        default_balance_cents=args.balance,
+    ))
+
+    if args.markets:
+        with open(args.markets) as f:
+            for market in json.load(f):
+                simulator.add_market(
+                    market["ticker"],
+                    market.get("yes_bid"),
+                    market.get("yes_ask"),
+                    depth=market.get("depth", 1000),
+                    title=market.get("title"),
+                    status=market.get("status", "active"),
+                )
+    print(f"Seeded {len(simulator.markets)} markets")
+
+    uvicorn.run(simulator, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,10 @@ Provides reusable dependencies for database sessions and authentication.
 """
 
 import uuid
-from typing import Annotated, AsyncGenerator, Optional, TypeAlias
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from typing import Annotated, AsyncGenerator, Callable, Optional, TypeAlias
 
-from fastapi import Depends, HTTPException, Query, status
+from fastapi import Depends, HTTPException, Query, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -15,6 +16,8 @@ from src.core.security import verify_token
 from src.core.exceptions import AuthenticationError
 from src.models.user import User
 from src.db.crud.user import UserCRUD
+from src.core.principal_cache import Principal, principal_cache
+from src.core.resource_versions import etag_matches, resource_versions
 
 
 security = HTTPBearer(auto_error=True)
@@ -33,10 +36,71 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+def get_session_factory() -> Callable[[], AbstractAsyncContextManager[AsyncSession]]:
+    """
+    Returns a factory for sessions that must outlive the request scope.
+    
+    Request-scoped sessions from get_db are closed before a StreamingResponse
+    body runs, so streamed routes open their session from this factory
+    inside the body instead. Each call opens a get_db session.
+    """
+    return asynccontextmanager(get_db)
+
+
+async def _resolve_principal(token: str, db: AsyncSession) -> Principal:
+    """
+    Validates a JWT and returns its user as a Principal.
+
+    The user row is only loaded on a principal cache miss.
+
+    Raises:
+        HTTPException: If token is invalid, user not found or deactivated
+    """
+    try:
+        payload = verify_token(token)
+    except AuthenticationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e)
+        )
+
+    user_id = payload.get("sub")
+    if not user_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token payload"
+        )
+
+    user_uuid = uuid.UUID(user_id)
+    token_key = str(payload.get("jti") or payload.get("iat"))
+    principal = principal_cache.get(user_uuid, token_key)
+
+    if principal is None:
+        generation = principal_cache.generation(user_uuid)
+        user = await UserCRUD.get_by_id(db, user_uuid)
+
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found"
+            )
+
+        principal = Principal.from_user(user)
+        principal_cache.put(principal, token_key, generation)
+
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is deactivated"
+        )
+
+    return principal
+
+
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     db: Annotated[AsyncSession, Depends(get_db)]
-) -> User:
+) -> Principal:
     """
     Validates JWT token and returns the authenticated user.
     
@@ -45,58 +109,48 @@ async def get_current_user(
         db: Database session
     
     Returns:
-        Authenticated User instance
+        Authenticated user as an immutable Principal
     
     Raises:
         HTTPException: If token is invalid or user not found
     """
-    try:
-        payload = verify_token(credentials.credentials)
-        user_id = payload.get("sub")
-        
-        if not user_id:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token payload"
-            )
-        
-        user = await UserCRUD.get_by_id(db, uuid.UUID(user_id))
-        
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found"
-            )
-        
-        if not user.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="User account is deactivated"
-            )
-        
-        return user
-        
-    except AuthenticationError as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=str(e)
-        )
+    return await _resolve_principal(credentials.credentials, db)
 
 
 async def get_current_active_user(
-    current_user: Annotated[User, Depends(get_current_user)]
-) -> User:
+    current_user: Annotated[Principal, Depends(get_current_user)]
+) -> Principal:
     """
     Ensures user is active. Alias for get_current_user with explicit naming.
     """
     return current_user
 
 
+async def get_current_user_record(
+    current_user: Annotated[Principal, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)]
+) -> User:
+    """
+    Loads the authenticated user's ORM row, for routes that modify it or
+    need its relationships.
+
+    Raises:
+        HTTPException: If the user no longer exists
+    """
+    user = await UserCRUD.get_by_id(db, current_user.id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    return user
+
+
 async def get_user_from_token(
     db: Annotated[AsyncSession, Depends(get_db)],
     token: Optional[str] = Query(None, description="JWT token for SSE auth"),
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security_optional)
-) -> User:
+) -> Principal:
     """
     Validates JWT token from query param or Authorization header.
     Designed for SSE endpoints where headers cannot be sent by EventSource.
@@ -107,7 +161,7 @@ async def get_user_from_token(
         credentials: Optional Bearer token from Authorization header
     
     Returns:
-        Authenticated User instance
+        Authenticated user as an immutable Principal
     
     Raises:
         HTTPException: If no valid token or user not found
@@ -121,42 +175,12 @@ async def get_user_from_token(
             detail="Authentication required"
         )
     
-    try:
-        payload = verify_token(jwt_token)
-        user_id = payload.get("sub")
-        
-        if not user_id:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token payload"
-            )
-        
-        user = await UserCRUD.get_by_id(db, uuid.UUID(user_id))
-        
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found"
-            )
-        
-        if not user.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="User account is deactivated"
-            )
-        
-        return user
-        
-    except AuthenticationError as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=str(e)
-        )
+    return await _resolve_principal(jwt_token, db)
 
 
 async def require_onboarding_complete(
-    current_user: Annotated[User, Depends(get_current_user)]
-) -> User:
+    current_user: Annotated[Principal, Depends(get_current_user)]
+) -> Principal:
     """
     Ensures user has completed onboarding before accessing protected resources.
     
@@ -171,21 +195,74 @@ async def require_onboarding_complete(
     return current_user
 
 
+def conditional_get(*resources: str, per_user: bool = True, max_age: int = 300):
+    """
+    Builds a dependency that serves a route conditionally by resource version.
+
+    The dependency computes a strong ETag from the versions of the given
+    resources (per user unless per_user is False), the path and the query
+    string. If the request's If-None-Match matches, it ends the request with
+    304 Not Modified before the route body runs, so no resource query or
+    serialization happens. Otherwise the ETag and Cache-Control headers are
+    attached to the route's response.
+
+    Per-user responses are marked private and must be revalidated on every
+    use; static ones (per_user=False) may be reused for max_age seconds.
+
+    Usage:
+        @router.get("/global", dependencies=[Depends(conditional_get("global_settings"))])
+    """
+    if per_user:
+        cache_control = "private, no-cache"
+    else:
+        cache_control = f"public, max-age={max_age}"
+
+    def respond(request: Request, response: Response, scope: uuid.UUID | None) -> None:
+        etag = resource_versions.etag(resources, scope, f"{request.url.path}?{request.url.query}")
+        headers = {"ETag": etag, "Cache-Control": cache_control}
+        if per_user:
+            headers["Vary"] = "Authorization"
+
+        not_modified = etag_matches(request.headers.get("if-none-match"), etag)
+        resource_versions.record(not_modified)
+        if not_modified:
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
+    if not per_user:
+        async def check_static(request: Request, response: Response) -> None:
+            respond(request, response, None)
+        return check_static
+
+    async def check_user(
+        request: Request,
+        response: Response,
+        current_user: Annotated[Principal, Depends(get_current_user)],
+    ) -> None:
+        respond(request, response, current_user.id)
+    return check_user
+
+
 # Type aliases for dependency injection - improves readability and IDE support
 DbSession: TypeAlias = Annotated[AsyncSession, Depends(get_db)]
-CurrentUser: TypeAlias = Annotated[User, Depends(get_current_user)]
-OnboardedUser: TypeAlias = Annotated[User, Depends(require_onboarding_complete)]
-SSEUser: TypeAlias = Annotated[User, Depends(get_user_from_token)]
+CurrentUser: TypeAlias = Annotated[Principal, Depends(get_current_user)]
+CurrentUserRecord: TypeAlias = Annotated[User, Depends(get_current_user_record)]
+OnboardedUser: TypeAlias = Annotated[Principal, Depends(require_onboarding_complete)]
+SSEUser: TypeAlias = Annotated[Principal, Depends(get_user_from_token)]
 
 
 __all__ = [
     "get_db",
+    "get_session_factory",
     "get_current_user",
     "get_current_active_user",
+    "get_current_user_record",
     "get_user_from_token",
     "require_onboarding_complete",
+    "conditional_get",
     "DbSession",
     "CurrentUser",
+    "CurrentUserRecord",
     "OnboardedUser",
     "SSEUser",
 ]
@@ -13,15 +13,17 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.deps import get_db, get_current_user
-from src.models import User, TradingAccount
+from src.core.principal_cache import Principal
+from src.models import TradingAccount
 from src.services.account_manager import AccountManager
 from src.services.kalshi_client import KalshiClient
 from src.core.encryption import encrypt_credential, decrypt_credential
 from src.config import settings
+from src.core.validation import ValidatedJSONRoute
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/accounts", tags=["accounts"])
+router = APIRouter(prefix="/accounts", tags=["accounts"], route_class=ValidatedJSONRoute)
 
 
 class AccountResponse(BaseModel):
@@ -84,7 +86,7 @@ class AllocationUpdateRequest(BaseModel):
 @router.get("/summary", response_model=AccountSummaryResponse)
 async def get_account_summary(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """
     Get summary of all trading accounts.
@@ -120,7 +122,7 @@ async def get_account_summary(
 @router.get("/", response_model=list[AccountResponse])
 async def list_accounts(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """
     List all trading accounts for the current user.
@@ -153,7 +155,7 @@ async def list_accounts(
 async def create_account(
     request: CreateAccountRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """
     Create a new trading account.
@@ -230,7 +232,7 @@ async def update_account(
     account_id: UUID,
     request: UpdateAccountRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """
     Update account settings (name, allocation, active status).
@@ -273,7 +275,7 @@ async def update_account(
 async def set_primary_account(
     account_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """
     Set an account as the primary trading account.
@@ -291,7 +293,7 @@ async def set_primary_account(
 async def update_allocations(
     request: AllocationUpdateRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """
     Update allocation percentages for multiple accounts atomically.
@@ -333,7 +335,7 @@ async def update_allocations(
 async def delete_account(
     account_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """
     Delete a trading account.
@@ -375,7 +377,7 @@ async def delete_account(
 async def get_account_balance(
     account_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """
     Get current balance for a specific account.
@@ -404,7 +406,7 @@ async def get_account_balance(
 async def test_account_connection(
     account_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """
     Test connection to a specific account's trading platform.
@@ -436,7 +438,7 @@ async def test_account_connection(
 
     if account.platform == "kalshi":
         try:
-            from src.services.kalshi_client import KalshiClient
+            from src.services.kalshi_client import create_kalshi_client
 
             api_key = decrypt_credential(account.api_key_encrypted) if account.api_key_encrypted else None
             api_secret = decrypt_credential(account.api_secret_encrypted) if account.api_secret_encrypted else None
@@ -449,7 +451,7 @@ async def test_account_connection(
                 }
 
             # Try to create client and fetch balance
-            client = KalshiClient(
+            client = create_kalshi_client(
                 api_key=api_key,
                 private_key_pem=api_secret,
             )
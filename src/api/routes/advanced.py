@@ -12,9 +12,10 @@ from pydantic import BaseModel, Field
 
 from src.api.deps import DbSession, OnboardedUser
 from src.db.crud.activity_log import ActivityLogCRUD
+from src.core.validation import ValidatedJSONRoute
 
 
-router = APIRouter(prefix="/api/v1/advanced", tags=["Advanced Trading"])
+router = APIRouter(prefix="/api/v1/advanced", tags=["Advanced Trading"], route_class=ValidatedJSONRoute)
 
 
 # =============================================================================
@@ -2,20 +2,27 @@
 Analytics API endpoints - performance metrics and trade statistics.
 """
 
-from datetime import datetime, timezone
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from contextlib import AbstractAsyncContextManager
+from typing import AsyncGenerator, Callable, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.deps import get_db, get_current_user
-from src.models import User
+from src.api.deps import get_db, get_current_user, get_session_factory
+from src.core.serialization import dumps
+from src.core.principal_cache import Principal
 from src.services.analytics_service import AnalyticsService
+from src.services.price_tape import price_tape
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
+# Equity points serialized per streamed chunk
+EQUITY_CURVE_CHUNK_SIZE = 500
+
 
 class PerformanceMetricsResponse(BaseModel):
     """Performance metrics response schema."""
@@ -58,6 +65,15 @@ class EquityPointResponse(BaseModel):
     trade_id: Optional[str]
 
 
+class PriceQuoteResponse(BaseModel):
+    """Single quote from the price tape."""
+    timestamp: datetime
+    bid: float
+    ask: float
+    last: float
+    volume: float
+
+
 class DailyPnLResponse(BaseModel):
     """Daily P&L response."""
     date: str
@@ -70,7 +86,7 @@ async def get_performance_metrics(
     end_date: Optional[datetime] = Query(None, description="Filter to date"),
     sport: Optional[str] = Query(None, description="Filter by sport"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """
     Get comprehensive trading performance metrics.
@@ -111,7 +127,7 @@ async def get_performance_metrics(
 @router.get("/sports", response_model=list[SportPerformanceResponse])
 async def get_sport_breakdown(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """
     Get performance breakdown by sport.
@@ -137,36 +153,52 @@ async def get_sport_breakdown(
 async def get_equity_curve(
     start_date: Optional[datetime] = Query(None),
     initial_capital: float = Query(1000, ge=0),
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
+    session_factory: Callable[[], AbstractAsyncContextManager[AsyncSession]] = Depends(get_session_factory),
 ):
     """
     Get equity curve time series.
     
-    Returns equity value at each trade close for charting.
+    Returns equity value at each trade close for charting. The JSON array
+    is streamed as points are read, so long histories start arriving
+    immediately and are never held in memory in full.
     """
-    analytics = AnalyticsService(db, current_user.id)
-    curve = await analytics.get_equity_curve(
-        start_date=start_date,
-        initial_capital=initial_capital,
-    )
+    user_id = current_user.id
     
-    return [
-        EquityPointResponse(
-            timestamp=point.timestamp,
-            equity=point.equity,
-            drawdown=point.drawdown,
-            trade_id=point.trade_id,
-        )
-        for point in curve
-    ]
+    async def body() -> AsyncGenerator[str, None]:
+        # Own session: the request-scoped one closes before the body is sent
+        async with session_factory() as db:
+            analytics = AnalyticsService(db, user_id)
+            chunk: list[str] = []
+            first = True
+            yield "["
+            async for point in analytics.iter_equity_curve(
+                start_date=start_date,
+                initial_capital=initial_capital,
+            ):
+                item = dumps({
+                    "timestamp": point.timestamp.isoformat(),
+                    "equity": point.equity,
+                    "drawdown": point.drawdown,
+                    "trade_id": point.trade_id,
+                })
+                chunk.append(item if first else "," + item)
+                first = False
+                if len(chunk) >= EQUITY_CURVE_CHUNK_SIZE:
+                    yield "".join(chunk)
+                    chunk = []
+            if chunk:
+                yield "".join(chunk)
+            yield "]"
+    
+    return StreamingResponse(body(), media_type="application/json")
 
 
 @router.get("/daily-pnl", response_model=list[DailyPnLResponse])
 async def get_daily_pnl(
     days: int = Query(30, ge=1, le=365, description="Number of days"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     """
     Get daily P&L for the last N days.
@@ -177,3 +209,28 @@ async def get_daily_pnl(
     daily = await analytics.get_daily_pnl(days=days)
     
     return [DailyPnLResponse(date=d["date"], pnl=d["pnl"]) for d in daily]
+
+
+@router.get("/price-history/{ticker}", response_model=list[PriceQuoteResponse])
+async def get_price_history(
+    ticker: str,
+    start: Optional[datetime] = Query(None, description="Range start (defaults to 24h ago)"),
+    end: Optional[datetime] = Query(None, description="Range end (defaults to now)"),
+    max_points: int = Query(1000, ge=2, le=10000, description="Downsample to at most this many quotes"),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Get recorded quotes for a market ticker from the price tape.
+    
+    Used for intraday price charts; long ranges are evenly downsampled,
+    always keeping the latest quote.
+    """
+    end = end or datetime.now(timezone.utc)
+    start = start or end - timedelta(hours=24)
+    quotes = await price_tape.read_range(ticker, start, end)
+    
+    if len(quotes) > max_points:
+        step = -(-len(quotes) // max_points)
+        quotes = quotes[-1::-step][::-1]
+    
+    return [PriceQuoteResponse(**q._asdict()) for q in quotes]
@@ -31,12 +31,13 @@ from src.schemas.auth import (
     LogoutRequest,
 )
 from src.core.exceptions import ValidationError
+from src.core.validation import ValidatedJSONRoute
 
 if TYPE_CHECKING:
-    from src.models.user import User
+    from src.core.principal_cache import Principal
 
 
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=ValidatedJSONRoute)
 
 
 def _get_client_info(request: Request) -> tuple[str | None, str | None]:
@@ -245,7 +246,7 @@ async def refresh_token(
 async def logout(
     logout_data: LogoutRequest,
     db: DbSession,
-    current_user: "User" = Depends(get_current_user),
+    current_user: "Principal" = Depends(get_current_user),
 ) -> dict:
     """
     Logout the user by revoking refresh tokens.
@@ -284,7 +285,7 @@ async def logout(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: "User" = Depends(get_current_user)
+    current_user: "Principal" = Depends(get_current_user)
 ) -> UserResponse:
     """
     Returns the current authenticated user's information.
@@ -295,7 +296,7 @@ async def get_current_user_info(
 @router.get("/sessions")
 async def get_active_sessions(
     db: DbSession,
-    current_user: "User" = Depends(get_current_user),
+    current_user: "Principal" = Depends(get_current_user),
 ) -> list[dict]:
     """
     Get all active sessions (refresh tokens) for the current user.
@@ -322,7 +323,7 @@ async def get_active_sessions(
 async def revoke_session(
     session_id: str,
     db: DbSession,
-    current_user: "User" = Depends(get_current_user),
+    current_user: "Principal" = Depends(get_current_user),
 ) -> dict:
     """
     Revoke a specific session (refresh token).
@@ -5,7 +5,7 @@ Integrates with BotRunner for actual trading operations.
 
 import logging
 from datetime import datetime, timezone
-from fastapi import APIRouter, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, HTTPException, status, BackgroundTasks, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.deps import DbSession, OnboardedUser
@@ -15,15 +15,23 @@ from src.db.crud.activity_log import ActivityLogCRUD
 from src.db.crud.sport_config import SportConfigCRUD
 from src.db.crud.market_config import MarketConfigCRUD
 from src.schemas.common import MessageResponse
-from src.services.bot_runner import get_bot_runner, get_bot_status, BotState
+from src.services.bot_runner import (
+    get_bot_runner,
+    get_bot_status,
+    get_bot_status_snapshot,
+    wait_for_bot_status,
+    BotState,
+)
 
 from src.services.trading_engine import TradingEngine
 from src.services.espn_service import ESPNService
 from src.config import settings as app_settings
+from src.core.resource_versions import etag_matches
+from src.core.validation import ValidatedJSONRoute
 
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/bot", tags=["Bot Control"])
+router = APIRouter(prefix="/bot", tags=["Bot Control"], route_class=ValidatedJSONRoute)
 
 
 async def _create_bot_dependencies(db, user_id, credentials: dict):
@@ -44,13 +52,19 @@ async def _create_bot_dependencies(db, user_id, credentials: dict):
 
     # Create the correct client based on platform
     if platform == "kalshi":
-        from src.services.kalshi_client import KalshiClient
-        trading_client = KalshiClient(
+        from src.services.kalshi_client import create_kalshi_client
+        trading_client = create_kalshi_client(
             api_key=credentials["api_key"],
             # Kalshi private key might be stored as 'private_key' OR 'api_secret' depending on onboarding
-            private_key_pem=credentials.get("private_key") or credentials.get("api_secret")
+            private_key_pem=credentials.get("private_key") or credentials.get("api_secret"),
         )
-        logger.info(f"Created KalshiClient for user {user_id} - REAL MONEY TRADING")
+        if app_settings.kalshi_simulator_url:
+            logger.info(
+                f"Created KalshiClient for user {user_id} - PAPER TRADING against "
+                f"{app_settings.kalshi_simulator_url}"
+            )
+        else:
+            logger.info(f"Created KalshiClient for user {user_id} - REAL MONEY TRADING")
     else:
         # Polymarket support removed
         raise HTTPException(
@@ -318,6 +332,39 @@ async def get_bot_status_endpoint(db: DbSession, current_user: OnboardedUser) ->
     }
 
 
+@router.get("/status/live", response_model=dict)
+async def get_live_bot_status(
+    request: Request,
+    response: Response,
+    db: DbSession,
+    current_user: OnboardedUser,
+    wait: float = Query(0, ge=0, le=30, description="Seconds to hold an unchanged request (long-poll)"),
+) -> dict:
+    """
+    Returns the bot's live status document, served by version.
+    
+    Send the last ETag as If-None-Match: an unchanged status is answered
+    with 304 Not Modified. With wait > 0 the request is held until the
+    status changes or wait seconds pass, so clients can long-poll instead
+    of re-polling.
+    """
+    snapshot = get_bot_status_snapshot(current_user.id)
+    if snapshot is None:
+        return {"state": "stopped", "status_version": 0}
+    
+    if_none_match = request.headers.get("if-none-match")
+    if wait and etag_matches(if_none_match, snapshot.etag):
+        # Don't hold a pooled connection (from the user lookup) while waiting
+        await db.close()
+        snapshot = await wait_for_bot_status(current_user.id, snapshot.version, wait) or snapshot
+    
+    headers = {"ETag": snapshot.etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+    if etag_matches(if_none_match, snapshot.etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return {**snapshot.document, "status_version": snapshot.version}
+
+
 @router.post("/emergency-stop", response_model=dict)
 async def emergency_stop(
     db: DbSession,
@@ -412,7 +459,7 @@ async def get_sport_stats(current_user: OnboardedUser) -> dict:
     return {
         "sports": bot_runner.get_sport_stats(),
         "enabled_sports": bot_runner.enabled_sports,
-        "paper_trading": False
+        "paper_trading": bool(app_settings.kalshi_simulator_url)
     }
 
 
@@ -436,27 +483,30 @@ async def toggle_paper_trading(
     enabled: bool = True
 ) -> MessageResponse:
     """
-    Paper trading is not supported. All trading uses real money.
-    This endpoint is kept for API compatibility but always returns live mode.
+    Trading mode is a deployment setting and cannot be toggled per user.
+    Paper trading is enabled by setting KALSHI_SIMULATOR_URL, which points
+    bot clients at the local exchange simulator instead of Kalshi.
+    This endpoint is kept for API compatibility and reports the active mode.
     """
-    await ActivityLogCRUD.info(
-        db,
-        current_user.id,
-        "BOT",
-        "Trading mode is LIVE TRADING (paper trading not supported)"
-    )
+    if app_settings.kalshi_simulator_url:
+        message = "Trading mode is PAPER TRADING against the exchange simulator."
+    else:
+        message = "Trading mode is LIVE TRADING. Paper trading requires KALSHI_SIMULATOR_URL."
 
-    return MessageResponse(message="Trading mode is LIVE TRADING. Paper trading is not supported.")
+    await ActivityLogCRUD.info(db, current_user.id, "BOT", message)
+
+    return MessageResponse(message=message)
 
 
 @router.get("/paper-trading", response_model=dict)
 async def get_paper_trading_status(db: DbSession, current_user: OnboardedUser) -> dict:
     """
-    Returns trading mode status. Always live - paper trading not supported.
+    Returns trading mode status. Paper when KALSHI_SIMULATOR_URL is set.
     """
+    paper = bool(app_settings.kalshi_simulator_url)
     return {
-        "paper_trading_enabled": False,
-        "mode": "LIVE",
+        "paper_trading_enabled": paper,
+        "mode": "PAPER" if paper else "LIVE",
         "simulated_trades": []
     }
 
@@ -690,7 +740,7 @@ async def place_manual_order(
     try:
         if request.platform.lower() == "kalshi":
             # Use Kalshi client
-            from src.services.kalshi_client import KalshiClient
+            from src.services.kalshi_client import create_kalshi_client
             
             kalshi_key = credentials.get("api_key")
             kalshi_private = credentials.get("api_secret")
@@ -701,7 +751,7 @@ async def place_manual_order(
                     detail="Kalshi credentials not configured. Please complete onboarding with Kalshi API key and secret."
                 )
             
-            client = KalshiClient(kalshi_key, kalshi_private)
+            client = create_kalshi_client(kalshi_key, kalshi_private)
             
             order = await client.place_order(
                 ticker=request.ticker,
@@ -987,7 +1037,7 @@ async def manual_reconciliation(
         Reconciliation results with any discrepancies found.
     """
     from src.services.position_reconciler import PositionReconciler
-    from src.services.kalshi_client import KalshiClient
+    from src.services.kalshi_client import create_kalshi_client
     from src.db.crud.polymarket_account import PolymarketAccountCRUD
     
     try:
@@ -1004,7 +1054,7 @@ async def manual_reconciliation(
         
         # Create client
         if credentials.get("platform") == "kalshi":
-            client = KalshiClient(
+            client = create_kalshi_client(
                 api_key=credentials["api_key"],
                 private_key_pem=credentials["api_secret"],
             )
@@ -1069,7 +1119,7 @@ async def get_reconciliation_status(
     Returns basic counts of exchange vs database positions.
     """
     from src.services.position_reconciler import PositionReconciler
-    from src.services.kalshi_client import KalshiClient
+    from src.services.kalshi_client import create_kalshi_client
     from src.db.crud.polymarket_account import PolymarketAccountCRUD
     
     try:
@@ -1083,7 +1133,7 @@ async def get_reconciliation_status(
                 "message": "Reconciliation only available for Kalshi"
             }
         
-        client = KalshiClient(
+        client = create_kalshi_client(
             api_key=credentials["api_key"],
             private_key_pem=credentials["api_secret"],
         )
@@ -55,8 +55,8 @@ async def trading_health_check(
             platform = credentials.get("platform", "polymarket")
             
             if platform == "kalshi":
-                from src.services.kalshi_client import KalshiClient
-                client = KalshiClient(
+                from src.services.kalshi_client import create_kalshi_client
+                client = create_kalshi_client(
                     api_key=credentials["api_key"],
                     private_key_pem=credentials["api_secret"],
                 )
@@ -236,8 +236,8 @@ async def detailed_health_check(
         )
         
         if credentials and credentials.get("platform") == "kalshi":
-            from src.services.kalshi_client import KalshiClient
-            client = KalshiClient(
+            from src.services.kalshi_client import create_kalshi_client
+            client = create_kalshi_client(
                 api_key=credentials["api_key"],
                 private_key_pem=credentials["api_secret"],
             )
@@ -5,11 +5,13 @@ Activity log routes for viewing system events and trading activity.
 import math
 from datetime import datetime, timedelta, timezone
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query, status
 from pydantic import BaseModel
 
 from src.api.deps import DbSession, OnboardedUser
+from src.core.exceptions import ValidationError
 from src.db.crud.activity_log import ActivityLogCRUD
+from src.schemas.common import CursorPage
 from src.schemas.dashboard import RecentActivity
 
 
@@ -34,6 +36,16 @@ class PaginatedLogs(BaseModel):
     total_pages: int
 
 
+def _to_log_entry(log) -> LogEntry:
+    return LogEntry(
+        id=str(log.id),
+        timestamp=log.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+        level=log.level,
+        module=log.category.lower().replace("_", "."),
+        message=log.message
+    )
+
+
 @router.get("/", response_model=PaginatedLogs)
 async def get_activity_logs(
     db: DbSession,
@@ -74,16 +86,7 @@ async def get_activity_logs(
     )
     
     # Convert to frontend format
-    items = [
-        LogEntry(
-            id=str(log.id),
-            timestamp=log.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-            level=log.level,
-            module=log.category.lower().replace("_", "."),
-            message=log.message
-        )
-        for log in logs
-    ]
+    items = [_to_log_entry(log) for log in logs]
     
     return PaginatedLogs(
         items=items,
@@ -94,6 +97,60 @@ async def get_activity_logs(
     )
 
 
+@router.get("/cursor", response_model=CursorPage[LogEntry])
+async def get_activity_logs_page(
+    db: DbSession,
+    current_user: OnboardedUser,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = None,
+    level: str | None = None,
+    category: str | None = None,
+    include_total: bool = False
+) -> CursorPage[LogEntry]:
+    """
+    Returns one newest-first page of activity logs using keyset pagination.
+    
+    Every page costs the same regardless of depth. Pass the returned
+    next_cursor back as ?cursor= for the next page.
+    
+    Args:
+        limit: Maximum number of logs per page
+        cursor: Cursor from the previous page (omit for the first page)
+        level: Filter by log level (INFO, WARNING, ERROR)
+        category: Filter by category (TRADE, BOT, WALLET, etc.)
+        include_total: Also return an approximate total (cached or estimated)
+    """
+    level = level if level and level != 'all' else None
+    
+    try:
+        logs, next_cursor = await ActivityLogCRUD.get_page(
+            db,
+            current_user.id,
+            limit=limit,
+            cursor=cursor,
+            level=level,
+            category=category
+        )
+    except ValidationError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+    
+    total = None
+    if include_total:
+        total = await ActivityLogCRUD.estimate_count(db, current_user.id, level=level, category=category)
+    
+    return CursorPage[LogEntry](
+        items=[_to_log_entry(log) for log in logs],
+        next_cursor=next_cursor,
+        has_more=next_cursor is not None,
+        limit=limit,
+        total=total,
+        total_is_estimate=include_total
+    )
+
+
 @router.get("/errors", response_model=list[RecentActivity])
 async def get_recent_errors(
     db: DbSession,
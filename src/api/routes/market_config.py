@@ -6,9 +6,9 @@ Allows users to set custom thresholds for specific markets.
 import uuid
 from decimal import Decimal
 
-from fastapi import APIRouter, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 
-from src.api.deps import DbSession, OnboardedUser
+from src.api.deps import DbSession, OnboardedUser, conditional_get
 from src.db.crud.market_config import MarketConfigCRUD
 from src.db.crud.sport_config import SportConfigCRUD
 from src.db.crud.tracked_market import TrackedMarketCRUD
@@ -18,12 +18,17 @@ from src.schemas.trading import (
     MarketConfigResponse,
     MarketConfigWithDefaults,
 )
+from src.core.validation import ValidatedJSONRoute
 
 
-router = APIRouter(prefix="/market-configs", tags=["Market Configuration"])
+router = APIRouter(prefix="/market-configs", tags=["Market Configuration"], route_class=ValidatedJSONRoute)
 
 
-@router.get("", response_model=list[MarketConfigResponse])
+@router.get(
+    "",
+    response_model=list[MarketConfigResponse],
+    dependencies=[Depends(conditional_get("market_configs"))],
+)
 async def get_market_configs(
     db: DbSession,
     current_user: OnboardedUser,
@@ -44,7 +49,11 @@ async def get_market_configs(
     return [MarketConfigResponse.model_validate(c) for c in configs]
 
 
-@router.get("/{config_id}", response_model=MarketConfigWithDefaults)
+@router.get(
+    "/{config_id}",
+    response_model=MarketConfigWithDefaults,
+    dependencies=[Depends(conditional_get("market_configs", "sport_configs"))],
+)
 async def get_market_config(
     config_id: uuid.UUID,
     db: DbSession,
@@ -103,7 +112,11 @@ async def get_market_config(
     return MarketConfigWithDefaults(**response_data)
 
 
-@router.get("/by-market/{condition_id}", response_model=MarketConfigResponse | None)
+@router.get(
+    "/by-market/{condition_id}",
+    response_model=MarketConfigResponse | None,
+    dependencies=[Depends(conditional_get("market_configs"))],
+)
 async def get_config_by_market(
     condition_id: str,
     db: DbSession,
@@ -15,9 +15,10 @@ from src.schemas.onboarding import (
     WalletTestResponse,
 )
 from src.schemas.common import MessageResponse
+from src.core.validation import ValidatedJSONRoute
 
 
-router = APIRouter(prefix="/onboarding", tags=["Onboarding"])
+router = APIRouter(prefix="/onboarding", tags=["Onboarding"], route_class=ValidatedJSONRoute)
 
 
 TOTAL_ONBOARDING_STEPS = 4
@@ -204,7 +205,7 @@ async def test_wallet_connection(
         )
     
     try:
-        from src.services.kalshi_client import KalshiClient
+        from src.services.kalshi_client import create_kalshi_client
         
         api_key = credentials.get("api_key")
         api_secret = credentials.get("api_secret")
@@ -218,7 +219,7 @@ async def test_wallet_connection(
         # Get environment (demo/production)
         environment = credentials.get("environment", "production")
         
-        client = KalshiClient(
+        client = create_kalshi_client(
             api_key=api_key,
             private_key_pem=api_secret,
         )
@@ -4,9 +4,9 @@ Settings routes for sport configs and global settings.
 
 import uuid
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 
-from src.api.deps import DbSession, CurrentUser
+from src.api.deps import DbSession, CurrentUser, conditional_get
 from src.db.crud.sport_config import SportConfigCRUD
 from src.db.crud.global_settings import GlobalSettingsCRUD
 from src.db.crud.activity_log import ActivityLogCRUD
@@ -27,18 +27,20 @@ from src.schemas.settings import (
 from src.schemas.common import MessageResponse
 from src.models.sport_config import SPORT_PROGRESS_CONFIG, ProgressMetricType
 from src.services.espn_service import ESPNService
+from src.core.validation import ValidatedJSONRoute
 
 
-router = APIRouter(prefix="/settings", tags=["Settings"])
+router = APIRouter(prefix="/settings", tags=["Settings"], route_class=ValidatedJSONRoute)
 
 
-@router.get("/sports/progress-config")
+@router.get("/sports/progress-config", dependencies=[Depends(conditional_get(per_user=False))])
 async def get_all_sports_progress_config() -> dict:
     """
     Returns progress metric configuration for all supported sports.
     Used by frontend to render sport-specific threshold inputs.
     
-    No auth required - this is static configuration data.
+    No auth required - this is static configuration data, so it is
+    served with a public max-age and a per-process ETag.
     """
     result = {}
     for sport, config in SPORT_PROGRESS_CONFIG.items():
@@ -173,7 +175,7 @@ async def get_all_sports_progress_config() -> dict:
     return result
 
 
-@router.get("/sports/{sport}/threshold-config")
+@router.get("/sports/{sport}/threshold-config", dependencies=[Depends(conditional_get("sport_configs"))])
 async def get_sport_threshold_config(
     sport: str,
     db: DbSession,
@@ -208,7 +210,11 @@ async def get_sport_threshold_config(
     }
 
 
-@router.get("/sports", response_model=list[SportConfigResponse])
+@router.get(
+    "/sports",
+    response_model=list[SportConfigResponse],
+    dependencies=[Depends(conditional_get("sport_configs"))],
+)
 async def get_all_sport_configs(
     db: DbSession,
     current_user: CurrentUser
@@ -220,7 +226,11 @@ async def get_all_sport_configs(
     return [SportConfigResponse.model_validate(c) for c in configs]
 
 
-@router.get("/sports/{sport}", response_model=SportConfigResponse)
+@router.get(
+    "/sports/{sport}",
+    response_model=SportConfigResponse,
+    dependencies=[Depends(conditional_get("sport_configs"))],
+)
 async def get_sport_config(
     sport: str,
     db: DbSession,
@@ -442,7 +452,11 @@ async def bulk_enable_leagues(
     )
 
 
-@router.get("/leagues/status", response_model=UserLeagueStatus)
+@router.get(
+    "/leagues/status",
+    response_model=UserLeagueStatus,
+    dependencies=[Depends(conditional_get("sport_configs"))],
+)
 async def get_user_league_status(
     db: DbSession,
     current_user: CurrentUser
@@ -535,7 +549,11 @@ async def delete_league_config(
     return MessageResponse(message=f"Deleted {league} configuration")
 
 
-@router.get("/global", response_model=GlobalSettingsResponse)
+@router.get(
+    "/global",
+    response_model=GlobalSettingsResponse,
+    dependencies=[Depends(conditional_get("global_settings"))],
+)
 async def get_global_settings(
     db: DbSession,
     current_user: CurrentUser
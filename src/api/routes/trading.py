@@ -7,13 +7,16 @@ import uuid
 from fastapi import APIRouter, HTTPException, status, Query
 
 from src.api.deps import DbSession, OnboardedUser
+from src.core.exceptions import ValidationError
 from src.db.crud.tracked_market import TrackedMarketCRUD
 from src.db.crud.position import PositionCRUD
 from src.db.crud.activity_log import ActivityLogCRUD
 from src.db.crud.account import AccountCRUD
+from src.db.crud.trade import TradeCRUD
 from src.schemas.trading import (
     TrackedMarketResponse,
     PositionResponse,
+    TradeResponse,
     OrderRequest,
     OrderResponse,
     GameSelectionRequest,
@@ -24,10 +27,11 @@ from src.schemas.trading import (
     AvailableGameResponse,
     GameListResponse,
 )
-from src.schemas.common import PaginatedResponse
+from src.schemas.common import CursorPage, PaginatedResponse
+from src.core.validation import ValidatedJSONRoute
 
 
-router = APIRouter(prefix="/trading", tags=["Trading"])
+router = APIRouter(prefix="/trading", tags=["Trading"], route_class=ValidatedJSONRoute)
 
 
 @router.get("/markets", response_model=list[TrackedMarketResponse])
@@ -91,6 +95,86 @@ async def get_positions(
     return [PositionResponse.model_validate(p) for p in positions]
 
 
+@router.get("/positions/cursor", response_model=CursorPage[PositionResponse])
+async def get_positions_page(
+    db: DbSession,
+    current_user: OnboardedUser,
+    status_filter: str | None = Query(None, alias="status"),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = None,
+    include_total: bool = False
+) -> CursorPage[PositionResponse]:
+    """
+    Returns one page of positions (most recently opened first) using
+    keyset pagination. Pass the returned next_cursor back as ?cursor=.
+    """
+    try:
+        positions, next_cursor = await PositionCRUD.get_page_for_user(
+            db,
+            current_user.id,
+            status=status_filter,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValidationError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+    
+    total = None
+    if include_total:
+        total = await PositionCRUD.estimate_count(db, current_user.id, status=status_filter)
+    
+    return CursorPage[PositionResponse](
+        items=[PositionResponse.model_validate(p) for p in positions],
+        next_cursor=next_cursor,
+        has_more=next_cursor is not None,
+        limit=limit,
+        total=total,
+        total_is_estimate=include_total
+    )
+
+
+@router.get("/trades/cursor", response_model=CursorPage[TradeResponse])
+async def get_trades_page(
+    db: DbSession,
+    current_user: OnboardedUser,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = None,
+    include_total: bool = False
+) -> CursorPage[TradeResponse]:
+    """
+    Returns one newest-first page of trade executions using keyset
+    pagination. Pass the returned next_cursor back as ?cursor=.
+    """
+    try:
+        trades, next_cursor = await TradeCRUD.get_page_for_user(
+            db,
+            current_user.id,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValidationError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+    
+    total = None
+    if include_total:
+        total = await TradeCRUD.estimate_count(db, current_user.id)
+    
+    return CursorPage[TradeResponse](
+        items=[TradeResponse.model_validate(t) for t in trades],
+        next_cursor=next_cursor,
+        has_more=next_cursor is not None,
+        limit=limit,
+        total=total,
+        total_is_estimate=include_total
+    )
+
+
 @router.get("/positions/open", response_model=list[PositionResponse])
 async def get_open_positions(
     db: DbSession,
@@ -141,34 +225,43 @@ async def place_manual_order(
         )
     
     try:
-        from src.services.kalshi_client import KalshiClient
+        from src.services.kalshi_client import create_kalshi_client
         
         # Initialize Kalshi client
-        client = KalshiClient(
+        client = create_kalshi_client(
             api_key=credentials["api_key"],
             private_key_pem=credentials.get("private_key") or credentials.get("api_secret")
         )
 
-        result = await client.place_order(
-            ticker=order_data.token_id, # token_id maps to ticker for Kalshi
-            side=order_data.side.lower(),
-            price=int(order_data.price * 100) if order_data.price < 2 else int(order_data.price), # Handle cents vs raw
-            count=int(order_data.size),
-            client_order_id=str(uuid.uuid4())
-        )
-        await client.close()
+        # Kalshi token IDs are "<ticker>_YES" / "<ticker>_NO"; a bare ticker buys YES
+        ticker, _, outcome = order_data.token_id.rpartition("_")
+        if outcome not in ("YES", "NO"):
+            ticker, outcome = order_data.token_id, "YES"
+
+        try:
+            result = await client.place_order(
+                ticker=ticker,
+                side=order_data.side.lower(),
+                yes_no=outcome.lower(),
+                price=float(order_data.price),
+                size=int(order_data.size),
+                client_order_id=str(uuid.uuid4())
+            )
+        finally:
+            await client.close()
+        order_id = result.get("order", result).get("order_id")
         
         await ActivityLogCRUD.info(
             db,
             current_user.id,
             "TRADE",
             f"Manual order placed: {order_data.side} {order_data.size} @ {order_data.price}",
-            details={"ticker": order_data.token_id, "order_id": result.get("order_id")}
+            details={"ticker": ticker, "order_id": order_id}
         )
         
         return OrderResponse(
             success=True,
-            order_id=result.get("id"),
+            order_id=order_id,
             message="Order placed successfully",
             price=order_data.price,
             size=order_data.size
@@ -221,9 +314,9 @@ async def close_position_manually(
         )
     
     try:
-        from src.services.kalshi_client import KalshiClient
+        from src.services.kalshi_client import create_kalshi_client
         
-        client = KalshiClient(
+        client = create_kalshi_client(
             api_key=credentials["api_key"],
             private_key_pem=credentials.get("private_key") or credentials.get("api_secret")
         )
@@ -585,7 +678,7 @@ async def get_open_orders(
     
     try:
         if platform == "kalshi":
-            from src.services.kalshi_client import KalshiClient
+            from src.services.kalshi_client import create_kalshi_client
             
             # Kalshi credentials might be stored as 'api_secret' (legacy) or 'private_key'
             private_key = credentials.get("private_key") or credentials.get("api_secret")
@@ -593,7 +686,7 @@ async def get_open_orders(
                 # logger.error(f"Missing private key for Kalshi user {current_user.id}")
                 return []
                 
-            client = KalshiClient(
+            client = create_kalshi_client(
                 api_key=credentials["api_key"],
                 private_key_pem=private_key
             )
@@ -638,9 +731,9 @@ async def cancel_order(
 
     try:
         if platform == "kalshi":
-            from src.services.kalshi_client import KalshiClient
+            from src.services.kalshi_client import create_kalshi_client
             
-            client = KalshiClient(
+            client = create_kalshi_client(
                 api_key=credentials["api_key"],
                 private_key_pem=credentials.get("private_key") or credentials.get("api_secret")
             )
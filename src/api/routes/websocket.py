@@ -89,7 +89,8 @@ async def websocket_endpoint(
     Client can send:
     - {"action": "authenticate", "token": "..."}: Authenticate the connection
     - {"action": "ping"}: Request immediate heartbeat
-    - {"action": "subscribe", "events": ["trade_executed", ...]}: Subscribe to specific events
+    - {"action": "subscribe", "events": ["trade_executed", ...]}: Only receive these events
+      on this connection (empty list = all events)
     """
     await websocket.accept()
     
@@ -148,8 +149,8 @@ async def websocket_endpoint(
     await connection_manager.connect(websocket, user_id)
     
     # Send connection established message
-    await connection_manager.send_to_user(
-        user_id,
+    await connection_manager.send_to_connection(
+        websocket,
         WebSocketMessage(
             event_type=WebSocketEventType.CONNECTION_ESTABLISHED,
             data={"authenticated": True, "user_id": user_id},
@@ -165,20 +166,30 @@ async def websocket_endpoint(
 
             if action == "ping":
                 # Respond with heartbeat
-                await connection_manager.send_to_user(
-                    user_id,
+                await connection_manager.send_to_connection(
+                    websocket,
                     WebSocketMessage(
                         event_type=WebSocketEventType.HEARTBEAT,
                         data={"pong": True},
                     ),
                 )
             elif action == "subscribe":
-                # Client wants to subscribe to specific events
-                # (For now, all events are pushed; this is a placeholder for filtering)
-                events = data.get("events", [])
-                logger.info(f"User {user_id} subscribed to events: {events}")
-                await connection_manager.send_to_user(
-                    user_id,
+                # Limit this connection to the listed events (empty = all);
+                # connection, heartbeat and error events are always sent
+                try:
+                    events = connection_manager.set_subscriptions(websocket, data.get("events") or [])
+                except ValueError as e:
+                    await connection_manager.send_to_connection(
+                        websocket,
+                        WebSocketMessage(
+                            event_type=WebSocketEventType.ERROR,
+                            data={"message": str(e)},
+                        ),
+                    )
+                    continue
+                logger.info(f"User {user_id} subscribed to events: {events or 'all'}")
+                await connection_manager.send_to_connection(
+                    websocket,
                     WebSocketMessage(
                         event_type=WebSocketEventType.CONNECTION_ESTABLISHED,
                         data={"subscribed": events},
@@ -189,8 +200,8 @@ async def websocket_endpoint(
                 pass
             else:
                 # Unknown action
-                await connection_manager.send_to_user(
-                    user_id,
+                await connection_manager.send_to_connection(
+                    websocket,
                     WebSocketMessage(
                         event_type=WebSocketEventType.ERROR,
                         data={"message": f"Unknown action: {action}"},
@@ -215,4 +226,5 @@ async def websocket_status():
     return {
         "total_connections": connection_manager.get_connection_count(),
         "connected_users": len(connection_manager.get_connected_users()),
+        "delivery": connection_manager.get_stats(),
     }
@@ -56,6 +56,9 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 15
     refresh_token_expire_days: int = 7
+    # Seconds an authenticated user (token -> principal) is served from memory
+    # instead of loading the user row again (0 = always load)
+    auth_principal_cache_ttl_seconds: float = 30.0
     
     # Server
     host: str = "0.0.0.0"
@@ -132,6 +135,29 @@ class Settings(BaseSettings):
     # Incident Management - Slack
     slack_alert_webhook: str | None = None
     
+    # Paper trading: when set, every Kalshi client built from user credentials
+    # (bot, manual orders, cancels, balance and position reads; see
+    # create_kalshi_client) talks to this exchange simulator URL
+    # (e.g. http://127.0.0.1:8765/trade-api/v2) instead of Kalshi
+    kalshi_simulator_url: str | None = None
+    
+    # Price tape: on-disk quote history written by the price pollers
+    price_tape_dir: str = "data/price_tape"
+    price_tape_retention_days: int = 30
+    
+    # Warm-restart snapshots of bot runtime state (ignored once older than max age)
+    bot_snapshot_dir: str = "data/bot_snapshots"
+    bot_snapshot_max_age_seconds: int = 900
+    
+    # Request validation middleware (size limits and attack pattern scanning)
+    request_validation_enabled: bool = True
+
+    # Fused middleware: run request logging, rate limiting, security headers,
+    # CORS and validation as a single ASGI layer instead of the separate stack
+    fused_middleware_enabled: bool = False
+    # gzip complete responses of at least this many bytes (fused middleware only, 0 = off)
+    response_gzip_minimum_size: int = 0
+    
     # Redis (optional, for distributed rate limiting)
     redis_url: str | None = None
     
@@ -7,7 +7,7 @@ import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
 from typing import Any
-from sqlalchemy import Column, String, DateTime, Text, Integer, Index, JSON, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, Text, Integer, Index, JSON, UniqueConstraint, Enum as SQLEnum
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import declarative_base
@@ -30,9 +30,11 @@ class AuditEventModel(Base):
     """SQLAlchemy model for audit events."""
     
     __tablename__ = "audit_events"
+    # On PostgreSQL this is range-partitioned by month on timestamp
+    # (migration 019, src/db/partitioning.py)
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    event_id = Column(String(255), unique=True, nullable=False, index=True)
+    event_id = Column(String(255), nullable=False)
     event_type = Column(String(50), nullable=False, index=True)
     severity = Column(String(20), nullable=False, index=True)
     user_id = Column(String(255), nullable=True, index=True)
@@ -46,6 +48,9 @@ class AuditEventModel(Base):
     timestamp = Column(DateTime(timezone=True), nullable=False, index=True)
     
     __table_args__ = (
+        # Partitioned tables need the partition key in every unique
+        # constraint; it also serves lookups by event_id
+        UniqueConstraint('event_id', 'timestamp', name='uq_audit_events_event_id_timestamp'),
         Index('ix_audit_events_user_timestamp', 'user_id', 'timestamp'),
         Index('ix_audit_events_type_timestamp', 'event_type', 'timestamp'),
         Index('ix_audit_events_correlation', 'correlation_id'),
@@ -300,25 +305,22 @@ class DatabaseAuditStorage(AuditStorage):
         """
         Delete audit events older than retention period.
         
+        On a partitioned table whole expired monthly partitions are dropped
+        (see src/db/partitioning.py); otherwise rows are deleted.
+        
         Args:
             retention_days: Number of days to retain events
         
         Returns:
-            Number of events deleted
+            Number of events deleted (estimated for dropped partitions)
         """
         try:
-            from sqlalchemy import delete
+            from src.db.partitioning import AUDIT_EVENTS, enforce_retention
             
             cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
             
             async with self._session_factory() as session:
-                stmt = delete(AuditEventModel).where(
-                    AuditEventModel.timestamp < cutoff
-                )
-                result = await session.execute(stmt)
-                await session.commit()
-                
-                deleted = result.rowcount
+                deleted = await enforce_retention(session, AUDIT_EVENTS, cutoff)
                 logger.info(f"Cleaned up {deleted} audit events older than {retention_days} days")
                 return deleted
                 
@@ -98,6 +98,19 @@ class InMemoryCache:
         async with self._lock:
             self._cache.clear()
     
+    def discard(self, key: str) -> None:
+        """
+        Drop a key without waiting for the lock.
+        
+        Safe to call from synchronous hooks (e.g. SQLAlchemy session events)
+        since a dict pop never yields to the event loop.
+        """
+        self._cache.pop(key, None)
+    
+    def discard_all(self) -> None:
+        """Drop every key without waiting for the lock."""
+        self._cache.clear()
+    
     async def cleanup_expired(self) -> int:
         """
         Remove all expired entries from cache.
@@ -121,6 +134,9 @@ class InMemoryCache:
 espn_cache = InMemoryCache(default_ttl=30)  # ESPN data refreshes every 30s
 market_cache = InMemoryCache(default_ttl=10)  # Market prices refresh every 10s
 settings_cache = InMemoryCache(default_ttl=300)  # Settings cache for 5 minutes
+dashboard_cache = InMemoryCache(default_ttl=5)  # Per-user dashboard snapshots
+balance_cache = InMemoryCache(default_ttl=30)  # Per-user exchange balances
+count_cache = InMemoryCache(default_ttl=60)  # Approximate totals for paginated lists
 
 
 def cached(
@@ -186,4 +202,16 @@ async def get_cache_stats() -> dict[str, Any]:
             "size": settings_cache.size,
             "default_ttl": settings_cache._default_ttl,
         },
+        "dashboard_cache": {
+            "size": dashboard_cache.size,
+            "default_ttl": dashboard_cache._default_ttl,
+        },
+        "balance_cache": {
+            "size": balance_cache.size,
+            "default_ttl": balance_cache._default_ttl,
+        },
+        "count_cache": {
+            "size": count_cache.size,
+            "default_ttl": count_cache._default_ttl,
+        },
     }
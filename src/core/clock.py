@@ -0,0 +1,256 @@
+"""
+Injectable clock and scheduler for the bot loops and time-dependent services.
+
+Production code uses the SystemClock (wall time, real asyncio sleeps).
+Tests and replays use the VirtualClock, which only moves time forward when
+every task is blocked on one of its sleeps, so a 3-hour game can be driven
+through the real BotRunner loops in seconds with a deterministic ordering
+of wake-ups.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone, timedelta
+from typing import Any, Callable
+
+
+logger = logging.getLogger(__name__)
+
+
+class Clock:
+    """
+    Time source and sleep primitive.
+
+    Subclasses must return timezone-aware UTC datetimes from now().
+    """
+
+    def now(self) -> datetime:
+        """Current UTC time."""
+        raise NotImplementedError
+
+    def monotonic(self) -> float:
+        """Monotonic seconds for measuring intervals and timeouts."""
+        raise NotImplementedError
+
+    async def sleep(self, seconds: float) -> None:
+        """Suspend the calling task for the given number of seconds."""
+        raise NotImplementedError
+
+
+class SystemClock(Clock):
+    """Wall-clock time with real asyncio sleeps."""
+
+    def now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+
+@dataclass(order=True)
+class _Timer:
+    """Heap entry; ties on `when` are broken by scheduling order."""
+    when: float
+    seq: int
+    future: asyncio.Future | None = field(default=None, compare=False)
+    task: asyncio.Task | None = field(default=None, compare=False)
+    callback: Callable[[], Any] | None = field(default=None, compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class VirtualClock(Clock):
+    """
+    Deterministic simulated time.
+
+    Sleeping tasks and scheduled callbacks share one heap ordered by
+    (wake time, scheduling order). The driver calls run_until()/advance(),
+    which repeatedly waits until every other task is parked in sleep(),
+    then jumps time to the next timer and fires exactly that one timer.
+    Each woken task runs until it sleeps again before the next timer fires,
+    so interleavings do not depend on event loop scheduling.
+
+    Tasks blocked on real I/O (database threads, HTTP transports) count as
+    busy; the clock waits for them in real time, up to settle_timeout.
+    """
+
+    def __init__(
+        self,
+        start: datetime | None = None,
+        settle_timeout: float = 30.0,
+    ):
+        """
+        Args:
+            start: Initial virtual time (defaults to the current UTC time)
+            settle_timeout: Real seconds to wait for busy tasks before failing
+        """
+        start = start or datetime.now(timezone.utc)
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        self._start = start
+        self._elapsed = 0.0
+        self._timers: list[_Timer] = []
+        self._seq = itertools.count()
+        self._sleeping: set[asyncio.Task] = set()
+        self._ignored: set[asyncio.Task] = set()
+        self.settle_timeout = settle_timeout
+        self.timers_fired = 0
+
+    # ------------------------------------------------------------------
+    # Clock interface
+    # ------------------------------------------------------------------
+
+    def now(self) -> datetime:
+        return self._start + timedelta(seconds=self._elapsed)
+
+    def monotonic(self) -> float:
+        return self._elapsed
+
+    async def sleep(self, seconds: float) -> None:
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        task = asyncio.current_task()
+        timer = self._push(self._elapsed + seconds, future=future, task=task)
+        if task is not None:
+            self._sleeping.add(task)
+        try:
+            await future
+        finally:
+            timer.cancel()
+            if task is not None:
+                self._sleeping.discard(task)
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def call_at(self, when: datetime, callback: Callable[[], Any]) -> _Timer:
+        """
+        Run a synchronous callback when virtual time reaches `when`.
+
+        Callbacks scheduled for a time already passed fire on the next
+        advance, before any later timer.
+        """
+        offset = (when - self._start).total_seconds()
+        return self._push(max(offset, self._elapsed), callback=callback)
+
+    def call_later(self, delay: float, callback: Callable[[], Any]) -> _Timer:
+        """Run a synchronous callback `delay` virtual seconds from now."""
+        return self._push(self._elapsed + max(delay, 0.0), callback=callback)
+
+    def ignore_task(self, task: asyncio.Task) -> None:
+        """Exclude a long-lived task that never sleeps on this clock from idle detection."""
+        self._ignored.add(task)
+
+    def pending(self) -> int:
+        """Number of live timers (sleepers and callbacks)."""
+        return sum(1 for t in self._timers if not t.cancelled and not self._is_stale(t))
+
+    def next_wakeup(self) -> datetime | None:
+        """Virtual time of the earliest live timer."""
+        self._drop_cancelled()
+        if not self._timers:
+            return None
+        return self._start + timedelta(seconds=self._timers[0].when)
+
+    # ------------------------------------------------------------------
+    # Driving time
+    # ------------------------------------------------------------------
+
+    async def advance(self, seconds: float) -> None:
+        """Advance virtual time by `seconds`, firing every timer due on the way."""
+        await self.run_until(self.now() + timedelta(seconds=seconds))
+
+    async def run_until(self, when: datetime) -> None:
+        """
+        Advance virtual time to `when`.
+
+        Must be awaited from a task that does not itself sleep on this clock.
+        """
+        target = (when - self._start).total_seconds()
+        while True:
+            await self.settle()
+            self._drop_cancelled()
+            if not self._timers or self._timers[0].when > target:
+                break
+            timer = heapq.heappop(self._timers)
+            self._elapsed = max(self._elapsed, timer.when)
+            self._fire(timer)
+        self._elapsed = max(self._elapsed, target)
+        await self.settle()
+
+    async def settle(self) -> None:
+        """
+        Wait until every other task is parked in sleep() on this clock.
+
+        Raises:
+            TimeoutError: If some task stays busy for settle_timeout real seconds
+        """
+        driver = asyncio.current_task()
+        deadline = time.monotonic() + self.settle_timeout
+        spins = 0
+        while True:
+            busy = self._busy_tasks(driver)
+            if not busy:
+                return
+            if time.monotonic() > deadline:
+                names = ", ".join(sorted(t.get_name() for t in busy))
+                raise TimeoutError(f"VirtualClock: tasks still busy after {self.settle_timeout}s: {names}")
+            # Let ready callbacks run first; only then give threads real time
+            spins += 1
+            await asyncio.sleep(0 if spins % 20 else 0.001)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _push(self, when: float, **kwargs: Any) -> _Timer:
+        timer = _Timer(when, next(self._seq), **kwargs)
+        heapq.heappush(self._timers, timer)
+        return timer
+
+    def _drop_cancelled(self) -> None:
+        while self._timers and (self._timers[0].cancelled or self._is_stale(self._timers[0])):
+            heapq.heappop(self._timers)
+
+    @staticmethod
+    def _is_stale(timer: _Timer) -> bool:
+        return timer.future is not None and timer.future.done()
+
+    def _fire(self, timer: _Timer) -> None:
+        self.timers_fired += 1
+        if timer.future is not None:
+            # The woken task is busy again until it next sleeps
+            self._sleeping.discard(timer.task)
+            timer.future.set_result(None)
+            return
+        try:
+            timer.callback()
+        except Exception as e:
+            logger.error(f"VirtualClock callback failed: {e}")
+
+    def _busy_tasks(self, driver: asyncio.Task | None) -> list[asyncio.Task]:
+        self._ignored = {t for t in self._ignored if not t.done()}
+        return [
+            task for task in asyncio.all_tasks()
+            if task is not driver
+            and not task.done()
+            and task not in self._sleeping
+            and task not in self._ignored
+        ]
+
+
+# Default clock used when none is injected
+system_clock = SystemClock()
@@ -4,18 +4,20 @@ Provides JSON-formatted logs for production observability.
 Integrates sensitive data redaction (REQ-SEC-007).
 """
 
-import json
 import logging
 import sys
 import uuid
 from contextvars import ContextVar
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from enum import Enum
 from typing import Any
 from functools import lru_cache
 
 from fastapi import Request
 
 from src.core.redaction import redact_sensitive, RedactionConfig
+from src.core.serialization import dumps
 
 
 # Context variable for request correlation ID
@@ -60,6 +62,9 @@ class JSONFormatter(logging.Formatter):
         "taskName",
     }
 
+    # Extra values written as-is (the serializer encodes these natively)
+    NATIVE_EXTRA_TYPES = (str, int, float, bool, type(None), Decimal, uuid.UUID, date, Enum)
+
     def __init__(
         self,
         include_source: bool = True,
@@ -117,11 +122,7 @@ class JSONFormatter(logging.Formatter):
         extra = {}
         for key, value in record.__dict__.items():
             if key not in self.RESERVED_ATTRS and not key.startswith("_"):
-                try:
-                    json.dumps(value)  # Ensure serializable
-                    extra[key] = value
-                except (TypeError, ValueError):
-                    extra[key] = str(value)
+                extra[key] = self._serializable_extra(value)
 
         if extra:
             log_data["extra"] = extra
@@ -130,7 +131,23 @@ class JSONFormatter(logging.Formatter):
         if self.redact_sensitive_data and self.redaction_config:
             log_data = redact_sensitive(log_data, self.redaction_config)
 
-        return json.dumps(log_data)
+        return dumps(log_data)
+
+    @staticmethod
+    def _serializable_extra(value: Any) -> Any:
+        """
+        Keeps values the serializer encodes natively; containers are kept if
+        they encode and everything else is stringified before redaction.
+        """
+        if isinstance(value, JSONFormatter.NATIVE_EXTRA_TYPES):
+            return value
+        if isinstance(value, (dict, list, tuple)):
+            try:
+                dumps(value)
+                return value
+            except (TypeError, ValueError):
+                pass
+        return str(value)
 
 
 class ContextLogger(logging.LoggerAdapter):
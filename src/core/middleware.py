@@ -0,0 +1,257 @@
+"""
+Fused HTTP middleware pipeline.
+
+The default stack in main.py installs request logging, rate limiting,
+security headers, CORS and request validation as separate middlewares.
+Every layer costs a call frame per request, and each of the first three
+wraps send and copies the response headers again. FusedMiddleware runs
+the same stages in one layer with a single send wrapper:
+
+    request logging   correlation ID, start/completion/failure log lines
+    rate limiting     same limiter, exempt paths, 429 body and headers
+    security headers  same headers, excluded paths and API Cache-Control
+    CORS              Starlette's CORSMiddleware, at its original position
+    validation        RequestValidationMiddleware, at its original position
+    compression       optional gzip of complete (non-streamed) bodies
+
+Response headers come out in the same order as with the separate stack,
+and a rate-limited request is still answered before the security headers
+and CORS stages. CORS and validation don't wrap send for ordinary
+requests, so they are kept as inner components rather than rewritten.
+
+Usage:
+    app.add_middleware(
+        FusedMiddleware,
+        security_headers=SecurityHeadersConfig(),
+        rate_limit=RateLimitConfig(),
+        cors={"allow_origins": ["https://example.com"]},
+        validation=ValidationConfig(),
+    )
+"""
+
+import gzip
+import logging
+import time
+from typing import Any
+
+from starlette.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.logging_service import get_logger, set_correlation_id
+from src.core.rate_limiter import (
+    RateLimitConfig,
+    RateLimiter,
+    rate_limit_headers,
+    send_rate_limit_response,
+)
+from src.core.security_headers import SecurityHeadersConfig, build_security_headers
+from src.core.validation import RequestValidationMiddleware, ValidationConfig
+
+
+logger = logging.getLogger(__name__)
+
+_API_CACHE_CONTROL = (b"cache-control", b"no-store, no-cache, must-revalidate, private")
+
+
+class FusedMiddleware:
+    """
+    Pure ASGI middleware running the whole HTTP pipeline in one layer.
+
+    Each stage is enabled by passing its configuration; omitted stages
+    are skipped, as if that middleware were not installed.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        request_logging: bool = True,
+        rate_limit: RateLimitConfig | None = None,
+        security_headers: SecurityHeadersConfig | None = None,
+        cors: dict[str, Any] | None = None,
+        validation: ValidationConfig | None = None,
+        gzip_minimum_size: int | None = None,
+        gzip_compresslevel: int = 6,
+    ):
+        """
+        Args:
+            app: The application
+            request_logging: Log requests and add X-Correlation-ID
+            rate_limit: Rate limit configuration
+            security_headers: Security headers configuration
+            cors: Keyword arguments for Starlette's CORSMiddleware
+            validation: Request validation configuration
+            gzip_minimum_size: Compress complete bodies of at least this
+                many bytes for clients accepting gzip
+            gzip_compresslevel: gzip compression level
+        """
+        inner = app
+        if validation is not None:
+            inner = RequestValidationMiddleware(inner, config=validation)
+        if cors is not None:
+            inner = CORSMiddleware(inner, **cors)
+        self.app = inner
+
+        self._request_logger = get_logger("api.requests") if request_logging else None
+
+        self.rate_limit_config = rate_limit
+        self.limiter = RateLimiter(rate_limit) if rate_limit is not None else None
+        self._rate_limit_exempt = frozenset(rate_limit.exempt_paths) if rate_limit is not None else frozenset()
+
+        self._security_headers = build_security_headers(security_headers) if security_headers else None
+        self._security_excluded = tuple(security_headers.excluded_paths) if security_headers else ()
+        self._api_cache_control = bool(security_headers and security_headers.cache_control_private)
+
+        self._gzip_minimum_size = gzip_minimum_size
+        self._gzip_compresslevel = gzip_compresslevel
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """ASGI interface - run every stage around the inner app."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope.get("method", "UNKNOWN")
+        path = scope.get("path", "/")
+
+        # One pass over the request headers (last value wins, as with dict())
+        correlation_header = b""
+        forwarded = b""
+        accept_encoding = b""
+        for name, value in scope.get("headers", []):
+            if name == b"x-correlation-id":
+                correlation_header = value
+            elif name == b"x-forwarded-for":
+                forwarded = value
+            elif name == b"accept-encoding":
+                accept_encoding = value
+
+        request_logger = self._request_logger
+        correlation_id = None
+        if request_logger is not None:
+            correlation_id = set_correlation_id(correlation_header.decode() or None).encode()
+            query = scope.get("query_string", b"").decode()
+            request_logger.info(
+                f"Request started: {method} {path}",
+                method=method,
+                path=path,
+                query=query[:200] if query else None,
+            )
+            start_time = time.perf_counter()
+
+        response_status = 0
+        add_security = self._security_headers is not None and not path.startswith(self._security_excluded)
+        limit_info = None
+        gzip_pending: Message | None = None
+        compress = (
+            self._gzip_minimum_size is not None
+            and b"gzip" in accept_encoding
+        )
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_status, gzip_pending, compress
+            message_type = message["type"]
+            if message_type == "http.response.start":
+                response_status = message["status"]
+                headers = list(message.get("headers", []))
+                if add_security:
+                    headers.extend(self._security_headers)
+                    if self._api_cache_control and path.startswith("/api"):
+                        if not any(h[0].lower() == b"cache-control" for h in headers):
+                            headers.append(_API_CACHE_CONTROL)
+                if limit_info is not None:
+                    headers.extend(rate_limit_headers(self.rate_limit_config, limit_info))
+                if correlation_id is not None:
+                    headers.append((b"x-correlation-id", correlation_id))
+                message = {**message, "headers": headers}
+                if compress:
+                    # Hold the start until the first body shows whether to compress
+                    gzip_pending = message
+                    return
+            elif message_type == "http.response.body" and gzip_pending is not None:
+                start, gzip_pending, compress = gzip_pending, None, False
+                start, body = self._compress(start, message)
+                await send(start)
+                message = {**message, "body": body}
+            await send(message)
+
+        try:
+            if self.limiter is not None and path not in self._rate_limit_exempt:
+                if forwarded:
+                    client_id = f"ip:{forwarded.decode().split(',')[0].strip()}"
+                else:
+                    client = scope.get("client")
+                    client_id = f"ip:{client[0]}" if client else "ip:unknown"
+
+                is_allowed, info = await self.limiter.check_rate_limit(client_id)
+                if not is_allowed:
+                    retry_after = int(info.get("retry_after", 60))
+                    exceeded = info.get("exceeded", "unknown")
+                    logger.warning(
+                        f"Rate limit exceeded for {client_id}: {exceeded} limit, "
+                        f"retry after {retry_after}s"
+                    )
+                    # Answered outside the security headers and CORS stages
+                    add_security = compress = False
+                    await send_rate_limit_response(send_wrapper, retry_after, exceeded, info)
+                    return
+                limit_info = info
+
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            if request_logger is not None:
+                request_logger.error(
+                    f"Request failed: {method} {path}",
+                    method=method,
+                    path=path,
+                    error=str(e),
+                    error_type=type(e).__name__,
+                    exc_info=True,
+                )
+            raise
+        finally:
+            if request_logger is not None:
+                duration_ms = (time.perf_counter() - start_time) * 1000
+                log_level = logging.WARNING if response_status >= 400 else logging.INFO
+                request_logger.log(
+                    log_level,
+                    f"Request completed: {method} {path} -> {response_status}",
+                    method=method,
+                    path=path,
+                    status=response_status,
+                    duration_ms=round(duration_ms, 2),
+                )
+
+    def _compress(self, start: Message, body_message: Message) -> tuple[Message, bytes]:
+        """
+        Gzips the first body message if it is the complete body, is large
+        enough and isn't already encoded; streamed responses (SSE) are
+        passed through.
+
+        Returns:
+            Tuple of (response start message, body to send)
+        """
+        body = body_message.get("body", b"")
+        headers = start["headers"]
+        if (
+            body_message.get("more_body", False)
+            or len(body) < self._gzip_minimum_size
+            or any(name.lower() == b"content-encoding" for name, _ in headers)
+        ):
+            return start, body
+
+        compressed = gzip.compress(body, compresslevel=self._gzip_compresslevel)
+        vary = [value for name, value in headers if name.lower() == b"vary"]
+        headers = [
+            (name, value) for name, value in headers
+            if name.lower() not in (b"content-length", b"vary")
+        ]
+        vary_values = [v.strip() for value in vary for v in value.split(b",") if v.strip()]
+        if b"accept-encoding" not in (v.lower() for v in vary_values):
+            vary_values.append(b"Accept-Encoding")
+        headers.extend([
+            (b"content-encoding", b"gzip"),
+            (b"content-length", str(len(compressed)).encode()),
+            (b"vary", b", ".join(vary_values)),
+        ])
+        return {**start, "headers": headers}, compressed
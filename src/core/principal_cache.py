@@ -0,0 +1,194 @@
+"""
+Cache of authenticated principals for the auth dependencies.
+
+Every authenticated request used to decode its JWT and then load the
+User row, and the frontend polls several endpoints every few seconds, so
+most of those lookups return the same row. The auth dependencies now
+resolve a token to a Principal, a small immutable copy of the user
+fields routes read, and cache it for a short TTL keyed by (user id,
+token iat/jti). A hit costs no database round trip.
+
+Entries for a user are dropped:
+
+    - after a commit that writes the user's row (profile or onboarding
+      updates, deactivation, password changes, deletion), from the
+      session hooks at the bottom of this module
+    - after a bulk UPDATE/DELETE on users (every entry)
+    - when refresh tokens are revoked (RefreshTokenCRUD)
+
+A per-user generation guards the race where a request reads the row just
+before a commit invalidates it: such a read is not cached.
+
+Routes that really need the ORM User (to modify it, or for relationships)
+load it lazily through get_current_user_record in src.api.deps.
+"""
+
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import chain
+from typing import Any
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from src.config import get_settings
+
+
+_USERS_TABLE = "users"
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """The authenticated user, as seen by routes."""
+    id: uuid.UUID
+    username: str
+    email: str
+    is_active: bool
+    onboarding_completed: bool
+    onboarding_step: int
+    created_at: datetime | None
+
+    @classmethod
+    def from_user(cls, user: Any) -> "Principal":
+        """Copies the fields from a User row."""
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            is_active=bool(user.is_active),
+            onboarding_completed=bool(user.onboarding_completed),
+            onboarding_step=user.onboarding_step or 0,
+            created_at=user.created_at,
+        )
+
+
+class PrincipalCache:
+    """
+    TTL cache of principals keyed by (user id, token key).
+
+    All methods are synchronous and never yield to the event loop, so
+    they are safe to call from SQLAlchemy session hooks.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 10_000):
+        """
+        Args:
+            ttl_seconds: How long an entry is served (0 disables caching)
+            max_entries: Size bound; expired entries are purged first,
+                then the oldest ones
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: dict[tuple[uuid.UUID, str], tuple[Principal, float]] = {}
+        self._generations: dict[uuid.UUID, int] = defaultdict(int)
+        self._global_generation = 0
+        self._stats = {"hits": 0, "misses": 0, "stale_reads": 0, "invalidations": 0}
+
+    def get(self, user_id: uuid.UUID, token_key: str) -> Principal | None:
+        """Returns the cached principal for a token, if still fresh."""
+        entry = self._entries.get((user_id, token_key))
+        if entry is not None:
+            if entry[1] > time.monotonic():
+                self._stats["hits"] += 1
+                return entry[0]
+            del self._entries[(user_id, token_key)]
+        self._stats["misses"] += 1
+        return None
+
+    def generation(self, user_id: uuid.UUID) -> tuple[int, int]:
+        """Current generation of a user; read it before loading the row."""
+        return self._global_generation, self._generations[user_id]
+
+    def put(self, principal: Principal, token_key: str, generation: tuple[int, int]) -> None:
+        """
+        Caches a principal loaded at the given generation.
+
+        Dropped if the user was invalidated since the generation was read.
+        """
+        if self.ttl_seconds <= 0:
+            return
+        if self.generation(principal.id) != generation:
+            self._stats["stale_reads"] += 1
+            return
+        if len(self._entries) >= self.max_entries:
+            self._evict()
+        self._entries[(principal.id, token_key)] = (principal, time.monotonic() + self.ttl_seconds)
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        """Drops every entry of a user."""
+        self._generations[user_id] += 1
+        self._stats["invalidations"] += 1
+        for key in [key for key in self._entries if key[0] == user_id]:
+            del self._entries[key]
+
+    def invalidate_all(self) -> None:
+        """Drops every entry."""
+        self._global_generation += 1
+        self._stats["invalidations"] += 1
+        self._entries.clear()
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        for key in [key for key, (_, expires_at) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+        # Still full: drop the oldest tenth (dicts keep insertion order)
+        overflow = len(self._entries) - self.max_entries + 1
+        if overflow > 0:
+            for key in list(self._entries)[:max(overflow, self.max_entries // 10)]:
+                del self._entries[key]
+
+    def get_stats(self) -> dict[str, int | float]:
+        """Hit/miss counters and current size."""
+        return {**self._stats, "size": len(self._entries), "ttl_seconds": self.ttl_seconds}
+
+
+# Global principal cache
+principal_cache = PrincipalCache(ttl_seconds=get_settings().auth_principal_cache_ttl_seconds)
+
+
+# ---------------------------------------------------------------------------
+# Invalidation on commit
+# ---------------------------------------------------------------------------
+
+_CHANGED_USERS = "principal_changed_users"
+_CHANGED_ALL = "principal_changed_all"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_user_changes(session: Session, flush_context) -> None:
+    """Remembers which users a flush wrote until the commit lands."""
+    for obj in chain(session.dirty, session.deleted):
+        if getattr(obj, "__tablename__", None) != _USERS_TABLE:
+            continue
+        # Read the loaded state directly; attribute access could trigger a refresh
+        user_id = inspect(obj).dict.get("id")
+        if user_id is None:
+            session.info[_CHANGED_ALL] = True
+        else:
+            session.info.setdefault(_CHANGED_USERS, set()).add(user_id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_user_changes(orm_execute_state) -> None:
+    """Bulk UPDATE/DELETE statements don't say which users they touch."""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if any(m.local_table.name == _USERS_TABLE for m in orm_execute_state.all_mappers):
+        orm_execute_state.session.info[_CHANGED_ALL] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_principals(session: Session) -> None:
+    if session.info.pop(_CHANGED_ALL, False):
+        principal_cache.invalidate_all()
+    for user_id in session.info.pop(_CHANGED_USERS, ()):
+        principal_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_changes(session: Session) -> None:
+    for key in (_CHANGED_ALL, _CHANGED_USERS):
+        session.info.pop(key, None)
@@ -4,14 +4,18 @@ Implements sliding window rate limiting with per-IP and per-user limits.
 
 Uses pure ASGI implementation to avoid request body consumption issues
 that occur with Starlette's BaseHTTPMiddleware.
+
+Each window (burst, minute, hour) is a sliding-window counter: the count
+of the current fixed bucket plus the previous bucket's count weighted by
+how much of it still overlaps the window. A check is O(1) and a client
+costs a few integers, however many requests it made in the last hour.
 """
 
-import asyncio
+import math
 import time
 import json
-from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Callable, Awaitable
+from typing import Callable
 import logging
 
 from fastapi import Request, HTTPException
@@ -46,28 +50,77 @@ class RateLimitConfig:
     ])
 
 
-@dataclass
+class WindowCounter:
+    """
+    Sliding-window request counter over two fixed buckets.
+
+    The estimated count at time t is the current bucket's count plus the
+    previous bucket's count scaled by the fraction of the window that
+    still overlaps it, which assumes the previous bucket's requests were
+    evenly spread.
+    """
+
+    __slots__ = ("window", "bucket", "current", "previous")
+
+    def __init__(self, window: float):
+        self.window = window
+        self.bucket = 0
+        self.current = 0
+        self.previous = 0
+
+    def _roll(self, now: float) -> float:
+        """Moves to the bucket containing `now`; returns the elapsed fraction of it."""
+        position = now / self.window
+        bucket = int(position)
+        if bucket != self.bucket:
+            self.previous = self.current if bucket == self.bucket + 1 else 0
+            self.current = 0
+            self.bucket = bucket
+        return position - bucket
+
+    def estimate(self, now: float) -> float:
+        """Estimated number of requests in the window ending at `now`."""
+        elapsed = self._roll(now)
+        return self.previous * (1.0 - elapsed) + self.current
+
+    def count(self, now: float) -> int:
+        """Estimate rounded up, the way limits are checked."""
+        # The epsilon absorbs float error at the instant retry_after points to
+        return math.ceil(self.estimate(now) - 1e-9)
+
+    def retry_after(self, now: float, limit: int) -> float:
+        """Seconds until one more request fits under `limit`."""
+        elapsed = self._roll(now)
+        allowed = limit - 1
+        if self.current <= allowed:
+            if not self.previous:
+                return 0.0
+            # Wait for the previous bucket's weight to decay
+            target = 1.0 - (allowed - self.current) / self.previous
+            return max(0.0, target - elapsed) * self.window
+        # Nothing fits before this bucket becomes the previous one
+        target = 1.0 - allowed / self.current
+        return (1.0 - elapsed + max(0.0, target)) * self.window
+
+
 class RateLimitState:
     """Tracks request counts for a single client."""
-    minute_requests: list[float] = field(default_factory=list)
-    hour_requests: list[float] = field(default_factory=list)
-    burst_requests: list[float] = field(default_factory=list)
-    
-    def cleanup(self, now: float) -> None:
-        """Remove expired timestamps from tracking lists."""
-        minute_ago = now - 60
-        hour_ago = now - 3600
-        burst_ago = now - 1.0
-        
-        self.minute_requests = [t for t in self.minute_requests if t > minute_ago]
-        self.hour_requests = [t for t in self.hour_requests if t > hour_ago]
-        self.burst_requests = [t for t in self.burst_requests if t > burst_ago]
-    
+
+    __slots__ = ("burst", "minute", "hour", "last_seen")
+
+    def __init__(self, burst_window_seconds: float = 1.0):
+        self.burst = WindowCounter(burst_window_seconds)
+        self.minute = WindowCounter(60.0)
+        self.hour = WindowCounter(3600.0)
+        self.last_seen = 0.0
+
     def record_request(self, now: float) -> None:
-        """Record a new request timestamp."""
-        self.minute_requests.append(now)
-        self.hour_requests.append(now)
-        self.burst_requests.append(now)
+        """Counts a request in every window."""
+        # Callers read the estimates first, so every bucket is current
+        self.burst.current += 1
+        self.minute.current += 1
+        self.hour.current += 1
+        self.last_seen = now
 
 
 class RateLimiter:
@@ -79,15 +132,25 @@ class RateLimiter:
     - Per-hour limit for overall volume
     - Burst limit for short-term spikes
     
-    Thread-safe using asyncio locks.
+    Client states live in hash-sharded dicts. A check never awaits
+    between reading and updating a client's counters, so it is atomic
+    on the event loop without a lock. Idle clients are expired one shard
+    at a time as requests come in, so no single request pays for
+    sweeping every client.
     """
     
-    def __init__(self, config: RateLimitConfig | None = None):
+    def __init__(self, config: RateLimitConfig | None = None, shards: int = 16):
         self.config = config or RateLimitConfig()
-        self._states: dict[str, RateLimitState] = defaultdict(RateLimitState)
-        self._lock = asyncio.Lock()
+        self._shards: list[dict[str, RateLimitState]] = [{} for _ in range(shards)]
         self._cleanup_interval = 60.0
-        self._last_cleanup = time.time()
+        self._sweep_interval = self._cleanup_interval / shards
+        self._next_sweep = time.time() + self._sweep_interval
+        self._sweep_shard = 0
+        # A client with no request in two hours has empty hour buckets
+        self._idle_after = 2 * 3600.0
+    
+    def _shard(self, client_id: str) -> dict[str, RateLimitState]:
+        return self._shards[hash(client_id) % len(self._shards)]
     
     async def check_rate_limit(self, client_id: str) -> tuple[bool, dict]:
         """
@@ -101,72 +164,73 @@ class RateLimiter:
         """
         now = time.time()
         
-        async with self._lock:
-            # Periodic cleanup of old data
-            if now - self._last_cleanup > self._cleanup_interval:
-                await self._cleanup_old_states(now)
-                self._last_cleanup = now
-            
-            state = self._states[client_id]
-            state.cleanup(now)
-            
-            # Check limits
-            minute_count = len(state.minute_requests)
-            hour_count = len(state.hour_requests)
-            burst_count = len(state.burst_requests)
-            
-            limit_info: dict[str, int | float | str] = {
-                "minute_count": minute_count,
-                "minute_limit": self.config.requests_per_minute,
-                "hour_count": hour_count,
-                "hour_limit": self.config.requests_per_hour,
-                "burst_count": burst_count,
-                "burst_limit": self.config.burst_limit,
-            }
-            
-            # Check burst limit first (short window)
-            if burst_count >= self.config.burst_limit:
-                limit_info["exceeded"] = "burst"
-                limit_info["retry_after"] = self.config.burst_window_seconds
-                return False, limit_info
-            
-            # Check minute limit
-            if minute_count >= self.config.requests_per_minute:
-                oldest = min(state.minute_requests) if state.minute_requests else now
-                limit_info["exceeded"] = "minute"
-                limit_info["retry_after"] = max(1, 60 - (now - oldest))
-                return False, limit_info
-            
-            # Check hour limit
-            if hour_count >= self.config.requests_per_hour:
-                oldest = min(state.hour_requests) if state.hour_requests else now
-                limit_info["exceeded"] = "hour"
-                limit_info["retry_after"] = max(1, 3600 - (now - oldest))
-                return False, limit_info
-            
-            # Record this request
-            state.record_request(now)
-            limit_info["remaining_minute"] = self.config.requests_per_minute - minute_count - 1
-            limit_info["remaining_hour"] = self.config.requests_per_hour - hour_count - 1
-            
-            return True, limit_info
+        # Expire idle clients, one shard per sweep interval
+        if now >= self._next_sweep:
+            self._cleanup_shard(self._sweep_shard, now)
+            self._sweep_shard = (self._sweep_shard + 1) % len(self._shards)
+            self._next_sweep = now + self._sweep_interval
+        
+        shard = self._shard(client_id)
+        state = shard.get(client_id)
+        if state is None:
+            state = shard[client_id] = RateLimitState(self.config.burst_window_seconds)
+        
+        config = self.config
+        burst_count = state.burst.count(now)
+        minute_count = state.minute.count(now)
+        hour_count = state.hour.count(now)
+        
+        limit_info: dict[str, int | float | str] = {
+            "minute_count": minute_count,
+            "minute_limit": config.requests_per_minute,
+            "hour_count": hour_count,
+            "hour_limit": config.requests_per_hour,
+            "burst_count": burst_count,
+            "burst_limit": config.burst_limit,
+        }
+        
+        # Check burst limit first (short window)
+        if burst_count >= config.burst_limit:
+            limit_info["exceeded"] = "burst"
+            limit_info["retry_after"] = config.burst_window_seconds
+            return False, limit_info
+        
+        # Check minute limit
+        if minute_count >= config.requests_per_minute:
+            limit_info["exceeded"] = "minute"
+            limit_info["retry_after"] = max(1, state.minute.retry_after(now, config.requests_per_minute))
+            return False, limit_info
+        
+        # Check hour limit
+        if hour_count >= config.requests_per_hour:
+            limit_info["exceeded"] = "hour"
+            limit_info["retry_after"] = max(1, state.hour.retry_after(now, config.requests_per_hour))
+            return False, limit_info
+        
+        # Record this request
+        state.record_request(now)
+        limit_info["remaining_minute"] = config.requests_per_minute - minute_count - 1
+        limit_info["remaining_hour"] = config.requests_per_hour - hour_count - 1
+        
+        return True, limit_info
     
-    async def _cleanup_old_states(self, now: float) -> None:
-        """Remove state for clients with no recent requests."""
-        hour_ago = now - 3600
-        empty_clients = [
-            client_id for client_id, state in self._states.items()
-            if not state.hour_requests or max(state.hour_requests) < hour_ago
+    def _cleanup_shard(self, index: int, now: float) -> None:
+        """Remove state for clients of one shard with no recent requests."""
+        idle_before = now - self._idle_after
+        shard = self._shards[index]
+        idle_clients = [
+            client_id for client_id, state in shard.items()
+            if state.last_seen < idle_before
         ]
-        for client_id in empty_clients:
-            del self._states[client_id]
+        for client_id in idle_clients:
+            del shard[client_id]
         
-        if empty_clients:
-            logger.debug(f"Rate limiter cleanup: removed {len(empty_clients)} inactive clients")
+        if idle_clients:
+            logger.debug(f"Rate limiter cleanup: removed {len(idle_clients)} inactive clients")
     
     def get_client_stats(self, client_id: str) -> dict:
         """Get current rate limit stats for a client."""
-        state = self._states.get(client_id)
+        state = self._shard(client_id).get(client_id)
         if not state:
             return {
                 "minute_count": 0,
@@ -175,12 +239,60 @@ class RateLimiter:
             }
         
         now = time.time()
-        state.cleanup(now)
         return {
-            "minute_count": len(state.minute_requests),
-            "hour_count": len(state.hour_requests),
-            "burst_count": len(state.burst_requests),
+            "minute_count": state.minute.count(now),
+            "hour_count": state.hour.count(now),
+            "burst_count": state.burst.count(now),
+        }
+    
+    def get_stats(self) -> dict[str, int]:
+        """Number of tracked clients."""
+        return {"clients": sum(len(shard) for shard in self._shards)}
+
+
+def rate_limit_headers(config: RateLimitConfig, limit_info: dict) -> list[tuple[bytes, bytes]]:
+    """Response headers reporting the remaining quota of an allowed request."""
+    return [
+        (b"x-ratelimit-limit-minute", str(config.requests_per_minute).encode()),
+        (b"x-ratelimit-remaining-minute", str(limit_info.get("remaining_minute", 0)).encode()),
+        (b"x-ratelimit-limit-hour", str(config.requests_per_hour).encode()),
+        (b"x-ratelimit-remaining-hour", str(limit_info.get("remaining_hour", 0)).encode()),
+    ]
+
+
+async def send_rate_limit_response(
+    send: Send,
+    retry_after: int,
+    exceeded: str,
+    limit_info: dict
+) -> None:
+    """Send a 429 Too Many Requests response."""
+    body = json.dumps({
+        "detail": {
+            "error": "rate_limit_exceeded",
+            "limit_type": exceeded,
+            "retry_after": retry_after,
+            "message": f"Too many requests. Please retry after {retry_after} seconds."
         }
+    }).encode()
+
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"retry-after", str(retry_after).encode()),
+        (b"x-ratelimit-limit", str(limit_info.get(f"{exceeded}_limit", 0)).encode()),
+        (b"x-ratelimit-remaining", b"0"),
+        (b"x-ratelimit-reset", str(int(time.time() + retry_after)).encode()),
+    ]
+
+    await send({
+        "type": "http.response.start",
+        "status": HTTP_429_TOO_MANY_REQUESTS,
+        "headers": headers,
+    })
+    await send({
+        "type": "http.response.body",
+        "body": body,
+    })
 
 
 class RateLimitMiddleware:
@@ -240,12 +352,7 @@ class RateLimitMiddleware:
         async def send_with_headers(message: Message) -> None:
             if message["type"] == "http.response.start":
                 headers = list(message.get("headers", []))
-                headers.extend([
-                    (b"x-ratelimit-limit-minute", str(self.config.requests_per_minute).encode()),
-                    (b"x-ratelimit-remaining-minute", str(limit_info.get("remaining_minute", 0)).encode()),
-                    (b"x-ratelimit-limit-hour", str(self.config.requests_per_hour).encode()),
-                    (b"x-ratelimit-remaining-hour", str(limit_info.get("remaining_hour", 0)).encode()),
-                ])
+                headers.extend(rate_limit_headers(self.config, limit_info))
                 message = {**message, "headers": headers}
             await send(message)
         
@@ -259,32 +366,7 @@ class RateLimitMiddleware:
         limit_info: dict
     ) -> None:
         """Send a 429 Too Many Requests response."""
-        body = json.dumps({
-            "detail": {
-                "error": "rate_limit_exceeded",
-                "limit_type": exceeded,
-                "retry_after": retry_after,
-                "message": f"Too many requests. Please retry after {retry_after} seconds."
-            }
-        }).encode()
-        
-        headers = [
-            (b"content-type", b"application/json"),
-            (b"retry-after", str(retry_after).encode()),
-            (b"x-ratelimit-limit", str(limit_info.get(f"{exceeded}_limit", 0)).encode()),
-            (b"x-ratelimit-remaining", b"0"),
-            (b"x-ratelimit-reset", str(int(time.time() + retry_after)).encode()),
-        ]
-        
-        await send({
-            "type": "http.response.start",
-            "status": HTTP_429_TOO_MANY_REQUESTS,
-            "headers": headers,
-        })
-        await send({
-            "type": "http.response.body",
-            "body": body,
-        })
+        await send_rate_limit_response(send, retry_after, exceeded, limit_info)
     
     def _get_client_id(self, scope: Scope) -> str:
         """
@@ -1,6 +1,21 @@
 """
 Distributed rate limiting using Redis.
 Provides consistent rate limiting across multiple application instances.
+
+Each window (burst, minute, hour) is a sliding-window counter kept in
+Redis as one integer per fixed bucket, the same estimate the in-process
+RateLimiter uses. Requests take tokens from those counters through a Lua
+script that grants as many as fit under the limit.
+
+With lease_size set, a worker takes a small batch of tokens per client
+and window (a lease) and spends it locally, refilling in the background
+before it runs out, so most requests make no Redis round trip. Leased
+tokens are counted in Redis when granted and are only spent within the
+bucket they were granted for, so leasing never admits a client over its
+limit. The cost is that unspent leases on other workers count against
+it: a client can be refused up to (workers x lease) tokens early in a
+window. lease_max_fraction bounds a lease relative to each window's
+limit.
 """
 
 import asyncio
@@ -10,13 +25,24 @@ import hashlib
 from dataclasses import dataclass, field
 from typing import Any
 
+from src.core.rate_limiter import WindowCounter
+
 
 logger = logging.getLogger(__name__)
 
 
 @dataclass
 class RedisRateLimitConfig:
-    """Configuration for Redis-based rate limiting."""
+    """
+    Configuration for Redis-based rate limiting.
+
+    Attributes:
+        lease_size: Tokens a worker leases per client and window; 0 makes
+            one Redis round trip per request
+        lease_max_fraction: Largest lease as a fraction of a window's limit
+        refill_threshold: Refill in the background once a lease is down
+            to this fraction of its size
+    """
     requests_per_minute: int = 60
     requests_per_hour: int = 1000
     burst_limit: int = 20
@@ -28,50 +54,74 @@ class RedisRateLimitConfig:
         "/openapi.json",
         "/metrics",
     ])
+    lease_size: int = 0
+    lease_max_fraction: float = 0.1
+    refill_threshold: float = 0.5
+
+
+class _Lease:
+    """Tokens a worker holds for one client and window."""
+
+    __slots__ = ("bucket", "tokens", "remaining", "denied_until", "refill")
+
+    def __init__(self, bucket: int):
+        self.bucket = bucket
+        self.tokens = 0
+        # Tokens left in Redis when the lease was granted
+        self.remaining = 0
+        self.denied_until = 0.0
+        self.refill: asyncio.Task | None = None
 
 
 class RedisRateLimiter:
     """
     Distributed rate limiter using Redis.
     
-    Uses sliding window algorithm with Redis sorted sets for
-    accurate rate limiting across multiple instances.
+    Uses sliding window counters in Redis for consistent rate limiting
+    across multiple instances.
     
     Features:
     - Per-minute, per-hour, and burst limits
     - Consistent across multiple app instances
     - Atomic operations using Lua scripts
-    - Automatic cleanup of expired entries
+    - Optional local token leases (no round trip per request)
+    - Global stats from counters maintained by the script
     """
     
-    # Lua script for atomic rate limit check and increment
-    RATE_LIMIT_SCRIPT = """
+    # Lua script granting up to ARGV[4] tokens from a sliding window counter
+    LEASE_SCRIPT = """
     local key = KEYS[1]
+    local stats_key = KEYS[2]
     local now = tonumber(ARGV[1])
     local window = tonumber(ARGV[2])
     local limit = tonumber(ARGV[3])
+    local requested = tonumber(ARGV[4])
+    local name = ARGV[5]
     
-    -- Remove old entries outside the window
-    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    local bucket = math.floor(now / window)
+    local current_key = key .. ':' .. bucket
+    local previous = tonumber(redis.call('GET', key .. ':' .. (bucket - 1)) or '0')
+    local current = tonumber(redis.call('GET', current_key) or '0')
     
-    -- Count current requests in window
-    local count = redis.call('ZCARD', key)
+    -- Tokens that fit under the limit at the estimated count
+    local elapsed = now / window - bucket
+    local available = math.floor(limit - previous * (1 - elapsed) - current + 1e-9)
+    local granted = math.max(0, math.min(requested, available))
     
-    if count < limit then
-        -- Add new request
-        redis.call('ZADD', key, now, now .. '-' .. math.random())
-        -- Set expiry on the key
-        redis.call('EXPIRE', key, window + 1)
-        return {1, limit - count - 1}  -- allowed, remaining
-    else
-        -- Get oldest entry to calculate retry-after
-        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
-        local retry_after = 0
-        if oldest[2] then
-            retry_after = window - (now - oldest[2])
+    if granted > 0 then
+        if current == 0 then
+            -- First tokens of this client in the bucket
+            local clients_key = stats_key .. ':clients:' .. name .. ':' .. bucket
+            redis.call('INCR', clients_key)
+            redis.call('EXPIRE', clients_key, math.ceil(window) + 1)
         end
-        return {0, retry_after}  -- denied, retry_after
+        redis.call('INCRBY', current_key, granted)
+        redis.call('EXPIRE', current_key, math.ceil(window * 2) + 1)
+        redis.call('HINCRBY', stats_key, 'granted:' .. name, granted)
+    else
+        redis.call('HINCRBY', stats_key, 'refused:' .. name, 1)
     end
+    return {granted, previous, current}
     """
     
     def __init__(
@@ -89,11 +139,28 @@ class RedisRateLimiter:
         self._redis = redis_client
         self.config = config or RedisRateLimitConfig()
         self._script_sha: str | None = None
+        self._stats_key = f"{self.config.key_prefix}:stats"
+        
+        # (name, window seconds, limit, lease size), checked in this order
+        self._windows: list[tuple[str, float, int, int]] = []
+        for name, window, limit in (
+            ("burst", self.config.burst_window_seconds, self.config.burst_limit),
+            ("minute", 60.0, self.config.requests_per_minute),
+            ("hour", 3600.0, self.config.requests_per_hour),
+        ):
+            lease_size = 1
+            if self.config.lease_size > 0:
+                lease_size = max(1, min(self.config.lease_size, int(limit * self.config.lease_max_fraction)))
+            self._windows.append((name, window, limit, lease_size))
+        
+        self._leases: dict[tuple[str, str], _Lease] = {}
+        self._next_sweep = time.time() + 60.0
+        self._local_stats = {"local_grants": 0, "round_trips": 0, "background_refills": 0}
     
     async def _ensure_script_loaded(self) -> str:
         """Load Lua script into Redis if not already loaded."""
         if self._script_sha is None:
-            self._script_sha = await self._redis.script_load(self.RATE_LIMIT_SCRIPT)
+            self._script_sha = await self._redis.script_load(self.LEASE_SCRIPT)
         return self._script_sha
     
     def _make_key(self, client_id: str, window: str) -> str:
@@ -102,12 +169,118 @@ class RedisRateLimiter:
         client_hash = hashlib.sha256(client_id.encode()).hexdigest()[:16]
         return f"{self.config.key_prefix}:{window}:{client_hash}"
     
+    async def _lease(
+        self,
+        client_id: str,
+        name: str,
+        window: float,
+        limit: int,
+        requested: int,
+    ) -> tuple[float, int, int, float]:
+        """
+        Takes up to `requested` tokens from Redis.
+        
+        Returns:
+            Tuple of (time of the grant, tokens granted, tokens left
+            unleased, seconds until a token frees up if none was granted)
+        """
+        script_sha = await self._ensure_script_loaded()
+        now = time.time()
+        self._local_stats["round_trips"] += 1
+        granted, previous, current = await self._redis.evalsha(
+            script_sha,
+            2,
+            self._make_key(client_id, name),
+            self._stats_key,
+            now,
+            window,
+            limit,
+            requested,
+            name,
+        )
+        granted, previous, current = int(granted), int(previous), int(current)
+        
+        counter = WindowCounter(window)
+        counter.bucket = int(now // window)
+        counter.previous = previous
+        counter.current = current + granted
+        remaining = max(0, limit - counter.count(now))
+        retry_after = counter.retry_after(now, limit) if not granted else 0.0
+        return now, granted, remaining, retry_after
+    
+    async def _refill(self, key: tuple[str, str], lease: _Lease, window: float, limit: int, size: int) -> None:
+        """Background refill of a lease running low."""
+        try:
+            now, granted, remaining, retry_after = await self._lease(key[0], key[1], window, limit, size)
+            if int(now // window) == lease.bucket:
+                lease.tokens += granted
+                lease.remaining = remaining
+                if not granted:
+                    lease.denied_until = now + retry_after
+            self._local_stats["background_refills"] += 1
+        except Exception as e:
+            # The next request without local tokens leases synchronously
+            logger.warning(f"Rate limit lease refill failed: {e}")
+        finally:
+            lease.refill = None
+    
+    async def _take(self, client_id: str, name: str, window: float, limit: int, size: int) -> tuple[bool, int, float]:
+        """
+        Spends one token of a window.
+        
+        Returns:
+            Tuple of (allowed, remaining, retry_after)
+        """
+        if size <= 1:
+            _, granted, remaining, retry_after = await self._lease(client_id, name, window, limit, 1)
+            return bool(granted), remaining, retry_after
+        
+        now = time.time()
+        bucket = int(now // window)
+        key = (client_id, name)
+        lease = self._leases.get(key)
+        if lease is None or lease.bucket != bucket:
+            # Tokens of a past bucket were counted there; they can't be spent now
+            lease = self._leases[key] = _Lease(bucket)
+        
+        if not lease.tokens and lease.refill is not None:
+            await lease.refill
+        if lease.tokens:
+            self._local_stats["local_grants"] += 1
+        else:
+            now = time.time()
+            if now < lease.denied_until:
+                return False, 0, lease.denied_until - now
+            now, granted, remaining, retry_after = await self._lease(client_id, name, window, limit, size)
+            if int(now // window) != lease.bucket:
+                lease = self._leases[key] = _Lease(int(now // window))
+            lease.remaining = remaining
+            if not granted:
+                lease.denied_until = now + retry_after
+                return False, 0, retry_after
+            lease.tokens += granted
+        
+        lease.tokens -= 1
+        if lease.refill is None and lease.tokens <= size * self.config.refill_threshold and lease.remaining:
+            lease.refill = asyncio.create_task(self._refill(key, lease, window, limit, size))
+        return True, lease.remaining + lease.tokens, 0.0
+    
+    def _sweep_leases(self, now: float) -> None:
+        """Drops leases of past buckets."""
+        windows = {name: window for name, window, _, _ in self._windows}
+        stale = [
+            key for key, lease in self._leases.items()
+            if lease.refill is None and lease.bucket != int(now // windows[key[1]])
+        ]
+        for key in stale:
+            del self._leases[key]
+    
     async def check_rate_limit(self, client_id: str) -> tuple[bool, dict]:
         """
         Check if a client has exceeded rate limits.
         
-        Uses Redis sorted sets with sliding window algorithm.
-        Checks burst, minute, and hour limits in order.
+        Checks burst, minute, and hour limits in order, from local
+        leases when leasing is enabled.
         
         Args:
             client_id: Unique identifier for the client
@@ -116,69 +289,23 @@ class RedisRateLimiter:
             Tuple of (is_allowed, limit_info_dict)
         """
         now = time.time()
-        script_sha = await self._ensure_script_loaded()
+        if now >= self._next_sweep:
+            self._sweep_leases(now)
+            self._next_sweep = now + 60.0
         
-        limit_info = {
+        limit_info: dict[str, Any] = {
             "client_id": client_id[:8] + "...",  # Truncate for privacy
             "timestamp": now,
         }
         
-        # Check burst limit (1 second window)
-        burst_key = self._make_key(client_id, "burst")
-        burst_result = await self._redis.evalsha(
-            script_sha,
-            1,
-            burst_key,
-            now,
-            self.config.burst_window_seconds,
-            self.config.burst_limit,
-        )
-        
-        if burst_result[0] == 0:
-            limit_info["exceeded"] = "burst"
-            limit_info["retry_after"] = max(0.1, burst_result[1])
-            limit_info["burst_limit"] = self.config.burst_limit
-            return False, limit_info
-        
-        limit_info["burst_remaining"] = burst_result[1]
-        
-        # Check minute limit
-        minute_key = self._make_key(client_id, "minute")
-        minute_result = await self._redis.evalsha(
-            script_sha,
-            1,
-            minute_key,
-            now,
-            60,
-            self.config.requests_per_minute,
-        )
-        
-        if minute_result[0] == 0:
-            limit_info["exceeded"] = "minute"
-            limit_info["retry_after"] = max(1, minute_result[1])
-            limit_info["minute_limit"] = self.config.requests_per_minute
-            return False, limit_info
-        
-        limit_info["minute_remaining"] = minute_result[1]
-        
-        # Check hour limit
-        hour_key = self._make_key(client_id, "hour")
-        hour_result = await self._redis.evalsha(
-            script_sha,
-            1,
-            hour_key,
-            now,
-            3600,
-            self.config.requests_per_hour,
-        )
-        
-        if hour_result[0] == 0:
-            limit_info["exceeded"] = "hour"
-            limit_info["retry_after"] = max(1, hour_result[1])
-            limit_info["hour_limit"] = self.config.requests_per_hour
-            return False, limit_info
-        
-        limit_info["hour_remaining"] = hour_result[1]
+        for name, window, limit, size in self._windows:
+            allowed, remaining, retry_after = await self._take(client_id, name, window, limit, size)
+            if not allowed:
+                limit_info["exceeded"] = name
+                limit_info["retry_after"] = max(0.1 if name == "burst" else 1, retry_after)
+                limit_info[f"{name}_limit"] = limit
+                return False, limit_info
+            limit_info[f"{name}_remaining"] = remaining
         
         return True, limit_info
     
@@ -186,88 +313,87 @@ class RedisRateLimiter:
         """
         Get current rate limit status for a client.
         
+        Counts include tokens leased by workers but not yet spent.
+        
         Returns:
             Dict with current counts and limits
         """
         now = time.time()
-        
-        # Get counts for all windows
-        burst_key = self._make_key(client_id, "burst")
-        minute_key = self._make_key(client_id, "minute")
-        hour_key = self._make_key(client_id, "hour")
-        
-        # Remove expired entries and count
-        async with self._redis.pipeline() as pipe:
-            pipe.zremrangebyscore(burst_key, "-inf", now - self.config.burst_window_seconds)
-            pipe.zcard(burst_key)
-            pipe.zremrangebyscore(minute_key, "-inf", now - 60)
-            pipe.zcard(minute_key)
-            pipe.zremrangebyscore(hour_key, "-inf", now - 3600)
-            pipe.zcard(hour_key)
-            results = await pipe.execute()
-        
-        return {
-            "burst": {
-                "count": results[1],
-                "limit": self.config.burst_limit,
-                "remaining": max(0, self.config.burst_limit - results[1]),
-            },
-            "minute": {
-                "count": results[3],
-                "limit": self.config.requests_per_minute,
-                "remaining": max(0, self.config.requests_per_minute - results[3]),
-            },
-            "hour": {
-                "count": results[5],
-                "limit": self.config.requests_per_hour,
-                "remaining": max(0, self.config.requests_per_hour - results[5]),
-            },
-        }
+        keys = []
+        for name, window, _, _ in self._windows:
+            bucket = int(now // window)
+            key = self._make_key(client_id, name)
+            keys.extend([f"{key}:{bucket - 1}", f"{key}:{bucket}"])
+        
+        values = await self._redis.mget(keys)
+        
+        status = {}
+        for i, (name, window, limit, _) in enumerate(self._windows):
+            counter = WindowCounter(window)
+            counter.bucket = int(now // window)
+            counter.previous = int(values[2 * i] or 0)
+            counter.current = int(values[2 * i + 1] or 0)
+            count = counter.count(now)
+            status[name] = {
+                "count": count,
+                "limit": limit,
+                "remaining": max(0, limit - count),
+            }
+        return status
     
     async def reset_client(self, client_id: str) -> None:
         """Reset all rate limits for a client."""
-        keys = [
-            self._make_key(client_id, "burst"),
-            self._make_key(client_id, "minute"),
-            self._make_key(client_id, "hour"),
-        ]
+        now = time.time()
+        keys = []
+        for name, window, _, _ in self._windows:
+            bucket = int(now // window)
+            key = self._make_key(client_id, name)
+            keys.extend([f"{key}:{bucket - 1}", f"{key}:{bucket}"])
+            self._leases.pop((client_id, name), None)
         await self._redis.delete(*keys)
     
     async def get_global_stats(self) -> dict:
         """
         Get global rate limiting statistics.
         
+        Read from the counters the lease script maintains, without
+        scanning keys.
+        
         Returns:
-            Dict with key counts and memory usage
+            Dict with active clients per window, granted and refused
+            token counts, and this worker's lease counters
         """
-        pattern = f"{self.config.key_prefix}:*"
-        
-        # Count keys by type
-        cursor = 0
-        key_counts = {"burst": 0, "minute": 0, "hour": 0}
-        
-        while True:
-            cursor, keys = await self._redis.scan(cursor, match=pattern, count=1000)
-            for key in keys:
-                key_str = key.decode() if isinstance(key, bytes) else key
-                if ":burst:" in key_str:
-                    key_counts["burst"] += 1
-                elif ":minute:" in key_str:
-                    key_counts["minute"] += 1
-                elif ":hour:" in key_str:
-                    key_counts["hour"] += 1
-            
-            if cursor == 0:
-                break
+        now = time.time()
+        client_keys = [
+            f"{self._stats_key}:clients:{name}:{int(now // window)}"
+            for name, window, _, _ in self._windows
+        ]
+        client_counts = await self._redis.mget(client_keys)
+        counters = {
+            (k.decode() if isinstance(k, bytes) else k): int(v)
+            for k, v in (await self._redis.hgetall(self._stats_key)).items()
+        }
+        names = [name for name, _, _, _ in self._windows]
         
         return {
-            "active_clients": key_counts,
+            "active_clients": {name: int(count or 0) for name, count in zip(names, client_counts)},
+            "granted": {name: counters.get(f"granted:{name}", 0) for name in names},
+            "refused": {name: counters.get(f"refused:{name}", 0) for name in names},
+            "local": {**self._local_stats, "leases": len(self._leases)},
             "config": {
                 "burst_limit": self.config.burst_limit,
                 "requests_per_minute": self.config.requests_per_minute,
                 "requests_per_hour": self.config.requests_per_hour,
+                "lease_size": self.config.lease_size,
             },
         }
+    
+    async def close(self) -> None:
+        """Cancels background lease refills."""
+        refills = [lease.refill for lease in self._leases.values() if lease.refill is not None]
+        for task in refills:
+            task.cancel()
+        await asyncio.gather(*refills, return_exceptions=True)
 
 
 class RedisRateLimitMiddleware:
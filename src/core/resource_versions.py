@@ -0,0 +1,171 @@
+"""
+Version stamps for slowly changing API resources.
+
+Settings-style endpoints (sport configs, global settings, market config
+overrides, static catalogs) return the same body on almost every poll.
+Each such resource carries a version per user, bumped whenever a commit
+writes one of its rows, so a route can derive a strong ETag from the
+version alone and answer If-None-Match with 304 Not Modified before
+querying or serializing anything (see conditional_get in src.api.deps).
+
+Versions are bumped from SQLAlchemy session hooks (bottom of this module),
+so every write through the CRUD layer counts without each CRUD method
+having to remember to do it:
+
+    - ORM inserts/updates/deletes bump the row owner's version
+    - bulk UPDATE/DELETE statements bump the resource for every user
+
+Every ETag also includes a per-process epoch, so tags issued before a
+restart (or by another worker) never match. Versions are read before the
+resource is queried: a write that lands in between only makes the next
+request miss, it can never pin stale content to a new tag.
+"""
+
+import hashlib
+import uuid
+from collections import defaultdict
+from itertools import chain
+from typing import Iterable
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+
+# Table name -> resource name (rows are scoped by their user_id column)
+VERSIONED_TABLES = {
+    "sport_configs": "sport_configs",
+    "global_settings": "global_settings",
+    "market_configs": "market_configs",
+}
+
+
+class ResourceVersions:
+    """
+    In-process registry of resource versions.
+
+    A resource's version for a scope (normally a user id) is the pair
+    (generation, version): version counts writes to that scope and
+    generation counts writes that may have touched any scope.
+    """
+
+    def __init__(self):
+        self._epoch = uuid.uuid4().hex[:8]
+        self._versions: dict[tuple[str, str], int] = defaultdict(int)
+        self._generations: dict[str, int] = defaultdict(int)
+        self._stats = {"bumps": 0, "not_modified": 0, "full": 0}
+
+    def bump(self, resource: str, scope: uuid.UUID | str | None = None) -> None:
+        """
+        Marks a resource as changed for one scope, or for all scopes if
+        scope is None.
+        """
+        if scope is None:
+            self._generations[resource] += 1
+        else:
+            self._versions[(resource, str(scope))] += 1
+        self._stats["bumps"] += 1
+
+    def version(self, resource: str, scope: uuid.UUID | str | None = None) -> tuple[int, int]:
+        """
+        Current (generation, version) of a resource for a scope.
+        """
+        key = (resource, str(scope))
+        return self._generations.get(resource, 0), self._versions.get(key, 0)
+
+    def etag(
+        self,
+        resources: Iterable[str],
+        scope: uuid.UUID | str | None = None,
+        variant: str = "",
+    ) -> str:
+        """
+        Strong ETag for a response built from the given resources.
+
+        Args:
+            resources: Resources the response body is derived from
+            scope: Scope the body is restricted to (user id), if any
+            variant: Anything else the body depends on (path, query string)
+
+        Returns:
+            Quoted entity tag
+        """
+        parts = [self._epoch, str(scope), variant]
+        parts.extend(f"{r}:{g}.{v}" for r in sorted(resources) for g, v in [self.version(r, scope)])
+        digest = hashlib.sha1("|".join(parts).encode()).hexdigest()[:20]
+        return f'"{digest}"'
+
+    def record(self, not_modified: bool) -> None:
+        """Counts a conditional request outcome."""
+        self._stats["not_modified" if not_modified else "full"] += 1
+
+    def get_stats(self) -> dict[str, int]:
+        """Bump and conditional-hit counters plus tracked scopes."""
+        return {**self._stats, "scopes": len(self._versions)}
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches an entity tag.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so a
+    W/ prefix added by an intermediary (e.g. after compressing) still
+    matches.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+# Global registry
+resource_versions = ResourceVersions()
+
+
+# ---------------------------------------------------------------------------
+# Version bumps on commit
+# ---------------------------------------------------------------------------
+
+_CHANGED_SCOPES = "resource_versions_changed"
+_CHANGED_ALL = "resource_versions_changed_all"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_resource_changes(session: Session, flush_context) -> None:
+    """Remembers which resources a flush wrote until the commit lands."""
+    for obj in chain(session.new, session.dirty, session.deleted):
+        resource = VERSIONED_TABLES.get(getattr(obj, "__tablename__", None))
+        if resource is None:
+            continue
+        # Read the loaded state directly; attribute access could trigger a refresh
+        user_id = inspect(obj).dict.get("user_id")
+        if user_id is None:
+            session.info.setdefault(_CHANGED_ALL, set()).add(resource)
+        else:
+            session.info.setdefault(_CHANGED_SCOPES, set()).add((resource, user_id))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_resource_changes(orm_execute_state) -> None:
+    """Bulk UPDATE/DELETE statements don't say which users they touch."""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    for mapper in orm_execute_state.all_mappers:
+        resource = VERSIONED_TABLES.get(mapper.local_table.name)
+        if resource is not None:
+            orm_execute_state.session.info.setdefault(_CHANGED_ALL, set()).add(resource)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_resource_versions(session: Session) -> None:
+    for resource in session.info.pop(_CHANGED_ALL, ()):
+        resource_versions.bump(resource)
+    for resource, user_id in session.info.pop(_CHANGED_SCOPES, ()):
+        resource_versions.bump(resource, user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_resource_changes(session: Session) -> None:
+    for key in (_CHANGED_ALL, _CHANGED_SCOPES):
+        session.info.pop(key, None)
@@ -123,6 +123,48 @@ def create_security_headers_config(
     return config
 
 
+def build_security_headers(config: SecurityHeadersConfig) -> list[tuple[bytes, bytes]]:
+    """Builds the security headers that don't change per request."""
+    headers = []
+
+    # X-Content-Type-Options
+    if config.x_content_type_options:
+        headers.append((b"x-content-type-options", config.x_content_type_options.encode()))
+
+    # X-Frame-Options
+    if config.x_frame_options:
+        headers.append((b"x-frame-options", config.x_frame_options.encode()))
+
+    # X-XSS-Protection
+    if config.x_xss_protection:
+        headers.append((b"x-xss-protection", config.x_xss_protection.encode()))
+
+    # Strict-Transport-Security (HSTS)
+    if config.hsts_enabled:
+        hsts_value = f"max-age={config.hsts_max_age}"
+        if config.hsts_include_subdomains:
+            hsts_value += "; includeSubDomains"
+        if config.hsts_preload:
+            hsts_value += "; preload"
+        headers.append((b"strict-transport-security", hsts_value.encode()))
+
+    # Referrer-Policy
+    if config.referrer_policy:
+        headers.append((b"referrer-policy", config.referrer_policy.encode()))
+
+    # Content-Security-Policy
+    if config.csp_enabled and config.csp_directives:
+        csp_parts = [f"{directive} {value}" for directive, value in config.csp_directives.items()]
+        headers.append((b"content-security-policy", "; ".join(csp_parts).encode()))
+
+    # Permissions-Policy
+    if config.permissions_policy_enabled and config.permissions_policy:
+        policy_parts = [f"{feature}={value}" for feature, value in config.permissions_policy.items()]
+        headers.append((b"permissions-policy", ", ".join(policy_parts).encode()))
+
+    return headers
+
+
 class SecurityHeadersMiddleware:
     """
     Pure ASGI middleware that adds security headers to HTTP responses.
@@ -143,44 +185,7 @@ class SecurityHeadersMiddleware:
     
     def _build_security_headers(self) -> list[tuple[bytes, bytes]]:
         """Pre-build security headers that don't change per request."""
-        headers = []
-        
-        # X-Content-Type-Options
-        if self.config.x_content_type_options:
-            headers.append((b"x-content-type-options", self.config.x_content_type_options.encode()))
-        
-        # X-Frame-Options
-        if self.config.x_frame_options:
-            headers.append((b"x-frame-options", self.config.x_frame_options.encode()))
-        
-        # X-XSS-Protection
-        if self.config.x_xss_protection:
-            headers.append((b"x-xss-protection", self.config.x_xss_protection.encode()))
-        
-        # Strict-Transport-Security (HSTS)
-        if self.config.hsts_enabled:
-            hsts_value = f"max-age={self.config.hsts_max_age}"
-            if self.config.hsts_include_subdomains:
-                hsts_value += "; includeSubDomains"
-            if self.config.hsts_preload:
-                hsts_value += "; preload"
-            headers.append((b"strict-transport-security", hsts_value.encode()))
-        
-        # Referrer-Policy
-        if self.config.referrer_policy:
-            headers.append((b"referrer-policy", self.config.referrer_policy.encode()))
-        
-        # Content-Security-Policy
-        if self.config.csp_enabled and self.config.csp_directives:
-            csp_parts = [f"{directive} {value}" for directive, value in self.config.csp_directives.items()]
-            headers.append((b"content-security-policy", "; ".join(csp_parts).encode()))
-        
-        # Permissions-Policy
-        if self.config.permissions_policy_enabled and self.config.permissions_policy:
-            policy_parts = [f"{feature}={value}" for feature, value in self.config.permissions_policy.items()]
-            headers.append((b"permissions-policy", ", ".join(policy_parts).encode()))
-        
-        return headers
+        return build_security_headers(self.config)
     
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """ASGI interface - add security headers to responses."""
@@ -0,0 +1,134 @@
+"""
+Fast JSON serialization for API responses, WebSocket/SSE frames and logs.
+
+Uses orjson when it is installed and falls back to the stdlib json module
+otherwise; both backends produce the same compact output (no spaces after
+separators, non-ASCII characters kept as UTF-8). orjson is an optional
+dependency:
+
+    pip install orjson
+
+Types beyond plain JSON are encoded the same way by either backend:
+
+    datetime/date/time  ISO 8601 (datetime.isoformat())
+    UUID                canonical string
+    Enum                its value
+    Decimal             string, so prices keep their exact digits
+                        (pydantic does the same for response models)
+    set/frozenset       list
+    dataclass           object of its fields
+
+Dict keys may also be int, float, bool, None, datetime/date/time, UUID or
+Enum; they are encoded as strings. NaN and Infinity become null (JSON has
+no representation for them).
+
+Anything else raises TypeError unless a default callable is passed.
+"""
+
+import dataclasses
+import json
+import math
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable
+from uuid import UUID
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional accelerator
+    orjson = None
+
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _encode_extra(obj: Any, default: Callable[[Any], Any] | None = None) -> Any:
+    """Encodes types that neither backend handles natively."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if default is not None:
+        return default(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _encode_stdlib(obj: Any, default: Callable[[Any], Any] | None = None) -> Any:
+    """Stdlib fallback for the types orjson encodes natively."""
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    return _encode_extra(obj, default)
+
+
+def _stdlib_compatible(obj: Any) -> Any:
+    """
+    Rewrites what the stdlib encodes differently from orjson: non-finite
+    floats become None, and keys of the types above become strings.
+    """
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {
+            _encode_stdlib(key) if isinstance(key, (date, time, UUID, Enum)) else key: _stdlib_compatible(value)
+            for key, value in obj.items()
+        }
+    if isinstance(obj, (list, tuple)):
+        return [_stdlib_compatible(item) for item in obj]
+    return obj
+
+
+def dumps_bytes(obj: Any, default: Callable[[Any], Any] | None = None) -> bytes:
+    """
+    Serializes obj to UTF-8 encoded JSON.
+
+    Args:
+        obj: Value to encode
+        default: Called for otherwise unsupported objects; its return
+            value is encoded in their place
+
+    Raises:
+        TypeError: If obj contains an unsupported object and no default
+            is given
+    """
+    if orjson is not None:
+        # orjson.JSONEncodeError subclasses TypeError
+        return orjson.dumps(obj, default=lambda o: _encode_extra(o, default), option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        _stdlib_compatible(obj),
+        default=lambda o: _stdlib_compatible(_encode_stdlib(o, default)),
+        ensure_ascii=False,
+        separators=(",", ":"),
+        allow_nan=False,
+    ).encode()
+
+
+def dumps(obj: Any, default: Callable[[Any], Any] | None = None) -> str:
+    """Serializes obj to a JSON string (see dumps_bytes)."""
+    return dumps_bytes(obj, default).decode()
+
+
+def loads(data: str | bytes) -> Any:
+    """Parses a JSON document."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with the fast backend.
+
+    Used as the application's default response class.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
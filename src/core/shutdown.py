@@ -196,6 +196,13 @@ class BotShutdownManager:
         """Register position state saving (highest priority)."""
         self._handler.register_cleanup(save_func, "save_positions", priority=5)
     
+    def register_snapshot_saver(
+        self,
+        save_func: Callable[[], Awaitable[None]],
+    ) -> None:
+        """Register bot runtime snapshotting for warm restarts."""
+        self._handler.register_cleanup(save_func, "save_bot_snapshots", priority=6)
+    
     def register_order_canceller(
         self,
         cancel_func: Callable[[], Awaitable[None]],
@@ -1,21 +1,53 @@
 """
 Request validation middleware for input sanitization and size limits.
 Provides comprehensive request filtering and validation.
+
+Uses pure ASGI implementation to avoid the task and stream overhead of
+Starlette's BaseHTTPMiddleware. Per request it:
+
+    - checks URL length, query parameter count, Content-Length and
+      Content-Type from the scope, without building a Request
+    - scans the path for traversal and query parameters for a narrower
+      set of patterns (see ValidationConfig.query_sql_injection_patterns);
+      opaque values such as JWTs and pagination cursors are not scanned
+    - for JSON bodies only, streams the body under the size cap, parses
+      it once and scans it (other content types are not buffered)
+
+All detection patterns are compiled into one alternation. A search for
+the literals every match must contain (keywords, "--", "<", ...) runs
+first, so a clean string usually costs one cheap literal search and never
+reaches the pattern scan. A JSON body is first prefiltered as raw text:
+JSON strings without escape sequences appear verbatim in the body, so a
+raw body containing none of the literals is clean as a whole. Otherwise
+(field names such as entry_threshold_drop already contain one) its
+strings are checked one by one, each repeated key only once. Numeric-only
+values are never scanned.
+
+The parsed body is left in the ASGI scope, and routes using
+ValidatedJSONRoute read it from there instead of decoding it again.
 """
 
-import re
-import json
 import logging
-from dataclasses import dataclass, field
-from typing import Callable, Awaitable, Pattern
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response, JSONResponse
-from fastapi import HTTPException
+import re
+from dataclasses import dataclass, field, replace
+from typing import Any, Pattern
+from urllib.parse import parse_qsl
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.serialization import loads
 
 
 logger = logging.getLogger(__name__)
 
+# Scope key holding (raw body, parsed JSON) of a validated request
+PARSED_BODY_SCOPE_KEY = "validation.json_body"
+
+_BODY_METHODS = ("POST", "PUT", "PATCH")
+
 
 @dataclass
 class ValidationConfig:
@@ -25,7 +57,7 @@ class ValidationConfig:
     max_header_size: int = 8192
     max_query_params: int = 50
     max_json_depth: int = 20
-    
+
     # Content type restrictions
     allowed_content_types: list[str] = field(default_factory=lambda: [
         "application/json",
@@ -33,7 +65,7 @@ class ValidationConfig:
         "multipart/form-data",
         "text/plain",
     ])
-    
+
     # Path traversal patterns to block
     blocked_path_patterns: list[str] = field(default_factory=lambda: [
         r"\.\./",
@@ -41,14 +73,16 @@ class ValidationConfig:
         r"%2e%2e",
         r"%252e%252e",
     ])
-    
+
     # SQL injection patterns
     sql_injection_patterns: list[str] = field(default_factory=lambda: [
         r"(\b(SELECT|INSERT|UPDATE|DELETE|DROP|UNION|ALTER|CREATE|TRUNCATE)\b)",
-        r"(--)|(;)--",
+        # A comment only after a closing quote or semicolon: a bare "--" is
+        # common in base64url tokens (JWTs, webhook URLs)
+        r"['\";]\s*--",
         r"(\/\*.*\*\/)",
     ])
-    
+
     # XSS patterns
     xss_patterns: list[str] = field(default_factory=lambda: [
         r"<script[^>]*>",
@@ -57,6 +91,56 @@ class ValidationConfig:
         r"<iframe[^>]*>",
     ])
 
+    # Lowercase literals, at least one of which occurs in any ASCII string
+    # the patterns above can match. A string containing none of them skips
+    # the (much slower) pattern scan. Keep in step with the patterns, or
+    # set to an empty list to always scan.
+    prefilter_literals: list[str] = field(default_factory=lambda: [
+        "..", "%2",
+        "select", "insert", "update", "delete", "drop", "union", "alter", "create", "truncate",
+        "--", "/*",
+        "<", "javascript:", "=",
+    ])
+
+    # Body fields holding secrets (passwords, PEM keys) that are hashed or
+    # encrypted, never rendered or queried
+    unscanned_fields: list[str] = field(default_factory=lambda: [
+        "password",
+        "new_password",
+        "current_password",
+        "api_key",
+        "api_secret",
+        "private_key",
+        "refresh_token",
+    ])
+
+    # Query parameters carry search text and opaque values (a JWT for the
+    # SSE stream, base64url pagination cursors), where the SQL keyword and
+    # "on...=" patterns above match legitimate input. Query values are
+    # scanned with these patterns instead.
+    query_sql_injection_patterns: list[str] = field(default_factory=lambda: [
+        r"['\";]\s*--",
+        r"(\/\*.*\*\/)",
+    ])
+
+    query_xss_patterns: list[str] = field(default_factory=lambda: [
+        r"<script[^>]*>",
+        r"javascript:",
+        r"<[^>]*\bon\w+\s*=",
+        r"<iframe[^>]*>",
+    ])
+
+    # Prefilter literals for the query patterns (same contract as above)
+    query_prefilter_literals: list[str] = field(default_factory=lambda: [
+        "..", "%2", "--", "/*", "<", "javascript:",
+    ])
+
+    # Query parameters holding tokens or cursors, never rendered or queried
+    unscanned_query_params: list[str] = field(default_factory=lambda: [
+        "token",
+        "cursor",
+    ])
+
 
 class RequestValidationError(Exception):
     """Raised when request validation fails."""
@@ -69,18 +153,18 @@ class RequestValidationError(Exception):
 def check_json_depth(obj, max_depth: int, current_depth: int = 0) -> bool:
     """
     Check if JSON object exceeds maximum nesting depth.
-    
+
     Args:
         obj: JSON object to check
         max_depth: Maximum allowed depth
         current_depth: Current recursion depth
-    
+
     Returns:
         True if within limits, False if exceeded
     """
     if current_depth > max_depth:
         return False
-    
+
     if isinstance(obj, dict):
         for value in obj.values():
             if not check_json_depth(value, max_depth, current_depth + 1):
@@ -89,247 +173,415 @@ def check_json_depth(obj, max_depth: int, current_depth: int = 0) -> bool:
         for item in obj:
             if not check_json_depth(item, max_depth, current_depth + 1):
                 return False
-    
+
     return True
 
 
+def _compile_any(patterns: list[str]) -> Pattern:
+    """One case-insensitive pattern matching any of the given ones."""
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+
+
 class InputSanitizer:
     """
     Sanitizes input strings for common attack patterns.
+
+    All categories share one compiled scanner; a named group per category
+    tells which one matched.
     """
-    
+
+    CATEGORY_MESSAGES = {
+        "path": "Path traversal detected in {}",
+        "sql": "SQL injection pattern detected in {}",
+        "xss": "XSS pattern detected in {}",
+    }
+
     def __init__(self, config: ValidationConfig):
         self._config = config
-        self._path_patterns = [
-            re.compile(p, re.IGNORECASE) for p in config.blocked_path_patterns
-        ]
-        self._sql_patterns = [
-            re.compile(p, re.IGNORECASE) for p in config.sql_injection_patterns
-        ]
-        self._xss_patterns = [
-            re.compile(p, re.IGNORECASE) for p in config.xss_patterns
-        ]
-    
+        self._path_pattern = _compile_any(config.blocked_path_patterns)
+        self._sql_pattern = _compile_any(config.sql_injection_patterns)
+        self._xss_pattern = _compile_any(config.xss_patterns)
+        self._scanner = re.compile(
+            "|".join(
+                f"(?P<{name}>{pattern.pattern})"
+                for name, pattern in (
+                    ("path", self._path_pattern),
+                    ("sql", self._sql_pattern),
+                    ("xss", self._xss_pattern),
+                )
+            ),
+            re.IGNORECASE,
+        )
+        self._prefilter = (
+            re.compile("|".join(re.escape(literal) for literal in config.prefilter_literals))
+            if config.prefilter_literals else None
+        )
+        self._unscanned_fields = frozenset(config.unscanned_fields)
+
+    def may_match(self, value: str) -> bool:
+        """
+        Literal prefilter: False means value cannot match any pattern.
+
+        Non-ASCII text always returns True (case folding differs).
+        """
+        if self._prefilter is None or not value.isascii():
+            return True
+        return self._prefilter.search(value.lower()) is not None
+
     def check_path_traversal(self, value: str) -> bool:
         """Check for path traversal attempts."""
-        for pattern in self._path_patterns:
-            if pattern.search(value):
-                return True
-        return False
-    
+        return self._path_pattern.search(value) is not None
+
     def check_sql_injection(self, value: str) -> bool:
         """Check for SQL injection patterns."""
-        for pattern in self._sql_patterns:
-            if pattern.search(value):
-                return True
-        return False
-    
+        return self._sql_pattern.search(value) is not None
+
     def check_xss(self, value: str) -> bool:
         """Check for XSS patterns."""
-        for pattern in self._xss_patterns:
-            if pattern.search(value):
-                return True
-        return False
-    
+        return self._xss_pattern.search(value) is not None
+
+    def is_suspicious(self, value: str) -> bool:
+        """Single search for any attack pattern."""
+        return self.may_match(value) and self._scanner.search(value) is not None
+
     def validate_string(self, value: str, context: str = "") -> list[str]:
         """
         Validate a string for common attack patterns.
-        
+
         Returns:
             List of detected issues (empty if clean)
         """
-        issues = []
-        
-        if self.check_path_traversal(value):
-            issues.append(f"Path traversal detected in {context}")
-        
-        if self.check_sql_injection(value):
-            issues.append(f"SQL injection pattern detected in {context}")
-        
-        if self.check_xss(value):
-            issues.append(f"XSS pattern detected in {context}")
-        
-        return issues
-    
+        if value.isdigit() or not self.is_suspicious(value):
+            return []
+
+        categories = {match.lastgroup for match in self._scanner.finditer(value)}
+        return [
+            message.format(context)
+            for name, message in self.CATEGORY_MESSAGES.items()
+            if name in categories
+        ]
+
+    def contains_suspicious(self, obj) -> bool:
+        """
+        Fast check whether any string in an object is suspicious.
+
+        Same coverage as sanitize_recursive (keys included, unscanned
+        fields skipped) without building issue messages; repeated keys
+        are checked once.
+        """
+        checked_keys: dict[str, bool] = {}
+        stack = [obj]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                if not item.isdigit() and self.is_suspicious(item):
+                    return True
+            elif isinstance(item, dict):
+                for key, value in item.items():
+                    suspicious = checked_keys.get(key)
+                    if suspicious is None:
+                        suspicious = checked_keys[key] = self.is_suspicious(key)
+                    if suspicious:
+                        return True
+                    if key not in self._unscanned_fields and isinstance(value, (str, dict, list)):
+                        stack.append(value)
+            elif isinstance(item, list):
+                stack.extend(item)
+        return False
+
     def sanitize_recursive(self, obj, context: str = "body") -> list[str]:
         """
         Recursively validate all strings in an object.
-        
+
+        Values of unscanned fields (secrets) are skipped.
+
         Returns:
             List of all detected issues
         """
         all_issues = []
-        
+
         if isinstance(obj, str):
             all_issues.extend(self.validate_string(obj, context))
         elif isinstance(obj, dict):
             for key, value in obj.items():
                 all_issues.extend(self.validate_string(key, f"{context}.key"))
-                all_issues.extend(self.sanitize_recursive(value, f"{context}.{key}"))
+                if key not in self._unscanned_fields:
+                    all_issues.extend(self.sanitize_recursive(value, f"{context}.{key}"))
         elif isinstance(obj, list):
             for i, item in enumerate(obj):
                 all_issues.extend(self.sanitize_recursive(item, f"{context}[{i}]"))
-        
+
         return all_issues
 
 
-class RequestValidationMiddleware(BaseHTTPMiddleware):
+class RequestValidationMiddleware:
     """
-    Middleware for validating incoming requests.
-    
+    Pure ASGI middleware for validating incoming requests.
+
     Checks:
     - Request body size
     - URL length
     - Content type
     - JSON depth
     - Common attack patterns
-    
-    Note: Uses body caching to prevent body consumption issues with BaseHTTPMiddleware.
+
+    Rejected requests get a 400 with an error code; unexpected errors
+    inside the middleware let the request through (fail open).
+
+    Usage:
+        app.add_middleware(RequestValidationMiddleware, config=ValidationConfig())
     """
-    
-    def __init__(self, app, config: ValidationConfig | None = None):
-        super().__init__(app)
+
+    def __init__(self, app: ASGIApp, config: ValidationConfig | None = None):
+        self.app = app
         self._config = config or ValidationConfig()
         self._sanitizer = InputSanitizer(self._config)
-    
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
-        """Process and validate the request."""
+        self._query_sanitizer = InputSanitizer(replace(
+            self._config,
+            sql_injection_patterns=self._config.query_sql_injection_patterns,
+            xss_patterns=self._config.query_xss_patterns,
+            prefilter_literals=self._config.query_prefilter_literals,
+        ))
+        self._unscanned_query_params = frozenset(self._config.unscanned_query_params)
+        self._allowed_content_types = frozenset(self._config.allowed_content_types)
+        self._stats = {"requests": 0, "bodies_scanned": 0, "bodies_walked": 0, "rejected": 0}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """ASGI interface - validate, then forward with the body replayed."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self._stats["requests"] += 1
+        consumed: list[Message] = []
         try:
-            # Cache the body so it can be read multiple times
-            body = await request.body()
-            
-            # Store body in request state for potential re-reading
-            request.state._body = body
-            
-            await self._validate_request(request, body)
-            return await call_next(request)
+            content_type = self._validate_request_line(scope)
+            if content_type == "application/json" and scope["method"] in _BODY_METHODS:
+                body = await self._read_body(receive, consumed)
+                if body:
+                    scope[PARSED_BODY_SCOPE_KEY] = (body, self._validate_json_body(body))
         except RequestValidationError as e:
             logger.warning(f"Request validation failed: {e.message}")
-            return JSONResponse(
+            self._stats["rejected"] += 1
+            response = JSONResponse(
                 status_code=400,
                 content={
                     "error": e.error_code,
                     "message": e.message,
                 },
             )
+            await response(scope, receive, send)
+            return
         except Exception as e:
             logger.error(f"Validation middleware error: {e}")
-            return await call_next(request)
-    
-    async def _validate_request(self, request: Request, body: bytes | None = None) -> None:
-        """Run all validation checks."""
-        # URL length check
-        url_length = len(str(request.url))
+
+        if consumed:
+            receive = self._replay(consumed, receive)
+        await self.app(scope, receive, send)
+
+    def _validate_request_line(self, scope: Scope) -> str:
+        """
+        Run the checks that need only the scope.
+
+        Returns:
+            Base content type of the request (may be empty)
+        """
+        content_type = ""
+        content_length = None
+        host = ""
+        for name, value in scope["headers"]:
+            if name == b"content-type":
+                content_type = value.decode("latin-1").split(";")[0].strip().lower()
+            elif name == b"content-length":
+                content_length = value
+            elif name == b"host":
+                host = value.decode("latin-1")
+
+        path = scope.get("root_path", "") + scope["path"]
+        query_string = scope.get("query_string", b"").decode("latin-1")
+
+        # URL length check (scheme://host/path?query)
+        url_length = len(scope.get("scheme", "http")) + 3 + len(host) + len(path)
+        if query_string:
+            url_length += 1 + len(query_string)
         if url_length > self._config.max_url_length:
             raise RequestValidationError(
                 f"URL exceeds maximum length ({url_length} > {self._config.max_url_length})",
                 "URL_TOO_LONG",
             )
-        
-        # Query parameter count check
-        if len(request.query_params) > self._config.max_query_params:
-            raise RequestValidationError(
-                f"Too many query parameters",
-                "TOO_MANY_PARAMS",
-            )
-        
+
         # Content-Length check
-        content_length = request.headers.get("content-length")
-        if content_length:
+        if content_length is not None:
             try:
                 size = int(content_length)
-                if size > self._config.max_body_size_bytes:
-                    raise RequestValidationError(
-                        f"Request body too large ({size} bytes)",
-                        "BODY_TOO_LARGE",
-                    )
             except ValueError:
                 raise RequestValidationError(
                     "Invalid Content-Length header",
                     "INVALID_CONTENT_LENGTH",
                 )
-        
+            if size > self._config.max_body_size_bytes:
+                raise RequestValidationError(
+                    f"Request body too large ({size} bytes)",
+                    "BODY_TOO_LARGE",
+                )
+
         # Content-Type check for POST/PUT/PATCH
-        if request.method in ("POST", "PUT", "PATCH"):
-            content_type = request.headers.get("content-type", "")
-            base_type = content_type.split(";")[0].strip()
-            
-            if base_type and base_type not in self._config.allowed_content_types:
+        if scope["method"] in _BODY_METHODS:
+            if content_type and content_type not in self._allowed_content_types:
                 raise RequestValidationError(
-                    f"Unsupported content type: {base_type}",
+                    f"Unsupported content type: {content_type}",
                     "UNSUPPORTED_CONTENT_TYPE",
                 )
-        
-        # Path validation
-        path_issues = self._sanitizer.validate_string(request.url.path, "path")
-        if path_issues:
+
+        # Path validation: route segments such as /games/{id}/select are
+        # matched literally, so only traversal is meaningful here
+        if self._sanitizer.check_path_traversal(path):
             raise RequestValidationError(
-                "; ".join(path_issues),
+                "Path traversal detected in path",
                 "INVALID_PATH",
             )
-        
+
         # Query parameter validation
-        for key, value in request.query_params.items():
-            issues = self._sanitizer.validate_string(key, "query_key")
-            issues.extend(self._sanitizer.validate_string(value, f"query[{key}]"))
-            if issues:
+        if query_string:
+            params = parse_qsl(query_string, keep_blank_values=True)
+            if len({key for key, _ in params}) > self._config.max_query_params:
                 raise RequestValidationError(
-                    "; ".join(issues),
-                    "INVALID_QUERY_PARAM",
+                    "Too many query parameters",
+                    "TOO_MANY_PARAMS",
                 )
-        
-        # JSON body validation
-        if request.method in ("POST", "PUT", "PATCH"):
-            content_type = request.headers.get("content-type", "")
-            if "application/json" in content_type:
-                await self._validate_json_body(request, body)
-    
-    async def _validate_json_body(self, request: Request, body: bytes | None = None) -> None:
-        """Validate JSON request body."""
-        try:
-            # Use passed body or read from request
-            if body is None:
-                body = await request.body()
-            
-            if len(body) > self._config.max_body_size_bytes:
+            for key, value in params:
+                issues = self._query_sanitizer.validate_string(key, "query_key")
+                if key not in self._unscanned_query_params:
+                    issues.extend(self._query_sanitizer.validate_string(value, f"query[{key}]"))
+                if issues:
+                    raise RequestValidationError(
+                        "; ".join(issues),
+                        "INVALID_QUERY_PARAM",
+                    )
+
+        return content_type
+
+    async def _read_body(self, receive: Receive, consumed: list[Message]) -> bytes:
+        """
+        Stream the request body, failing as soon as it exceeds the cap.
+
+        Every message read is appended to consumed for replay.
+        """
+        chunks: list[bytes] = []
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                consumed.append(message)
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self._config.max_body_size_bytes:
                 raise RequestValidationError(
                     "Request body too large",
                     "BODY_TOO_LARGE",
                 )
-            
-            if not body:
-                return
-            
-            data = json.loads(body)
-            
-            # Check JSON depth
-            if not check_json_depth(data, self._config.max_json_depth):
-                raise RequestValidationError(
-                    f"JSON nesting exceeds maximum depth ({self._config.max_json_depth})",
-                    "JSON_TOO_DEEP",
-                )
-            
-            # Check for attack patterns
-            issues = self._sanitizer.sanitize_recursive(data)
-            if issues:
-                raise RequestValidationError(
-                    "; ".join(issues[:3]),  # Limit error message length
-                    "INVALID_INPUT",
-                )
-                
-        except json.JSONDecodeError as e:
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                break
+
+        body = b"".join(chunks)
+        consumed.insert(0, {"type": "http.request", "body": body, "more_body": False})
+        return body
+
+    @staticmethod
+    def _replay(messages: list[Message], receive: Receive) -> Receive:
+        """Receive callable that yields the consumed messages first."""
+        pending = list(messages)
+
+        async def replay() -> Message:
+            if pending:
+                return pending.pop(0)
+            return await receive()
+
+        return replay
+
+    def _validate_json_body(self, body: bytes) -> Any:
+        """
+        Parse and validate a JSON request body.
+
+        Returns:
+            The parsed body
+        """
+        try:
+            data = loads(body)
+        except ValueError as e:
             raise RequestValidationError(
-                f"Invalid JSON: {e.msg}",
+                f"Invalid JSON: {getattr(e, 'msg', e)}",
                 "INVALID_JSON",
             )
-        except RequestValidationError:
-            raise
-        except Exception as e:
-            logger.error(f"JSON validation error: {e}")
+
+        # Check JSON depth (a body with fewer brackets than the limit can't exceed it)
+        max_depth = self._config.max_json_depth
+        if body.count(b"{") + body.count(b"[") > max_depth and not check_json_depth(data, max_depth):
+            raise RequestValidationError(
+                f"JSON nesting exceeds maximum depth ({max_depth})",
+                "JSON_TOO_DEEP",
+            )
+
+        # Check for attack patterns: raw prefilter, then per string
+        self._stats["bodies_scanned"] += 1
+        if b"\\" not in body:
+            try:
+                if not self._sanitizer.may_match(body.decode("utf-8")):
+                    return data
+            except UnicodeDecodeError:
+                pass
+        self._stats["bodies_walked"] += 1
+        if not self._sanitizer.contains_suspicious(data):
+            return data
+        issues = self._sanitizer.sanitize_recursive(data)
+        if issues:
+            raise RequestValidationError(
+                "; ".join(issues[:3]),  # Limit error message length
+                "INVALID_INPUT",
+            )
+        return data
+
+    def get_stats(self) -> dict[str, int]:
+        """Request, scan and rejection counters."""
+        return dict(self._stats)
+
+
+class PreparsedRequest(Request):
+    """
+    Request whose body and JSON come from RequestValidationMiddleware.
+    """
+
+    async def body(self) -> bytes:
+        if not hasattr(self, "_body"):
+            self._body = self.scope[PARSED_BODY_SCOPE_KEY][0]
+        return self._body
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = self.scope[PARSED_BODY_SCOPE_KEY][1]
+        return self._json
+
+
+class ValidatedJSONRoute(APIRoute):
+    """
+    Route class that reuses the body parsed by RequestValidationMiddleware
+    instead of reading and decoding it again.
+
+    Usage:
+        router = APIRouter(prefix="/settings", route_class=ValidatedJSONRoute)
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            if PARSED_BODY_SCOPE_KEY in request.scope:
+                request = PreparsedRequest(request.scope, request.receive)
+            return await handler(request)
+
+        return route_handler
 
 
 def create_validation_config(
@@ -6,8 +6,8 @@ Supports multiple event types and per-user connection management.
 """
 
 import asyncio
-import json
 import logging
+from collections import deque
 from datetime import datetime, timezone
 from enum import Enum
 from dataclasses import dataclass, field, asdict
@@ -15,6 +15,8 @@ from typing import Any
 from fastapi import WebSocket, WebSocketDisconnect
 from starlette.websockets import WebSocketState
 
+from src.core.serialization import dumps
+
 logger = logging.getLogger(__name__)
 
 
@@ -60,8 +62,8 @@ class WebSocketMessage:
     correlation_id: str | None = None
 
     def to_json(self) -> str:
-        """Serialize message to JSON string."""
-        return json.dumps({
+        """Serialize message to JSON string (Decimal, UUID and datetime values allowed)."""
+        return dumps({
             "event": self.event_type.value,
             "data": self.data,
             "timestamp": self.timestamp,
@@ -79,6 +81,59 @@ class WebSocketMessage:
         )
 
 
+# Events where only the latest value matters: a newer one replaces an
+# unsent older one for the same entity instead of queueing behind it
+COALESCED_EVENTS = frozenset({
+    WebSocketEventType.POSITION_UPDATED,
+    WebSocketEventType.PRICE_UPDATE,
+    WebSocketEventType.BOT_STATUS_CHANGED,
+    WebSocketEventType.HEARTBEAT,
+})
+
+# Always delivered, whatever the connection subscribed to
+SYSTEM_EVENTS = frozenset({
+    WebSocketEventType.CONNECTION_ESTABLISHED,
+    WebSocketEventType.HEARTBEAT,
+    WebSocketEventType.ERROR,
+})
+
+
+def _coalesce_key(message: WebSocketMessage) -> tuple | None:
+    """Identity of the entity a superseding event describes, or None."""
+    if message.event_type not in COALESCED_EVENTS:
+        return None
+    data = message.data or {}
+    entity = data.get("position_id") or data.get("id") or data.get("ticker") or data.get("condition_id")
+    return (message.event_type, entity)
+
+
+class _Connection:
+    """
+    One socket with its bounded outbound queue and writer task.
+
+    Queue entries are [coalesce_key, text] slots; a superseding event
+    overwrites the text of its unsent slot in place.
+    """
+
+    def __init__(self, websocket: WebSocket, user_id: str, max_queue: int):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.max_queue = max_queue
+        self.subscriptions: frozenset[str] | None = None  # None = every event
+        self.queue: deque[list] = deque()
+        self.pending: dict[tuple, list] = {}
+        self.wakeup = asyncio.Event()
+        self.task: asyncio.Task | None = None
+        self.closed = False
+
+    def wants(self, event_type: WebSocketEventType) -> bool:
+        return (
+            self.subscriptions is None
+            or event_type in SYSTEM_EVENTS
+            or event_type.value in self.subscriptions
+        )
+
+
 class ConnectionManager:
     """
     Manages WebSocket connections for real-time updates.
@@ -86,38 +141,52 @@ class ConnectionManager:
     Features:
     - Per-user connection tracking
     - Broadcast to all users or specific user
+    - Per-connection writer tasks: publishing only serializes the message
+      once and appends it to bounded per-socket queues, so slow or dead
+      clients never hold up the caller or other sockets
+    - Coalescing of superseded events (COALESCED_EVENTS) in the queues
+    - Per-connection event subscriptions
     - Automatic connection cleanup
     - Heartbeat support
+
+    A connection whose queue is full of messages that cannot be coalesced
+    or dropped is closed; the client reconnects and refetches state.
     """
 
-    def __init__(self):
-        # Map of user_id -> list of active WebSocket connections
-        self._connections: dict[str, list[WebSocket]] = {}
-        # Lock for thread-safe connection management
-        self._lock = asyncio.Lock()
+    MAX_QUEUE_SIZE = 256
+    SEND_TIMEOUT_SECONDS = 10.0
+
+    def __init__(self, max_queue: int = MAX_QUEUE_SIZE, send_timeout: float = SEND_TIMEOUT_SECONDS):
+        # Map of user_id -> active connections
+        self._connections: dict[str, list[_Connection]] = {}
+        self._by_socket: dict[int, _Connection] = {}
+        self._max_queue = max_queue
+        self._send_timeout = send_timeout
         # Heartbeat interval in seconds
         self.heartbeat_interval = 30
+        self._stats = {"queued": 0, "sent": 0, "coalesced": 0, "dropped": 0, "closed_slow": 0}
 
     async def connect(self, websocket: WebSocket, user_id: str) -> None:
         """
-        Accept and register a new WebSocket connection.
+        Accept (if not yet accepted) and register a new WebSocket connection.
 
         Args:
             websocket: The WebSocket connection to register
             user_id: The authenticated user's ID
         """
-        await websocket.accept()
+        if websocket.client_state == WebSocketState.CONNECTING:
+            await websocket.accept()
 
-        async with self._lock:
-            if user_id not in self._connections:
-                self._connections[user_id] = []
-            self._connections[user_id].append(websocket)
+        conn = _Connection(websocket, user_id, self._max_queue)
+        conn.task = asyncio.create_task(self._writer(conn), name=f"ws-writer-{user_id}")
+        self._connections.setdefault(user_id, []).append(conn)
+        self._by_socket[id(websocket)] = conn
 
         logger.info(f"WebSocket connected for user {user_id}")
 
         # Send connection confirmation
-        await self.send_to_user(
-            user_id,
+        self._enqueue(
+            conn,
             WebSocketMessage(
                 event_type=WebSocketEventType.CONNECTION_ESTABLISHED,
                 data={"message": "Connected to trading bot"},
@@ -126,82 +195,165 @@ class ConnectionManager:
 
     async def disconnect(self, websocket: WebSocket, user_id: str) -> None:
         """
-        Remove a WebSocket connection.
+        Remove a WebSocket connection and stop its writer.
 
         Args:
             websocket: The WebSocket connection to remove
             user_id: The user's ID
         """
-        async with self._lock:
-            if user_id in self._connections:
-                if websocket in self._connections[user_id]:
-                    self._connections[user_id].remove(websocket)
-                if not self._connections[user_id]:
-                    del self._connections[user_id]
+        conn = self._by_socket.get(id(websocket))
+        if conn is None:
+            return
+        self._unregister(conn)
+        if conn.task and conn.task is not asyncio.current_task():
+            conn.task.cancel()
+            await asyncio.gather(conn.task, return_exceptions=True)
 
         logger.info(f"WebSocket disconnected for user {user_id}")
 
+    def _unregister(self, conn: _Connection) -> None:
+        conn.closed = True
+        self._by_socket.pop(id(conn.websocket), None)
+        connections = self._connections.get(conn.user_id)
+        if connections and conn in connections:
+            connections.remove(conn)
+            if not connections:
+                del self._connections[conn.user_id]
+
+    def set_subscriptions(self, websocket: WebSocket, events: list[str] | None) -> list[str]:
+        """
+        Limit a connection to the given event types (None or empty = all).
+
+        Returns:
+            The accepted event names
+
+        Raises:
+            ValueError: If an event name is not a WebSocketEventType value
+        """
+        valid = {event.value for event in WebSocketEventType}
+        unknown = [event for event in events or [] if event not in valid]
+        if unknown:
+            raise ValueError(f"Unknown events: {', '.join(unknown)}")
+        conn = self._by_socket.get(id(websocket))
+        if conn is not None:
+            conn.subscriptions = frozenset(events) if events else None
+        return list(events or [])
+
+    def _enqueue(self, conn: _Connection, message: WebSocketMessage, text: str | None = None) -> bool:
+        """
+        Queue a message on one connection without waiting on the socket.
+
+        Returns:
+            False if the connection does not want the event or was closed
+        """
+        if conn.closed or not conn.wants(message.event_type):
+            return False
+        text = text if text is not None else message.to_json()
+        key = _coalesce_key(message)
+        if key is not None and key in conn.pending:
+            conn.pending[key][1] = text
+            self._stats["coalesced"] += 1
+            return True
+
+        if len(conn.queue) >= conn.max_queue and not self._make_room(conn):
+            logger.warning(f"WebSocket send queue full for user {conn.user_id}; closing slow connection")
+            self._stats["closed_slow"] += 1
+            self._unregister(conn)
+            conn.queue.clear()
+            conn.pending.clear()
+            conn.wakeup.set()  # writer closes the socket
+            return False
+
+        slot = [key, text]
+        conn.queue.append(slot)
+        if key is not None:
+            conn.pending[key] = slot
+        self._stats["queued"] += 1
+        conn.wakeup.set()
+        return True
+
+    def _make_room(self, conn: _Connection) -> bool:
+        """Drop the oldest droppable (coalescable) message, if any."""
+        for slot in conn.queue:
+            if slot[0] is not None:
+                conn.queue.remove(slot)
+                conn.pending.pop(slot[0], None)
+                self._stats["dropped"] += 1
+                return True
+        return False
+
+    async def _writer(self, conn: _Connection) -> None:
+        """Drain one connection's queue; a failed or stalled send closes it."""
+        websocket = conn.websocket
+        try:
+            while True:
+                while not conn.queue:
+                    if conn.closed:
+                        raise ConnectionError("connection closed")
+                    conn.wakeup.clear()
+                    await conn.wakeup.wait()
+                slot = conn.queue.popleft()
+                if slot[0] is not None:
+                    conn.pending.pop(slot[0], None)
+                if websocket.client_state != WebSocketState.CONNECTED:
+                    raise ConnectionError("socket not connected")
+                await asyncio.wait_for(websocket.send_text(slot[1]), self._send_timeout)
+                self._stats["sent"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if not conn.closed:
+                logger.warning(f"Failed to send WebSocket message: {e}")
+            self._unregister(conn)
+            try:
+                await websocket.close(code=1013)
+            except Exception:
+                pass
+
+    async def send_to_connection(self, websocket: WebSocket, message: WebSocketMessage) -> bool:
+        """Queue a message for one specific connection (e.g. a reply)."""
+        conn = self._by_socket.get(id(websocket))
+        return conn is not None and self._enqueue(conn, message)
+
     async def send_to_user(
         self,
         user_id: str,
         message: WebSocketMessage,
     ) -> int:
         """
-        Send a message to all connections for a specific user.
+        Queue a message on all connections for a specific user.
+
+        Never waits on a socket; delivery happens in the writer tasks.
 
         Args:
             user_id: The target user's ID
             message: The message to send
 
         Returns:
-            Number of connections message was sent to
+            Number of connections the message was queued for
         """
-        sent_count = 0
-        disconnected = []
-
-        async with self._lock:
-            connections = self._connections.get(user_id, []).copy()
-
-        for websocket in connections:
-            try:
-                if websocket.client_state == WebSocketState.CONNECTED:
-                    await websocket.send_text(message.to_json())
-                    sent_count += 1
-                else:
-                    disconnected.append(websocket)
-            except Exception as e:
-                logger.warning(f"Failed to send WebSocket message: {e}")
-                disconnected.append(websocket)
-
-        # Clean up disconnected sockets
-        if disconnected:
-            async with self._lock:
-                for ws in disconnected:
-                    if user_id in self._connections and ws in self._connections[user_id]:
-                        self._connections[user_id].remove(ws)
-
-        return sent_count
+        connections = self._connections.get(user_id)
+        if not connections:
+            return 0
+        text = message.to_json()
+        return sum(self._enqueue(conn, message, text) for conn in list(connections))
 
     async def broadcast(self, message: WebSocketMessage) -> int:
         """
-        Broadcast a message to all connected users.
+        Queue a message on every connection of every user.
 
         Args:
             message: The message to broadcast
 
         Returns:
-            Total number of connections message was sent to
+            Total number of connections the message was queued for
         """
-        total_sent = 0
-
-        async with self._lock:
-            user_ids = list(self._connections.keys())
-
-        for user_id in user_ids:
-            sent = await self.send_to_user(user_id, message)
-            total_sent += sent
-
-        return total_sent
+        text = message.to_json()
+        return sum(
+            self._enqueue(conn, message, text)
+            for connections in list(self._connections.values())
+            for conn in list(connections)
+        )
 
     async def send_heartbeat(self) -> None:
         """Send heartbeat to all connections."""
@@ -230,6 +382,14 @@ class ConnectionManager:
         """Get list of user IDs with active connections."""
         return list(self._connections.keys())
 
+    def get_stats(self) -> dict[str, int]:
+        """Queue and delivery counters."""
+        return {
+            **self._stats,
+            "connections": self.get_connection_count(),
+            "backlog": sum(len(c.queue) for conns in self._connections.values() for c in conns),
+        }
+
 
 # Global connection manager instance
 connection_manager = ConnectionManager()
@@ -0,0 +1,223 @@
+"""
+Write-behind pipeline for activity log entries.
+
+ActivityLogCRUD.info/warning/error enqueue entries here instead of doing an
+INSERT + COMMIT + SELECT on the caller's session. A single writer task
+flushes the queue in multi-row INSERT batches whenever it reaches
+batch_size or every flush_interval seconds, whichever comes first.
+
+The queue is bounded. When it is full, callers wait up to put_timeout for
+the writer to make room and the entry is dropped after that; drops are
+counted per user and written back as a single WARNING entry on the next
+flush so gaps are visible in the activity feed.
+"""
+
+import asyncio
+import logging
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from sqlalchemy import insert
+
+from src.db.database import async_session_factory
+from src.models.activity_log import ActivityLog
+
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityLogWriter:
+    """
+    Batched background writer for ActivityLog rows.
+
+    Entries carry their own created_at (the enqueue time), so ordering in the
+    activity feed is unaffected by batching.
+    """
+
+    DEFAULT_BATCH_SIZE = 200
+    DEFAULT_FLUSH_INTERVAL = 1.0
+    DEFAULT_MAX_QUEUE_SIZE = 10000
+    DEFAULT_PUT_TIMEOUT = 0.05
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any] = async_session_factory,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        put_timeout: float = DEFAULT_PUT_TIMEOUT,
+    ):
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_queue_size = max_queue_size
+        self._put_timeout = put_timeout
+        self._queue: deque[dict[str, Any]] = deque()
+        self._dropped_by_user: dict[uuid.UUID, int] = {}
+        self._wakeup: asyncio.Event | None = None
+        self._space: asyncio.Event | None = None
+        self._flush_lock: asyncio.Lock | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "failed": 0,
+            "batches": 0,
+            "max_queue_depth": 0,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the writer task on the running event loop."""
+        if self.is_running:
+            return
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="activity_log_writer")
+        logger.info("Activity log writer started")
+
+    async def stop(self) -> None:
+        """Stop the writer task and flush everything still queued."""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            # Let the writer finish its current batch instead of cancelling mid-INSERT
+            self._stopping = True
+            self._wakeup.set()
+            await task
+        await self.flush()
+        if self._space is not None:
+            # Release anyone still waiting for room
+            self._space.set()
+        logger.info(
+            f"Activity log writer stopped (written={self._stats['written']}, "
+            f"dropped={self._stats['dropped']}, failed={self._stats['failed']})"
+        )
+
+    async def put(
+        self,
+        user_id: uuid.UUID,
+        level: str,
+        category: str,
+        message: str,
+        details: dict[str, Any] | None = None,
+    ) -> bool:
+        """
+        Queue an entry for the next batch.
+
+        Returns:
+            False if the queue stayed full for put_timeout and the entry was dropped
+        """
+        if len(self._queue) >= self._max_queue_size and self._space is not None:
+            # Backpressure: give the writer a moment to drain before dropping
+            self._space.clear()
+            self._wakeup.set()
+            try:
+                await asyncio.wait_for(self._space.wait(), timeout=self._put_timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        if len(self._queue) >= self._max_queue_size:
+            self._stats["dropped"] += 1
+            self._dropped_by_user[user_id] = self._dropped_by_user.get(user_id, 0) + 1
+            if self._stats["dropped"] == 1 or self._stats["dropped"] % 1000 == 0:
+                logger.warning(f"Activity log queue full; {self._stats['dropped']} entries dropped so far")
+            return False
+
+        self._queue.append({
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "level": level,
+            "category": category,
+            "message": message,
+            "details": details,
+            "created_at": datetime.now(timezone.utc),
+        })
+        self._stats["enqueued"] += 1
+        depth = len(self._queue)
+        if depth > self._stats["max_queue_depth"]:
+            self._stats["max_queue_depth"] = depth
+        if depth >= self._batch_size and self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    async def flush(self) -> int:
+        """
+        Write every queued entry now.
+
+        Returns:
+            Number of rows written
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        written = 0
+        async with self._flush_lock:
+            self._queue_drop_summaries()
+            while self._queue:
+                batch = [self._queue.popleft() for _ in range(min(self._batch_size, len(self._queue)))]
+                if self._space is not None:
+                    self._space.set()
+                written += await self._write(batch)
+        return written
+
+    def get_stats(self) -> dict[str, Any]:
+        """Queue depth and lifetime counters."""
+        return {
+            **self._stats,
+            "queue_depth": len(self._queue),
+            "running": self.is_running,
+        }
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Activity log flush failed: {e}")
+
+    def _queue_drop_summaries(self) -> None:
+        """Turn per-user drop counts into WARNING entries at the front of the queue."""
+        if not self._dropped_by_user:
+            return
+        now = datetime.now(timezone.utc)
+        for user_id, count in self._dropped_by_user.items():
+            self._queue.appendleft({
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "level": "WARNING",
+                "category": "SYSTEM",
+                "message": f"{count} activity log entries dropped (log queue full)",
+                "details": {"dropped": count},
+                "created_at": now,
+            })
+        self._dropped_by_user.clear()
+
+    async def _write(self, batch: list[dict[str, Any]]) -> int:
+        try:
+            async with self._session_factory() as session:
+                await session.execute(insert(ActivityLog), batch)
+                await session.commit()
+        except Exception as e:
+            self._stats["failed"] += len(batch)
+            logger.error(f"Failed to write {len(batch)} activity log entries: {e}")
+            return 0
+        self._stats["written"] += len(batch)
+        self._stats["batches"] += 1
+        return len(batch)
+
+
+# Global writer instance (started in the application lifespan)
+activity_log_writer = ActivityLogWriter()
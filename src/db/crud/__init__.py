@@ -11,6 +11,7 @@ from src.db.crud.position import PositionCRUD
 from src.db.crud.global_settings import GlobalSettingsCRUD
 from src.db.crud.activity_log import ActivityLogCRUD
 from src.db.crud.market_config import MarketConfigCRUD
+from src.db.crud.analytics_rollup import AnalyticsRollupCRUD
 
 __all__ = [
     "UserCRUD",
@@ -22,4 +23,5 @@ __all__ = [
     "GlobalSettingsCRUD",
     "ActivityLogCRUD",
     "MarketConfigCRUD",
+    "AnalyticsRollupCRUD",
 ]
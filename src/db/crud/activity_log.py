@@ -5,9 +5,12 @@ CRUD operations for ActivityLog model.
 import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any
-from sqlalchemy import select, delete, func
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.db.activity_log_writer import activity_log_writer
+from src.db.pagination import approximate_count, keyset_paginate
+from src.db.partitioning import ACTIVITY_LOGS, enforce_retention
 from src.models.activity_log import ActivityLog
 
 
@@ -52,6 +55,27 @@ class ActivityLogCRUD:
         await db.refresh(log)
         return log
     
+    @staticmethod
+    async def log(
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        level: str,
+        category: str,
+        message: str,
+        details: dict[str, Any] | None = None
+    ) -> None:
+        """
+        Records an activity log entry without a database round trip.
+        
+        While the background ActivityLogWriter is running the entry is
+        queued and written in the next batch; `db` is not touched. Otherwise
+        (tests, one-off scripts) it falls back to an immediate create().
+        """
+        if activity_log_writer.is_running:
+            await activity_log_writer.put(user_id, level, category, message, details)
+            return
+        await ActivityLogCRUD.create(db, user_id, level, category, message, details)
+    
     @staticmethod
     async def info(
         db: AsyncSession,
@@ -59,11 +83,11 @@ class ActivityLogCRUD:
         category: str,
         message: str,
         details: dict[str, Any] | None = None
-    ) -> ActivityLog:
+    ) -> None:
         """
-        Creates an INFO level log entry.
+        Records an INFO level log entry.
         """
-        return await ActivityLogCRUD.create(db, user_id, "INFO", category, message, details)
+        await ActivityLogCRUD.log(db, user_id, "INFO", category, message, details)
     
     @staticmethod
     async def warning(
@@ -72,11 +96,11 @@ class ActivityLogCRUD:
         category: str,
         message: str,
         details: dict[str, Any] | None = None
-    ) -> ActivityLog:
+    ) -> None:
         """
-        Creates a WARNING level log entry.
+        Records a WARNING level log entry.
         """
-        return await ActivityLogCRUD.create(db, user_id, "WARNING", category, message, details)
+        await ActivityLogCRUD.log(db, user_id, "WARNING", category, message, details)
     
     @staticmethod
     async def error(
@@ -85,11 +109,11 @@ class ActivityLogCRUD:
         category: str,
         message: str,
         details: dict[str, Any] | None = None
-    ) -> ActivityLog:
+    ) -> None:
         """
-        Creates an ERROR level log entry.
+        Records an ERROR level log entry.
         """
-        return await ActivityLogCRUD.create(db, user_id, "ERROR", category, message, details)
+        await ActivityLogCRUD.log(db, user_id, "ERROR", category, message, details)
     
     @staticmethod
     async def count_logs(
@@ -135,6 +159,54 @@ class ActivityLogCRUD:
         result = await db.execute(query)
         return list(result.scalars().all())
     
+    @staticmethod
+    async def get_page(
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        limit: int = 50,
+        cursor: str | None = None,
+        level: str | None = None,
+        category: str | None = None
+    ) -> tuple[list[ActivityLog], str | None]:
+        """
+        Retrieves one newest-first keyset page of activity logs.
+        Returns the logs and the cursor for the next page (None on the last page).
+        """
+        logs, next_cursor = await keyset_paginate(
+            db,
+            ActivityLogCRUD._filtered(user_id, level, category),
+            ActivityLog.created_at,
+            ActivityLog.id,
+            limit,
+            cursor
+        )
+        return list(logs), next_cursor
+    
+    @staticmethod
+    async def estimate_count(
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        level: str | None = None,
+        category: str | None = None
+    ) -> int:
+        """
+        Approximate count of logs matching the filters (cached; see db.pagination).
+        """
+        return await approximate_count(
+            db,
+            ActivityLogCRUD._filtered(user_id, level, category),
+            f"activity_logs:{user_id}:{level}:{category}"
+        )
+    
+    @staticmethod
+    def _filtered(user_id: uuid.UUID, level: str | None, category: str | None):
+        query = select(ActivityLog).where(ActivityLog.user_id == user_id)
+        if level:
+            query = query.where(ActivityLog.level == level)
+        if category:
+            query = query.where(ActivityLog.category == category)
+        return query
+    
     @staticmethod
     async def get_recent(
         db: AsyncSession,
@@ -204,20 +276,18 @@ class ActivityLogCRUD:
         """
         Deletes activity logs older than specified days.
         
+        On a partitioned table whole expired daily partitions are dropped
+        (see src/db/partitioning.py); otherwise rows are deleted.
+        
         Args:
             db: Database session
             days: Number of days to retain logs
         
         Returns:
-            Number of deleted records
+            Number of deleted records (estimated for dropped partitions)
         """
         cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-        
-        result = await db.execute(
-            delete(ActivityLog).where(ActivityLog.created_at < cutoff)
-        )
-        await db.commit()
-        return result.rowcount
+        return await enforce_retention(db, ACTIVITY_LOGS, cutoff)
 
 
 # Singleton instance for simplified imports
@@ -0,0 +1,398 @@
+"""
+CRUD operations for the analytics rollup tables.
+
+PositionCRUD.close_position calls record_closed_position in a savepoint of
+the transaction that closes the position, so the rollups commit together
+with it, and a failed rollup does not stop the close. Positions closed any
+other way (bulk reconciler updates, history from before the rollups
+existed) or whose rollup failed are picked up by rebuild_for_user, which
+scripts/backfill_analytics.py runs for every user.
+"""
+
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import AsyncIterator
+from sqlalchemy import select, delete, func, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.analytics_rollup import (
+    ALL_SPORTS,
+    UNKNOWN_SPORT,
+    DailyPnLRollup,
+    EquityPoint,
+    TradeStatsRollup,
+)
+from src.models.position import Position
+
+
+_COUNTER_DEFAULTS = {
+    "trades": 0,
+    "wins": 0,
+    "losses": 0,
+    "gross_profit": Decimal("0"),
+    "gross_loss": Decimal("0"),
+}
+_STATS_DEFAULTS = {
+    **_COUNTER_DEFAULTS,
+    "largest_win": Decimal("0"),
+    "largest_loss": Decimal("0"),
+    "sum_pnl_squared": Decimal("0"),
+    "total_hold_seconds": 0,
+    "timed_trades": 0,
+    "current_streak": 0,
+    "max_win_streak": 0,
+    "max_lose_streak": 0,
+    "cumulative_pnl": Decimal("0"),
+    "peak_pnl": Decimal("0"),
+    "max_drawdown_pct": Decimal("0"),
+}
+
+
+def _aware(dt: datetime | None) -> datetime | None:
+    if dt is not None and dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def _hold_seconds(opened_at: datetime | None, closed_at: datetime | None) -> int | None:
+    if opened_at is None or closed_at is None:
+        return None
+    return max(0, int((_aware(closed_at) - _aware(opened_at)).total_seconds()))
+
+
+def _sport_key(sport: str | None) -> str:
+    return (sport or UNKNOWN_SPORT).lower()
+
+
+class AnalyticsRollupCRUD:
+    """
+    Database operations for DailyPnLRollup, TradeStatsRollup and EquityPoint.
+    """
+
+    @staticmethod
+    def new_trade_stats(user_id: uuid.UUID | None = None, sport: str = ALL_SPORTS) -> TradeStatsRollup:
+        """
+        Returns a zeroed TradeStatsRollup (not added to any session).
+        """
+        return TradeStatsRollup(user_id=user_id, sport=sport, **_STATS_DEFAULTS)
+
+    @staticmethod
+    def apply_trade(
+        stats: TradeStatsRollup,
+        pnl: Decimal,
+        hold_seconds: int | None = None,
+        closed_at: datetime | None = None,
+    ) -> None:
+        """
+        Folds one closed trade into a TradeStatsRollup, in close order.
+        """
+        pnl = Decimal(pnl)
+        stats.trades += 1
+        if pnl > 0:
+            stats.wins += 1
+            stats.gross_profit += pnl
+            stats.largest_win = max(stats.largest_win, pnl)
+            stats.current_streak = stats.current_streak + 1 if stats.current_streak > 0 else 1
+            stats.max_win_streak = max(stats.max_win_streak, stats.current_streak)
+        else:
+            stats.losses += 1
+            stats.gross_loss += -pnl
+            stats.largest_loss = max(stats.largest_loss, -pnl)
+            stats.current_streak = stats.current_streak - 1 if stats.current_streak < 0 else -1
+            stats.max_lose_streak = max(stats.max_lose_streak, -stats.current_streak)
+
+        stats.sum_pnl_squared += pnl * pnl
+        if hold_seconds is not None:
+            stats.total_hold_seconds += hold_seconds
+            stats.timed_trades += 1
+
+        # Drawdown is measured from the P&L peak, starting from zero equity
+        stats.cumulative_pnl += pnl
+        stats.peak_pnl = max(stats.peak_pnl, stats.cumulative_pnl)
+        if stats.peak_pnl > 0:
+            drawdown = (stats.peak_pnl - stats.cumulative_pnl) / stats.peak_pnl * 100
+            stats.max_drawdown_pct = max(stats.max_drawdown_pct, drawdown)
+
+        if closed_at is not None:
+            stats.last_closed_at = closed_at
+
+    @staticmethod
+    def _apply_daily(rollup: DailyPnLRollup, pnl: Decimal) -> None:
+        rollup.trades += 1
+        rollup.realized_pnl += pnl
+        if pnl > 0:
+            rollup.wins += 1
+            rollup.gross_profit += pnl
+        else:
+            rollup.losses += 1
+            rollup.gross_loss += -pnl
+
+    @staticmethod
+    async def record_closed_position(db: AsyncSession, position: Position) -> bool:
+        """
+        Adds a just-closed position to the user's rollups without committing.
+
+        Returns:
+            False if the position was already recorded
+        """
+        already = await db.execute(
+            select(EquityPoint.id).where(EquityPoint.position_id == position.id)
+        )
+        if already.scalar_one_or_none() is not None:
+            return False
+
+        pnl = position.realized_pnl_usdc or Decimal("0")
+        closed_at = _aware(position.closed_at) or datetime.now(timezone.utc)
+        sport = _sport_key(position.sport)
+        hold_seconds = _hold_seconds(position.opened_at, closed_at)
+
+        # Create missing rows first: two first closes for a user racing on
+        # SELECT-then-add would both insert and one would violate the unique
+        # constraint. Existing rows are left alone.
+        upsert = pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+        await db.execute(
+            upsert(TradeStatsRollup)
+            .values([
+                {"id": uuid.uuid4(), "user_id": position.user_id, "sport": key, **_STATS_DEFAULTS}
+                for key in (ALL_SPORTS, sport)
+            ])
+            .on_conflict_do_nothing(index_elements=["user_id", "sport"])
+        )
+        await db.execute(
+            upsert(DailyPnLRollup)
+            .values(
+                id=uuid.uuid4(), user_id=position.user_id, day=closed_at.date(), sport=sport,
+                realized_pnl=Decimal("0"), **_COUNTER_DEFAULTS
+            )
+            .on_conflict_do_nothing(index_elements=["user_id", "day", "sport"])
+        )
+
+        # Lock the user's counters so concurrent closes apply in sequence;
+        # populate_existing so values loaded before the lock are not reused
+        result = await db.execute(
+            select(TradeStatsRollup)
+            .where(
+                TradeStatsRollup.user_id == position.user_id,
+                TradeStatsRollup.sport.in_((ALL_SPORTS, sport)),
+            )
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        stats_by_sport = {s.sport: s for s in result.scalars().all()}
+        for key in (ALL_SPORTS, sport):
+            AnalyticsRollupCRUD.apply_trade(stats_by_sport[key], pnl, hold_seconds, closed_at)
+
+        result = await db.execute(
+            select(DailyPnLRollup)
+            .where(
+                DailyPnLRollup.user_id == position.user_id,
+                DailyPnLRollup.day == closed_at.date(),
+                DailyPnLRollup.sport == sport,
+            )
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        AnalyticsRollupCRUD._apply_daily(result.scalar_one(), pnl)
+
+        db.add(EquityPoint(
+            user_id=position.user_id,
+            position_id=position.id,
+            sport=sport,
+            closed_at=closed_at,
+            trade_number=stats_by_sport[ALL_SPORTS].trades,
+            pnl=pnl,
+            hold_seconds=hold_seconds,
+            cumulative_pnl=stats_by_sport[ALL_SPORTS].cumulative_pnl,
+        ))
+        return True
+
+    @staticmethod
+    async def rebuild_for_user(db: AsyncSession, user_id: uuid.UUID, batch_size: int = 1000) -> int:
+        """
+        Recomputes a user's rollups from their closed positions and commits.
+
+        Closed positions are streamed in close order and only the columns the
+        rollups need are loaded.
+
+        Returns:
+            Number of closed positions rolled up
+        """
+        for model in (EquityPoint, DailyPnLRollup, TradeStatsRollup):
+            await db.execute(delete(model).where(model.user_id == user_id))
+
+        stats: dict[str, TradeStatsRollup] = {}
+        daily: dict[tuple[date, str], DailyPnLRollup] = {}
+        points: list[dict] = []
+        count = 0
+
+        result = await db.stream(
+            select(
+                Position.id,
+                Position.sport,
+                Position.opened_at,
+                Position.closed_at,
+                Position.realized_pnl_usdc,
+            )
+            .where(Position.user_id == user_id, Position.status == "closed")
+            .order_by(Position.closed_at.asc(), Position.id.asc())
+            .execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions(batch_size):
+            for row in partition:
+                pnl = row.realized_pnl_usdc or Decimal("0")
+                closed_at = _aware(row.closed_at)
+                if closed_at is None:
+                    continue
+                sport = _sport_key(row.sport)
+                hold_seconds = _hold_seconds(row.opened_at, closed_at)
+
+                for key in (ALL_SPORTS, sport):
+                    if key not in stats:
+                        stats[key] = AnalyticsRollupCRUD.new_trade_stats(user_id, key)
+                    AnalyticsRollupCRUD.apply_trade(stats[key], pnl, hold_seconds, closed_at)
+
+                day_key = (closed_at.date(), sport)
+                if day_key not in daily:
+                    daily[day_key] = DailyPnLRollup(
+                        user_id=user_id, day=day_key[0], sport=sport,
+                        realized_pnl=Decimal("0"), **_COUNTER_DEFAULTS
+                    )
+                AnalyticsRollupCRUD._apply_daily(daily[day_key], pnl)
+
+                points.append({
+                    "id": uuid.uuid4(),
+                    "user_id": user_id,
+                    "position_id": row.id,
+                    "sport": sport,
+                    "closed_at": closed_at,
+                    "trade_number": stats[ALL_SPORTS].trades,
+                    "pnl": pnl,
+                    "hold_seconds": hold_seconds,
+                    "cumulative_pnl": stats[ALL_SPORTS].cumulative_pnl,
+                })
+                count += 1
+            if points:
+                await db.execute(insert(EquityPoint), points)
+                points = []
+
+        db.add_all(stats.values())
+        db.add_all(daily.values())
+        await db.commit()
+        return count
+
+    @staticmethod
+    async def get_trade_stats(
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        sport: str = ALL_SPORTS
+    ) -> TradeStatsRollup | None:
+        """
+        Retrieves the lifetime counters for one sport (or all sports).
+        """
+        result = await db.execute(
+            select(TradeStatsRollup).where(
+                TradeStatsRollup.user_id == user_id,
+                TradeStatsRollup.sport == (sport if sport == ALL_SPORTS else _sport_key(sport))
+            )
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def get_sport_stats(db: AsyncSession, user_id: uuid.UUID) -> list[TradeStatsRollup]:
+        """
+        Retrieves per-sport counters, excluding the all-sports row.
+        """
+        result = await db.execute(
+            select(TradeStatsRollup)
+            .where(
+                TradeStatsRollup.user_id == user_id,
+                TradeStatsRollup.sport != ALL_SPORTS
+            )
+            .order_by(TradeStatsRollup.sport)
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def get_daily_pnl(
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        start_day: date
+    ) -> list[tuple[date, Decimal]]:
+        """
+        Retrieves realized P&L per day (summed across sports) since start_day.
+        """
+        result = await db.execute(
+            select(DailyPnLRollup.day, func.sum(DailyPnLRollup.realized_pnl))
+            .where(
+                DailyPnLRollup.user_id == user_id,
+                DailyPnLRollup.day >= start_day
+            )
+            .group_by(DailyPnLRollup.day)
+            .order_by(DailyPnLRollup.day)
+        )
+        return [(day, pnl) for day, pnl in result.all()]
+
+    @staticmethod
+    def _equity_points_query(
+        user_id: uuid.UUID,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        sport: str | None = None
+    ):
+        query = select(
+            EquityPoint.position_id,
+            EquityPoint.closed_at,
+            EquityPoint.trade_number,
+            EquityPoint.pnl,
+            EquityPoint.hold_seconds,
+            EquityPoint.cumulative_pnl,
+        ).where(EquityPoint.user_id == user_id)
+
+        if start_date:
+            query = query.where(EquityPoint.closed_at >= start_date)
+        if end_date:
+            query = query.where(EquityPoint.closed_at <= end_date)
+        if sport:
+            query = query.where(EquityPoint.sport == _sport_key(sport))
+
+        return query.order_by(EquityPoint.trade_number.asc())
+
+    @staticmethod
+    async def get_equity_points(
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        sport: str | None = None
+    ) -> list:
+        """
+        Retrieves equity curve rows (columns only) in close order.
+        """
+        result = await db.execute(
+            AnalyticsRollupCRUD._equity_points_query(user_id, start_date, end_date, sport)
+        )
+        return list(result.all())
+
+    @staticmethod
+    async def stream_equity_points(
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        sport: str | None = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator:
+        """
+        Yields equity curve rows in close order, batch_size rows at a time
+        from a server-side cursor, so memory stays flat for long histories.
+        """
+        result = await db.stream(
+            AnalyticsRollupCRUD._equity_points_query(user_id, start_date, end_date, sport)
+            .execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions(batch_size):
+            for row in partition:
+                yield row
@@ -2,6 +2,7 @@
 CRUD operations for Position model.
 """
 
+import logging
 import uuid
 from datetime import datetime, timezone
 from decimal import Decimal
@@ -11,7 +12,13 @@ from sqlalchemy.orm import selectinload
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from src.models.position import Position
+from src.models.tracked_market import TrackedMarket
 from src.core.exceptions import NotFoundError
+from src.db.crud.analytics_rollup import AnalyticsRollupCRUD
+from src.db.pagination import approximate_count, keyset_paginate
+
+
+logger = logging.getLogger(__name__)
 
 
 class PositionCRUD:
@@ -138,6 +145,31 @@ class PositionCRUD:
         )
         return list(result.scalars().all())
     
+    @staticmethod
+    async def get_open_with_markets(
+        db: AsyncSession,
+        user_id: uuid.UUID
+    ) -> list[tuple[Position, TrackedMarket | None]]:
+        """
+        Retrieves all open positions for a user with their tracked markets.
+        
+        One LEFT JOIN on (user_id, condition_id); the market is None for
+        positions whose tracked market no longer exists.
+        """
+        result = await db.execute(
+            select(Position, TrackedMarket)
+            .outerjoin(
+                TrackedMarket,
+                (TrackedMarket.user_id == Position.user_id)
+                & (TrackedMarket.condition_id == Position.condition_id),
+            )
+            .where(
+                Position.user_id == user_id,
+                Position.status == "open"
+            )
+        )
+        return [(position, market) for position, market in result.all()]
+    
     @staticmethod
     async def get_open_for_market(
         db: AsyncSession,
@@ -177,6 +209,46 @@ class PositionCRUD:
         result = await db.execute(query)
         return list(result.scalars().all())
     
+    @staticmethod
+    async def get_page_for_user(
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        status: str | None = None,
+        limit: int = 50,
+        cursor: str | None = None
+    ) -> tuple[list[Position], str | None]:
+        """
+        Retrieves one keyset page of positions, most recently opened first.
+        Returns the positions and the cursor for the next page (None on the last page).
+        """
+        positions, next_cursor = await keyset_paginate(
+            db,
+            PositionCRUD._filtered(user_id, status).options(selectinload(Position.trades)),
+            Position.opened_at,
+            Position.id,
+            limit,
+            cursor
+        )
+        return list(positions), next_cursor
+    
+    @staticmethod
+    async def estimate_count(db: AsyncSession, user_id: uuid.UUID, status: str | None = None) -> int:
+        """
+        Approximate count of positions with the given status (cached; see db.pagination).
+        """
+        return await approximate_count(
+            db,
+            PositionCRUD._filtered(user_id, status),
+            f"positions:{user_id}:{status}"
+        )
+    
+    @staticmethod
+    def _filtered(user_id: uuid.UUID, status: str | None):
+        query = select(Position).where(Position.user_id == user_id)
+        if status:
+            query = query.where(Position.status == status)
+        return query
+    
     @staticmethod
     async def close_position(
         db: AsyncSession,
@@ -189,6 +261,9 @@ class PositionCRUD:
     ) -> Position:
         """
         Closes a position and calculates realized P&L.
+        The analytics rollups are updated in the same transaction, inside a
+        savepoint: if that fails the position still closes, and the rollups
+        catch up on the next backfill (scripts/backfill_analytics.py).
         """
         position = await PositionCRUD.get_by_id(db, position_id)
         if not position:
@@ -203,6 +278,11 @@ class PositionCRUD:
         position.status = "closed"
         position.closed_at = datetime.now(timezone.utc)
         
+        try:
+            async with db.begin_nested():
+                await AnalyticsRollupCRUD.record_closed_position(db, position)
+        except Exception as e:
+            logger.error(f"Analytics rollup failed for position {position.id}: {e}")
         await db.commit()
         await db.refresh(position)
         return position
@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.refresh_token import RefreshToken
 from src.core.security import hash_refresh_token, generate_refresh_token
+from src.core.principal_cache import principal_cache
 from src.config import get_settings
 
 settings = get_settings()
@@ -146,8 +147,10 @@ class RefreshTokenCRUD:
         if not token:
             return False
 
+        user_id = token.user_id
         token.revoke(reason)
         await db.commit()
+        principal_cache.invalidate(user_id)
 
         return True
 
@@ -173,8 +176,10 @@ class RefreshTokenCRUD:
         if not token:
             return False
 
+        user_id = token.user_id
         token.revoke(reason)
         await db.commit()
+        principal_cache.invalidate(user_id)
 
         return True
 
@@ -210,6 +215,7 @@ class RefreshTokenCRUD:
             )
         )
         await db.commit()
+        principal_cache.invalidate(user_id)
 
         return result.rowcount
 
@@ -6,7 +6,10 @@ Includes game selection functionality.
 import uuid
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal
-from sqlalchemy import select, and_, update, delete
+from typing import Any
+from sqlalchemy import select, and_, update, delete, bindparam, cast, column, func, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -14,6 +17,13 @@ from src.models.tracked_market import TrackedMarket
 from src.core.exceptions import NotFoundError
 
 
+# Columns an upsert never overwrites on an existing row: identity, and the
+# user's own game selection
+_UPSERT_PRESERVED = {"id", "user_id", "condition_id", "is_user_selected", "auto_discovered", "created_at"}
+# Pre-game baselines are captured once; later discoveries only fill them in
+_UPSERT_FILL_ONLY = {"baseline_price_yes", "baseline_price_no", "baseline_captured_at"}
+
+
 class TrackedMarketCRUD:
     """
     Database operations for TrackedMarket model.
@@ -45,6 +55,124 @@ class TrackedMarketCRUD:
         await db.refresh(market)
         return market
     
+    @staticmethod
+    async def bulk_upsert(db: AsyncSession, rows: list[dict[str, Any]]) -> int:
+        """
+        Inserts or updates many tracked markets, keyed on (user_id, condition_id).
+        
+        Rows with the same set of keys share one
+        INSERT ... ON CONFLICT (user_id, condition_id) DO UPDATE statement
+        (PostgreSQL and SQLite). Existing rows keep their id, selection
+        flags and any baseline already captured. Does not commit.
+        
+        Args:
+            db: Database session
+            rows: Column dicts; each needs user_id, condition_id, token_id_yes,
+                token_id_no and sport. Keys must be unique per batch.
+        
+        Returns:
+            Number of rows inserted or updated
+        """
+        if not rows:
+            return 0
+        
+        insert = pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+        table = TrackedMarket.__table__
+        groups: dict[frozenset, list[dict[str, Any]]] = {}
+        for row in rows:
+            row = {"id": uuid.uuid4(), **row}
+            groups.setdefault(frozenset(row), []).append(row)
+        
+        affected = 0
+        for keys, group in groups.items():
+            stmt = insert(TrackedMarket).values(group)
+            set_ = {
+                key: (
+                    func.coalesce(table.c[key], stmt.excluded[key])
+                    if key in _UPSERT_FILL_ONLY
+                    else stmt.excluded[key]
+                )
+                for key in keys - _UPSERT_PRESERVED
+            }
+            set_["last_updated_at"] = func.now()
+            stmt = stmt.on_conflict_do_update(index_elements=["user_id", "condition_id"], set_=set_)
+            result = await db.execute(stmt)
+            affected += result.rowcount or 0
+        return affected
+    
+    @staticmethod
+    async def bulk_update_state(
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        changes: dict[str, dict[str, Any]],
+    ) -> int:
+        """
+        Applies changed price/game-state columns for many markets.
+        
+        Markets that changed the same set of columns share one statement:
+        UPDATE ... FROM (VALUES ...) on PostgreSQL, and a single executemany
+        UPDATE elsewhere. Does not commit.
+        
+        Args:
+            db: Database session
+            user_id: Owner of the markets
+            changes: condition_id -> {column: new value}
+        
+        Returns:
+            Number of rows updated
+        """
+        table = TrackedMarket.__table__
+        groups: dict[tuple, list[tuple[str, dict[str, Any]]]] = {}
+        for condition_id, fields in changes.items():
+            if fields:
+                groups.setdefault(tuple(sorted(fields)), []).append((condition_id, fields))
+        
+        updated = 0
+        for columns, group in groups.items():
+            if db.bind.dialect.name == "postgresql":
+                # Inline literals: bind params in a VALUES list carry no type,
+                # so each column is cast back to its real type in SET instead
+                changed = values(
+                    column("condition_id", table.c.condition_id.type),
+                    *(column(name, table.c[name].type) for name in columns),
+                    name="changes",
+                    literal_binds=True,
+                ).data([(condition_id, *(fields[name] for name in columns)) for condition_id, fields in group])
+                stmt = (
+                    update(TrackedMarket)
+                    .where(
+                        TrackedMarket.user_id == user_id,
+                        TrackedMarket.condition_id == changed.c.condition_id,
+                    )
+                    .values({
+                        **{name: cast(changed.c[name], table.c[name].type) for name in columns},
+                        "last_updated_at": func.now(),
+                    })
+                )
+                result = await db.execute(stmt)
+            else:
+                stmt = (
+                    update(table)
+                    .where(
+                        table.c.user_id == bindparam("b_user_id"),
+                        table.c.condition_id == bindparam("b_condition_id"),
+                    )
+                    .values({
+                        **{name: bindparam(f"b_{name}") for name in columns},
+                        "last_updated_at": func.now(),
+                    })
+                )
+                result = await db.execute(stmt, [
+                    {
+                        "b_user_id": user_id,
+                        "b_condition_id": condition_id,
+                        **{f"b_{name}": fields[name] for name in columns},
+                    }
+                    for condition_id, fields in group
+                ])
+            updated += result.rowcount or 0
+        return updated
+    
     @staticmethod
     async def get_by_id(db: AsyncSession, market_id: uuid.UUID) -> TrackedMarket | None:
         """
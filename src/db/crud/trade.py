@@ -11,6 +11,7 @@ from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, desc
 
+from src.db.pagination import approximate_count, keyset_paginate
 from src.models.trade import Trade
 
 
@@ -67,6 +68,33 @@ class TradeCRUD:
         )
         return result.scalars().all()
     
+    @staticmethod
+    async def get_page_for_user(
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> tuple[list[Trade], Optional[str]]:
+        """Get one newest-first keyset page of trades and the next page's cursor."""
+        trades, next_cursor = await keyset_paginate(
+            db,
+            select(Trade).where(Trade.user_id == user_id),
+            Trade.created_at,
+            Trade.id,
+            limit,
+            cursor
+        )
+        return list(trades), next_cursor
+    
+    @staticmethod
+    async def estimate_count(db: AsyncSession, user_id: uuid.UUID) -> int:
+        """Approximate count of the user's trades (cached; see db.pagination)."""
+        return await approximate_count(
+            db,
+            select(Trade).where(Trade.user_id == user_id),
+            f"trades:{user_id}"
+        )
+    
     @staticmethod
     async def get_by_user(db: AsyncSession, user_id: uuid.UUID, limit: int = 100):
         """Get recent trades for user."""
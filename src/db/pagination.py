@@ -0,0 +1,154 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Pages are ordered newest-first on a (timestamp, id) pair and each page
+starts strictly after the last row of the previous one:
+
+    WHERE (created_at, id) < (:last_created_at, :last_id)
+    ORDER BY created_at DESC, id DESC
+    LIMIT :limit + 1
+
+With a matching (user_id, created_at, id) index every page is a single
+index range scan, so page N costs the same as page 1. The cursor handed to
+clients is an opaque url-safe token encoding the last row's sort key.
+
+Totals are optional and approximate: a cached COUNT(*) or, on PostgreSQL,
+the planner's row estimate, so they never cost a full scan per page.
+"""
+
+import base64
+import binascii
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Sequence
+
+from sqlalchemy import Select, func, literal_column, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from src.core.cache import count_cache
+from src.core.exceptions import ValidationError
+
+
+logger = logging.getLogger(__name__)
+
+
+def encode_cursor(sort_value: datetime, row_id: uuid.UUID) -> str:
+    """
+    Encodes a row's sort key as an opaque cursor.
+    """
+    payload = json.dumps({"t": sort_value.isoformat(), "id": str(row_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """
+    Decodes a cursor produced by encode_cursor.
+
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["t"]), uuid.UUID(payload["id"])
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise ValidationError("Invalid pagination cursor") from e
+
+
+async def keyset_paginate(
+    db: AsyncSession,
+    query: Select,
+    sort_column: Any,
+    id_column: Any,
+    limit: int,
+    cursor: str | None = None,
+) -> tuple[Sequence[Any], str | None]:
+    """
+    Fetches one newest-first page of an entity query.
+
+    Args:
+        query: Filtered select() of a single entity (no ORDER BY/LIMIT)
+        sort_column: Timestamp column to order by
+        id_column: Primary key column used as the tie-breaker
+        limit: Page size
+        cursor: Cursor returned with the previous page, or None for the first page
+
+    Returns:
+        (rows, next_cursor); next_cursor is None on the last page
+    """
+    if cursor:
+        last_sort, last_id = decode_cursor(cursor)
+        # A plain tuple on the right picks up the columns' types for binding
+        query = query.where(tuple_(sort_column, id_column) < (last_sort, last_id))
+
+    query = query.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1)
+    result = await db.execute(query)
+    rows = list(result.scalars().all())
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(
+        getattr(last, sort_column.key),
+        getattr(last, id_column.key),
+    )
+
+
+async def approximate_count(db: AsyncSession, query: Select, cache_key: str) -> int:
+    """
+    Returns a cheap row count for a filtered query.
+
+    Uses the cached value when present, then the PostgreSQL planner
+    estimate, then an exact COUNT(*); whichever is used is cached for
+    count_cache's TTL.
+    """
+    cached = await count_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    count = None
+    if db.bind.dialect.name == "postgresql":
+        count = await _planner_estimate(db, query)
+    if count is None:
+        result = await db.execute(select(func.count()).select_from(query.order_by(None).subquery()))
+        count = result.scalar() or 0
+
+    await count_cache.set(cache_key, count)
+    return count
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a SELECT, keeping its bound parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, query: Select):
+        # The select list doesn't change the row estimate, and the query's
+        # own column types must not be applied to the plan row
+        self.query = query.with_only_columns(literal_column("1"), maintain_column_froms=True)
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    # Filter values (user ids, sports, statuses) stay bind parameters
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.query, **kw)
+
+
+async def _planner_estimate(db: AsyncSession, query: Select) -> int | None:
+    try:
+        # Savepoint so a failed EXPLAIN doesn't abort the caller's transaction
+        async with db.begin_nested():
+            result = await db.execute(_Explain(query))
+            plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as e:
+        logger.debug(f"Planner row estimate unavailable: {e}")
+        return None
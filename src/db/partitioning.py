@@ -0,0 +1,325 @@
+"""
+Time-range partitioning for append-heavy log tables.
+
+On PostgreSQL, activity_logs and audit_events are native range-partitioned
+tables (migration 019_partition_log_tables). Partitions are created ahead
+of time by PartitionMaintainer, and retention detaches and drops whole
+expired partitions instead of running a bulk DELETE. That avoids heap churn,
+index bloat and vacuum work competing with trading writes. Queries bounded
+on the partition column are pruned to the matching partitions.
+
+Each partitioned table also has a DEFAULT partition, so a late or
+far-future timestamp never fails an INSERT. It is expected to stay
+(nearly) empty, and retention trims it with a plain DELETE.
+
+On SQLite (local dev) and on databases that have not been migrated yet,
+the tables are ordinary tables. ensure_partitions is a no-op there and
+retention falls back to a DELETE on the timestamp column.
+"""
+
+import asyncio
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from sqlalchemy import DateTime, column, delete, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PartitionSpec:
+    """
+    How one table is partitioned.
+
+    Attributes:
+        table: Parent table name
+        column: Timestamp column used as the range partition key
+        interval: "day" or "month"
+        premake: Number of future partitions kept ahead of the current one
+        retention_days: Default retention used by PartitionMaintainer
+    """
+
+    table: str
+    column: str
+    interval: str
+    premake: int
+    retention_days: int
+
+    @property
+    def default_partition(self) -> str:
+        return f"{self.table}_default"
+
+
+ACTIVITY_LOGS = PartitionSpec(
+    table="activity_logs", column="created_at", interval="day", premake=7, retention_days=30
+)
+AUDIT_EVENTS = PartitionSpec(
+    table="audit_events", column="timestamp", interval="month", premake=2, retention_days=90
+)
+
+PARTITIONED_TABLES = {spec.table: spec for spec in (ACTIVITY_LOGS, AUDIT_EVENTS)}
+
+_SUFFIX_FORMATS = {"day": "%Y%m%d", "month": "%Y%m"}
+
+
+def partition_start(spec: PartitionSpec, moment: datetime) -> datetime:
+    """
+    Returns the lower bound (UTC) of the partition containing moment.
+    """
+    moment = moment.astimezone(timezone.utc) if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+    start = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if spec.interval == "month":
+        start = start.replace(day=1)
+    return start
+
+
+def next_partition_start(spec: PartitionSpec, start: datetime) -> datetime:
+    """
+    Returns the lower bound of the partition after the one starting at start.
+    """
+    if spec.interval == "day":
+        return start + timedelta(days=1)
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def partition_ranges(spec: PartitionSpec, start: datetime, end: datetime) -> list[tuple[datetime, datetime]]:
+    """
+    Returns [lower, upper) bounds of every partition overlapping [start, end].
+    """
+    ranges = []
+    lower = partition_start(spec, start)
+    while lower <= end:
+        upper = next_partition_start(spec, lower)
+        ranges.append((lower, upper))
+        lower = upper
+    return ranges
+
+
+def partition_name(spec: PartitionSpec, lower: datetime) -> str:
+    """
+    Returns the child table name for the partition starting at lower.
+    """
+    return f"{spec.table}_p{lower.strftime(_SUFFIX_FORMATS[spec.interval])}"
+
+
+def parse_partition_name(spec: PartitionSpec, name: str) -> datetime | None:
+    """
+    Returns the lower bound encoded in a partition name, or None for
+    tables not created by partition_name (e.g. the default partition).
+    """
+    match = re.fullmatch(rf"{re.escape(spec.table)}_p(\d{{6}}|\d{{8}})", name)
+    if not match:
+        return None
+    try:
+        lower = datetime.strptime(match.group(1), _SUFFIX_FORMATS[spec.interval])
+    except ValueError:
+        return None
+    return lower.replace(tzinfo=timezone.utc)
+
+
+def create_partition_sql(spec: PartitionSpec, lower: datetime) -> str:
+    """
+    Returns the DDL creating the partition that starts at lower.
+    """
+    upper = next_partition_start(spec, lower)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(spec, lower)} "
+        f"PARTITION OF {spec.table} "
+        f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+    )
+
+
+def create_default_partition_sql(spec: PartitionSpec) -> str:
+    """
+    Returns the DDL creating the catch-all DEFAULT partition.
+    """
+    return f"CREATE TABLE IF NOT EXISTS {spec.default_partition} PARTITION OF {spec.table} DEFAULT"
+
+
+def _delete_before(table_name: str, spec: PartitionSpec, cutoff: datetime):
+    # Lightweight typed construct so cutoff binds like the mapped column would
+    timestamp = column(spec.column, DateTime(timezone=True))
+    return delete(table(table_name, timestamp)).where(timestamp < cutoff)
+
+
+def expired_partitions(spec: PartitionSpec, names: list[str], cutoff: datetime) -> list[str]:
+    """
+    Returns the partitions whose whole range lies before cutoff, oldest first.
+    """
+    expired = []
+    for name in names:
+        lower = parse_partition_name(spec, name)
+        if lower is not None and next_partition_start(spec, lower) <= cutoff:
+            expired.append((lower, name))
+    return [name for _, name in sorted(expired)]
+
+
+async def is_partitioned(db: AsyncSession, spec: PartitionSpec) -> bool:
+    """
+    Returns True if spec.table is a native partitioned table.
+    """
+    if db.bind.dialect.name != "postgresql":
+        return False
+    result = await db.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = :table AND pg_table_is_visible(c.oid)"
+        ),
+        {"table": spec.table},
+    )
+    return result.scalar() is not None
+
+
+async def list_partitions(db: AsyncSession, spec: PartitionSpec) -> list[str]:
+    """
+    Returns the names of spec.table's attached partitions.
+    """
+    result = await db.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = :table AND pg_table_is_visible(parent.oid)"
+        ),
+        {"table": spec.table},
+    )
+    return list(result.scalars().all())
+
+
+async def ensure_partitions(db: AsyncSession, spec: PartitionSpec, now: datetime | None = None) -> list[str]:
+    """
+    Creates the current partition and spec.premake future ones.
+
+    No-op (returns []) when the table is not partitioned.
+
+    Returns:
+        Names of partitions that did not exist before
+    """
+    if not await is_partitioned(db, spec):
+        return []
+
+    now = now or datetime.now(timezone.utc)
+    existing = set(await list_partitions(db, spec))
+    created = []
+    lower = partition_start(spec, now)
+    for _ in range(spec.premake + 1):
+        name = partition_name(spec, lower)
+        if name not in existing:
+            await db.execute(text(create_partition_sql(spec, lower)))
+            created.append(name)
+        lower = next_partition_start(spec, lower)
+    if spec.default_partition not in existing:
+        await db.execute(text(create_default_partition_sql(spec)))
+    await db.commit()
+
+    if created:
+        logger.info(f"Created {spec.table} partitions: {', '.join(created)}")
+    return created
+
+
+async def enforce_retention(db: AsyncSession, spec: PartitionSpec, cutoff: datetime) -> int:
+    """
+    Removes rows older than cutoff.
+
+    Partitioned tables drop every partition that ends on or before cutoff,
+    so retention is enforced at partition granularity. Rows in the partition
+    that straddles cutoff are kept until that partition expires. Other tables
+    run a DELETE.
+
+    Returns:
+        Number of rows removed. For dropped partitions this is the planner's
+        row estimate, so no expired partition has to be scanned.
+    """
+    if not await is_partitioned(db, spec):
+        result = await db.execute(_delete_before(spec.table, spec, cutoff))
+        await db.commit()
+        return result.rowcount or 0
+
+    removed = 0
+    for name in expired_partitions(spec, await list_partitions(db, spec), cutoff):
+        estimate = await db.execute(
+            text("SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE relname = :name"),
+            {"name": name},
+        )
+        await db.execute(text(f"ALTER TABLE {spec.table} DETACH PARTITION {name}"))
+        await db.execute(text(f"DROP TABLE {name}"))
+        # Commit per partition so each drop holds its lock only briefly
+        await db.commit()
+        removed += estimate.scalar() or 0
+        logger.info(f"Dropped expired partition {name}")
+
+    result = await db.execute(_delete_before(spec.default_partition, spec, cutoff))
+    await db.commit()
+    return removed + (result.rowcount or 0)
+
+
+class PartitionMaintainer:
+    """
+    Background task that keeps partitions created ahead of time and drops
+    expired ones for every table in PARTITIONED_TABLES.
+
+    Tables that are not partitioned are skipped.
+    """
+
+    DEFAULT_INTERVAL_SECONDS = 3600.0
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        specs: list[PartitionSpec] | None = None,
+        interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+    ):
+        self._session_factory = session_factory
+        self._specs = specs or list(PARTITIONED_TABLES.values())
+        self._interval = interval_seconds
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self, now: datetime | None = None) -> dict[str, dict[str, Any]]:
+        """
+        Runs one maintenance pass.
+
+        Returns:
+            Per-table summary of partitions created and rows removed
+        """
+        now = now or datetime.now(timezone.utc)
+        summary = {}
+        for spec in self._specs:
+            try:
+                async with self._session_factory() as db:
+                    if not await is_partitioned(db, spec):
+                        # Unmigrated/SQLite tables keep on-demand DELETE retention
+                        continue
+                    created = await ensure_partitions(db, spec, now)
+                    removed = await enforce_retention(db, spec, now - timedelta(days=spec.retention_days))
+                summary[spec.table] = {"created": created, "removed": removed}
+            except Exception as e:
+                logger.error(f"Partition maintenance failed for {spec.table}: {e}")
+        return summary
+
+    async def start(self) -> None:
+        """Run a pass now and then every interval_seconds."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="partition_maintainer")
+
+    async def stop(self) -> None:
+        """Stop the background task."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self._interval)
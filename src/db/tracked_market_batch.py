@@ -0,0 +1,132 @@
+"""
+Per-cycle batching of tracked-market writes.
+
+BotRunner stages the markets it starts tracking and their changed
+price/game-state columns here while a loop iteration runs, then flushes
+once at the end of the cycle. A flush is at most one upsert statement plus
+one UPDATE per distinct set of changed columns, all in one commit, instead
+of a commit + refresh per market.
+"""
+
+import logging
+import uuid
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.crud.tracked_market import TrackedMarketCRUD
+
+
+logger = logging.getLogger(__name__)
+
+
+class TrackedMarketBatch:
+    """
+    Collects tracked-market upserts and state changes for one user.
+
+    State changes are compared against the values last written, so a
+    market whose price and score did not move since the previous flush
+    costs nothing.
+    """
+
+    def __init__(self):
+        self._upserts: dict[tuple[uuid.UUID, str], dict[str, Any]] = {}
+        self._changes: dict[tuple[uuid.UUID, str], dict[str, Any]] = {}
+        self._written: dict[tuple[uuid.UUID, str], dict[str, Any]] = {}
+        self._stats = {"flushes": 0, "upserted": 0, "updated": 0, "skipped_unchanged": 0}
+
+    @property
+    def pending(self) -> int:
+        """Number of markets with staged writes."""
+        return len(self._upserts.keys() | self._changes.keys())
+
+    def stage_upsert(self, user_id: uuid.UUID, condition_id: str, **fields: Any) -> None:
+        """
+        Stage a market to insert (or refresh, if it already exists).
+
+        A later call for the same market overrides earlier values.
+        """
+        key = (user_id, condition_id)
+        row = self._upserts.setdefault(key, {"user_id": user_id, "condition_id": condition_id})
+        row.update(fields)
+        # The upsert writes these columns itself
+        self._written[key] = {**self._written.get(key, {}), **fields}
+        pending = self._changes.get(key)
+        if pending:
+            for name in fields.keys() & pending.keys():
+                del pending[name]
+
+    def stage_state(self, user_id: uuid.UUID, condition_id: str, **fields: Any) -> None:
+        """
+        Stage changed price/game-state columns for a market.
+
+        Columns equal to the last written value are ignored.
+        """
+        key = (user_id, condition_id)
+        written = self._written.get(key, {})
+        changed = {
+            name: value for name, value in fields.items()
+            if name not in written or written[name] != value
+        }
+        self._stats["skipped_unchanged"] += len(fields) - len(changed)
+        if not changed:
+            return
+        upsert = self._upserts.get(key)
+        if upsert is not None:
+            # Not inserted yet: ride along with the INSERT
+            upsert.update(changed)
+            self._written[key] = {**written, **changed}
+        else:
+            self._changes.setdefault(key, {}).update(changed)
+
+    def forget(self, user_id: uuid.UUID, condition_id: str) -> None:
+        """Drop staged writes and change-tracking state for a market (e.g. deleted)."""
+        key = (user_id, condition_id)
+        self._upserts.pop(key, None)
+        self._changes.pop(key, None)
+        self._written.pop(key, None)
+
+    async def flush(self, db: AsyncSession) -> dict[str, int]:
+        """
+        Write everything staged in one transaction and commit.
+
+        On failure the staged writes are kept for the next flush and the
+        error is re-raised.
+
+        Returns:
+            Counts of rows upserted and updated
+        """
+        if not self._upserts and not self._changes:
+            return {"upserted": 0, "updated": 0}
+
+        upserts, self._upserts = self._upserts, {}
+        changes, self._changes = self._changes, {}
+        try:
+            upserted = await TrackedMarketCRUD.bulk_upsert(db, list(upserts.values()))
+            updated = 0
+            by_user: dict[uuid.UUID, dict[str, dict[str, Any]]] = {}
+            for (user_id, condition_id), fields in changes.items():
+                if fields:
+                    by_user.setdefault(user_id, {})[condition_id] = fields
+            for user_id, user_changes in by_user.items():
+                updated += await TrackedMarketCRUD.bulk_update_state(db, user_id, user_changes)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            # Keep them for the next cycle; anything staged meanwhile wins
+            for key, row in upserts.items():
+                self._upserts[key] = {**row, **self._upserts.get(key, {})}
+            for key, fields in changes.items():
+                self._changes[key] = {**fields, **self._changes.get(key, {})}
+            raise
+
+        for key, fields in changes.items():
+            self._written[key] = {**self._written.get(key, {}), **fields}
+        self._stats["flushes"] += 1
+        self._stats["upserted"] += upserted
+        self._stats["updated"] += updated
+        return {"upserted": upserted, "updated": updated}
+
+    def get_stats(self) -> dict[str, int]:
+        """Flush counters."""
+        return {**self._stats, "pending": self.pending}
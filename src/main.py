@@ -20,6 +20,14 @@ import asyncio
 
 from src.config import get_settings
 from src.db.database import init_db, engine, async_session_factory
+from src.db.activity_log_writer import activity_log_writer
+from src.db.partitioning import PartitionMaintainer
+from src.services.price_tape import price_tape
+from src.services.bot_runner import save_bot_snapshots
+from src.services.dashboard_stream import dashboard_stream_hub
+from src.core.resource_versions import resource_versions
+from src.core.principal_cache import principal_cache
+from src.core.serialization import FastJSONResponse
 # Import all models so they register with Base.metadata before init_db() creates tables
 from src.models.trading_account import TradingAccount
 from src.models import (
@@ -56,6 +64,7 @@ from src.core.logging_service import (
     log_system_event,
 )
 from src.core.validation import RequestValidationMiddleware, create_validation_config
+from src.core.middleware import FusedMiddleware
 from src.core.health import (
     DatabaseHealthMonitor,
     ServiceHealthAggregator,
@@ -113,6 +122,19 @@ async def lifespan(app: FastAPI):
         logger.error(f"Database initialization failed: {e}", exc_info=True)
         # We continue, but the app might be unstable without DB
     
+    # Batch activity log writes off the request/trading path
+    await activity_log_writer.start()
+    BotShutdownManager(shutdown_handler).register_log_flusher(activity_log_writer.stop)
+    # Checkpoint running bots so the next start is a warm restart
+    BotShutdownManager(shutdown_handler).register_snapshot_saver(save_bot_snapshots)
+    
+    # Keep log table partitions created ahead and drop expired ones (PostgreSQL only)
+    partition_maintainer = PartitionMaintainer(async_session_factory)
+    await partition_maintainer.start()
+    
+    # Persist polled quotes off the poller path
+    await price_tape.start()
+    
     # Setup database health monitoring (skip if no engine)
     try:
         if engine:
@@ -231,6 +253,27 @@ async def lifespan(app: FastAPI):
     except Exception:
         pass
     
+    # Checkpoint running bots (rewriting a snapshot the signal handler saved is harmless)
+    try:
+        saved = await save_bot_snapshots()
+        logger.info(f"Saved {saved} bot snapshots")
+    except Exception as e:
+        logger.error(f"Bot snapshot on shutdown failed: {e}")
+    
+    await dashboard_stream_hub.close()
+    await partition_maintainer.stop()
+    
+    try:
+        await price_tape.stop()
+    except Exception as e:
+        logger.error(f"Price tape flush on shutdown failed: {e}")
+    
+    # Flush queued activity logs (no-op if the signal handler already did)
+    try:
+        await activity_log_writer.stop()
+    except Exception as e:
+        logger.error(f"Activity log flush on shutdown failed: {e}")
+    
     log_system_event("shutdown", {"reason": "normal"})
     logger.info("Shutdown complete")
 
@@ -242,40 +285,60 @@ app = FastAPI(
     lifespan=lifespan,
     # Disable trailing slash redirects - they cause CORS preflight failures
     redirect_slashes=False,
+    # orjson-backed when installed; stdlib json otherwise
+    default_response_class=FastJSONResponse,
 )
 
 # Production middleware stack (order matters - last added = first executed)
 # All middlewares use pure ASGI implementation to avoid body consumption issues
 
-# 1. CORS (must be outermost for preflight requests)
 # Use allow_origin_regex to support wildcard subdomains (e.g., *.polymarket-sports-bot.pages.dev)
-app.add_middleware(
-    CORSMiddleware,
+cors_options = dict(
     allow_origins=app_settings.cors_origins_list,
     allow_origin_regex=r"https://.*\.polymarket-sports-bot\.pages\.dev|https://polymarket-sports-bot.*\.vercel\.app|https://.*\.vercel\.app|https://.*\.up\.railway\.app",
     allow_credentials=app_settings.cors_allow_credentials,
     allow_methods=app_settings.cors_allow_methods.split(","),
     allow_headers=app_settings.cors_allow_headers.split(","),
 )
-
-# 2. Security headers (OWASP recommended headers)
 security_config = create_security_headers_config(
     debug=app_settings.debug,
     allowed_origins=app_settings.cors_origins_list,
 )
-app.add_middleware(SecurityHeadersMiddleware, config=security_config)
-
-# 3. Rate limiting (protect against abuse)
 rate_limit_config = RateLimitConfig(
     requests_per_minute=120,  # 2 requests/second average
     requests_per_hour=3000,
     burst_limit=30,
     exempt_paths=["/health", "/health/detailed", "/health/db", "/docs", "/openapi.json", "/redoc"],
 )
-app.add_middleware(RateLimitMiddleware, config=rate_limit_config)
+validation_config = create_validation_config() if app_settings.request_validation_enabled else None
+
+if app_settings.fused_middleware_enabled:
+    # Same stages in one layer (see src/core/middleware.py), plus optional gzip
+    app.add_middleware(
+        FusedMiddleware,
+        rate_limit=rate_limit_config,
+        security_headers=security_config,
+        cors=cors_options,
+        validation=validation_config,
+        gzip_minimum_size=app_settings.response_gzip_minimum_size or None,
+    )
+else:
+    # 0. Request validation (added first so it runs innermost: preflights never
+    #    reach it and its 400 responses still get CORS and security headers)
+    if validation_config is not None:
+        app.add_middleware(RequestValidationMiddleware, config=validation_config)
+
+    # 1. CORS (answers preflight requests before validation sees them)
+    app.add_middleware(CORSMiddleware, **cors_options)
+
+    # 2. Security headers (OWASP recommended headers)
+    app.add_middleware(SecurityHeadersMiddleware, config=security_config)
+
+    # 3. Rate limiting (protect against abuse)
+    app.add_middleware(RateLimitMiddleware, config=rate_limit_config)
 
-# 4. Request logging (innermost - logs after processing)
-app.add_middleware(RequestLoggingMiddleware)
+    # 4. Request logging (outermost - sees every response, including 429s)
+    app.add_middleware(RequestLoggingMiddleware)
 
 app.include_router(auth_router, prefix="/api/v1")
 app.include_router(onboarding_router, prefix="/api/v1")
@@ -365,6 +428,10 @@ async def get_metrics():
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "alerts": alert_manager.get_stats(),
         "price_cache": price_cache.get_cache_stats(),
+        "price_tape": price_tape.get_stats(),
+        "dashboard_stream": dashboard_stream_hub.get_stats(),
+        "resource_versions": resource_versions.get_stats(),
+        "principal_cache": principal_cache.get_stats(),
         "health": health_aggregator.get_summary(),
         "incidents": incident_manager.get_stats() if incident_manager else {},
     }
@@ -9,6 +9,7 @@ from src.models.global_settings import GlobalSettings
 from src.models.activity_log import ActivityLog
 from src.models.market_config import MarketConfig
 from src.models.refresh_token import RefreshToken
+from src.models.analytics_rollup import DailyPnLRollup, TradeStatsRollup, EquityPoint
 
 __all__ = [
     "User",
@@ -21,4 +22,7 @@ __all__ = [
     "ActivityLog",
     "MarketConfig",
     "RefreshToken",
+    "DailyPnLRollup",
+    "TradeStatsRollup",
+    "EquityPoint",
 ]
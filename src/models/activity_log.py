@@ -19,9 +19,14 @@ class ActivityLog(Base):
     """
     
     __tablename__ = "activity_logs"
+    # On PostgreSQL this is range-partitioned by day on created_at
+    # (migration 019, src/db/partitioning.py)
     __table_args__ = (
         Index("idx_activity_logs_user_created", "user_id", "created_at"),
         Index("idx_activity_logs_level", "level"),
+        # Keyset pagination (see src/db/pagination.py)
+        Index("idx_activity_logs_user_created_id", "user_id", "created_at", "id"),
+        Index("idx_activity_logs_user_category_created_id", "user_id", "category", "created_at", "id"),
     )
     
     id: Mapped[uuid.UUID] = mapped_column(
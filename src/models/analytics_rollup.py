@@ -0,0 +1,180 @@
+"""
+Analytics rollup models.
+
+Pre-aggregated trading statistics maintained as positions close, so the
+analytics endpoints read a handful of rows per day or per sport instead of
+every closed position the user has ever had.
+"""
+
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import String, Integer, Date, DateTime, Numeric, ForeignKey, UniqueConstraint, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.db.database import Base
+
+
+# Sport key of the TradeStatsRollup row that covers every sport
+ALL_SPORTS = "*"
+# Sport key used for positions closed without a sport
+UNKNOWN_SPORT = "unknown"
+
+
+class DailyPnLRollup(Base):
+    """
+    Realized P&L and win/loss counts for one user, UTC day and sport.
+    """
+
+    __tablename__ = "analytics_daily_pnl"
+    __table_args__ = (
+        UniqueConstraint("user_id", "day", "sport", name="uq_analytics_daily_pnl_user_day_sport"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    day: Mapped[date] = mapped_column(
+        Date,
+        nullable=False
+    )
+    sport: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False
+    )
+
+    trades: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    wins: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    losses: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    gross_profit: Mapped[Decimal] = mapped_column(Numeric(18, 6), default=0, nullable=False)
+    gross_loss: Mapped[Decimal] = mapped_column(Numeric(18, 6), default=0, nullable=False)
+    realized_pnl: Mapped[Decimal] = mapped_column(Numeric(18, 6), default=0, nullable=False)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=func.now(),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<DailyPnLRollup(user_id={self.user_id}, day={self.day}, sport={self.sport}, pnl={self.realized_pnl})>"
+
+
+class TradeStatsRollup(Base):
+    """
+    Lifetime win/loss counters, streaks and drawdown for one user and sport.
+
+    The row with sport == ALL_SPORTS covers every closed position; the other
+    rows cover a single sport. sum_pnl_squared lets the Sharpe ratio be
+    derived without revisiting individual trades.
+    """
+
+    __tablename__ = "analytics_trade_stats"
+    __table_args__ = (
+        UniqueConstraint("user_id", "sport", name="uq_analytics_trade_stats_user_sport"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    sport: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False
+    )
+
+    trades: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    wins: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    losses: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    gross_profit: Mapped[Decimal] = mapped_column(Numeric(18, 6), default=0, nullable=False)
+    gross_loss: Mapped[Decimal] = mapped_column(Numeric(18, 6), default=0, nullable=False)
+    largest_win: Mapped[Decimal] = mapped_column(Numeric(18, 6), default=0, nullable=False)
+    largest_loss: Mapped[Decimal] = mapped_column(Numeric(18, 6), default=0, nullable=False)
+    sum_pnl_squared: Mapped[Decimal] = mapped_column(Numeric(24, 6), default=0, nullable=False)
+    total_hold_seconds: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    timed_trades: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    # Positive for a run of wins, negative for a run of losses
+    current_streak: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_win_streak: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_lose_streak: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    cumulative_pnl: Mapped[Decimal] = mapped_column(Numeric(18, 6), default=0, nullable=False)
+    peak_pnl: Mapped[Decimal] = mapped_column(Numeric(18, 6), default=0, nullable=False)
+    max_drawdown_pct: Mapped[Decimal] = mapped_column(Numeric(12, 4), default=0, nullable=False)
+
+    last_closed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=func.now(),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<TradeStatsRollup(user_id={self.user_id}, sport={self.sport}, trades={self.trades})>"
+
+
+class EquityPoint(Base):
+    """
+    One closed position on the user's equity curve.
+
+    trade_number is the position's 1-based close order for the user and
+    cumulative_pnl the user's all-sport realized P&L up to and including it.
+    """
+
+    __tablename__ = "analytics_equity_points"
+    __table_args__ = (
+        Index("idx_analytics_equity_points_user_closed", "user_id", "closed_at"),
+        Index("idx_analytics_equity_points_user_trade", "user_id", "trade_number"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    position_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("positions.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True
+    )
+    sport: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False
+    )
+    closed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False
+    )
+    trade_number: Mapped[int] = mapped_column(Integer, nullable=False)
+    pnl: Mapped[Decimal] = mapped_column(Numeric(18, 6), nullable=False)
+    hold_seconds: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    cumulative_pnl: Mapped[Decimal] = mapped_column(Numeric(18, 6), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<EquityPoint(position_id={self.position_id}, cumulative_pnl={self.cumulative_pnl})>"
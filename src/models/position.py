@@ -24,6 +24,9 @@ class Position(Base):
         Index("ix_positions_status", "status"),
         Index("ix_positions_user_id", "user_id"),
         Index("ix_positions_tracked_market", "tracked_market_id"),
+        # Keyset pagination (see src/db/pagination.py)
+        Index("ix_positions_user_opened_id", "user_id", "opened_at", "id"),
+        Index("ix_positions_user_status_opened_id", "user_id", "status", "opened_at", "id"),
     )
     
     id: Mapped[uuid.UUID] = mapped_column(
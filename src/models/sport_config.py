@@ -380,6 +380,9 @@ class SportConfig(Base):
         Generate list of allowed entry segments based on max_entry_segment.
         For NBA/NFL: q1, q2, q3 if max is q3
         For NHL: p1, p2 if max is p2
+        
+        Overtime ('ot') is only allowed when it is chosen as the max
+        segment explicitly; a max of q4/p3 still blocks overtime entries.
         """
         segment_orders = {
             "q1": ["q1"],
@@ -392,6 +395,10 @@ class SportConfig(Base):
             "h1": ["h1"],
             "h2": ["h1", "h2"],
         }
+        if self.max_entry_segment == "ot":
+            segments = SPORT_PROGRESS_CONFIG.get(self.sport, {}).get("segments", [])
+            if "ot" in segments:
+                return list(segments)
         return segment_orders.get(self.max_entry_segment, ["q1", "q2", "q3"])
     
     def __repr__(self) -> str:
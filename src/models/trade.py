@@ -6,7 +6,7 @@ Each position may have multiple trades (entry and exit orders).
 import uuid
 from datetime import datetime
 from decimal import Decimal
-from sqlalchemy import String, DateTime, Numeric, ForeignKey, func
+from sqlalchemy import String, DateTime, Numeric, ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -20,6 +20,10 @@ class Trade(Base):
     """
     
     __tablename__ = "trades"
+    __table_args__ = (
+        # Keyset pagination (see src/db/pagination.py)
+        Index("ix_trades_user_created_id", "user_id", "created_at", "id"),
+    )
     
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
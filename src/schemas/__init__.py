@@ -11,6 +11,7 @@ from src.schemas.auth import (
 from src.schemas.common import (
     MessageResponse,
     PaginatedResponse,
+    CursorPage,
     ErrorResponse,
 )
 from src.schemas.onboarding import (
@@ -46,6 +47,7 @@ __all__ = [
     "TokenResponse",
     "MessageResponse",
     "PaginatedResponse",
+    "CursorPage",
     "ErrorResponse",
     "OnboardingStatus",
     "OnboardingStepData",
@@ -34,3 +34,19 @@ class PaginatedResponse(BaseModel, Generic[T]):
     page: int
     page_size: int
     total_pages: int
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """
+    Keyset-paginated response wrapper.
+    
+    Pass next_cursor back as ?cursor= to fetch the following page; it is
+    None on the last page. total is only filled in when requested and may
+    be an estimate (see total_is_estimate).
+    """
+    items: list[T]
+    next_cursor: str | None
+    has_more: bool
+    limit: int
+    total: int | None = None
+    total_is_estimate: bool = False
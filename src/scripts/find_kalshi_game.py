@@ -8,7 +8,7 @@ import sys
 os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///./test_local.db"
 
 from src.db.database import async_session_factory
-from src.services.kalshi_client import KalshiClient
+from src.services.kalshi_client import create_kalshi_client
 from src.db.crud.polymarket_account import PolymarketAccountCRUD
 from src.models import User, PolymarketAccount
 
@@ -34,7 +34,7 @@ async def find_nba_game():
         api_key = decrypt_credential(account.api_key_encrypted)
         private_key = decrypt_credential(account.private_key_encrypted)
         
-        client = KalshiClient(api_key=api_key, private_key_pem=private_key)
+        client = create_kalshi_client(api_key=api_key, private_key_pem=private_key)
         
         logger.info("SEARCHING BROADLY FOR BASKETBALL MARKETS...")
         
@@ -7,7 +7,7 @@ import logging
 from sqlalchemy import select, func
 from src.db.database import async_session_factory
 from src.models import User, PolymarketAccount, TrackedMarket
-from src.services.kalshi_client import KalshiClient
+from src.services.kalshi_client import create_kalshi_client
 from src.core.encryption import decrypt_credential
 
 logging.basicConfig(level=logging.INFO)
@@ -45,7 +45,7 @@ async def select_all_markets():
         api_key = decrypt_credential(account.api_key_encrypted)
         private_key = decrypt_credential(account.private_key_encrypted)
         
-        client = KalshiClient(api_key=api_key, private_key_pem=private_key)
+        client = create_kalshi_client(api_key=api_key, private_key_pem=private_key)
         
         # 3. Fetch Markets
         logger.info("Fetching Kalshi markets...")
@@ -124,7 +124,7 @@ class AccountManager:
             return self._clients_cache[account_id]
 
         from src.models import TradingAccount
-        from src.services.kalshi_client import KalshiClient
+        from src.services.kalshi_client import create_kalshi_client
         from src.core.encryption import decrypt_credential
         
         # Manually fetch account to ensure we get credentials for THIS account
@@ -153,7 +153,7 @@ class AccountManager:
                 logger.error(f"No API credentials found for Kalshi account {account_id}")
                 return None
             
-            client = KalshiClient(
+            client = create_kalshi_client(
                 api_key=api_key,
                 private_key_pem=api_secret,
             )
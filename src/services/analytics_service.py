@@ -1,18 +1,24 @@
 """
 Analytics Service - calculates trade performance metrics and statistics.
 Provides win rate, ROI, drawdown, Sharpe ratio and other KPIs.
+
+Reads the rollup tables maintained by AnalyticsRollupCRUD rather than
+loading closed positions, so cost scales with days and sports traded
+instead of lifetime trade count.
 """
 
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal
-from typing import Optional
+from typing import AsyncIterator, Optional
 from uuid import UUID
 
-from sqlalchemy import select, func, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.db.crud.analytics_rollup import AnalyticsRollupCRUD
+from src.models.analytics_rollup import ALL_SPORTS, TradeStatsRollup
+
 logger = logging.getLogger(__name__)
 
 
@@ -71,6 +77,8 @@ class AnalyticsService:
     - Risk metrics (Sharpe, drawdown, etc.)
     """
     
+    INITIAL_CAPITAL = 1000
+    
     def __init__(self, db: AsyncSession, user_id: UUID):
         self.db = db
         self.user_id = user_id
@@ -84,6 +92,10 @@ class AnalyticsService:
         """
         Calculate comprehensive performance metrics.
         
+        Unbounded queries read a single lifetime counters row. Date-bounded
+        queries stream the equity points in range and fold them in one pass,
+        since streaks and drawdown depend on trade order within the window.
+        
         Args:
             start_date: Filter trades from this date
             end_date: Filter trades until this date
@@ -92,71 +104,32 @@ class AnalyticsService:
         Returns:
             PerformanceMetrics with all calculated statistics
         """
-        from src.models import Position
-        
-        query = select(Position).where(
-            and_(
-                Position.user_id == self.user_id,
-                Position.status == "closed",
+        if start_date is None and end_date is None:
+            stats = await AnalyticsRollupCRUD.get_trade_stats(
+                self.db, self.user_id, sport or ALL_SPORTS
             )
-        )
-        
-        if start_date:
-            query = query.where(Position.closed_at >= start_date)
-        if end_date:
-            query = query.where(Position.closed_at <= end_date)
-        if sport:
-            query = query.where(Position.sport == sport)
-        
-        query = query.order_by(Position.closed_at.asc())
-        
-        result = await self.db.execute(query)
-        positions = result.scalars().all()
+        else:
+            stats = AnalyticsRollupCRUD.new_trade_stats(self.user_id)
+            points = AnalyticsRollupCRUD.stream_equity_points(
+                self.db, self.user_id, start_date=start_date, end_date=end_date, sport=sport
+            )
+            async for point in points:
+                AnalyticsRollupCRUD.apply_trade(stats, point.pnl, point.hold_seconds)
         
-        if not positions:
+        if stats is None or stats.trades == 0:
             return self._empty_metrics()
         
-        trades = []
-        for pos in positions:
-            pnl = self._calculate_position_pnl(pos)
-            trades.append({
-                "pnl": pnl,
-                "entry_time": pos.created_at,
-                "exit_time": pos.closed_at,
-                "is_win": pnl > 0,
-            })
-        
-        return self._compute_metrics(trades)
-    
-    def _calculate_position_pnl(self, position) -> float:
-        """Calculate P&L for a closed position."""
-        if position.exit_price is None:
-            return 0.0
-        
-        entry = float(position.actual_entry_price or position.entry_price or 0)
-        exit_price = float(position.exit_price)
-        contracts = position.contracts or 0
-        
-        if position.side == "sell" or position.side == "NO":
-            pnl = (entry - exit_price) * contracts
-        else:
-            pnl = (exit_price - entry) * contracts
-        
-        return pnl
+        return self._compute_metrics(stats)
     
-    def _compute_metrics(self, trades: list[dict]) -> PerformanceMetrics:
-        """Compute all metrics from trade list."""
-        total_trades = len(trades)
-        
-        winning_trades = [t for t in trades if t["is_win"]]
-        losing_trades = [t for t in trades if not t["is_win"]]
-        
-        win_count = len(winning_trades)
-        lose_count = len(losing_trades)
+    def _compute_metrics(self, stats: TradeStatsRollup) -> PerformanceMetrics:
+        """Compute all metrics from rolled-up counters."""
+        total_trades = stats.trades
+        win_count = stats.wins
+        lose_count = stats.losses
         win_rate = win_count / total_trades if total_trades > 0 else 0
         
-        gross_profit = sum(t["pnl"] for t in winning_trades)
-        gross_loss = abs(sum(t["pnl"] for t in losing_trades))
+        gross_profit = float(stats.gross_profit)
+        gross_loss = float(stats.gross_loss)
         total_pnl = gross_profit - gross_loss
         
         avg_win = gross_profit / win_count if win_count > 0 else 0
@@ -164,24 +137,17 @@ class AnalyticsService:
         
         profit_factor = gross_profit / gross_loss if gross_loss > 0 else float("inf")
         
-        largest_win = max((t["pnl"] for t in winning_trades), default=0)
-        largest_loss = abs(min((t["pnl"] for t in losing_trades), default=0))
-        
-        durations = []
-        for t in trades:
-            if t["entry_time"] and t["exit_time"]:
-                duration = (t["exit_time"] - t["entry_time"]).total_seconds() / 3600
-                durations.append(duration)
-        avg_duration = sum(durations) / len(durations) if durations else 0
-        
-        streak_data = self._calculate_streaks(trades)
+        avg_duration = (
+            stats.total_hold_seconds / stats.timed_trades / 3600
+            if stats.timed_trades else 0
+        )
         
-        max_drawdown = self._calculate_max_drawdown(trades)
+        max_drawdown = float(stats.max_drawdown_pct)
         
-        initial_capital = 1000
+        initial_capital = self.INITIAL_CAPITAL
         roi_pct = (total_pnl / initial_capital) * 100 if initial_capital > 0 else 0
         
-        sharpe = self._calculate_sharpe_ratio(trades)
+        sharpe = self._calculate_sharpe_ratio(stats)
         calmar = abs(roi_pct / max_drawdown) if max_drawdown > 0 else None
         
         return PerformanceMetrics(
@@ -195,86 +161,35 @@ class AnalyticsService:
             avg_win=round(avg_win, 2),
             avg_loss=round(avg_loss, 2),
             profit_factor=round(profit_factor, 2) if profit_factor != float("inf") else 999.99,
-            largest_win=round(largest_win, 2),
-            largest_loss=round(largest_loss, 2),
+            largest_win=round(float(stats.largest_win), 2),
+            largest_loss=round(float(stats.largest_loss), 2),
             avg_trade_duration_hours=round(avg_duration, 2),
-            current_streak=streak_data["current"],
-            max_win_streak=streak_data["max_win"],
-            max_lose_streak=streak_data["max_lose"],
+            current_streak=stats.current_streak,
+            max_win_streak=stats.max_win_streak,
+            max_lose_streak=stats.max_lose_streak,
             max_drawdown=round(max_drawdown, 2),
             roi_pct=round(roi_pct, 2),
             sharpe_ratio=round(sharpe, 2) if sharpe else None,
             calmar_ratio=round(calmar, 2) if calmar else None,
         )
     
-    def _calculate_streaks(self, trades: list[dict]) -> dict:
-        """Calculate winning/losing streaks."""
-        if not trades:
-            return {"current": 0, "max_win": 0, "max_lose": 0}
-        
-        max_win_streak = 0
-        max_lose_streak = 0
-        current_streak = 0
-        win_streak = 0
-        lose_streak = 0
-        
-        for trade in trades:
-            if trade["is_win"]:
-                win_streak += 1
-                lose_streak = 0
-                max_win_streak = max(max_win_streak, win_streak)
-            else:
-                lose_streak += 1
-                win_streak = 0
-                max_lose_streak = max(max_lose_streak, lose_streak)
-        
-        if trades[-1]["is_win"]:
-            current_streak = win_streak
-        else:
-            current_streak = -lose_streak
-        
-        return {
-            "current": current_streak,
-            "max_win": max_win_streak,
-            "max_lose": max_lose_streak,
-        }
-    
-    def _calculate_max_drawdown(self, trades: list[dict]) -> float:
-        """Calculate maximum drawdown percentage."""
-        if not trades:
-            return 0.0
-        
-        peak = 0
-        max_dd = 0
-        equity = 0
-        
-        for trade in trades:
-            equity += trade["pnl"]
-            peak = max(peak, equity)
-            drawdown = peak - equity
-            if peak > 0:
-                dd_pct = (drawdown / peak) * 100
-                max_dd = max(max_dd, dd_pct)
-        
-        return max_dd
-    
     def _calculate_sharpe_ratio(
         self,
-        trades: list[dict],
+        stats: TradeStatsRollup,
         risk_free_rate: float = 0.05,
     ) -> Optional[float]:
         """
         Calculate Sharpe ratio (annualized).
         
-        Sharpe = (avg_return - risk_free) / std_dev_returns
+        Sharpe = (avg_return - risk_free) / std_dev_returns, with the
+        population variance taken from the running sum of squared P&L.
         """
-        if len(trades) < 10:
+        n = stats.trades
+        if n < 10:
             return None
         
-        returns = [t["pnl"] for t in trades]
-        avg_return = sum(returns) / len(returns)
-        
-        variance = sum((r - avg_return) ** 2 for r in returns) / len(returns)
+        avg_return = float(stats.cumulative_pnl) / n
+        variance = max(0.0, float(stats.sum_pnl_squared) / n - avg_return ** 2)
         std_dev = variance ** 0.5
         
         if std_dev == 0:
@@ -290,85 +205,20 @@ class AnalyticsService:
     
     async def get_sport_breakdown(self) -> list[SportPerformance]:
         """Get performance breakdown by sport."""
-        from src.models import Position
-        from sqlalchemy import case
-        
-        query = (
-            select(
-                Position.sport,
-                func.count(Position.id).label("total"),
-                func.sum(
-                    case(
-                        [(Position.exit_price > Position.entry_price, 1)],
-                        else_=0
-                    )
-                ).label("wins"),
-                # Sum for NFL
-                func.sum(
-                    case(
-                        [(Position.market_id.ilike("%NFL%"), Position.market_exposure)],
-                        else_=0
-                    )
-                ),
-                # Sum for NBA
-                func.sum(
-                    case(
-                        [(Position.market_id.ilike("%NBA%"), Position.market_exposure)],
-                        else_=0
-                    )
-                ),
-                # Sum for MLB
-                func.sum(
-                    case(
-                        [(Position.market_id.ilike("%MLB%"), Position.market_exposure)],
-                        else_=0
-                    )
-                ),
-                # Sum for NHL
-                func.sum(
-                    case(
-                        [(Position.market_id.ilike("%NHL%"), Position.market_exposure)],
-                        else_=0
-                    )
-                )
-            )
-            .where(
-                and_(
-                    Position.user_id == self.user_id,
-                    Position.status == "closed",
-                    Position.sport.isnot(None),
-                )
-            )
-            .group_by(Position.sport)
-        )
-        
-        result = await self.db.execute(query)
-        rows = result.fetchall()
+        rows = await AnalyticsRollupCRUD.get_sport_stats(self.db, self.user_id)
         
         breakdown = []
         for row in rows:
-            sport, total, wins = row
-            win_rate = wins / total if total > 0 else 0
-            
-            pnl_query = (
-                select(func.sum(Position.exit_price - Position.entry_price))
-                .where(
-                    and_(
-                        Position.user_id == self.user_id,
-                        Position.status == "closed",
-                        Position.sport == sport,
-                    )
-                )
-            )
-            pnl_result = await self.db.execute(pnl_query)
-            total_pnl = pnl_result.scalar() or 0
+            total = row.trades
+            win_rate = row.wins / total if total > 0 else 0
+            total_pnl = float(row.cumulative_pnl)
             
             breakdown.append(SportPerformance(
-                sport=sport,
+                sport=row.sport,
                 total_trades=total,
                 win_rate=round(win_rate, 4),
-                total_pnl=round(float(total_pnl), 2),
-                avg_return=round(float(total_pnl) / total, 2) if total > 0 else 0,
+                total_pnl=round(total_pnl, 2),
+                avg_return=round(total_pnl / total, 2) if total > 0 else 0,
             ))
         
         return breakdown
@@ -383,82 +233,53 @@ class AnalyticsService:
         
         Returns list of equity values at each trade close.
         """
-        from src.models import Position
+        return [point async for point in self.iter_equity_curve(start_date, initial_capital)]
+    
+    async def iter_equity_curve(
+        self,
+        start_date: Optional[datetime] = None,
+        initial_capital: float = 1000,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[TimeSeriesPoint]:
+        """
+        Stream the equity curve one point at a time.
         
-        query = (
-            select(Position)
-            .where(
-                and_(
-                    Position.user_id == self.user_id,
-                    Position.status == "closed",
-                )
-            )
-            .order_by(Position.closed_at.asc())
+        Rows come from a server-side cursor in batches, so memory use does
+        not grow with the number of trades.
+        """
+        points = AnalyticsRollupCRUD.stream_equity_points(
+            self.db, self.user_id, start_date=start_date, batch_size=batch_size
         )
-        
-        if start_date:
-            query = query.where(Position.closed_at >= start_date)
-        
-        result = await self.db.execute(query)
-        positions = result.scalars().all()
-        
-        curve = []
-        equity = initial_capital
+        base = None
         peak = initial_capital
         
-        for pos in positions:
-            # Skip positions without a closed_at timestamp
-            if pos.closed_at is None:
-                continue
-                
-            pnl = self._calculate_position_pnl(pos)
-            equity += pnl
+        async for point in points:
+            # Equity starts at initial_capital at the first point in range
+            if base is None:
+                base = point.cumulative_pnl - point.pnl
+            equity = initial_capital + float(point.cumulative_pnl - base)
             peak = max(peak, equity)
             drawdown = ((peak - equity) / peak) * 100 if peak > 0 else 0
             
-            curve.append(TimeSeriesPoint(
-                timestamp=pos.closed_at,
+            yield TimeSeriesPoint(
+                timestamp=point.closed_at,
                 equity=round(equity, 2),
                 drawdown=round(drawdown, 2),
-                trade_id=str(pos.id),
-            ))
-        
-        return curve
+                trade_id=str(point.position_id),
+            )
     
     async def get_daily_pnl(
         self,
         days: int = 30,
     ) -> list[dict]:
         """Get daily P&L for the last N days."""
-        from src.models import Position
-        
         start_date = datetime.now(timezone.utc) - timedelta(days=days)
         
-        query = (
-            select(Position)
-            .where(
-                and_(
-                    Position.user_id == self.user_id,
-                    Position.status == "closed",
-                    Position.closed_at >= start_date,
-                )
-            )
-            .order_by(Position.closed_at.asc())
-        )
-        
-        result = await self.db.execute(query)
-        positions = result.scalars().all()
-        
-        daily_pnl = {}
-        for pos in positions:
-            if pos.closed_at:
-                date_key = pos.closed_at.date().isoformat()
-                pnl = self._calculate_position_pnl(pos)
-                daily_pnl[date_key] = daily_pnl.get(date_key, 0) + pnl
+        rows = await AnalyticsRollupCRUD.get_daily_pnl(self.db, self.user_id, start_date.date())
         
         return [
-            {"date": date, "pnl": round(pnl, 2)}
-            for date, pnl in sorted(daily_pnl.items())
+            {"date": day.isoformat(), "pnl": round(float(pnl or 0), 2)}
+            for day, pnl in rows
         ]
     
     def _empty_metrics(self) -> PerformanceMetrics:
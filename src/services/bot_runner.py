@@ -5,7 +5,7 @@ Coordinates ESPN game state, Polymarket prices, and trade execution.
 
 import asyncio
 import logging
-import uuid
+import time
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal
 from typing import Any, Callable, Union
@@ -17,6 +17,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.services.kalshi_client import KalshiClient
 from src.services.game_tracker_service import GameTrackerService
+from src.services.game_clock import get_sport_rules, is_past_segment, parse_ticker_start_time
 from src.services.trading_client_interface import TradingClient
 from src.services.espn_service import ESPNService
 from src.services.trading_engine import TradingEngine
@@ -26,14 +27,25 @@ from src.services.advanced_orders import AdvancedOrderManager
 from src.services.balance_guardian import BalanceGuardian
 from src.db.database import async_session_factory
 from src.db.crud.tracked_market import TrackedMarketCRUD
+from src.db.tracked_market_batch import TrackedMarketBatch
 from src.db.crud.position import PositionCRUD
 from src.services.market_discovery import DiscoveredMarket, market_discovery as discovery_service
 
 from src.db.crud.global_settings import GlobalSettingsCRUD
 from src.db.crud.sport_config import SportConfigCRUD
 from src.db.crud.activity_log import ActivityLogCRUD
+from src.core.clock import Clock, system_clock
 from src.core.exceptions import TradingError
 from src.services.discord_notifier import discord_notifier
+from src.services.price_cache import PriceHistoryCache, price_cache
+from src.services.price_tape import PriceTape, price_tape as default_price_tape
+from src.services.bot_snapshot import (
+    BotSnapshotStore,
+    bot_snapshot_store as default_snapshot_store,
+    game_from_dict,
+    game_to_dict,
+)
+from src.services.bot_status import BotStatusPublisher, BotStatusSnapshot
 
 
 logger = logging.getLogger(__name__)
@@ -49,7 +61,7 @@ class BotState(Enum):
     ERROR = "error"
 
 
-from src.services.types import TrackedGame, SportStats
+from src.services.types import TrackedGame, SportStats, GameMarketView, LoopMetrics
 
 
 class BotRunner:
@@ -72,24 +84,44 @@ class BotRunner:
     # Polling intervals
     ESPN_POLL_INTERVAL = 5.0  # Seconds between ESPN polls
     DISCOVERY_INTERVAL = 10.0  # Seconds between market discovery runs
+    PRICE_POLL_INTERVAL = 10.0  # Seconds between Kalshi price polls
+    TRADING_LOOP_INTERVAL = 1.0  # Seconds between entry/exit evaluation passes
     HEALTH_CHECK_INTERVAL = 60.0  # Seconds between health checks
     CLEANUP_INTERVAL = 120.0  # Seconds between stale game cleanup runs
+    SNAPSHOT_INTERVAL = 30.0  # Seconds between warm-restart snapshots
+    STATUS_PUBLISH_INTERVAL = 1.0  # Seconds between status document refreshes
     MAX_TRACKED_GAMES = 100  # Maximum number of games to track simultaneously
     
     def __init__(
         self,
         trading_client: KalshiClient,
         trading_engine: TradingEngine,
-        espn_service: ESPNService
+        espn_service: ESPNService,
+        clock: Clock | None = None,
+        price_tape: PriceTape | None = default_price_tape,
+        snapshot_store: BotSnapshotStore | None = default_snapshot_store,
     ):
         self.trading_client = trading_client
         self.trading_engine = trading_engine
         self.espn_service = espn_service
-        self.game_tracker = GameTrackerService(espn_service)
+        # Time source for every loop sleep and timestamp (VirtualClock in replays)
+        self.clock = clock or system_clock
+        # Durable quote history; None for replays and synthetic load tests
+        self.price_tape = price_tape
+        self._tape_restored: set[str] = set()
+        # Warm-restart checkpoints of runtime state; None disables them
+        self.snapshot_store = snapshot_store
+        # Tracked-market rows staged during a loop cycle and written once at its end
+        self.market_batch = TrackedMarketBatch()
+        self.game_tracker = GameTrackerService(espn_service, clock=self.clock)
 
         self.platform = "kalshi"
 
-        self.state = BotState.STOPPED
+        # Versioned status document served to status readers
+        self.status_publisher = BotStatusPublisher(clock=self.clock)
+        # Set directly: the setter publishes, and the status fields don't exist yet
+        self._state = BotState.STOPPED
+        self._status_dirty = True
 
 
         # Tracked games keyed by ESPN event ID
@@ -154,6 +186,9 @@ class BotRunner:
         self.kelly_fraction: float = 0.25
         self.min_confidence_score: float = 0.6
 
+        # Per-loop iteration timings (discovery, espn_poll, price_poll, trading)
+        self.loop_metrics: dict[str, LoopMetrics] = {}
+
         # Stats
         self.start_time: datetime | None = None
         self.trades_today: int = 0
@@ -163,6 +198,23 @@ class BotRunner:
         self._stop_event = asyncio.Event()
         self._tasks: list[asyncio.Task] = []
 
+    @property
+    def state(self) -> BotState:
+        """Current lifecycle state."""
+        return self._state
+    
+    @state.setter
+    def state(self, value: BotState) -> None:
+        self._state = value
+        # Published right away rather than on the next read: stop and
+        # emergency stop happen after the status loop is cancelled, and
+        # long-pollers must still be woken for them
+        try:
+            self.publish_status()
+        except Exception as e:
+            self._status_dirty = True
+            logger.warning(f"Status publish failed: {e}")
+
     async def _place_order(self, game: TrackedGame, side: str, price: float, size: int) -> Any | None:
         """
         Place order on Kalshi.
@@ -291,7 +343,9 @@ class BotRunner:
             self.market_configs[mc.condition_id] = mc
         logger.info(f"Loaded {len(self.market_configs)} market-specific configurations")
 
-        # Recover open positions from database
+        # Warm restart: restore runtime state from the last snapshot, then
+        # reconcile it (and recover any other open positions) from the database
+        await self._restore_snapshot()
         await self._recover_positions(db)
         
         # Load user-selected games from bot config
@@ -482,7 +536,7 @@ class BotRunner:
         logger.info("Starting trading bot...")
         self.state = BotState.STARTING
         self._stop_event.clear()
-        self.start_time = datetime.now(timezone.utc)
+        self.start_time = self.clock.now()
         
         # Send start notification
         await discord_notifier.notify_bot_started(str(self.user_id), self.enabled_sports)
@@ -505,6 +559,9 @@ class BotRunner:
             asyncio.create_task(self._health_check_loop(), name="health"),
             asyncio.create_task(self._cleanup_loop(), name="cleanup"),
         ]
+        if self.snapshot_store is not None:
+            self._tasks.append(asyncio.create_task(self._snapshot_loop(), name="snapshot"))
+        self._tasks.append(asyncio.create_task(self._status_loop(), name="status"))
         
 
         
@@ -540,7 +597,7 @@ class BotRunner:
         # Send stop notification
         runtime = None
         if self.start_time:
-            runtime = datetime.now(timezone.utc) - self.start_time
+            runtime = self.clock.now() - self.start_time
         
         await discord_notifier.notify_bot_stopped(
             reason="User requested stop",
@@ -562,6 +619,13 @@ class BotRunner:
                 }
             )
         
+        # A user-requested stop starts cold next time
+        if self.snapshot_store is not None and self.user_id:
+            try:
+                await self.snapshot_store.discard(self.user_id)
+            except Exception as e:
+                logger.warning(f"Error discarding bot snapshot: {e}")
+        
         # Close trading client to release HTTP connections
         if hasattr(self.trading_client, 'close'):
             try:
@@ -569,9 +633,10 @@ class BotRunner:
             except Exception as e:
                 logger.warning(f"Error closing trading client: {e}")
 
-        self.state = BotState.STOPPED
         self.tracked_games.clear()
         self.token_to_game.clear()
+        # Publishes the final, empty status
+        self.state = BotState.STOPPED
 
         # Remove from singleton cache to free memory
         if self.user_id and self.user_id in _bot_instances:
@@ -588,6 +653,7 @@ class BotRunner:
         Uses platform-aware discovery (Polymarket Gamma API or Kalshi Sports API).
         """
         while not self._stop_event.is_set():
+            iteration_started = time.perf_counter()
             try:
                 async with async_session_factory() as db:
                     logger.info(f"Running market discovery for {self.platform}...")
@@ -595,7 +661,7 @@ class BotRunner:
                     # Skip discovery if no games selected by user AND auto_trade_all is disabled
                     if not self.user_selected_games and not self.auto_trade_all:
                         logger.debug("No user-selected games to track and auto_trade_all is disabled")
-                        await asyncio.sleep(self.DISCOVERY_INTERVAL)
+                        await self.clock.sleep(self.DISCOVERY_INTERVAL)
                         continue
 
                     # Use Kalshi market discovery
@@ -628,7 +694,7 @@ class BotRunner:
                                             {"homeAway": "away", "team": {"displayName": matched.away_team, "name": matched.away_team}}
                                         ],
                                         "status": {"type": {"state": "pre", "name": "STATUS_SCHEDULED"}},
-                                        "date": matched.game_start_time.isoformat() if matched.game_start_time else datetime.now().isoformat()
+                                        "date": matched.game_start_time.isoformat() if matched.game_start_time else self.clock.now().isoformat()
                                     }]
                                 }
                                 await self._start_tracking_game(
@@ -700,6 +766,9 @@ class BotRunner:
                                     matched_market, game, selected_side=selected_side
                                 )
 
+                    # One upsert for every market matched this pass
+                    await self.market_batch.flush(db)
+
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -723,7 +792,8 @@ class BotRunner:
                     except Exception as log_err:
                         logger.debug(f"Suppressed logging error: {log_err}")
             
-            await asyncio.sleep(self.DISCOVERY_INTERVAL)
+            self._record_loop_iteration("discovery", iteration_started)
+            await self.clock.sleep(self.DISCOVERY_INTERVAL)
     
     async def _espn_poll_loop(self) -> None:
         """
@@ -732,6 +802,7 @@ class BotRunner:
         Runs every ESPN_POLL_INTERVAL seconds.
         """
         while not self._stop_event.is_set():
+            iteration_started = time.perf_counter()
             try:
                 async with async_session_factory() as db:
                     # Use GameTrackerService to update all games
@@ -745,6 +816,10 @@ class BotRunner:
                         logger.info(f"Game finished: {game.home_team} vs {game.away_team}")
                         await self._handle_game_finished(db, game)
 
+                    # Persist this cycle's price and game-state changes in one go
+                    self._stage_market_state()
+                    await self.market_batch.flush(db)
+
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -763,7 +838,8 @@ class BotRunner:
                     except Exception as log_err:
                         logger.debug(f"Suppressed logging error: {log_err}")
             
-            await asyncio.sleep(self.ESPN_POLL_INTERVAL)
+            self._record_loop_iteration("espn_poll", iteration_started)
+            await self.clock.sleep(self.ESPN_POLL_INTERVAL)
 
     async def _price_poll_loop(self) -> None:
         """
@@ -773,8 +849,6 @@ class BotRunner:
         Crucial for Kalshi since we don't have WebSocket price feeds.
         Uses asyncio.gather for parallel HTTP requests instead of sequential polling.
         """
-        PRICE_POLL_INTERVAL = 10.0
-
         async def _fetch_and_update_price(event_id: str, game) -> None:
             """Fetch price for a single market and update tracked game state."""
             try:
@@ -788,19 +862,21 @@ class BotRunner:
 
                 # Kalshi returns prices in cents (1-99). Normalize to 0-1.
                 yes_ask = data.get("yes_ask", 0)
+                await self._record_quote(game, data)
 
                 # Update TrackedGame state
                 game.current_price = float(yes_ask) / 100.0 if yes_ask > 0 else None
 
                 # Update DB model-like market object attached to game
                 if game.market:
-                    game.market.current_price_yes = Decimal(str(game.current_price)) if game.current_price is not None else None
-                    game.market.current_price_no = Decimal(str(1.0 - game.current_price)) if game.current_price is not None else None
+                    game.market.current_price_yes = game.current_price
+                    game.market.current_price_no = 1.0 - game.current_price if game.current_price is not None else None
 
             except Exception as e:
                 logger.warning(f"Failed to fetch price for {game.market.ticker}: {e}")
 
         while not self._stop_event.is_set():
+            iteration_started = time.perf_counter()
             try:
                 # Build list of price fetch tasks for all tracked games with markets
                 tasks = []
@@ -818,7 +894,8 @@ class BotRunner:
             except Exception as e:
                 logger.error(f"Error in price poll loop: {e}")
                 
-            await asyncio.sleep(PRICE_POLL_INTERVAL)
+            self._record_loop_iteration("price_poll", iteration_started)
+            await self.clock.sleep(self.PRICE_POLL_INTERVAL)
     
 
     
@@ -829,6 +906,7 @@ class BotRunner:
         Evaluates entry/exit conditions for all tracked games.
         """
         while not self._stop_event.is_set():
+            iteration_started = time.perf_counter()
             try:
                 async with async_session_factory() as db:
                     # Check daily loss limit
@@ -840,7 +918,7 @@ class BotRunner:
                             self.daily_pnl
                         )
                         self.state = BotState.PAUSED
-                        await asyncio.sleep(60)
+                        await self.clock.sleep(60)
                         continue
                 
                     for event_id, game in list(self.tracked_games.items()):
@@ -880,62 +958,100 @@ class BotRunner:
                     except Exception as log_err:
                         logger.debug(f"Suppressed logging error: {log_err}")
             
-            await asyncio.sleep(1)  # Check every second
+            self._record_loop_iteration("trading", iteration_started)
+            await self.clock.sleep(self.TRADING_LOOP_INTERVAL)
     
-    def _build_tracked_market_from_game(self, game: TrackedGame) -> "TrackedMarket":
-        """
-        Build a TrackedMarket object from a TrackedGame for TradingEngine.
-        
-        TradingEngine expects TrackedMarket (DB model format) while bot_runner
-        uses TrackedGame (runtime dataclass). This adapts between them.
-        
-        Note: This creates a detached model object not persisted to DB.
-        """
-        from src.models import TrackedMarket
-        
-        # Handle baseline price - use market's current price if no baseline captured
-        baseline = game.baseline_price
-        if baseline is None:
-            baseline = game.market.current_price_yes if hasattr(game.market, 'current_price_yes') else 0.5
-        
-        # Get current price from tracked game or market discovery
-        current = game.current_price
-        if current is None:
-            current = game.market.current_price_yes if hasattr(game.market, 'current_price_yes') else baseline
-        
-        # Create a TrackedMarket-like object with fields TradingEngine expects
-        market = TrackedMarket(
-            id=game.position_id or uuid.uuid4(),
-            user_id=self.user_id,
-            condition_id=game.market.condition_id or game.market.ticker or "",
-            token_id_yes=game.market.token_id_yes or "",
-            token_id_no=game.market.token_id_no or "",
-            question=game.market.question or "",
-            sport=game.sport,
-            home_team=game.home_team,
-            away_team=game.away_team,
-            baseline_price_yes=Decimal(str(baseline)),
-            baseline_price_no=Decimal(str(1 - baseline)),
-            current_price_yes=Decimal(str(current)),
-            current_price_no=Decimal(str(1 - current)),
-            is_live=game.game_status == "in",
-            current_period=game.period,
-        )
-        return market
+    def _stage_market_state(self) -> None:
+        """Stage current prices and game state of every tracked game for the next flush."""
+        for game in self.tracked_games.values():
+            if not game.market or not self.user_id:
+                continue
+            fields: dict[str, Any] = {
+                "is_live": game.game_status == "in",
+                "is_finished": game.game_status == "post",
+                "current_period": game.period,
+                "home_score": game.home_score,
+                "away_score": game.away_score,
+            }
+            if game.current_price is not None:
+                price_yes = Decimal(str(game.current_price)).quantize(Decimal("0.0001"))
+                fields["current_price_yes"] = price_yes
+                fields["current_price_no"] = Decimal("1") - price_yes
+            self.market_batch.stage_state(self.user_id, game.market.condition_id, **fields)
+
+    async def _record_quote(self, game: TrackedGame, data: dict) -> None:
+        """
+        Append a polled Kalshi quote to the price tape and price history cache.
+
+        The first time a ticker is seen, its recent history is reloaded from
+        the tape so charts and baselines survive a restart.
+        """
+        ticker = game.market.ticker
+        now = self.clock.now()
+        bid = (data.get("yes_bid") or 0) / 100.0
+        ask = (data.get("yes_ask") or 0) / 100.0
+        last = (data.get("last_price") or 0) / 100.0
+        volume = float(data.get("volume") or 0)
+
+        if self.price_tape is not None:
+            if ticker not in self._tape_restored:
+                self._tape_restored.add(ticker)
+                since = now - timedelta(hours=PriceHistoryCache.DEFAULT_TTL_HOURS)
+                try:
+                    restored = await self.price_tape.restore_cache(price_cache, ticker, since)
+                    if game.baseline_price is None and restored:
+                        game.baseline_price = await self.price_tape.get_baseline(ticker, since)
+                except Exception as e:
+                    logger.warning(f"Price tape restore failed for {ticker}: {e}")
+            self.price_tape.append(ticker, bid, ask, last, volume, timestamp=now)
+
+        price = last or ask
+        if price > 0:
+            await price_cache.add(
+                ticker,
+                Decimal(str(price)),
+                timestamp=now,
+                bid=Decimal(str(bid)),
+                ask=Decimal(str(ask)),
+                volume=Decimal(str(volume)),
+                source="poll",
+            )
+
+    def _record_loop_iteration(self, loop_name: str, started: float) -> None:
+        """Record how long one background loop iteration took (excluding sleep)."""
+        metrics = self.loop_metrics.get(loop_name)
+        if metrics is None:
+            metrics = self.loop_metrics[loop_name] = LoopMetrics()
+        metrics.record(time.perf_counter() - started)
+    
+    def _build_market_view(self, game: TrackedGame) -> GameMarketView:
+        """
+        Build a read-only market view of a TrackedGame for TradingEngine.
+        
+        TradingEngine only reads prices and identifiers, so the view wraps the
+        runtime dataclass directly instead of constructing a detached
+        TrackedMarket ORM object per evaluation. ORM models are only created
+        when something is actually persisted.
+        """
+        return GameMarketView(game)
     
     def _build_game_state_from_game(self, game: TrackedGame) -> dict:
         """
         Build a game_state dictionary from TrackedGame for TradingEngine.
+        
+        Reads the GameClock cached by GameTrackerService instead of
+        re-parsing the clock string.
         """
-        segment = self._get_game_segment(game)
-        time_remaining = self._get_time_remaining_seconds(game)
+        clock = game.clock_state
         
         return {
             "is_live": game.game_status == "in",
-            "segment": segment,
+            "segment": clock.segment,
             "period": game.period,
             "clock": game.clock,
-            "time_remaining_seconds": time_remaining or 0,
+            "time_remaining_seconds": clock.seconds_remaining or 0,
+            "total_period_seconds": clock.period_seconds or 720,
+            "total_periods": clock.total_periods or 4,
             "home_score": game.home_score,
             "away_score": game.away_score,
             "home_team": game.home_team,
@@ -1009,7 +1125,7 @@ class BotRunner:
         # TIME-BASED ENTRY CUTOFF: Check if too little time remaining
         # Uses frontend config's latest_entry_time_minutes
         if hasattr(self, 'latest_entry_time_minutes'):
-            time_remaining_sec = self._get_time_remaining_seconds(game)
+            time_remaining_sec = game.clock_state.seconds_remaining
             entry_cutoff_sec = self.latest_entry_time_minutes * 60
             if time_remaining_sec is not None and time_remaining_sec < entry_cutoff_sec:
                 logger.debug(
@@ -1019,7 +1135,7 @@ class BotRunner:
                 return
 
         # Build objects for TradingEngine
-        tracked_market = self._build_tracked_market_from_game(game)
+        tracked_market = self._build_market_view(game)
         game_state = self._build_game_state_from_game(game)
         
         # Build overrides from frontend config
@@ -1162,7 +1278,7 @@ class BotRunner:
                     "side": side,
                     "price": price,
                     "size": position_size,
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "timestamp": self.clock.now().isoformat(),
                     "action": "BUY"
                 }
 
@@ -1292,9 +1408,10 @@ class BotRunner:
 
         entry_price = float(position.entry_price)
         current_price = game.current_price
+        clock = game.clock_state
 
         # Build objects for TradingEngine
-        tracked_market = self._build_tracked_market_from_game(game)
+        tracked_market = self._build_market_view(game)
         game_state = self._build_game_state_from_game(game)
         game_state["is_finished"] = game.game_status == "post"
         
@@ -1338,8 +1455,8 @@ class BotRunner:
                 
                 # FRONTEND CONFIG TIME-BASED FORCED EXIT
                 # Uses latest_exit_time_minutes from frontend config
+                time_remaining = clock.seconds_remaining
                 if hasattr(self, 'latest_exit_time_minutes'):
-                    time_remaining = self._get_time_remaining_seconds(game)
                     exit_threshold_sec = self.latest_exit_time_minutes * 60
                     if time_remaining is not None and time_remaining <= exit_threshold_sec:
                         exit_reason = f"time_exit_{time_remaining}s_remaining"
@@ -1353,7 +1470,6 @@ class BotRunner:
                 if not exit_reason:
                     exit_time_remaining = self._get_effective_config(game, 'exit_time_remaining_seconds', None)
                     if exit_time_remaining is not None:
-                        time_remaining = self._get_time_remaining_seconds(game)
                         if time_remaining is not None and time_remaining <= exit_time_remaining:
                             exit_reason = f"time_exit_{time_remaining}s_remaining"
                             exit_message = f"Time-based exit: {time_remaining}s remaining, threshold {exit_time_remaining}s"
@@ -1362,8 +1478,8 @@ class BotRunner:
                 # Segment-based exit (more granular than TradingEngine's segment check)
                 exit_before_segment = self._get_effective_config(game, 'exit_before_segment', None)
                 if not exit_reason and exit_before_segment:
-                    current_segment = self._get_game_segment(game)
-                    if self._is_past_segment(current_segment, exit_before_segment):
+                    current_segment = clock.segment
+                    if is_past_segment(current_segment, exit_before_segment):
                         exit_reason = f"segment_exit_{current_segment}"
                         exit_message = f"Segment-based exit: in {current_segment}, must exit before {exit_before_segment}"
                         logger.info(exit_message)
@@ -1411,7 +1527,7 @@ class BotRunner:
                     "side": position.side,
                     "price": current_price,
                     "size": exit_size,
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "timestamp": self.clock.now().isoformat(),
                     "action": "SELL"
                 }
                 
@@ -1452,7 +1568,7 @@ class BotRunner:
                     entry_price=entry_price,
                     pnl=pnl,
                     exit_reason=exit_reason,
-                    hold_time=datetime.now(timezone.utc) - position.created_at
+                    hold_time=self.clock.now() - position.created_at
                 )
                 
                 logger.info(f"Exit executed: P&L ${pnl:.2f} ({pnl_pct:.1%})")
@@ -1500,7 +1616,7 @@ class BotRunner:
             except Exception as e:
                 logger.error(f"Health check error: {e}")
             
-            await asyncio.sleep(self.HEALTH_CHECK_INTERVAL)
+            await self.clock.sleep(self.HEALTH_CHECK_INTERVAL)
     
     async def _cleanup_loop(self) -> None:
         """
@@ -1514,7 +1630,7 @@ class BotRunner:
         while not self._stop_event.is_set():
             try:
                 async with async_session_factory() as db:
-                    now = datetime.now(timezone.utc)
+                    now = self.clock.now()
                     stale_threshold = timedelta(hours=6)
                     games_to_remove = []
                 
@@ -1577,7 +1693,126 @@ class BotRunner:
             except Exception as e:
                 logger.error(f"Cleanup loop error: {e}")
             
-            await asyncio.sleep(self.CLEANUP_INTERVAL)
+            await self.clock.sleep(self.CLEANUP_INTERVAL)
+    
+    def build_snapshot(self) -> dict[str, Any]:
+        """
+        Runtime state worth keeping across a restart, as JSON-safe data.
+        
+        Configs and user selections are not included; they are reloaded
+        from the database on initialize().
+        """
+        return {
+            "tracked_games": [game_to_dict(game) for game in self.tracked_games.values()],
+            "token_to_game": dict(self.token_to_game),
+            "pending_orders": dict(self.pending_orders),
+            "trading_day": self.clock.now().date().isoformat(),
+            "trades_today": self.trades_today,
+            "daily_pnl": self.daily_pnl,
+            "sport_stats": {
+                sport: {"trades_today": stats.trades_today, "daily_pnl": stats.daily_pnl}
+                for sport, stats in self.sport_stats.items()
+            },
+        }
+    
+    async def save_snapshot(self) -> None:
+        """Checkpoint runtime state for a warm restart."""
+        if self.snapshot_store is None or not self.user_id:
+            return
+        await self.snapshot_store.save(self.user_id, self.build_snapshot())
+    
+    async def _snapshot_loop(self) -> None:
+        """
+        Periodically checkpoint runtime state.
+        
+        Runs every SNAPSHOT_INTERVAL seconds.
+        """
+        while not self._stop_event.is_set():
+            await self.clock.sleep(self.SNAPSHOT_INTERVAL)
+            try:
+                await self.save_snapshot()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.warning(f"Bot snapshot failed: {e}")
+    
+    async def _status_loop(self) -> None:
+        """
+        Periodically republish the status document so long-polling
+        readers see game, price and counter changes.
+        
+        Runs every STATUS_PUBLISH_INTERVAL seconds.
+        """
+        while not self._stop_event.is_set():
+            await self.clock.sleep(self.STATUS_PUBLISH_INTERVAL)
+            try:
+                self.publish_status()
+            except Exception as e:
+                logger.warning(f"Status publish failed: {e}")
+    
+    async def _restore_snapshot(self) -> bool:
+        """
+        Restore tracked games, pending orders and daily counters from the
+        last snapshot, if a recent one exists.
+        
+        Pending orders are re-checked against the exchange here. Positions
+        and quotes of the restored games are reconciled by
+        _recover_positions, which runs next.
+        
+        Returns:
+            True if a snapshot was restored
+        """
+        if self.snapshot_store is None or not self.user_id:
+            return False
+        
+        try:
+            state = await self.snapshot_store.load(self.user_id)
+            if not state:
+                return False
+            games = [game_from_dict(data) for data in state.get("tracked_games", [])]
+        except Exception as e:
+            logger.warning(f"Ignoring bot snapshot: {e}")
+            return False
+        
+        self.tracked_games.update((game.espn_event_id, game) for game in games)
+        self.token_to_game.update(state.get("token_to_game", {}))
+        self.game_tracker.add_games(games)
+        
+        # Daily counters only carry over within the same (UTC) day
+        if state.get("trading_day") == self.clock.now().date().isoformat():
+            self.trades_today = int(state.get("trades_today", 0))
+            self.daily_pnl = float(state.get("daily_pnl", 0.0))
+            for sport, counters in state.get("sport_stats", {}).items():
+                if sport in self.sport_stats:
+                    self.sport_stats[sport].trades_today = int(counters.get("trades_today", 0))
+                    self.sport_stats[sport].daily_pnl = float(counters.get("daily_pnl", 0.0))
+        
+        self.pending_orders = await self._reconcile_pending_orders(state.get("pending_orders", {}))
+        
+        logger.info(
+            f"Restored bot snapshot from {state['saved_at'].isoformat()}: "
+            f"{len(games)} games, {len(self.pending_orders)} pending orders"
+        )
+        return True
+    
+    async def _reconcile_pending_orders(self, orders: dict[str, dict]) -> dict[str, dict]:
+        """
+        Keep only snapshot orders the exchange still reports as open.
+        
+        Orders whose status cannot be fetched are kept.
+        """
+        async def _still_open(order_id: str) -> bool:
+            try:
+                response = await self.trading_client.get_order_status(order_id)
+            except Exception as e:
+                logger.warning(f"Could not check pending order {order_id}: {e}")
+                return True
+            status = (response.get("order", response) or {}).get("status")
+            return status in ("resting", "pending")
+        
+        order_ids = list(orders)
+        still_open = await asyncio.gather(*(_still_open(order_id) for order_id in order_ids))
+        return {order_id: orders[order_id] for order_id, keep in zip(order_ids, still_open) if keep}
     
     async def _recover_positions(self, db: AsyncSession) -> None:
         """
@@ -1586,25 +1821,61 @@ class BotRunner:
         Reconstructs tracked games from positions that were open when
         the bot last stopped. Essential for preventing orphaned positions
         after restarts or crashes.
+        
+        Games already restored from a snapshot are reconciled instead:
+        positions closed since the snapshot are cleared, and their quotes
+        are refreshed in the same batched fetch.
         """
         if not self.user_id:
             return
         
         try:
-            # Get all open positions for user
-            open_positions = await PositionCRUD.get_open_for_user(db, self.user_id)
+            # Open positions and their tracked markets in one query
+            open_positions = await PositionCRUD.get_open_with_markets(db, self.user_id)
+            
+            # Restored games: drop positions closed since the snapshot
+            open_ids = {position.id for position, _ in open_positions}
+            restored = list(self.tracked_games.values())
+            for game in restored:
+                if game.has_position and game.position_id not in open_ids:
+                    game.has_position = False
+                    game.position_id = None
+            already_tracked = {game.position_id: game for game in restored if game.has_position}
             
-            if not open_positions:
+            if not open_positions and not restored:
                 logger.info("No open positions to recover")
                 return
             
             logger.info(f"Recovering {len(open_positions)} open positions")
             
-            for position in open_positions:
-                # Get the tracked market data
-                tracked_market = await TrackedMarketCRUD.get_by_condition_id(
-                    db, self.user_id, position.condition_id
-                )
+            # Current quotes for every recovered or restored ticker in one
+            # batched fetch (Kalshi condition_id is the ticker)
+            tickers = [
+                market.condition_id for position, market in open_positions
+                if market and position.id not in already_tracked
+            ]
+            tickers += [game.market.ticker for game in restored if game.market.ticker]
+            try:
+                quotes = await self.trading_client.get_markets_by_tickers(tickers) if tickers else {}
+            except Exception as e:
+                logger.warning(f"Could not prime quotes for recovered positions: {e}")
+                quotes = {}
+            
+            for game in restored:
+                quote = quotes.get(game.market.ticker)
+                if quote and (quote.get("yes_ask") or 0) > 0:
+                    game.current_price = quote["yes_ask"] / 100.0
+                    game.market.current_price_yes = game.current_price
+                    game.market.current_price_no = 1.0 - game.current_price
+                    await self._record_quote(game, quote)
+            
+            recovered: list[TrackedGame] = []
+            for position, tracked_market in open_positions:
+                if position.id in already_tracked:
+                    sport_key = already_tracked[position.id].sport.lower()
+                    if sport_key in self.sport_stats:
+                        self.sport_stats[sport_key].open_positions += 1
+                    continue
                 
                 if not tracked_market:
                     logger.warning(
@@ -1612,6 +1883,14 @@ class BotRunner:
                     )
                     continue
                 
+                # Live ask when Kalshi returned one, else the last persisted price
+                quote = quotes.get(tracked_market.condition_id)
+                yes_ask = (quote or {}).get("yes_ask") or 0
+                if yes_ask > 0:
+                    price_yes = yes_ask / 100.0
+                else:
+                    price_yes = float(tracked_market.current_price_yes or 0.5)
+                
                 # Reconstruct market object
                 market = DiscoveredMarket(
                     condition_id=tracked_market.condition_id,
@@ -1619,11 +1898,12 @@ class BotRunner:
                     token_id_yes=tracked_market.token_id_yes,
                     token_id_no=tracked_market.token_id_no,
                     sport=tracked_market.sport,
-                    current_price_yes=float(tracked_market.current_price_yes or 0.5),
-                    current_price_no=1.0 - float(tracked_market.current_price_yes or 0.5),
-                    volume_24h=0,
+                    current_price_yes=price_yes,
+                    current_price_no=1.0 - price_yes,
+                    volume_24h=float((quote or {}).get("volume_24h") or 0),
                     liquidity=0,
-                    spread=0.02
+                    spread=0.02,
+                    ticker=tracked_market.condition_id,
                 )
                 
                 # Create tracked game entry.
@@ -1643,14 +1923,14 @@ class BotRunner:
                     away_team=tracked_market.away_team or "Unknown",
                     market=market,
                     baseline_price=float(tracked_market.baseline_price_yes or 0.5),
-                    current_price=float(tracked_market.current_price_yes or 0.5),
+                    current_price=price_yes,
                     has_position=True,
-                    position_id=position.id
+                    position_id=position.id,
+                    last_update=self.clock.now()
                 )
-
-                self.tracked_games[event_id] = tracked
-                self.game_tracker.add_game(tracked)
-                self.token_to_game[market.token_id_yes] = event_id
+                if quote:
+                    await self._record_quote(tracked, quote)
+                recovered.append(tracked)
                 
                 # Update per-sport stats
                 sport_key = tracked_market.sport.lower()
@@ -1662,6 +1942,10 @@ class BotRunner:
                     f"(entry: ${float(position.entry_price):.4f})"
                 )
             
+            self.tracked_games.update((game.espn_event_id, game) for game in recovered)
+            self.token_to_game.update((game.market.token_id_yes, game.espn_event_id) for game in recovered)
+            self.game_tracker.add_games(recovered)
+            
             logger.info(
                 f"Position recovery complete. "
                 f"Tracking {len(self.tracked_games)} games with positions"
@@ -1821,14 +2105,15 @@ class BotRunner:
         baseline_price = Decimal(str(game.baseline_price or 0.5))
         
         # Estimate time remaining based on period and sport
-        time_remaining = self._get_time_remaining_seconds(game) or 600
-        total_period_seconds = self._get_total_period_seconds(game.sport) or 720
+        clock = game.clock_state
+        time_remaining = clock.seconds_remaining or 600
+        total_period_seconds = clock.period_seconds or 720
         
         # Get score differential if available
         score_diff = abs(game.home_score - game.away_score) if game.home_score and game.away_score else None
         
         # Determine periods based on sport
-        total_periods = self._get_total_periods(game.sport)
+        total_periods = clock.total_periods or 4
         
         return self.confidence_scorer.calculate_confidence(
             current_price=current_price,
@@ -1913,27 +2198,11 @@ class BotRunner:
 
     def _get_total_period_seconds(self, sport: str) -> int:
         """Get total seconds in a period for the given sport."""
-        period_lengths = {
-            "nba": 720,    # 12 minutes
-            "nfl": 900,    # 15 minutes  
-            "nhl": 1200,   # 20 minutes
-            "mlb": 0,      # No clock
-            "ncaab": 1200, # 20 minutes
-            "ncaaf": 900,  # 15 minutes
-        }
-        return period_lengths.get(sport.lower(), 720)
+        return get_sport_rules(sport).period_seconds or 720
 
     def _get_total_periods(self, sport: str) -> int:
         """Get total number of periods for the given sport."""
-        total_periods = {
-            "nba": 4,
-            "nfl": 4,
-            "nhl": 3,
-            "mlb": 9,
-            "ncaab": 2,
-            "ncaaf": 4,
-        }
-        return total_periods.get(sport.lower(), 4)
+        return get_sport_rules(sport).total_periods or 4
     
     def _check_sport_trading_hours(self, sport: str) -> bool:
         """
@@ -1956,7 +2225,7 @@ class BotRunner:
             return True  # No hours configured
         
         try:
-            now = datetime.now()
+            now = self.clock.now().astimezone()
             start = datetime.strptime(start_hour, "%H:%M").time()
             end = datetime.strptime(end_hour, "%H:%M").time()
             current_time = now.time()
@@ -2003,14 +2272,12 @@ class BotRunner:
         """
         Determine if a game is LIVE using Kalshi market data.
         
-        Uses market game_start_time to infer if game is in progress.
-        Kalshi API doesn't have explicit 'in-play' status, but markets
-        are open during live games.
+        Uses market game_start_time (or the date embedded in the ticker) to
+        infer if game is in progress. Kalshi API doesn't have explicit
+        'in-play' status, but markets are open during live games.
         
-        Logic:
-        - If game_start_time is set and current_time > game_start_time, game is likely live
-        - If market status is 'open' and past start time, assume game is in progress
-        - Returns False if we can't determine (prefer ESPN status in that case)
+        The start time and sport-specific live window are resolved once in
+        the cached GameClock, so this is just a window comparison.
         
         Args:
             game: Tracked game to check
@@ -2019,45 +2286,7 @@ class BotRunner:
             True if game appears to be live based on Kalshi data
         """
         try:
-            # First check if we have game_start_time from market
-            game_start = game.market.game_start_time
-            if game_start is None:
-                # Try to parse from ticker: KXNBAGAME-26FEB07GSWLAL-LAL
-                game_start = self._parse_game_start_from_ticker(game.market.ticker)
-            
-            if game_start is None:
-                return False  # Can't determine, fall back to ESPN
-            
-            now = datetime.now(timezone.utc)
-            
-            # Game is considered "live" if it has started
-            # Add 15 min buffer before official start to catch tip-off preparation
-            if now >= game_start - timedelta(minutes=5):
-                # NBA games typically last ~2.5 hours, NFL ~3.5 hours
-                # If we're past start time but not too far, game is likely in progress
-                hours_since_start = (now - game_start).total_seconds() / 3600
-                
-                # Sport-specific game duration estimates
-                max_duration_hours = {
-                    'nba': 3.0,
-                    'nfl': 4.0,
-                    'mlb': 4.0,
-                    'nhl': 3.0,
-                }.get(game.sport.lower(), 3.0)
-                
-                # If we're past start but within expected duration, game is live
-                if hours_since_start < max_duration_hours:
-                    logger.debug(
-                        f"Kalshi live detection: {game.home_team} vs {game.away_team} "
-                        f"started {hours_since_start:.1f}h ago (max {max_duration_hours}h)"
-                    )
-                    return True
-                else:
-                    # Game likely over
-                    return False
-            
-            return False  # Game hasn't started yet
-            
+            return game.clock_state.is_live_by_schedule(self.clock.now())
         except Exception as e:
             logger.debug(f"Error in Kalshi live detection: {e}")
             return False
@@ -2068,97 +2297,24 @@ class BotRunner:
         
         Ticker format: KXNBAGAME-26FEB07GSWLAL-LAL
         Date portion: 26FEB07 = Feb 7, 2026
-        
-        Returns approximate start time (7PM local on game day).
         """
-        if not ticker:
-            return None
-            
-        try:
-            import re
-            # Match patterns like 26FEB07, 25JAN15, etc.
-            match = re.search(r'(\d{2})(JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)(\d{2})', ticker.upper())
-            if not match:
-                return None
-            
-            year = int(match.group(1)) + 2000  # 26 -> 2026
-            month_str = match.group(2)
-            day = int(match.group(3))
-            
-            month_map = {
-                'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4,
-                'MAY': 5, 'JUN': 6, 'JUL': 7, 'AUG': 8,
-                'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12
-            }
-            month = month_map.get(month_str, 1)
-            
-            # Default to 7PM EST / 12:00 UTC as typical NBA game start
-            # This is approximate but good enough for live detection
-            game_date = datetime(year, month, day, 0, 0, 0, tzinfo=timezone.utc)
-            
-            return game_date
-            
-        except Exception as e:
-            logger.debug(f"Failed to parse game start from ticker {ticker}: {e}")
-            return None
+        return parse_ticker_start_time(ticker)
 
     def _get_game_segment(self, game: TrackedGame) -> str:
-
         """
-        Get the current game segment (q1, q2, q3, q4, p1, p2, h1, h2, etc.).
+        Get the current game segment (q1, q2, p1, h1, inning_5, etc.).
 
         Args:
             game: Tracked game
 
         Returns:
-            Segment string (e.g., 'q1', 'q2', 'p1', 'h1')
-        """
-        sport = game.sport.lower()
-        period = game.period
-
-        if period <= 0:
-            return "pre"
-
-        # NBA, NFL, NCAA use quarters
-        if sport in ['nba', 'nfl', 'ncaab', 'ncaaf']:
-            if period == 1:
-                return "q1"
-            elif period == 2:
-                return "q2"
-            elif period == 3:
-                return "q3"
-            elif period >= 4:
-                return "q4"
-
-        # NHL uses periods
-        elif sport == 'nhl':
-            if period == 1:
-                return "p1"
-            elif period == 2:
-                return "p2"
-            elif period >= 3:
-                return "p3"
-
-        # Soccer, MMA use halves or rounds
-        elif sport in ['soccer', 'mma']:
-            if period == 1:
-                return "h1"
-            elif period >= 2:
-                return "h2"
-
-        # Tennis, Golf - just use period number
-        elif sport in ['tennis', 'golf']:
-            return f"set{period}"
-
-        # MLB uses innings
-        elif sport == 'mlb':
-            return f"i{period}"
-
-        return f"p{period}"
+            Segment string from the cached GameClock
+        """
+        return game.clock_state.segment
 
     def _get_time_remaining_seconds(self, game: TrackedGame) -> int | None:
         """
-        Parse game clock and estimate total time remaining in game.
+        Estimated total time remaining in game.
 
         Args:
             game: Tracked game
@@ -2166,55 +2322,7 @@ class BotRunner:
         Returns:
             Estimated seconds remaining in game, or None if cannot determine
         """
-        clock = game.clock
-        period = game.period
-        sport = game.sport.lower()
-
-        if not clock:
-            return None
-
-        # Parse clock format (typically "MM:SS" or "M:SS")
-        try:
-            parts = clock.replace(" ", "").split(":")
-            if len(parts) == 2:
-                minutes = int(parts[0])
-                seconds = int(parts[1])
-                clock_seconds = minutes * 60 + seconds
-            else:
-                return None
-        except (ValueError, IndexError):
-            return None
-
-        # Calculate total remaining based on sport
-        if sport in ['nba']:
-            # 12 min quarters, 4 quarters
-            period_length = 12 * 60
-            total_periods = 4
-        elif sport in ['nfl', 'ncaaf']:
-            # 15 min quarters, 4 quarters
-            period_length = 15 * 60
-            total_periods = 4
-        elif sport in ['ncaab']:
-            # 20 min halves, 2 halves (but period counts 1, 2)
-            period_length = 20 * 60
-            total_periods = 2
-        elif sport == 'nhl':
-            # 20 min periods, 3 periods
-            period_length = 20 * 60
-            total_periods = 3
-        elif sport == 'soccer':
-            # 45 min halves, 2 halves
-            period_length = 45 * 60
-            total_periods = 2
-        else:
-            # Default: can't estimate
-            return clock_seconds
-
-        # Remaining in current period + full remaining periods
-        remaining_periods = max(0, total_periods - period)
-        total_remaining = clock_seconds + (remaining_periods * period_length)
-
-        return total_remaining
+        return game.clock_state.seconds_remaining
 
     def _is_past_segment(self, current_segment: str, threshold_segment: str) -> bool:
         """
@@ -2227,23 +2335,7 @@ class BotRunner:
         Returns:
             True if current segment is past threshold
         """
-        # Parse threshold (may include time component like 'q4_2min')
-        threshold_base = threshold_segment.split('_')[0]
-
-        # Define segment order
-        segment_order = {
-            'pre': 0,
-            'q1': 1, 'q2': 2, 'q3': 3, 'q4': 4,
-            'p1': 1, 'p2': 2, 'p3': 3,
-            'h1': 1, 'h2': 2,
-            'i1': 1, 'i2': 2, 'i3': 3, 'i4': 4, 'i5': 5, 'i6': 6, 'i7': 7, 'i8': 8, 'i9': 9,
-            'set1': 1, 'set2': 2, 'set3': 3, 'set4': 4, 'set5': 5,
-        }
-
-        current_order = segment_order.get(current_segment, 0)
-        threshold_order = segment_order.get(threshold_base, 99)
-
-        return current_order >= threshold_order
+        return is_past_segment(current_segment, threshold_segment)
 
     def _get_effective_config(self, game: TrackedGame, param: str, default: Any = None) -> Any:
         """
@@ -2391,6 +2483,11 @@ class BotRunner:
         Returns:
             Dictionary of sport -> stats
         """
+        games_per_sport: dict[str, int] = {}
+        for game in self.tracked_games.values():
+            sport = game.sport.lower()
+            games_per_sport[sport] = games_per_sport.get(sport, 0) + 1
+        
         result = {}
         for sport, stats in self.sport_stats.items():
             result[sport] = {
@@ -2399,10 +2496,7 @@ class BotRunner:
                 "trades_today": stats.trades_today,
                 "daily_pnl": stats.daily_pnl,
                 "open_positions": stats.open_positions,
-                "tracked_games": len([
-                    g for g in self.tracked_games.values() 
-                    if g.sport.lower() == sport
-                ]),
+                "tracked_games": games_per_sport.get(sport, 0),
                 "max_daily_loss": stats.max_daily_loss,
                 "max_exposure": stats.max_exposure
             }
@@ -2540,7 +2634,8 @@ class BotRunner:
             market=market,
             baseline_price=baseline,
             current_price=baseline,
-            selected_side=selected_side
+            selected_side=selected_side,
+            last_update=self.clock.now()
         )
 
         if event_id not in self.tracked_games:
@@ -2556,11 +2651,10 @@ class BotRunner:
                     market.token_id_no
                 )
         
-        # Save to database
-        await TrackedMarketCRUD.create(
-            db,
-            user_id=self.user_id,
-            condition_id=market.condition_id,
+        # Staged; written by the discovery loop's end-of-pass flush
+        self.market_batch.stage_upsert(
+            self.user_id,
+            market.condition_id,
             token_id_yes=market.token_id_yes,
             token_id_no=market.token_id_no,
             sport=sport,
@@ -2631,6 +2725,7 @@ class BotRunner:
             await self.websocket.unsubscribe(game.market.condition_id)
 
         # Update database
+        self.market_batch.forget(self.user_id, game.market.condition_id)
         await TrackedMarketCRUD.deactivate(
             db,
             condition_id=game.market.condition_id
@@ -2640,19 +2735,17 @@ class BotRunner:
             f"Stopped tracking finished game: {game.home_team} vs {game.away_team}"
         )
     
-    def get_status(self) -> dict:
+    def publish_status(self) -> BotStatusSnapshot:
         """
-        Get current bot status including paper trading mode and per-sport stats.
+        Rebuild the status document; the version is bumped only if
+        something in it changed.
         
         Returns:
-            Status dictionary with state, stats, and multi-sport breakdown
+            The current snapshot
         """
+        self._status_dirty = False
         ws_status = "connected" if self.websocket and self.websocket.is_connected else "disconnected"
         
-        runtime = None
-        if self.start_time:
-            runtime = str(datetime.now(timezone.utc) - self.start_time)
-        
         # Count games and positions per sport
         games_by_sport = {}
         for game in self.tracked_games.values():
@@ -2663,39 +2756,74 @@ class BotRunner:
             if game.has_position:
                 games_by_sport[sport]["positions"] += 1
         
+        return self.status_publisher.publish(
+            {
+                "state": self.state.value,
+                "started_at": self.start_time.isoformat() if self.start_time else None,
+                "paper_trading": False,
+                "emergency_stop": self.emergency_stop,
+                "tracked_games": len(self.tracked_games),
+                "enabled_sports": list(self.enabled_sports),
+                "websocket_status": ws_status,
+                "trades_today": self.trades_today,
+                "daily_pnl": self.daily_pnl,
+                "max_daily_loss": self.max_daily_loss,
+                "max_slippage": self.max_slippage,
+                "pending_orders": len(self.pending_orders),
+                "sport_breakdown": games_by_sport,
+                "sport_stats": self.get_sport_stats(),
+            },
+            self.tracked_games.values(),
+        )
+    
+    def status_snapshot(self) -> BotStatusSnapshot:
+        """
+        The cached status snapshot, republished first if the state
+        changed or the status loop hasn't refreshed it recently (e.g.
+        the bot isn't running).
+        """
+        snapshot = self.status_publisher.snapshot
+        if (
+            snapshot is None
+            or self._status_dirty
+            or snapshot.age(self.clock.monotonic()) > 2 * self.STATUS_PUBLISH_INTERVAL
+        ):
+            snapshot = self.publish_status()
+        return snapshot
+    
+    async def wait_for_status(self, version: int, timeout: float) -> BotStatusSnapshot | None:
+        """
+        Wait for a status version newer than `version` (long-poll).
+        
+        Returns:
+            The newer snapshot, or None if the status didn't change in time
+        """
+        snapshot = self.status_snapshot()
+        if snapshot.version != version:
+            return snapshot
+        return await self.status_publisher.wait(version, timeout)
+    
+    def get_status(self) -> dict:
+        """
+        Get current bot status including paper trading mode and per-sport stats.
+        
+        Built from the cached status snapshot plus the values that change
+        on every read (runtime, loop timings).
+        
+        Returns:
+            Status dictionary with state, stats, and multi-sport breakdown
+        """
+        snapshot = self.status_snapshot()
+        
+        runtime = None
+        if self.start_time:
+            runtime = str(self.clock.now() - self.start_time)
+        
         return {
-            "state": self.state.value,
+            **snapshot.document,
             "runtime": runtime,
-            "paper_trading": False,
-            "emergency_stop": self.emergency_stop,
-            "tracked_games": len(self.tracked_games),
-            "enabled_sports": self.enabled_sports,
-            "websocket_status": ws_status,
-            "trades_today": self.trades_today,
-            "daily_pnl": self.daily_pnl,
-            "max_daily_loss": self.max_daily_loss,
-            "max_slippage": self.max_slippage,
-            "pending_orders": len(self.pending_orders),
-            "sport_breakdown": games_by_sport,
-            "sport_stats": self.get_sport_stats(),
-            "games": [
-                {
-                    "event_id": g.espn_event_id,
-                    "matchup": f"{g.away_team} @ {g.home_team}",
-                    "sport": g.sport,
-                    "status": g.game_status,
-                    "period": g.period,
-                    "score": f"{g.away_score}-{g.home_score}",
-                    "baseline_price": g.baseline_price,
-                    "current_price": g.current_price,
-                    "has_position": g.has_position,
-                    "price_change_pct": (
-                        ((g.current_price - g.baseline_price) / g.baseline_price * 100)
-                        if g.baseline_price and g.current_price else 0
-                    )
-                }
-                for g in self.tracked_games.values()
-            ]
+            "loop_metrics": {name: m.to_dict() for name, m in self.loop_metrics.items()},
+            "status_version": snapshot.version,
         }
 
 
@@ -2744,6 +2872,25 @@ def remove_bot_runner(user_id: UUID) -> None:
         logger.info(f"Removed bot instance for user {user_id}")
 
 
+async def save_bot_snapshots() -> int:
+    """
+    Checkpoint every running bot for a warm restart (used on shutdown).
+
+    Returns:
+        Number of snapshots written
+    """
+    saved = 0
+    for user_id, runner in list(_bot_instances.items()):
+        if runner.state != BotState.RUNNING:
+            continue
+        try:
+            await runner.save_snapshot()
+            saved += 1
+        except Exception as e:
+            logger.error(f"Failed to snapshot bot for user {user_id}: {e}")
+    return saved
+
+
 def get_bot_status(user_id: UUID) -> dict | None:
     """
     Get bot status for a user without creating instance.
@@ -2758,3 +2905,27 @@ def get_bot_status(user_id: UUID) -> dict | None:
         return _bot_instances[user_id].get_status()
     return None
 
+
+def get_bot_status_snapshot(user_id: UUID) -> BotStatusSnapshot | None:
+    """
+    Get the cached, versioned status snapshot of a user's bot.
+
+    Returns:
+        Snapshot or None if no bot instance exists
+    """
+    runner = _bot_instances.get(user_id)
+    return runner.status_snapshot() if runner else None
+
+
+async def wait_for_bot_status(user_id: UUID, version: int, timeout: float) -> BotStatusSnapshot | None:
+    """
+    Wait for a user's bot status to move past `version` (long-poll).
+
+    Returns:
+        The newer snapshot, or None if there is no bot or no change in time
+    """
+    runner = _bot_instances.get(user_id)
+    if runner is None:
+        return None
+    return await runner.wait_for_status(version, timeout)
+
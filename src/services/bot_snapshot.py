@@ -0,0 +1,169 @@
+"""
+Warm-restart snapshots of BotRunner runtime state.
+
+A running bot periodically checkpoints what it would otherwise have to
+rebuild after a restart: tracked games with their baselines and markets,
+token mappings, pending orders and the daily counters. Each user has one
+small gzip-compressed JSON file:
+
+    <root>/<user_id>.snap
+
+Writes go to a temporary file that is then renamed over the old one, so a
+crash mid-write leaves the previous snapshot intact. A snapshot older than
+max_age_seconds is ignored on load; the bot then falls back to a cold
+start (discovery plus position recovery from the database).
+
+The snapshot is only a cache. On restore, BotRunner reconciles it against
+the database (open positions) and the exchange (quotes, pending orders).
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+from dataclasses import fields
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from src.config import settings
+from src.core.clock import Clock, system_clock
+from src.services.market_discovery import DiscoveredMarket
+from src.services.types import TrackedGame
+
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+_MARKET_FIELDS = [f.name for f in fields(DiscoveredMarket)]
+_MARKET_DATETIMES = ("game_start_time", "end_date")
+# game_clock is derived and recomputed from the ESPN fields on restore
+_GAME_FIELDS = [f.name for f in fields(TrackedGame) if f.name not in ("market", "game_clock")]
+
+
+def _dt_out(value: datetime | None) -> str | None:
+    return value.isoformat() if value else None
+
+
+def _dt_in(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+def game_to_dict(game: TrackedGame) -> dict[str, Any]:
+    """JSON-safe representation of a tracked game and its market."""
+    data = {name: getattr(game, name) for name in _GAME_FIELDS}
+    data["last_update"] = _dt_out(game.last_update)
+    data["position_id"] = str(game.position_id) if game.position_id else None
+    market = {name: getattr(game.market, name) for name in _MARKET_FIELDS}
+    for name in _MARKET_DATETIMES:
+        market[name] = _dt_out(market[name])
+    data["market"] = market
+    return data
+
+
+def game_from_dict(data: dict[str, Any]) -> TrackedGame:
+    """Inverse of game_to_dict. Unknown keys (from newer versions) are ignored."""
+    market = {k: v for k, v in data["market"].items() if k in _MARKET_FIELDS}
+    for name in _MARKET_DATETIMES:
+        market[name] = _dt_in(market.get(name))
+    game = {k: v for k, v in data.items() if k in _GAME_FIELDS}
+    if game.get("last_update"):
+        game["last_update"] = _dt_in(game["last_update"])
+    else:
+        game.pop("last_update", None)
+    game["position_id"] = UUID(game["position_id"]) if game.get("position_id") else None
+    return TrackedGame(market=DiscoveredMarket(**market), **game)
+
+
+class BotSnapshotStore:
+    """
+    Per-user snapshot files under one directory.
+
+    File I/O runs in a worker thread so checkpoints never block the
+    trading loops.
+    """
+
+    DEFAULT_MAX_AGE_SECONDS = 900
+
+    def __init__(
+        self,
+        root: str | os.PathLike,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+        clock: Clock | None = None,
+    ):
+        self._root = Path(root)
+        self._max_age_seconds = max_age_seconds
+        self._clock = clock or system_clock
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def path_for(self, user_id: UUID) -> Path:
+        return self._root / f"{user_id}.snap"
+
+    async def save(self, user_id: UUID, state: dict[str, Any]) -> int:
+        """
+        Write a snapshot for a user, replacing the previous one.
+
+        Returns:
+            Compressed size in bytes
+        """
+        document = {
+            "version": SNAPSHOT_VERSION,
+            "user_id": str(user_id),
+            "saved_at": self._clock.now().isoformat(),
+            "state": state,
+        }
+        payload = gzip.compress(json.dumps(document, separators=(",", ":")).encode(), compresslevel=6)
+        await asyncio.to_thread(self._write, self.path_for(user_id), payload)
+        return len(payload)
+
+    def _write(self, path: Path, payload: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    async def load(self, user_id: UUID) -> dict[str, Any] | None:
+        """
+        Read a user's snapshot state.
+
+        Returns:
+            The saved state with "saved_at" added, or None if there is no
+            usable snapshot (missing, unreadable, other version or too old)
+        """
+        path = self.path_for(user_id)
+        try:
+            payload = await asyncio.to_thread(path.read_bytes)
+        except FileNotFoundError:
+            return None
+        try:
+            document = json.loads(gzip.decompress(payload))
+            saved_at = datetime.fromisoformat(document["saved_at"])
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable bot snapshot {path}: {e}")
+            return None
+
+        if document.get("version") != SNAPSHOT_VERSION or document.get("user_id") != str(user_id):
+            return None
+        age = (self._clock.now() - saved_at).total_seconds()
+        if age > self._max_age_seconds:
+            logger.info(f"Ignoring bot snapshot for user {user_id}: {age:.0f}s old")
+            return None
+        return {**document["state"], "saved_at": saved_at}
+
+    async def discard(self, user_id: UUID) -> None:
+        """Delete a user's snapshot, if any."""
+        await asyncio.to_thread(self.path_for(user_id).unlink, missing_ok=True)
+
+
+bot_snapshot_store = BotSnapshotStore(
+    settings.bot_snapshot_dir, max_age_seconds=settings.bot_snapshot_max_age_seconds
+)
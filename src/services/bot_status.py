@@ -0,0 +1,142 @@
+"""
+Versioned status documents for BotRunner.
+
+GET /bot/status, the tracked-games and health routes and the dashboard
+stream all read a bot's status, often several times a second per user.
+Instead of rebuilding the games list and per-sport stats on every read,
+the runner publishes a status document about once a second (and right
+after state transitions); readers get that cached snapshot.
+
+Every snapshot carries a version that only increases when the document
+actually changes, so a client can ask "anything newer than version N?"
+and be answered from the version alone, or wait for the next change
+(long-poll) instead of re-polling.
+
+Publishing is incremental: each game's row is rebuilt only when one of
+its fields changed, and unchanged rows are shared between versions.
+Values that change on every read (runtime, loop timings) are not part of
+the document; BotRunner.get_status adds them.
+
+Snapshots are shared between readers and must not be modified.
+"""
+
+import asyncio
+import uuid
+from dataclasses import dataclass, replace
+from typing import Any, Iterable
+
+from src.core.clock import Clock, system_clock
+from src.services.types import TrackedGame
+
+
+@dataclass(frozen=True, slots=True)
+class BotStatusSnapshot:
+    """One published status document."""
+    epoch: str
+    version: int
+    document: dict[str, Any]
+    published_at: float
+
+    @property
+    def etag(self) -> str:
+        """Strong ETag of this version (the epoch changes per runner)."""
+        return f'"bot-{self.epoch}-{self.version}"'
+
+    def age(self, now: float) -> float:
+        """Seconds since the document was last confirmed current, given clock.monotonic()."""
+        return now - self.published_at
+
+
+def _game_fingerprint(game: TrackedGame) -> tuple:
+    return (
+        game.espn_event_id, game.away_team, game.home_team, game.sport, game.game_status,
+        game.period, game.away_score, game.home_score, game.baseline_price,
+        game.current_price, game.has_position,
+    )
+
+
+def game_status_row(game: TrackedGame) -> dict[str, Any]:
+    """The status row of one tracked game."""
+    return {
+        "event_id": game.espn_event_id,
+        "matchup": f"{game.away_team} @ {game.home_team}",
+        "sport": game.sport,
+        "status": game.game_status,
+        "period": game.period,
+        "score": f"{game.away_score}-{game.home_score}",
+        "baseline_price": game.baseline_price,
+        "current_price": game.current_price,
+        "has_position": game.has_position,
+        "price_change_pct": (
+            ((game.current_price - game.baseline_price) / game.baseline_price * 100)
+            if game.baseline_price and game.current_price else 0
+        )
+    }
+
+
+class BotStatusPublisher:
+    """
+    Holds a runner's latest status snapshot and wakes readers waiting
+    for a newer version.
+    """
+
+    def __init__(self, clock: Clock | None = None):
+        self.clock = clock or system_clock
+        self.epoch = uuid.uuid4().hex[:8]
+        self.snapshot: BotStatusSnapshot | None = None
+        # ESPN event id -> (fingerprint, row) of the last published games
+        self._rows: dict[str, tuple[tuple, dict[str, Any]]] = {}
+        self._changed = asyncio.Event()
+        self._stats = {"publishes": 0, "versions": 0}
+
+    def publish(self, document: dict[str, Any], games: Iterable[TrackedGame]) -> BotStatusSnapshot:
+        """
+        Publishes a status document with a "games" list built from games.
+
+        The version is bumped only if the document differs from the
+        previous one.
+        """
+        rows = {}
+        for game in games:
+            fingerprint = _game_fingerprint(game)
+            cached = self._rows.get(game.espn_event_id)
+            if cached is None or cached[0] != fingerprint:
+                cached = (fingerprint, game_status_row(game))
+            rows[game.espn_event_id] = cached
+        self._rows = rows
+        document["games"] = tuple(row for _, row in rows.values())
+
+        self._stats["publishes"] += 1
+        previous = self.snapshot
+        if previous is not None and previous.document == document:
+            # Unchanged rows are the same objects, so this is mostly identity checks
+            self.snapshot = replace(previous, published_at=self.clock.monotonic())
+            return self.snapshot
+
+        version = previous.version + 1 if previous is not None else 1
+        self.snapshot = BotStatusSnapshot(self.epoch, version, document, self.clock.monotonic())
+        self._stats["versions"] += 1
+        # Wake everyone waiting on the previous version
+        self._changed.set()
+        self._changed = asyncio.Event()
+        return self.snapshot
+
+    async def wait(self, version: int, timeout: float) -> BotStatusSnapshot | None:
+        """
+        Waits until a version newer than `version` is published.
+
+        Returns:
+            The newer snapshot, or None if none was published in time
+        """
+        changed = self._changed
+        if self.snapshot is not None and self.snapshot.version != version:
+            return self.snapshot
+        try:
+            await asyncio.wait_for(changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return self.snapshot
+
+    def get_stats(self) -> dict[str, int]:
+        """Publish and version counters."""
+        return {**self._stats, "version": self.snapshot.version if self.snapshot else 0}
@@ -0,0 +1,325 @@
+"""
+Dashboard snapshot service.
+
+Builds the /dashboard/stats payload with three statements instead of one
+query per figure plus one per open position:
+
+    1. A single aggregate over the user's positions (exposure, daily and
+       all-time P&L, win rate) with scalar subqueries for the active market
+       count and bot_enabled.
+    2. Open positions outer-joined to their tracked markets for marks.
+    3. The most recent activity log entries.
+
+Snapshots are cached per user for a few seconds and the exchange balance for
+longer. Commits that touch a user's positions or settings drop that user's
+snapshot immediately (see the session hooks at the bottom of this module);
+credential changes drop the cached balance. The caches are per process, so
+other workers catch up within the TTL.
+"""
+
+import logging
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from itertools import chain
+
+from sqlalchemy import and_, case, event, func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.core.cache import InMemoryCache, balance_cache, dashboard_cache
+from src.db.crud.account import AccountCRUD
+from src.models.activity_log import ActivityLog
+from src.models.global_settings import GlobalSettings
+from src.models.position import Position
+from src.models.tracked_market import TrackedMarket
+from src.models.trading_account import TradingAccount
+from src.schemas.dashboard import DashboardStats, PositionSummary, RecentActivity
+
+
+logger = logging.getLogger(__name__)
+
+
+class DashboardSnapshotService:
+    """
+    Computes and caches per-user dashboard snapshots.
+    """
+
+    SNAPSHOT_TTL_SECONDS = 5
+    BALANCE_TTL_SECONDS = 30
+    # Failed balance lookups are retried sooner than successful ones expire
+    BALANCE_ERROR_TTL_SECONDS = 5
+    RECENT_ACTIVITY_LIMIT = 10
+
+    def __init__(
+        self,
+        snapshots: InMemoryCache = dashboard_cache,
+        balances: InMemoryCache = balance_cache,
+    ):
+        self._snapshots = snapshots
+        self._balances = balances
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    async def get_stats(self, db: AsyncSession, user_id: uuid.UUID) -> DashboardStats:
+        """
+        Returns the user's dashboard snapshot, building it on a cache miss.
+        """
+        key = str(user_id)
+        snapshot = await self._snapshots.get(key)
+        if snapshot is not None:
+            self._stats["hits"] += 1
+            return snapshot
+
+        self._stats["misses"] += 1
+        snapshot = await self.build(db, user_id)
+        await self._snapshots.set(key, snapshot, self.SNAPSHOT_TTL_SECONDS)
+        return snapshot
+
+    async def build(self, db: AsyncSession, user_id: uuid.UUID) -> DashboardStats:
+        """
+        Builds a fresh snapshot from the database (bypasses the snapshot cache).
+        """
+        totals = (await db.execute(self._totals_query(user_id))).one()
+        marks = (await db.execute(self._open_positions_query(user_id))).all()
+        recent = (await db.execute(self._recent_activity_query(user_id))).all()
+        balance_usdc = await self.get_balance(db, user_id)
+
+        position_summaries = []
+        for row in marks:
+            current_price = row.current_price_yes if row.side == "YES" else row.current_price_no
+            unrealized_pnl = None
+            if current_price:
+                unrealized_pnl = current_price * row.entry_size - row.entry_cost_usdc
+            position_summaries.append(PositionSummary(
+                id=row.id,
+                token_id=row.token_id,
+                side=row.side,
+                team=row.team,
+                entry_price=row.entry_price,
+                current_price=current_price,
+                unrealized_pnl=unrealized_pnl,
+                size=row.entry_size,
+                opened_at=row.opened_at,
+            ))
+
+        closed_count = totals.closed_count or 0
+        win_rate = (totals.win_count or 0) / closed_count * 100 if closed_count else 0.0
+
+        return DashboardStats(
+            balance_usdc=balance_usdc,
+            open_positions_count=totals.open_count or 0,
+            open_positions_value=totals.open_exposure or Decimal("0"),
+            total_pnl_today=totals.daily_pnl or Decimal("0"),
+            total_pnl_all_time=totals.total_pnl or Decimal("0"),
+            win_rate=win_rate,
+            active_markets_count=totals.active_markets or 0,
+            bot_status="running" if totals.bot_enabled else "stopped",
+            open_positions=position_summaries,
+            recent_activity=[
+                RecentActivity(
+                    id=row.id,
+                    level=row.level,
+                    category=row.category,
+                    message=row.message,
+                    created_at=row.created_at,
+                )
+                for row in recent
+            ],
+        )
+
+    async def get_balance(self, db: AsyncSession, user_id: uuid.UUID) -> Decimal:
+        """
+        Returns the user's exchange balance, calling Kalshi at most once per TTL.
+        """
+        key = str(user_id)
+        balance = await self._balances.get(key)
+        if balance is not None:
+            return balance
+
+        balance, ok = await self._fetch_balance(db, user_id)
+        ttl = self.BALANCE_TTL_SECONDS if ok else self.BALANCE_ERROR_TTL_SECONDS
+        await self._balances.set(key, balance, ttl)
+        return balance
+
+    def invalidate(self, user_id: uuid.UUID | str) -> None:
+        """
+        Drops a user's cached snapshot.
+        """
+        self._snapshots.discard(str(user_id))
+        self._stats["invalidations"] += 1
+
+    def invalidate_all(self) -> None:
+        """
+        Drops every cached snapshot (used after bulk UPDATE/DELETE statements).
+        """
+        self._snapshots.discard_all()
+        self._stats["invalidations"] += 1
+
+    def invalidate_balance(self, user_id: uuid.UUID | str) -> None:
+        """
+        Drops a user's cached balance and the snapshot that includes it.
+        """
+        self._balances.discard(str(user_id))
+        self.invalidate(user_id)
+
+    def get_cache_stats(self) -> dict:
+        """
+        Hit/miss counters and cache sizes.
+        """
+        return {
+            **self._stats,
+            "snapshots": self._snapshots.size,
+            "balances": self._balances.size,
+        }
+
+    @staticmethod
+    def _totals_query(user_id: uuid.UUID):
+        today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        is_open = Position.status == "open"
+        is_closed = Position.status == "closed"
+
+        active_markets = select(func.count(TrackedMarket.id)).where(
+            TrackedMarket.user_id == user_id,
+            TrackedMarket.is_finished == False,
+        ).scalar_subquery()
+        bot_enabled = select(GlobalSettings.bot_enabled).where(
+            GlobalSettings.user_id == user_id
+        ).scalar_subquery()
+
+        return select(
+            func.count(case((is_open, 1))).label("open_count"),
+            func.coalesce(func.sum(case((is_open, Position.entry_cost_usdc))), 0).label("open_exposure"),
+            func.coalesce(
+                func.sum(case((and_(is_closed, Position.closed_at >= today_start), Position.realized_pnl_usdc))),
+                0,
+            ).label("daily_pnl"),
+            func.coalesce(func.sum(case((is_closed, Position.realized_pnl_usdc))), 0).label("total_pnl"),
+            func.count(case((is_closed, 1))).label("closed_count"),
+            func.count(case((and_(is_closed, Position.realized_pnl_usdc > 0), 1))).label("win_count"),
+            active_markets.label("active_markets"),
+            bot_enabled.label("bot_enabled"),
+        ).select_from(Position).where(Position.user_id == user_id)
+
+    @staticmethod
+    def _open_positions_query(user_id: uuid.UUID):
+        return (
+            select(
+                Position.id,
+                Position.token_id,
+                Position.side,
+                Position.team,
+                Position.entry_price,
+                Position.entry_size,
+                Position.entry_cost_usdc,
+                Position.opened_at,
+                TrackedMarket.current_price_yes,
+                TrackedMarket.current_price_no,
+            )
+            .outerjoin(
+                TrackedMarket,
+                and_(
+                    TrackedMarket.user_id == Position.user_id,
+                    TrackedMarket.condition_id == Position.condition_id,
+                ),
+            )
+            .where(Position.user_id == user_id, Position.status == "open")
+            .order_by(Position.opened_at.desc())
+        )
+
+    @classmethod
+    def _recent_activity_query(cls, user_id: uuid.UUID):
+        return (
+            select(
+                ActivityLog.id,
+                ActivityLog.level,
+                ActivityLog.category,
+                ActivityLog.message,
+                ActivityLog.created_at,
+            )
+            .where(ActivityLog.user_id == user_id)
+            .order_by(ActivityLog.created_at.desc())
+            .limit(cls.RECENT_ACTIVITY_LIMIT)
+        )
+
+    @staticmethod
+    async def _fetch_balance(db: AsyncSession, user_id: uuid.UUID) -> tuple[Decimal, bool]:
+        credentials = await AccountCRUD.get_decrypted_credentials(db, user_id)
+        if not credentials:
+            return Decimal("0"), True
+
+        api_key = credentials.get("api_key")
+        api_secret = credentials.get("api_secret")
+        if not (api_key and api_secret):
+            return Decimal("0"), True
+
+        try:
+            # Only Kalshi supported
+            from src.services.kalshi_client import create_kalshi_client
+            client = create_kalshi_client(api_key=api_key, private_key_pem=api_secret)
+            try:
+                balance_data = await client.get_balance()
+            finally:
+                await client.close()
+            # Kalshi returns balance in cents, but client normalizes to dollars
+            balance_val = balance_data.get("balance", 0) or balance_data.get("available_balance", 0)
+            return Decimal(str(balance_val)), True
+        except Exception as e:
+            logger.warning(f"Failed to fetch balance for user {user_id}: {e}")
+            return Decimal("0"), False
+
+
+# Global service instance
+dashboard_snapshots = DashboardSnapshotService()
+
+
+# ---------------------------------------------------------------------------
+# Cache invalidation on commit
+# ---------------------------------------------------------------------------
+
+_SNAPSHOT_MODELS = (Position, GlobalSettings)
+_DIRTY_USERS = "dashboard_dirty_users"
+_DIRTY_BALANCES = "dashboard_dirty_balances"
+_DIRTY_ALL = "dashboard_dirty_all"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_dashboard_changes(session: Session, flush_context) -> None:
+    """Remembers which users' snapshots a flush touched until the commit lands."""
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, _SNAPSHOT_MODELS):
+            key = _DIRTY_USERS
+        elif isinstance(obj, TradingAccount):
+            key = _DIRTY_BALANCES
+        else:
+            continue
+        # Read the loaded state directly; attribute access could trigger a refresh
+        user_id = inspect(obj).dict.get("user_id")
+        if user_id is None:
+            session.info[_DIRTY_ALL] = True
+        else:
+            session.info.setdefault(key, set()).add(user_id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_dashboard_changes(orm_execute_state) -> None:
+    """Bulk UPDATE/DELETE statements don't say which users they touch."""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if any(m.class_ in _SNAPSHOT_MODELS for m in orm_execute_state.all_mappers):
+        orm_execute_state.session.info[_DIRTY_ALL] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_dashboard_snapshots(session: Session) -> None:
+    if session.info.pop(_DIRTY_ALL, False):
+        dashboard_snapshots.invalidate_all()
+    for user_id in session.info.pop(_DIRTY_USERS, ()):
+        dashboard_snapshots.invalidate(user_id)
+    for user_id in session.info.pop(_DIRTY_BALANCES, ()):
+        dashboard_snapshots.invalidate_balance(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_dashboard_changes(session: Session) -> None:
+    for key in (_DIRTY_ALL, _DIRTY_USERS, _DIRTY_BALANCES):
+        session.info.pop(key, None)
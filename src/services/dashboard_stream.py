@@ -0,0 +1,330 @@
+"""
+Per-user dashboard stream hub for the /dashboard/stream SSE endpoint.
+
+One producer task per user rebuilds the dashboard state every
+INTERVAL_SECONDS (bot status, tracked games, open positions). Any number
+of SSE subscribers (browser tabs) share that producer, so database and
+CPU cost scale with users, not connections.
+
+Each state change gets a new version and is published once, pre-encoded,
+as one of two frames:
+
+    snapshot   full state (a keyframe): first frame for a new subscriber,
+               every KEYFRAME_EVERY versions, and after a resync
+    patch      JSON-Patch style operations (add/remove/replace with JSON
+               Pointer paths) turning the previous version into this one
+
+Frames carry an SSE id of "<epoch>-<version>". A client reconnecting with
+Last-Event-ID (header or last_event_id query param) gets the missed patches
+replayed from a short history, or a fresh snapshot if they are gone. The
+epoch changes whenever a user's stream is recreated, so ids from before a
+restart never match. A subscriber that falls too far behind is dropped back
+to a snapshot instead of blocking the producer.
+"""
+
+import asyncio
+import logging
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, NamedTuple
+
+from src.core.serialization import dumps
+
+
+logger = logging.getLogger(__name__)
+
+StateBuilder = Callable[[uuid.UUID], Awaitable[dict[str, Any]]]
+
+
+class StreamFrame(NamedTuple):
+    """One encoded SSE message."""
+    version: int
+    event: str
+    data: str
+    id: str | None = None
+
+    def encode(self) -> str:
+        head = f"id: {self.id}\n" if self.id else ""
+        return f"{head}event: {self.event}\ndata: {self.data}\n\n"
+
+
+def _pointer(path: str, key: str) -> str:
+    return f"{path}/{key.replace('~', '~0').replace('/', '~1')}"
+
+
+def diff_state(old: Any, new: Any, path: str = "") -> list[dict[str, Any]]:
+    """
+    JSON-Patch operations turning old into new.
+
+    Objects are diffed key by key; any other changed value (including
+    lists) is replaced whole.
+    """
+    if old == new:
+        return []
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return [{"op": "replace", "path": path, "value": new}]
+
+    ops: list[dict[str, Any]] = []
+    for key in old.keys() - new.keys():
+        ops.append({"op": "remove", "path": _pointer(path, str(key))})
+    for key, value in new.items():
+        if key not in old:
+            ops.append({"op": "add", "path": _pointer(path, str(key)), "value": value})
+        else:
+            ops.extend(diff_state(old[key], value, _pointer(path, str(key))))
+    return ops
+
+
+def apply_patch(state: Any, ops: list[dict[str, Any]]) -> Any:
+    """Apply operations from diff_state (the client-side counterpart, used in tests)."""
+    for op in ops:
+        keys = [k.replace("~1", "/").replace("~0", "~") for k in op["path"].split("/")[1:]]
+        if not keys:
+            state = op["value"]
+            continue
+        target = state
+        for key in keys[:-1]:
+            target = target[key]
+        if op["op"] == "remove":
+            del target[keys[-1]]
+        else:
+            target[keys[-1]] = op["value"]
+    return state
+
+
+class _Subscriber:
+    """Bounded frame queue for one connection."""
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue[StreamFrame] = asyncio.Queue(maxsize=maxsize)
+
+    async def get(self, timeout: float | None = None) -> StreamFrame | None:
+        """Next frame, or None if none arrives within timeout."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class _UserStream:
+    """Producer state for one user."""
+
+    def __init__(self, history_size: int):
+        self.epoch = uuid.uuid4().hex[:8]
+        self.version = 0
+        self.state: dict[str, Any] | None = None
+        self.history: deque[StreamFrame] = deque(maxlen=history_size)
+        self.keyframe: StreamFrame | None = None
+        self.subscribers: set[_Subscriber] = set()
+        self.task: asyncio.Task | None = None
+
+    def frame_id(self, version: int) -> str:
+        return f"{self.epoch}-{version}"
+
+    def current_keyframe(self) -> StreamFrame | None:
+        """Snapshot frame of the current version, encoded once per version."""
+        if self.state is None:
+            return None
+        if self.keyframe is None or self.keyframe.version != self.version:
+            self.keyframe = StreamFrame(
+                self.version,
+                "snapshot",
+                dumps({"version": self.version, "state": self.state}),
+                self.frame_id(self.version),
+            )
+        return self.keyframe
+
+    def frames_after(self, last_event_id: str | None) -> list[StreamFrame] | None:
+        """
+        Frames a client that last saw last_event_id has missed, or None
+        if they cannot be replayed (unknown epoch or evicted history).
+        """
+        if not last_event_id:
+            return None
+        epoch, _, version = last_event_id.partition("-")
+        if epoch != self.epoch or not version.isdigit():
+            return None
+        seen = int(version)
+        if seen > self.version:
+            return None
+        missed = [frame for frame in self.history if frame.version > seen]
+        expected = self.version - seen
+        return missed if len(missed) == expected else None
+
+
+class DashboardStreamHub:
+    """
+    Shares one dashboard producer per user among all of that user's
+    SSE connections.
+    """
+
+    INTERVAL_SECONDS = 2.0
+    KEYFRAME_EVERY = 30
+    HISTORY_SIZE = 64
+    SUBSCRIBER_QUEUE_SIZE = 32
+
+    def __init__(self, build_state: StateBuilder | None = None, interval: float | None = None):
+        self._build_state = build_state or build_dashboard_state
+        self._interval = self.INTERVAL_SECONDS if interval is None else interval
+        self._streams: dict[uuid.UUID, _UserStream] = {}
+        self._stats = {"builds": 0, "frames": 0, "keyframes": 0, "resyncs": 0, "replays": 0}
+
+    @asynccontextmanager
+    async def subscribe(
+        self,
+        user_id: uuid.UUID,
+        last_event_id: str | None = None,
+    ) -> AsyncIterator[_Subscriber]:
+        """
+        Attach a connection to the user's stream.
+
+        The first frames queued are either the replay after last_event_id
+        or a snapshot of the current state (once one exists). The producer
+        starts with the first subscriber and stops with the last.
+        """
+        stream = self._streams.get(user_id)
+        if stream is None:
+            stream = self._streams[user_id] = _UserStream(self.HISTORY_SIZE)
+        subscriber = _Subscriber(self.SUBSCRIBER_QUEUE_SIZE)
+
+        replay = stream.frames_after(last_event_id)
+        if replay is not None:
+            self._stats["replays"] += 1
+            initial = replay[-self.SUBSCRIBER_QUEUE_SIZE:]
+        else:
+            keyframe = stream.current_keyframe()
+            initial = [keyframe] if keyframe else []
+        for frame in initial:
+            subscriber.queue.put_nowait(frame)
+
+        stream.subscribers.add(subscriber)
+        if stream.task is None or stream.task.done():
+            stream.task = asyncio.create_task(self._produce(user_id, stream), name=f"dashboard-stream-{user_id}")
+        try:
+            yield subscriber
+        finally:
+            stream.subscribers.discard(subscriber)
+            if not stream.subscribers and stream.task is not None:
+                stream.task.cancel()
+                stream.task = None
+
+    async def _produce(self, user_id: uuid.UUID, stream: _UserStream) -> None:
+        while stream.subscribers:
+            try:
+                state = await self._build_state(user_id)
+                self._stats["builds"] += 1
+                self.publish(stream, state)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Dashboard stream build failed for user {user_id}: {e}")
+                self._broadcast(stream, StreamFrame(stream.version, "error", dumps({"error": str(e)})))
+            await asyncio.sleep(self._interval)
+
+    def publish(self, stream: _UserStream, state: dict[str, Any]) -> StreamFrame | None:
+        """
+        Record a newly built state and fan out its frame.
+
+        Returns:
+            The published frame, or None if nothing changed
+        """
+        if state == stream.state:
+            return None
+        previous = stream.state
+        stream.version += 1
+        stream.state = state
+
+        if previous is None or stream.version % self.KEYFRAME_EVERY == 0:
+            frame = stream.current_keyframe()
+            self._stats["keyframes"] += 1
+        else:
+            ops = diff_state(previous, state)
+            frame = StreamFrame(
+                stream.version,
+                "patch",
+                dumps({"version": stream.version, "base": stream.version - 1, "ops": ops}),
+                stream.frame_id(stream.version),
+            )
+        stream.history.append(frame)
+        self._stats["frames"] += 1
+        self._broadcast(stream, frame)
+        return frame
+
+    def _broadcast(self, stream: _UserStream, frame: StreamFrame) -> None:
+        for subscriber in stream.subscribers:
+            try:
+                subscriber.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                # Slow consumer: skip what it missed and resync from a snapshot
+                while not subscriber.queue.empty():
+                    subscriber.queue.get_nowait()
+                keyframe = stream.current_keyframe()
+                if keyframe:
+                    subscriber.queue.put_nowait(keyframe)
+                self._stats["resyncs"] += 1
+
+    async def close(self) -> None:
+        """Stop all producers (application shutdown)."""
+        tasks = [stream.task for stream in self._streams.values() if stream.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._streams.clear()
+
+    def get_stats(self) -> dict[str, int]:
+        """Counters plus current users and connections."""
+        return {
+            **self._stats,
+            "users": sum(1 for s in self._streams.values() if s.subscribers),
+            "subscribers": sum(len(s.subscribers) for s in self._streams.values()),
+        }
+
+
+async def build_dashboard_state(user_id: uuid.UUID) -> dict[str, Any]:
+    """
+    Current dashboard stream state for a user.
+
+    Games and positions are keyed by id so patches address single rows.
+    """
+    # Imported here: bot_runner imports half the service layer
+    from src.db.crud.position import PositionCRUD
+    from src.db.database import async_session_factory
+    from src.services.bot_runner import get_bot_status
+
+    bot_status = get_bot_status(user_id)
+    if bot_status:
+        status = {
+            "state": bot_status.get("state", "stopped"),
+            "tracked_games": bot_status.get("tracked_games", 0),
+            "trades_today": bot_status.get("trades_today", 0),
+            "daily_pnl": bot_status.get("daily_pnl", 0),
+            "websocket_status": bot_status.get("websocket_status", "disconnected"),
+            "runtime": bot_status.get("runtime"),
+        }
+        games = {game["event_id"]: game for game in bot_status.get("games", [])}
+    else:
+        status = {"state": "stopped"}
+        games = {}
+
+    async with async_session_factory() as session:
+        positions = await PositionCRUD.get_open_for_user(session, user_id)
+
+    return {
+        "status": status,
+        "games": games,
+        "positions": {
+            str(p.id): {
+                "id": str(p.id),
+                "condition_id": p.condition_id,
+                "side": p.side,
+                "entry_price": float(p.entry_price),
+                "entry_size": float(p.entry_size),
+                "team": p.team,
+            }
+            for p in positions
+        },
+    }
+
+
+dashboard_stream_hub = DashboardStreamHub()
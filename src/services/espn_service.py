@@ -14,6 +14,7 @@ import httpx
 from src.core.exceptions import ESPNAPIError
 from src.core.retry import retry_async, espn_circuit
 from src.core.cache import espn_cache
+from src.services.game_clock import SPORT_RULES, get_sport_rules, parse_clock_seconds
 
 
 logger = logging.getLogger(__name__)
@@ -384,93 +385,16 @@ class ESPNService:
         "ncaa_hockey": "50",
     }
     
-    # Default segment mappings by sport type
-    # Individual league overrides can be added as needed
+    # Segment mappings by league, derived from the shared sport rules registry
     SEGMENT_MAPPING = {
-        # Basketball - quarters
-        "nba": {1: "q1", 2: "q2", 3: "q3", 4: "q4"},
-        "wnba": {1: "q1", 2: "q2", 3: "q3", 4: "q4"},
-        "nba_gleague": {1: "q1", 2: "q2", 3: "q3", 4: "q4"},
-        "euroleague": {1: "q1", 2: "q2", 3: "q3", 4: "q4"},
-        "eurocup": {1: "q1", 2: "q2", 3: "q3", 4: "q4"},
-        "spanish_acb": {1: "q1", 2: "q2", 3: "q3", 4: "q4"},
-        "australian_nbl": {1: "q1", 2: "q2", 3: "q3", 4: "q4"},
-        "fiba": {1: "q1", 2: "q2", 3: "q3", 4: "q4"},
-        "ncaab": {1: "h1", 2: "h2"},  # College basketball uses halves
-        "ncaaw": {1: "h1", 2: "h2"},
-        
-        # Football - quarters
-        "nfl": {1: "q1", 2: "q2", 3: "q3", 4: "q4"},
-        "ncaaf": {1: "q1", 2: "q2", 3: "q3", 4: "q4"},
-        "cfl": {1: "q1", 2: "q2", 3: "q3", 4: "q4"},
-        "xfl": {1: "q1", 2: "q2", 3: "q3", 4: "q4"},
-        "usfl": {1: "q1", 2: "q2", 3: "q3", 4: "q4"},
-        
-        # Hockey - periods
-        "nhl": {1: "p1", 2: "p2", 3: "p3"},
-        "ahl": {1: "p1", 2: "p2", 3: "p3"},
-        "khl": {1: "p1", 2: "p2", 3: "p3"},
-        "shl": {1: "p1", 2: "p2", 3: "p3"},
-        "ncaa_hockey": {1: "p1", 2: "p2", 3: "p3"},
-        "iihf": {1: "p1", 2: "p2", 3: "p3"},
-        
-        # Baseball - innings (handled dynamically)
-        "mlb": {},
-        "ncaa_baseball": {},
-        "npb": {},
-        "kbo": {},
-        "mexican_baseball": {},
-        
-        # Tennis - sets
-        "atp": {1: "set_1", 2: "set_2", 3: "set_3", 4: "set_4", 5: "set_5"},
-        "wta": {1: "set_1", 2: "set_2", 3: "set_3"},
-        "australian_open": {1: "set_1", 2: "set_2", 3: "set_3", 4: "set_4", 5: "set_5"},
-        "french_open": {1: "set_1", 2: "set_2", 3: "set_3", 4: "set_4", 5: "set_5"},
-        "wimbledon": {1: "set_1", 2: "set_2", 3: "set_3", 4: "set_4", 5: "set_5"},
-        "us_open_tennis": {1: "set_1", 2: "set_2", 3: "set_3", 4: "set_4", 5: "set_5"},
-        "davis_cup": {1: "set_1", 2: "set_2", 3: "set_3", 4: "set_4", 5: "set_5"},
-        
-        # MMA - rounds
-        "ufc": {1: "r1", 2: "r2", 3: "r3", 4: "r4", 5: "r5"},
-        "bellator": {1: "r1", 2: "r2", 3: "r3", 4: "r4", 5: "r5"},
-        "pfl": {1: "r1", 2: "r2", 3: "r3", 4: "r4", 5: "r5"},
-        "one_championship": {1: "r1", 2: "r2", 3: "r3", 4: "r4", 5: "r5"},
-        "boxing": {1: "r1", 2: "r2", 3: "r3", 4: "r4", 5: "r5", 6: "r6", 7: "r7", 8: "r8", 9: "r9", 10: "r10", 11: "r11", 12: "r12"},
-        
-        # Golf - no periods, uses holes
-        "pga": {},
-        "lpga": {},
-        "european_tour": {},
-        "masters": {},
-        "us_open_golf": {},
-        "british_open": {},
-        "pga_championship": {},
-        "liv_golf": {},
-        
-        # Motorsports - laps
-        "f1": {},
-        "nascar": {},
-        "indycar": {},
-        "motogp": {},
+        league: dict(enumerate(rules.segments, start=1))
+        for league, rules in SPORT_RULES.items()
     }
     
-    # All soccer leagues use halves - generate dynamically
-    SOCCER_SEGMENT = {1: "h1", 2: "h2"}
-    
-    # Add all soccer leagues to segment mapping
-    for category in ["soccer_england", "soccer_spain", "soccer_germany", "soccer_italy", 
-                     "soccer_france", "soccer_europe_other", "soccer_uefa", "soccer_americas",
-                     "soccer_asia", "soccer_international"]:
-        for league in SPORT_CATEGORIES.get(category, []):
-            SEGMENT_MAPPING[league] = SOCCER_SEGMENT
-    
     # Sports where clock counts UP instead of DOWN (all soccer leagues)
-    CLOCK_COUNTUP_SPORTS = set()
-    for category in ["soccer_england", "soccer_spain", "soccer_germany", "soccer_italy", 
-                     "soccer_france", "soccer_europe_other", "soccer_uefa", "soccer_americas",
-                     "soccer_asia", "soccer_international"]:
-        for league in SPORT_CATEGORIES.get(category, []):
-            CLOCK_COUNTUP_SPORTS.add(league)
+    CLOCK_COUNTUP_SPORTS = {
+        league for league, rules in SPORT_RULES.items() if rules.clock_counts_up
+    }
     
     @classmethod
     def get_available_leagues(cls) -> list[dict]:
@@ -752,7 +676,8 @@ class ESPNService:
         
         # Safe period access
         safe_period = period if period is not None else 0
-        segment = self._normalize_segment(safe_period, sport)
+        rules = get_sport_rules(sport)
+        segment = rules.segment_for(safe_period)
         
         start_time = None
         if game.get("date"):
@@ -770,12 +695,12 @@ class ESPNService:
         current_inning_half = "top"
         
         # Soccer: calculate elapsed minutes (clock counts UP)
-        if sport_lower in self.CLOCK_COUNTUP_SPORTS:
+        if rules.clock_counts_up:
             # For soccer, clock_seconds IS elapsed time, not remaining
             elapsed_minutes = clock_seconds / 60
-            # Calculate period contribution (45 min per half)
-            if period == 2:
-                elapsed_minutes += 45
+            # Add completed periods (45 min per half)
+            if safe_period > 1:
+                elapsed_minutes += (safe_period - 1) * rules.period_seconds / 60
         
         # MLB: parse inning details
         elif sport_lower == "mlb":
@@ -822,15 +747,7 @@ class ESPNService:
         Converts clock display string to seconds.
         Handles formats like "12:00", "5:30", "0:45"
         """
-        try:
-            parts = clock_display.split(":")
-            if len(parts) == 2:
-                minutes = int(parts[0])
-                seconds = int(parts[1])
-                return minutes * 60 + seconds
-            return 0
-        except (ValueError, IndexError):
-            return 0
+        return parse_clock_seconds(clock_display) or 0
     
     def _normalize_segment(self, period: int, sport: str) -> str:
         """
@@ -843,19 +760,7 @@ class ESPNService:
         Returns:
             Normalized segment string (e.g., "q1", "p2", "inning_5")
         """
-        sport_lower = sport.lower()
-        
-        if sport_lower in self.SEGMENT_MAPPING:
-            mapping = self.SEGMENT_MAPPING[sport_lower]
-            segment = mapping.get(period)
-            if segment:
-                return segment
-            return "ot"
-        
-        if sport_lower == "mlb":
-            return f"inning_{period}"
-        
-        return f"period_{period}"
+        return get_sport_rules(sport).segment_for(period)
     
     async def get_live_games(self, sport: str) -> list[dict[str, Any]]:
         """
@@ -0,0 +1,412 @@
+"""
+Sport rules registry and derived game-clock state.
+
+Single source of truth for per-sport period structure (segment labels,
+period length, clock direction, expected game duration). GameTrackerService
+computes a GameClock from these rules once per ESPN update and caches it on
+the TrackedGame, so entry/exit evaluations read segment and time remaining
+without re-parsing the clock string.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timezone, timedelta
+
+
+logger = logging.getLogger(__name__)
+
+
+# Segment label used before the first period and once periods run past the
+# regulation structure (overtime, extra innings are handled by templates).
+PRE_GAME_SEGMENT = "pre"
+OVERTIME_SEGMENT = "ot"
+
+# Kalshi tickers embed the game date: KXNBAGAME-26FEB07GSWLAL-LAL
+_TICKER_DATE_RE = re.compile(
+    r"(\d{2})(JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)(\d{2})"
+)
+_MONTHS = {
+    "JAN": 1, "FEB": 2, "MAR": 3, "APR": 4, "MAY": 5, "JUN": 6,
+    "JUL": 7, "AUG": 8, "SEP": 9, "OCT": 10, "NOV": 11, "DEC": 12,
+}
+_SEGMENT_NUMBER_RE = re.compile(r"(\d+)$")
+# Exit thresholds may carry a time component: "q4_2min"
+_THRESHOLD_SUFFIX_RE = re.compile(r"_\d+min$")
+
+# Minutes before scheduled start at which schedule-based detection treats
+# a game as live (tip-off preparation, clock drift between feeds).
+LIVE_START_BUFFER = timedelta(minutes=5)
+
+
+@dataclass(frozen=True, slots=True)
+class SportRules:
+    """
+    Period structure for a sport or league.
+
+    Attributes:
+        segments: Segment labels for regulation periods, in order
+        period_seconds: Length of one period in seconds (0 = untimed)
+        clock_counts_up: True when the game clock shows elapsed time (soccer)
+        max_duration_hours: Expected wall-clock length used for live detection
+        segment_template: Label format for sports without a fixed period list
+        regulation_periods: Period count when segments is empty (e.g. innings)
+    """
+    segments: tuple[str, ...] = ()
+    period_seconds: int = 0
+    clock_counts_up: bool = False
+    max_duration_hours: float = 3.0
+    segment_template: str | None = None
+    regulation_periods: int = 0
+
+    @property
+    def total_periods(self) -> int:
+        """Number of regulation periods."""
+        return len(self.segments) or self.regulation_periods
+
+    @property
+    def total_seconds(self) -> int:
+        """Regulation game length in seconds (0 if untimed)."""
+        return self.period_seconds * self.total_periods
+
+    def segment_for(self, period: int) -> str:
+        """
+        Map an ESPN period number to a normalized segment label.
+
+        Args:
+            period: Period number from ESPN (0 before the game starts)
+
+        Returns:
+            Segment string (e.g., 'q3', 'h2', 'inning_7', 'ot')
+        """
+        if period <= 0:
+            return PRE_GAME_SEGMENT
+        if self.segments:
+            if period <= len(self.segments):
+                return self.segments[period - 1]
+            return OVERTIME_SEGMENT
+        if self.segment_template:
+            return self.segment_template.format(period)
+        return f"period_{period}"
+
+
+def _labels(prefix: str, count: int) -> tuple[str, ...]:
+    return tuple(f"{prefix}{i}" for i in range(1, count + 1))
+
+
+QUARTERS_12 = SportRules(segments=_labels("q", 4), period_seconds=720)
+QUARTERS_10 = SportRules(segments=_labels("q", 4), period_seconds=600)
+QUARTERS_15 = SportRules(segments=_labels("q", 4), period_seconds=900, max_duration_hours=4.0)
+COLLEGE_HALVES = SportRules(segments=_labels("h", 2), period_seconds=1200)
+HOCKEY_PERIODS = SportRules(segments=_labels("p", 3), period_seconds=1200)
+INNINGS = SportRules(segment_template="inning_{}", regulation_periods=9, max_duration_hours=4.0)
+SOCCER_HALVES = SportRules(
+    segments=_labels("h", 2), period_seconds=2700, clock_counts_up=True, max_duration_hours=2.5
+)
+SETS_5 = SportRules(segments=_labels("set_", 5), max_duration_hours=5.0)
+SETS_3 = SportRules(segments=_labels("set_", 3))
+ROUNDS_5 = SportRules(segments=_labels("r", 5), period_seconds=300, max_duration_hours=1.0)
+ROUNDS_12 = SportRules(segments=_labels("r", 12), period_seconds=180, max_duration_hours=1.5)
+UNTIMED = SportRules(max_duration_hours=5.0)
+DEFAULT_RULES = SportRules()
+
+# ESPN soccer league keys (mirrors ESPNService.SPORT_CATEGORIES soccer_*)
+SOCCER_LEAGUES = (
+    # England / Spain / Germany / Italy / France
+    "epl", "championship", "league_one", "league_two", "fa_cup", "efl_cup",
+    "laliga", "laliga2", "copa_del_rey",
+    "bundesliga", "bundesliga2", "dfb_pokal",
+    "seriea", "serieb", "coppa_italia",
+    "ligue1", "ligue2", "coupe_de_france",
+    # Rest of Europe
+    "eredivisie", "liga_portugal", "scottish", "belgian", "turkish", "russian", "greek",
+    "austrian", "swiss", "danish", "norwegian", "swedish", "polish", "czech", "ukrainian",
+    # UEFA
+    "ucl", "europa", "conference", "nations_league", "euro_qualifiers", "euros",
+    # Americas
+    "mls", "usl", "nwsl", "us_open_cup", "brazilian", "brazilian_b", "copa_brazil",
+    "libertadores", "sudamericana", "argentine", "mexican", "liga_mx_cup", "colombian",
+    "chilean", "peruvian", "copa_america",
+    # Asia / Oceania
+    "saudi", "japanese", "korean", "chinese", "australian_aleague", "indian", "afc_champions",
+    # International
+    "world_cup", "world_cup_qualifiers", "club_world_cup", "womens_world_cup",
+    "concacaf_gold", "concacaf_nations",
+)
+
+
+SPORT_RULES: dict[str, SportRules] = {
+    # Basketball
+    "nba": QUARTERS_12,
+    "wnba": QUARTERS_10,
+    "nba_gleague": QUARTERS_12,
+    "euroleague": QUARTERS_10,
+    "eurocup": QUARTERS_10,
+    "spanish_acb": QUARTERS_10,
+    "australian_nbl": QUARTERS_10,
+    "fiba": QUARTERS_10,
+    "ncaab": COLLEGE_HALVES,
+    "ncaaw": COLLEGE_HALVES,
+
+    # Football
+    "nfl": QUARTERS_15,
+    "ncaaf": QUARTERS_15,
+    "cfl": QUARTERS_15,
+    "xfl": QUARTERS_15,
+    "usfl": QUARTERS_15,
+
+    # Hockey
+    "nhl": HOCKEY_PERIODS,
+    "ahl": HOCKEY_PERIODS,
+    "khl": HOCKEY_PERIODS,
+    "shl": HOCKEY_PERIODS,
+    "ncaa_hockey": HOCKEY_PERIODS,
+    "iihf": HOCKEY_PERIODS,
+
+    # Baseball
+    "mlb": INNINGS,
+    "ncaa_baseball": INNINGS,
+    "npb": INNINGS,
+    "kbo": INNINGS,
+    "mexican_baseball": INNINGS,
+
+    # Tennis
+    "tennis": SETS_5,
+    "atp": SETS_5,
+    "wta": SETS_3,
+    "australian_open": SETS_5,
+    "french_open": SETS_5,
+    "wimbledon": SETS_5,
+    "us_open_tennis": SETS_5,
+    "davis_cup": SETS_5,
+
+    # Combat
+    "mma": ROUNDS_5,
+    "ufc": ROUNDS_5,
+    "bellator": ROUNDS_5,
+    "pfl": ROUNDS_5,
+    "one_championship": ROUNDS_5,
+    "boxing": ROUNDS_12,
+
+    # Soccer - every league uses halves with a count-up clock
+    "soccer": SOCCER_HALVES,
+    **{league: SOCCER_HALVES for league in SOCCER_LEAGUES},
+
+    # Golf / motorsports have no periods
+    "golf": UNTIMED,
+    "pga": UNTIMED,
+    "lpga": UNTIMED,
+    "european_tour": UNTIMED,
+    "masters": UNTIMED,
+    "us_open_golf": UNTIMED,
+    "british_open": UNTIMED,
+    "pga_championship": UNTIMED,
+    "liv_golf": UNTIMED,
+    "f1": UNTIMED,
+    "nascar": UNTIMED,
+    "indycar": UNTIMED,
+    "motogp": UNTIMED,
+}
+
+
+def get_sport_rules(sport: str | None) -> SportRules:
+    """
+    Look up rules for a sport, falling back to an untimed default.
+
+    Args:
+        sport: Sport or league key (e.g., 'nba', 'epl')
+
+    Returns:
+        SportRules for the sport
+    """
+    if not sport:
+        return DEFAULT_RULES
+    return SPORT_RULES.get(sport.lower(), DEFAULT_RULES)
+
+
+def parse_clock_seconds(clock: str | None) -> int | None:
+    """
+    Parse an ESPN display clock ("MM:SS" / "M:SS") into seconds.
+
+    Returns:
+        Seconds on the clock, or None if the string is empty or malformed
+    """
+    if not clock:
+        return None
+    parts = clock.replace(" ", "").split(":")
+    if len(parts) != 2:
+        return None
+    try:
+        return int(parts[0]) * 60 + int(parts[1])
+    except ValueError:
+        return None
+
+
+def parse_ticker_start_time(ticker: str | None) -> datetime | None:
+    """
+    Parse the game date from a Kalshi ticker.
+
+    Ticker format: KXNBAGAME-26FEB07GSWLAL-LAL (26FEB07 = Feb 7, 2026).
+    Returns midnight UTC on the game day, which is approximate but good
+    enough for live detection.
+    """
+    if not ticker:
+        return None
+    match = _TICKER_DATE_RE.search(ticker.upper())
+    if not match:
+        return None
+    try:
+        return datetime(
+            int(match.group(1)) + 2000,
+            _MONTHS[match.group(2)],
+            int(match.group(3)),
+            tzinfo=timezone.utc,
+        )
+    except ValueError as e:
+        logger.debug(f"Failed to parse game start from ticker {ticker}: {e}")
+        return None
+
+
+def segment_rank(segment: str) -> int | None:
+    """
+    Ordinal position of a segment within a game.
+
+    'pre' ranks first, numbered segments rank by their number and
+    overtime ranks after every regulation segment.
+
+    Returns:
+        Rank, or None for unrecognized labels
+    """
+    if segment == PRE_GAME_SEGMENT:
+        return 0
+    if segment == OVERTIME_SEGMENT:
+        return 100
+    match = _SEGMENT_NUMBER_RE.search(segment)
+    return int(match.group(1)) if match else None
+
+
+def is_past_segment(current_segment: str, threshold_segment: str) -> bool:
+    """
+    Check if current segment is at or past the threshold segment.
+
+    Args:
+        current_segment: Current game segment (e.g., 'q3')
+        threshold_segment: Threshold segment, optionally with a time suffix
+            (e.g., 'q4_2min')
+
+    Returns:
+        True if current segment is past threshold. Unrecognized thresholds
+        never trigger.
+    """
+    threshold_rank = segment_rank(_THRESHOLD_SUFFIX_RE.sub("", threshold_segment))
+    if threshold_rank is None:
+        return False
+    return (segment_rank(current_segment) or 0) >= threshold_rank
+
+
+@dataclass(frozen=True, slots=True)
+class GameClock:
+    """
+    Derived clock state for a tracked game.
+
+    Computed once per ESPN update by GameTrackerService and cached on
+    TrackedGame.game_clock. Immutable so evaluations can share it freely.
+    """
+    segment: str
+    period: int
+    clock_seconds: int | None
+    seconds_remaining: int | None
+    elapsed_fraction: float | None
+    is_live_espn: bool
+    start_time: datetime | None
+    period_seconds: int
+    total_periods: int
+    live_until: datetime | None = None
+    computed_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def is_live(self, now: datetime | None = None) -> bool:
+        """
+        Whether the game is in progress.
+
+        True if ESPN reports the game as live, otherwise falls back to the
+        scheduled start window (start - buffer .. start + expected duration).
+        """
+        return self.is_live_espn or self.is_live_by_schedule(now)
+
+    def is_live_by_schedule(self, now: datetime | None = None) -> bool:
+        """Schedule-based live detection used when ESPN status is unavailable."""
+        if self.start_time is None or self.live_until is None:
+            return False
+        now = now or datetime.now(timezone.utc)
+        return self.start_time - LIVE_START_BUFFER <= now < self.live_until
+
+    @classmethod
+    def compute(
+        cls,
+        sport: str,
+        game_status: str,
+        period: int,
+        clock: str,
+        start_time: datetime | None = None,
+        now: datetime | None = None,
+    ) -> "GameClock":
+        """
+        Build clock state from raw ESPN fields.
+
+        Args:
+            sport: Sport or league key
+            game_status: ESPN state ('pre', 'in', 'post')
+            period: Current period number
+            clock: ESPN display clock
+            start_time: Scheduled start (market start time or ticker date)
+            now: Computation timestamp (defaults to current UTC time)
+
+        Returns:
+            GameClock snapshot
+        """
+        rules = get_sport_rules(sport)
+        period = period or 0
+        clock_seconds = parse_clock_seconds(clock)
+        total_periods = rules.total_periods
+
+        seconds_remaining: int | None = None
+        if clock_seconds is not None:
+            if rules.period_seconds and total_periods:
+                in_period = clock_seconds
+                if rules.clock_counts_up:
+                    in_period = max(0, rules.period_seconds - clock_seconds)
+                remaining_periods = max(0, total_periods - period)
+                seconds_remaining = in_period + remaining_periods * rules.period_seconds
+            else:
+                # Unknown structure - best estimate is the clock itself
+                seconds_remaining = clock_seconds
+
+        elapsed_fraction: float | None = None
+        if game_status == "post":
+            elapsed_fraction = 1.0
+        elif period <= 0:
+            elapsed_fraction = 0.0
+        elif rules.total_seconds and seconds_remaining is not None:
+            elapsed_fraction = 1.0 - seconds_remaining / rules.total_seconds
+        elif total_periods:
+            elapsed_fraction = (period - 1) / total_periods
+        if elapsed_fraction is not None:
+            elapsed_fraction = min(1.0, max(0.0, elapsed_fraction))
+
+        live_until = None
+        if start_time is not None:
+            live_until = start_time + timedelta(hours=rules.max_duration_hours)
+
+        return cls(
+            segment=rules.segment_for(period),
+            period=period,
+            clock_seconds=clock_seconds,
+            seconds_remaining=seconds_remaining,
+            elapsed_fraction=elapsed_fraction,
+            is_live_espn=game_status == "in",
+            start_time=start_time,
+            period_seconds=rules.period_seconds,
+            total_periods=total_periods,
+            live_until=live_until,
+            computed_at=now or datetime.now(timezone.utc),
+        )
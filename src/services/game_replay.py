@@ -0,0 +1,282 @@
+"""
+Recorded game replay on a VirtualClock.
+
+A GameRecording is a time-ordered list of ESPN state frames and Kalshi quote
+frames for one game. GameReplay schedules every frame on a VirtualClock and
+applies it to a ReplayESPNService and a KalshiExchangeSimulator, so the real
+BotRunner loops see the game unfold exactly as recorded, only faster.
+
+Recording format (JSON):
+    {
+        "sport": "nba",
+        "event_id": "401585123",
+        "ticker": "KXNBAGAME-26FEB07GSWLAL-LAL",
+        "home_team": "Los Angeles Lakers",
+        "away_team": "Golden State Warriors",
+        "start_time": "2026-02-07T03:30:00+00:00",
+        "frames": [
+            {"at": "2026-02-07T03:30:00+00:00", "espn": {"state": "in", "period": 1,
+             "clock": "12:00", "home_score": 0, "away_score": 0}},
+            {"at": "2026-02-07T03:30:05+00:00", "quote": {"yes_bid": 55, "yes_ask": 57}}
+        ]
+    }
+"""
+
+import json
+import logging
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from typing import Any
+
+from src.core.clock import VirtualClock
+from src.services.espn_service import ESPNService
+from src.services.game_clock import get_sport_rules
+from src.services.kalshi_simulator import KalshiExchangeSimulator
+
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_time(value: str | datetime) -> datetime:
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+@dataclass
+class ReplayFrame:
+    """One recorded observation: an ESPN state update or a Kalshi quote."""
+    at: datetime
+    kind: str  # "espn" or "quote"
+    data: dict[str, Any]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"at": self.at.isoformat(), self.kind: self.data}
+
+
+@dataclass
+class GameRecording:
+    """A single game's ESPN and market history."""
+    sport: str
+    event_id: str
+    ticker: str
+    home_team: str
+    away_team: str
+    start_time: datetime
+    frames: list[ReplayFrame] = field(default_factory=list)
+
+    @property
+    def end_time(self) -> datetime:
+        return self.frames[-1].at if self.frames else self.start_time
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "GameRecording":
+        frames = []
+        for raw in data.get("frames", []):
+            kind = "espn" if "espn" in raw else "quote"
+            frames.append(ReplayFrame(_parse_time(raw["at"]), kind, raw[kind]))
+        # Stable sort keeps the recorded order for frames with equal timestamps
+        frames.sort(key=lambda f: f.at)
+        return cls(
+            sport=data["sport"],
+            event_id=str(data["event_id"]),
+            ticker=data["ticker"],
+            home_team=data["home_team"],
+            away_team=data["away_team"],
+            start_time=_parse_time(data["start_time"]),
+            frames=frames,
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "GameRecording":
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "sport": self.sport,
+            "event_id": self.event_id,
+            "ticker": self.ticker,
+            "home_team": self.home_team,
+            "away_team": self.away_team,
+            "start_time": self.start_time.isoformat(),
+            "frames": [f.to_dict() for f in self.frames],
+        }
+
+    def save(self, path: str | Path) -> None:
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+    @classmethod
+    def synthetic(
+        cls,
+        start_time: datetime,
+        sport: str = "nba",
+        duration_hours: float = 3.0,
+        espn_step_seconds: int = 15,
+        quote_step_seconds: int = 5,
+        seed: int = 0,
+    ) -> "GameRecording":
+        """
+        Generate a plausible game for tests and demos.
+
+        Game time runs linearly across the regulation periods for the given
+        wall duration while the home win price random-walks with the score.
+        """
+        rng = random.Random(seed)
+        rules = get_sport_rules(sport)
+        periods = rules.total_periods or 4
+        period_seconds = rules.period_seconds or 720
+        start_time = _parse_time(start_time)
+        total = int(duration_hours * 3600)
+        date_code = start_time.strftime("%y%b%d").upper()
+
+        frames: list[ReplayFrame] = []
+        home_score = away_score = 0
+        price = 55
+        for t in range(0, total + 1, quote_step_seconds):
+            at = start_time + timedelta(seconds=t)
+            if t % espn_step_seconds == 0:
+                fraction = t / total
+                game_seconds = int(fraction * periods * period_seconds)
+                period = min(periods, game_seconds // period_seconds + 1)
+                remaining = max(0, period * period_seconds - game_seconds)
+                if rng.random() < 0.3:
+                    home_score += rng.choice((1, 2, 2, 3))
+                if rng.random() < 0.3:
+                    away_score += rng.choice((1, 2, 2, 3))
+                frames.append(ReplayFrame(at, "espn", {
+                    "state": "post" if t == total else "in",
+                    "period": period,
+                    "clock": f"{remaining // 60}:{remaining % 60:02d}",
+                    "home_score": home_score,
+                    "away_score": away_score,
+                }))
+            lead = home_score - away_score
+            price = max(3, min(95, price + rng.choice((-2, -1, 0, 1, 2)) + (1 if lead > 5 else -1 if lead < -5 else 0)))
+            frames.append(ReplayFrame(at, "quote", {"yes_bid": price - 1, "yes_ask": price + 1}))
+
+        return cls(
+            sport=sport,
+            event_id=f"replay-{seed}",
+            ticker=f"KX{sport.upper()}GAME-{date_code}AWYHOM-HOM",
+            home_team="Home",
+            away_team="Away",
+            start_time=start_time,
+            frames=frames,
+        )
+
+
+class ReplayESPNService(ESPNService):
+    """ESPNService serving recorded game state instead of calling ESPN."""
+
+    def __init__(self):
+        super().__init__()
+        self._games: dict[str, dict[str, Any]] = {}
+        self.requests = 0
+
+    def register(self, recording: GameRecording) -> None:
+        self._games[recording.event_id] = {
+            "sport": recording.sport.lower(),
+            "home": recording.home_team,
+            "away": recording.away_team,
+            "start": recording.start_time,
+            "state": {"state": "pre", "period": 0, "clock": "", "home_score": 0, "away_score": 0},
+        }
+
+    def update(self, event_id: str, state: dict[str, Any]) -> None:
+        self._games[event_id]["state"] = {**self._games[event_id]["state"], **state}
+
+    def _event(self, event_id: str) -> dict[str, Any]:
+        game = self._games[event_id]
+        state = game["state"]
+        status = {
+            "type": {"state": state["state"]},
+            "period": state["period"],
+            "displayClock": state["clock"],
+        }
+        return {
+            "id": event_id,
+            "date": game["start"].isoformat(),
+            "status": status,
+            "competitions": [{
+                "status": status,
+                "competitors": [
+                    {"homeAway": "home", "score": str(state["home_score"]),
+                     "team": {"displayName": game["home"], "name": game["home"]}},
+                    {"homeAway": "away", "score": str(state["away_score"]),
+                     "team": {"displayName": game["away"], "name": game["away"]}},
+                ],
+            }],
+        }
+
+    async def get_scoreboard(self, sport: str) -> list[dict[str, Any]]:
+        self.requests += 1
+        return [self._event(eid) for eid, g in self._games.items() if g["sport"] == sport.lower()]
+
+    async def get_game_summary(self, sport: str, event_id: str) -> dict[str, Any]:
+        self.requests += 1
+        if event_id not in self._games:
+            return {}
+        return self._event(event_id)
+
+
+class GameReplay:
+    """
+    Schedules a recording's frames on a VirtualClock.
+
+    ESPN frames update the ReplayESPNService; quote frames move the house
+    quote on the simulator, which fills any resting bot orders they cross.
+    """
+
+    def __init__(
+        self,
+        recording: GameRecording,
+        clock: VirtualClock,
+        exchange: KalshiExchangeSimulator,
+        espn: ReplayESPNService,
+        depth: int = 1000,
+    ):
+        self.recording = recording
+        self.clock = clock
+        self.exchange = exchange
+        self.espn = espn
+        self.depth = depth
+        self.frames_applied = 0
+        # (virtual time, kind, data) in the order frames were applied
+        self.applied: list[tuple[datetime, str, dict[str, Any]]] = []
+
+    def schedule(self) -> None:
+        """Register the game with the stand-ins and schedule every frame."""
+        self.espn.register(self.recording)
+        if self.recording.ticker not in self.exchange.markets:
+            self.exchange.add_market(
+                self.recording.ticker,
+                title=f"{self.recording.away_team} at {self.recording.home_team}",
+            )
+        for frame in self.recording.frames:
+            self.clock.call_at(frame.at, lambda frame=frame: self.apply(frame))
+
+    def apply(self, frame: ReplayFrame) -> None:
+        if frame.kind == "espn":
+            self.espn.update(self.recording.event_id, frame.data)
+        else:
+            self.exchange.set_quote(
+                self.recording.ticker,
+                frame.data.get("yes_bid"),
+                frame.data.get("yes_ask"),
+                self.depth,
+            )
+        self.frames_applied += 1
+        self.applied.append((self.clock.now(), frame.kind, frame.data))
+
+    async def run(self, until: datetime | None = None) -> None:
+        """Drive virtual time through the end of the recording (plus `until`, if later)."""
+        end = self.recording.end_time
+        if until is not None and until > end:
+            end = until
+        await self.clock.run_until(end)
@@ -1,12 +1,12 @@
 import logging
 import asyncio
-from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.clock import Clock, system_clock
 from src.services.espn_service import ESPNService
 from src.services.types import TrackedGame
 from src.db.crud.tracked_market import TrackedMarketCRUD
@@ -18,18 +18,27 @@ class GameTrackerService:
     """
     Manages the lifecycle of tracked games:
     - Polling ESPN for updates
-    - Syncing state (score, period, clock)
+    - Syncing state (score, period, clock) and the derived GameClock
     - Handling game completion
     """
     
-    def __init__(self, espn_service: ESPNService):
+    def __init__(self, espn_service: ESPNService, clock: Clock | None = None):
         self.espn_service = espn_service
+        self.clock = clock or system_clock
         self.tracked_games: dict[str, TrackedGame] = {}
         
     def add_game(self, game: TrackedGame) -> None:
         """Start tracking a game."""
+        game.refresh_clock(self.clock.now())
         self.tracked_games[game.espn_event_id] = game
         
+    def add_games(self, games: list[TrackedGame]) -> None:
+        """Start tracking several games at once (e.g. recovered on startup)."""
+        now = self.clock.now()
+        for game in games:
+            game.refresh_clock(now)
+            self.tracked_games[game.espn_event_id] = game
+        
     def get_game(self, event_id: str) -> TrackedGame | None:
         """Get a tracked game by ID."""
         return self.tracked_games.get(event_id)
@@ -68,7 +77,10 @@ class GameTrackerService:
                     else:
                         game.away_score = int(comp.get("score", 0) or 0)
                 
-                game.last_update = datetime.now(timezone.utc)
+                game.last_update = self.clock.now()
+                
+                # Derive segment/time remaining once per update
+                game.refresh_clock(game.last_update)
                 
                 if game.game_status == "post":
                     finished_games.append(game)
@@ -5,7 +5,6 @@ Implements RSA-PSS authentication, order management, and portfolio endpoints
 using the current Kalshi trade-api/v2 at api.elections.kalshi.com.
 """
 
-import asyncio
 import base64
 import logging
 import time
@@ -19,6 +18,9 @@ from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.hazmat.primitives.serialization import load_pem_private_key
 from cryptography.hazmat.backends import default_backend
 
+from src.config import settings
+from src.core.clock import Clock, system_clock
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,15 +34,27 @@ class KalshiClient:
 
     BASE_URL = "https://api.elections.kalshi.com/trade-api/v2"
 
-    def __init__(self, api_key: str, private_key_pem: str):
+    def __init__(
+        self,
+        api_key: str,
+        private_key_pem: str,
+        base_url: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        clock: Optional[Clock] = None,
+    ):
         """
         Initialize Kalshi client with API credentials.
 
         Args:
             api_key: Kalshi API key ID
             private_key_pem: RSA private key in PEM format
+            base_url: Override for BASE_URL (e.g. a local exchange simulator)
+            transport: Optional httpx transport (e.g. the in-process simulator)
+            clock: Time source for fill polling and retry backoff (defaults to wall time)
         """
         self.api_key = api_key
+        self.clock = clock or system_clock
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")
         # Validate and format the key before loading
         valid, error_msg, formatted_key = self.validate_rsa_key(private_key_pem)
         if not valid:
@@ -52,7 +66,7 @@ class KalshiClient:
             password=None,
             backend=default_backend()
         )
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.client = httpx.AsyncClient(timeout=30.0, transport=transport)
 
     @staticmethod
     def format_private_key(key_str: str) -> str:
@@ -171,7 +185,7 @@ class KalshiClient:
         for attempt in range(max_retries):
             try:
                 headers = self._sign_request(method, path)
-                url = f"{self.BASE_URL}{path}"
+                url = f"{self.base_url}{path}"
 
                 response = await self.client.request(
                     method,
@@ -185,14 +199,14 @@ class KalshiClient:
                     retry_after = int(response.headers.get("Retry-After", 5))
                     wait_time = max(retry_after, 2 ** attempt)
                     logger.warning(f"Rate limited (429), waiting {wait_time}s before retry {attempt + 1}/{max_retries}")
-                    await asyncio.sleep(wait_time)
+                    await self.clock.sleep(wait_time)
                     continue
 
                 # Handle server errors (5xx) with exponential backoff
                 if response.status_code in (500, 502, 503, 504):
                     wait_time = 2 ** attempt
                     logger.warning(f"Server error ({response.status_code}), waiting {wait_time}s before retry {attempt + 1}/{max_retries}")
-                    await asyncio.sleep(wait_time)
+                    await self.clock.sleep(wait_time)
                     continue
 
                 response.raise_for_status()
@@ -215,7 +229,7 @@ class KalshiClient:
                 if attempt < max_retries - 1:
                     wait_time = 2 ** attempt
                     logger.warning(f"HTTP error ({e.response.status_code}), retrying in {wait_time}s...")
-                    await asyncio.sleep(wait_time)
+                    await self.clock.sleep(wait_time)
                     continue
                 raise
             except Exception as e:
@@ -223,7 +237,7 @@ class KalshiClient:
                 if attempt < max_retries - 1:
                     wait_time = 2 ** attempt
                     logger.warning(f"Request error: {str(e)}, retrying in {wait_time}s...")
-                    await asyncio.sleep(wait_time)
+                    await self.clock.sleep(wait_time)
                     continue
 
         raise Exception(f"API request failed after {max_retries} attempts: {str(last_error)}")
@@ -248,6 +262,24 @@ class KalshiClient:
         """Get details for a specific market by ticker."""
         return await self._authenticated_request("GET", f"/markets/{ticker}")
 
+    async def get_markets_by_tickers(self, tickers: List[str], batch_size: int = 200) -> Dict[str, Dict]:
+        """
+        Get current details for many markets, one request per batch_size tickers.
+
+        Returns:
+            Market dicts keyed by ticker; tickers Kalshi does not return are absent
+        """
+        markets: Dict[str, Dict] = {}
+        unique = list(dict.fromkeys(tickers))
+        for i in range(0, len(unique), batch_size):
+            batch = unique[i:i + batch_size]
+            query = urlencode({"tickers": ",".join(batch), "limit": len(batch)})
+            response = await self._authenticated_request("GET", f"/markets?{query}")
+            for market in response.get("markets", []):
+                if market.get("ticker"):
+                    markets[market["ticker"]] = market
+        return markets
+
     async def get_market_history(
         self,
         ticker: str,
@@ -439,10 +471,10 @@ class KalshiClient:
         Returns:
             Final status string: "filled", "canceled", "timeout", or other status
         """
-        start = time.time()
+        start = self.clock.monotonic()
         poll_interval = 1.0
 
-        while time.time() - start < timeout:
+        while self.clock.monotonic() - start < timeout:
             try:
                 resp = await self.get_order_status(order_id)
                 order = resp.get("order", resp)
@@ -457,7 +489,7 @@ class KalshiClient:
             except Exception as e:
                 logger.warning(f"Error polling order {order_id}: {e}")
 
-            await asyncio.sleep(poll_interval)
+            await self.clock.sleep(poll_interval)
             # Increase interval over time
             poll_interval = min(poll_interval * 1.5, 5.0)
 
@@ -530,3 +562,19 @@ class KalshiClient:
     async def close(self) -> None:
         """Close HTTP client."""
         await self.client.aclose()
+
+
+def create_kalshi_client(api_key: str, private_key_pem: str, **kwargs: Any) -> KalshiClient:
+    """
+    Creates a KalshiClient for the configured exchange.
+
+    Every client the app builds from user credentials goes through here:
+    with settings.kalshi_simulator_url set (paper trading), orders, cancels
+    and portfolio reads must reach the simulator, never the real exchange.
+
+    Args:
+        api_key: Kalshi API key ID
+        private_key_pem: RSA private key in PEM format
+        **kwargs: Passed to KalshiClient (transport, clock)
+    """
+    return KalshiClient(api_key, private_key_pem, base_url=settings.kalshi_simulator_url, **kwargs)
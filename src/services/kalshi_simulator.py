@@ -0,0 +1,835 @@
+"""
+Local Kalshi exchange simulator.
+
+Implements the subset of the trade-api/v2 REST surface used by KalshiClient
+(markets, orders, batched orders, fills, positions, balance) on top of an
+in-memory price-time-priority matching engine. Requests are authenticated
+with the same RSA-PSS scheme as the live exchange.
+
+The simulator can be reached two ways:
+- In process, by passing ``simulator.transport()`` to KalshiClient (or using
+  ``simulator.create_client``), which avoids sockets entirely.
+- Over localhost, since the simulator is itself an ASGI app
+  (``uvicorn src.services.kalshi_simulator:app``); point the bot at it with
+  KALSHI_SIMULATOR_URL for paper trading.
+
+Latency, partial fills, rate limiting (429) and server errors (5xx) can be
+injected through SimulatorConfig to exercise retry and confirmation paths.
+"""
+
+import asyncio
+import base64
+import bisect
+import json
+import logging
+import random
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+from urllib.parse import parse_qsl
+
+import httpx
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.serialization import load_pem_private_key, load_pem_public_key
+
+from src.core.clock import Clock
+from src.services.kalshi_client import KalshiClient
+
+logger = logging.getLogger(__name__)
+
+
+API_PREFIX = "/trade-api/v2"
+HOUSE_ACCOUNT = "__house__"
+
+
+class SimulatorError(Exception):
+    """Error returned to the caller as a Kalshi-style JSON error body."""
+
+    def __init__(self, status_code: int, code: str, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+        self.message = message
+
+
+@dataclass
+class SimulatorConfig:
+    """Fault and latency injection settings."""
+    # Added to every request before it is handled
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    # Per-account token bucket; None disables rate limiting
+    rate_limit_per_second: float | None = None
+    # Probability of answering 503 instead of handling the request
+    error_rate: float = 0.0
+    # Probability that a crossing order only fills half of what it could
+    partial_fill_rate: float = 0.0
+    verify_signatures: bool = True
+    signature_max_age_ms: int = 30_000
+    # Create unknown API keys on first use (signatures cannot be verified)
+    auto_create_accounts: bool = False
+    default_balance_cents: int = 100_000
+    seed: int | None = None
+
+
+@dataclass
+class SimOrder:
+    """A resting or completed order. Prices are always in YES cents."""
+    order_id: str
+    client_order_id: str
+    account: str
+    ticker: str
+    action: str
+    side: str
+    order_type: str
+    yes_price: int
+    count: int
+    # True when the order buys YES exposure (buy yes / sell no)
+    is_bid: bool
+    seq: int
+    remaining: int = 0
+    fill_cost: int = 0
+    status: str = "resting"
+    created_time: str = ""
+    last_update_time: str = ""
+
+    @property
+    def filled(self) -> int:
+        return self.count - self.remaining
+
+    def to_dict(self) -> dict[str, Any]:
+        filled = self.filled
+        average = round(self.fill_cost / filled) if filled else 0
+        return {
+            "order_id": self.order_id,
+            "client_order_id": self.client_order_id,
+            "ticker": self.ticker,
+            "action": self.action,
+            "side": self.side,
+            "type": self.order_type,
+            "status": self.status,
+            "yes_price": self.yes_price,
+            "no_price": 100 - self.yes_price,
+            "count": self.count,
+            "initial_count": self.count,
+            "remaining_count": self.remaining,
+            "fill_count": filled,
+            "filled_count": filled,
+            "average_fill_price": average,
+            "taker_fill_cost": self.fill_cost,
+            "created_time": self.created_time,
+            "last_update_time": self.last_update_time,
+        }
+
+
+@dataclass
+class SimPosition:
+    """Net position in a market. Positive is YES, negative is NO."""
+    position: int = 0
+    cost: int = 0
+    realized_pnl: int = 0
+    total_traded: int = 0
+
+    def to_dict(self, ticker: str, resting_orders: int) -> dict[str, Any]:
+        return {
+            "ticker": ticker,
+            "market_ticker": ticker,
+            "position": self.position,
+            "market_exposure": self.cost,
+            "cost_basis": self.cost,
+            "realized_pnl": self.realized_pnl,
+            "total_traded": self.total_traded,
+            "fees_paid": 0,
+            "fees": 0,
+            "resting_orders_count": resting_orders,
+        }
+
+
+@dataclass
+class SimAccount:
+    api_key: str
+    public_key: Any | None
+    balance: int
+    positions: dict[str, SimPosition] = field(default_factory=dict)
+    orders: dict[str, SimOrder] = field(default_factory=dict)
+    client_order_ids: set[str] = field(default_factory=set)
+    fills: list[dict[str, Any]] = field(default_factory=list)
+    tokens: float = 0.0
+    tokens_updated: float = 0.0
+
+
+class _OrderBook:
+    """Price levels with FIFO queues, giving price-time priority."""
+
+    def __init__(self):
+        self.levels: dict[bool, dict[int, deque[SimOrder]]] = {True: {}, False: {}}
+        # Ascending price lists for each side
+        self.prices: dict[bool, list[int]] = {True: [], False: []}
+
+    def add(self, order: SimOrder) -> None:
+        levels = self.levels[order.is_bid]
+        queue = levels.get(order.yes_price)
+        if queue is None:
+            queue = levels[order.yes_price] = deque()
+            bisect.insort(self.prices[order.is_bid], order.yes_price)
+        queue.append(order)
+
+    def remove(self, order: SimOrder) -> None:
+        queue = self.levels[order.is_bid].get(order.yes_price)
+        if queue is None:
+            return
+        try:
+            queue.remove(order)
+        except ValueError:
+            return
+        if not queue:
+            self._drop_level(order.is_bid, order.yes_price)
+
+    def best(self, is_bid: bool) -> int | None:
+        prices = self.prices[is_bid]
+        if not prices:
+            return None
+        return prices[-1] if is_bid else prices[0]
+
+    def head(self, is_bid: bool) -> SimOrder | None:
+        price = self.best(is_bid)
+        return None if price is None else self.levels[is_bid][price][0]
+
+    def pop_head(self, is_bid: bool) -> None:
+        price = self.best(is_bid)
+        queue = self.levels[is_bid][price]
+        queue.popleft()
+        if not queue:
+            self._drop_level(is_bid, price)
+
+    def depth(self, is_bid: bool) -> list[list[int]]:
+        """Aggregated [price, quantity] levels, best first."""
+        prices = self.prices[is_bid]
+        ordered = reversed(prices) if is_bid else prices
+        return [[p, sum(o.remaining for o in self.levels[is_bid][p])] for p in ordered]
+
+    def _drop_level(self, is_bid: bool, price: int) -> None:
+        del self.levels[is_bid][price]
+        prices = self.prices[is_bid]
+        prices.pop(bisect.bisect_left(prices, price))
+
+
+@dataclass
+class SimMarket:
+    ticker: str
+    event_ticker: str
+    title: str
+    status: str = "active"
+    close_time: str | None = None
+    last_price: int = 0
+    volume: int = 0
+    book: _OrderBook = field(default_factory=_OrderBook)
+
+    def to_dict(self) -> dict[str, Any]:
+        yes_bid = self.book.best(True) or 0
+        yes_ask = self.book.best(False) or 100
+        return {
+            "ticker": self.ticker,
+            "event_ticker": self.event_ticker,
+            "title": self.title,
+            "status": self.status,
+            "close_time": self.close_time,
+            "yes_bid": yes_bid,
+            "yes_ask": yes_ask,
+            "no_bid": 100 - yes_ask,
+            "no_ask": 100 - yes_bid,
+            "yes_bid_dollars": yes_bid / 100,
+            "yes_ask_dollars": yes_ask / 100,
+            "last_price": self.last_price,
+            "volume": self.volume,
+        }
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class KalshiExchangeSimulator:
+    """
+    In-memory Kalshi exchange.
+
+    Every order is normalized to the YES book: buying YES (or selling NO) is a
+    bid at the YES price, buying NO (or selling YES) is an ask. Trades execute
+    at the resting order's price, and opposite positions net out at 100c per
+    contract the way Kalshi settles paired YES/NO holdings.
+    """
+
+    def __init__(self, config: SimulatorConfig | None = None):
+        self.config = config or SimulatorConfig()
+        self.markets: dict[str, SimMarket] = {}
+        self.accounts: dict[str, SimAccount] = {}
+        self._orders: dict[str, SimOrder] = {}
+        self._seq = 0
+        self._rng = random.Random(self.config.seed)
+        self._forced_errors: deque[int] = deque()
+        self.request_count = 0
+        self.accounts[HOUSE_ACCOUNT] = SimAccount(HOUSE_ACCOUNT, None, 0)
+
+    # =========================================================================
+    # Setup
+    # =========================================================================
+
+    def add_account(
+        self,
+        api_key: str,
+        public_key_pem: str | bytes | None = None,
+        balance_cents: int | None = None,
+    ) -> SimAccount:
+        """Register an API key, optionally with the RSA public key used to verify it."""
+        public_key = None
+        if public_key_pem:
+            if isinstance(public_key_pem, str):
+                public_key_pem = public_key_pem.encode()
+            public_key = load_pem_public_key(public_key_pem)
+        account = SimAccount(
+            api_key=api_key,
+            public_key=public_key,
+            balance=self.config.default_balance_cents if balance_cents is None else balance_cents,
+        )
+        self.accounts[api_key] = account
+        return account
+
+    def add_account_from_private_key(
+        self,
+        api_key: str,
+        private_key_pem: str,
+        balance_cents: int | None = None,
+    ) -> SimAccount:
+        """Register an API key using the private key a client will sign with."""
+        formatted = KalshiClient.format_private_key(private_key_pem)
+        private_key = load_pem_private_key(formatted.encode(), password=None)
+        account = self.add_account(api_key, balance_cents=balance_cents)
+        account.public_key = private_key.public_key()
+        return account
+
+    def add_market(
+        self,
+        ticker: str,
+        yes_bid: int | None = None,
+        yes_ask: int | None = None,
+        depth: int = 1000,
+        event_ticker: str | None = None,
+        title: str | None = None,
+        status: str = "active",
+        close_time: str | None = None,
+    ) -> SimMarket:
+        """Create a market, optionally seeded with house liquidity."""
+        market = SimMarket(
+            ticker=ticker,
+            event_ticker=event_ticker or ticker.rsplit("-", 1)[0],
+            title=title or ticker,
+            status=status,
+            close_time=close_time,
+        )
+        self.markets[ticker] = market
+        if yes_bid is not None or yes_ask is not None:
+            self.set_quote(ticker, yes_bid, yes_ask, depth)
+        return market
+
+    def set_quote(
+        self,
+        ticker: str,
+        yes_bid: int | None,
+        yes_ask: int | None,
+        depth: int = 1000,
+    ) -> list[dict[str, Any]]:
+        """
+        Replace the house quote for a market.
+
+        House orders go through the matching engine, so moving the quote
+        through a resting client order fills it. Returns the fills produced.
+        """
+        market = self._get_market(ticker)
+        for order in [o for o in self._orders.values()
+                      if o.account == HOUSE_ACCOUNT and o.ticker == ticker and o.status == "resting"]:
+            market.book.remove(order)
+            order.status = "canceled"
+
+        fills: list[dict[str, Any]] = []
+        house = self.accounts[HOUSE_ACCOUNT]
+        before = len(house.fills)
+        if yes_bid is not None:
+            self._submit(house, {"ticker": ticker, "action": "buy", "side": "yes",
+                                 "count": depth, "yes_price": yes_bid})
+        if yes_ask is not None:
+            self._submit(house, {"ticker": ticker, "action": "sell", "side": "yes",
+                                 "count": depth, "yes_price": yes_ask})
+        fills.extend(house.fills[before:])
+        return fills
+
+    def fail_next(self, status_code: int, times: int = 1) -> None:
+        """Answer the next requests with the given error status (e.g. 429, 503)."""
+        self._forced_errors.extend([status_code] * times)
+
+    # =========================================================================
+    # Matching engine
+    # =========================================================================
+
+    def _submit(self, account: SimAccount, payload: dict[str, Any]) -> SimOrder:
+        ticker = payload.get("ticker")
+        market = self._get_market(ticker)
+        if market.status not in ("active", "open") and account.api_key != HOUSE_ACCOUNT:
+            raise SimulatorError(400, "market_closed", f"Market {ticker} is not open")
+
+        action = str(payload.get("action", "")).lower()
+        side = str(payload.get("side", "")).lower()
+        if action not in ("buy", "sell") or side not in ("yes", "no"):
+            raise SimulatorError(400, "invalid_parameters", "action must be buy/sell and side yes/no")
+
+        try:
+            count = int(payload.get("count", 0))
+        except (TypeError, ValueError):
+            count = 0
+        if count < 1:
+            raise SimulatorError(400, "invalid_parameters", "count must be a positive integer")
+
+        order_type = str(payload.get("type", "limit")).lower()
+        is_bid = (action == "buy") == (side == "yes")
+        if payload.get("yes_price") is not None:
+            yes_price = int(payload["yes_price"])
+        elif payload.get("no_price") is not None:
+            yes_price = 100 - int(payload["no_price"])
+        elif order_type == "market":
+            yes_price = 99 if is_bid else 1
+        else:
+            raise SimulatorError(400, "invalid_parameters", "yes_price or no_price is required")
+        if not 1 <= yes_price <= 99:
+            raise SimulatorError(400, "invalid_parameters", "price must be between 1 and 99 cents")
+
+        client_order_id = payload.get("client_order_id") or str(uuid.uuid4())
+        if client_order_id in account.client_order_ids:
+            raise SimulatorError(409, "order_already_exists", f"Duplicate client_order_id {client_order_id}")
+
+        if account.api_key != HOUSE_ACCOUNT:
+            required = self._required_cash(account, ticker, is_bid, yes_price, count)
+            if required > account.balance:
+                raise SimulatorError(400, "insufficient_balance", "Insufficient balance for order")
+
+        self._seq += 1
+        now = _now_iso()
+        order = SimOrder(
+            order_id=str(uuid.uuid4()),
+            client_order_id=client_order_id,
+            account=account.api_key,
+            ticker=ticker,
+            action=action,
+            side=side,
+            order_type=order_type,
+            yes_price=yes_price,
+            count=count,
+            is_bid=is_bid,
+            seq=self._seq,
+            remaining=count,
+            created_time=now,
+            last_update_time=now,
+        )
+        account.orders[order.order_id] = order
+        account.client_order_ids.add(client_order_id)
+        self._orders[order.order_id] = order
+
+        self._match(market, order)
+
+        if order.remaining == 0:
+            order.status = "executed"
+        elif order_type == "market":
+            # Market orders never rest; the unfilled remainder is canceled
+            order.status = "canceled"
+        else:
+            market.book.add(order)
+        return order
+
+    def _match(self, market: SimMarket, taker: SimOrder) -> None:
+        book = market.book
+        opposite = not taker.is_bid
+        limit = taker.remaining
+        if (
+            taker.account != HOUSE_ACCOUNT
+            and self.config.partial_fill_rate
+            and self._rng.random() < self.config.partial_fill_rate
+        ):
+            limit = max(1, taker.remaining // 2)
+
+        while limit > 0:
+            maker = book.head(opposite)
+            if maker is None:
+                break
+            crosses = maker.yes_price <= taker.yes_price if taker.is_bid else maker.yes_price >= taker.yes_price
+            if not crosses:
+                break
+            quantity = min(limit, maker.remaining)
+            self._execute(market, taker, maker, quantity, maker.yes_price)
+            limit -= quantity
+            if maker.remaining == 0:
+                maker.status = "executed"
+                book.pop_head(opposite)
+
+    def _execute(self, market: SimMarket, taker: SimOrder, maker: SimOrder, quantity: int, price: int) -> None:
+        now = _now_iso()
+        trade_id = str(uuid.uuid4())
+        for order, is_taker in ((taker, True), (maker, False)):
+            order.remaining -= quantity
+            cost = price * quantity if order.is_bid else (100 - price) * quantity
+            order.fill_cost += cost
+            order.last_update_time = now
+            account = self.accounts[order.account]
+            if order.account != HOUSE_ACCOUNT:
+                self._apply_fill(account, market.ticker, order.is_bid, quantity, cost)
+            account.fills.append({
+                "trade_id": trade_id,
+                "order_id": order.order_id,
+                "ticker": market.ticker,
+                "action": order.action,
+                "side": order.side,
+                "count": quantity,
+                "yes_price": price,
+                "no_price": 100 - price,
+                "is_taker": is_taker,
+                "created_time": now,
+            })
+        market.last_price = price
+        market.volume += quantity
+
+    def _apply_fill(self, account: SimAccount, ticker: str, is_bid: bool, quantity: int, cost: int) -> None:
+        position = account.positions.setdefault(ticker, SimPosition())
+        direction = 1 if is_bid else -1
+        account.balance -= cost
+        position.total_traded += cost
+
+        # Contracts on the other side net out and pay 100c each
+        held_opposite = max(0, -direction * position.position)
+        netted = min(quantity, held_opposite)
+        if netted:
+            released = round(position.cost * netted / held_opposite)
+            closing_cost = round(cost * netted / quantity)
+            account.balance += 100 * netted
+            position.realized_pnl += 100 * netted - released - closing_cost
+            position.cost -= released
+            cost -= closing_cost
+        position.cost += cost
+        position.position += direction * quantity
+
+    def _required_cash(self, account: SimAccount, ticker: str, is_bid: bool, yes_price: int, count: int) -> int:
+        per_contract = yes_price if is_bid else 100 - yes_price
+        position = account.positions.get(ticker)
+        held_opposite = 0
+        if position:
+            held_opposite = max(0, (-1 if is_bid else 1) * position.position)
+        closable = min(count, held_opposite)
+        return per_contract * count - 100 * closable
+
+    def _cancel(self, account: SimAccount, order_id: str) -> SimOrder:
+        order = account.orders.get(order_id)
+        if order is None:
+            raise SimulatorError(404, "not_found", f"Order {order_id} not found")
+        if order.status != "resting":
+            raise SimulatorError(400, "order_not_cancelable", f"Order {order_id} is {order.status}")
+        self.markets[order.ticker].book.remove(order)
+        order.status = "canceled"
+        order.last_update_time = _now_iso()
+        return order
+
+    def _get_market(self, ticker: str | None) -> SimMarket:
+        market = self.markets.get(ticker or "")
+        if market is None:
+            raise SimulatorError(404, "market_not_found", f"Market {ticker} not found")
+        return market
+
+    # =========================================================================
+    # Request handling
+    # =========================================================================
+
+    async def handle(
+        self,
+        method: str,
+        path: str,
+        headers: dict[str, str],
+        body: bytes = b"",
+    ) -> tuple[int, dict[str, Any], dict[str, str]]:
+        """
+        Handle a single REST request.
+
+        Args:
+            method: HTTP method
+            path: Full request path including /trade-api/v2 and query string
+            headers: Request headers (case-insensitive keys are lower-cased)
+            body: Raw request body
+
+        Returns:
+            Tuple of (status_code, json_body, extra_headers)
+        """
+        self.request_count += 1
+        headers = {k.lower(): v for k, v in headers.items()}
+        if self.config.latency_ms or self.config.latency_jitter_ms:
+            delay = self.config.latency_ms + self._rng.uniform(0, self.config.latency_jitter_ms)
+            await asyncio.sleep(delay / 1000)
+
+        try:
+            if self._forced_errors:
+                self._raise_injected(self._forced_errors.popleft())
+            if self.config.error_rate and self._rng.random() < self.config.error_rate:
+                self._raise_injected(503)
+
+            path_only, _, query_string = path.partition("?")
+            account = self._authenticate(method, path_only, headers)
+            self._check_rate_limit(account)
+
+            if not path_only.startswith(API_PREFIX):
+                raise SimulatorError(404, "not_found", f"Unknown path {path_only}")
+            route = path_only[len(API_PREFIX):].rstrip("/")
+            query = dict(parse_qsl(query_string))
+            payload = json.loads(body) if body else {}
+            status_code, data = self._route(method.upper(), route, query, payload, account)
+            return status_code, data, {}
+        except SimulatorError as e:
+            extra = {"Retry-After": "0"} if e.status_code == 429 else {}
+            return e.status_code, {"error": {"code": e.code, "message": e.message}}, extra
+        except json.JSONDecodeError:
+            return 400, {"error": {"code": "bad_request", "message": "Invalid JSON body"}}, {}
+
+    def _raise_injected(self, status_code: int) -> None:
+        logger.debug(f"Simulator injecting HTTP {status_code}")
+        if status_code == 429:
+            raise SimulatorError(429, "too_many_requests", "Injected rate limit")
+        raise SimulatorError(status_code, "internal_server_error", "Injected server error")
+
+    def _authenticate(self, method: str, path: str, headers: dict[str, str]) -> SimAccount:
+        api_key = headers.get("kalshi-access-key")
+        timestamp = headers.get("kalshi-access-timestamp", "")
+        signature = headers.get("kalshi-access-signature", "")
+        if not api_key:
+            raise SimulatorError(401, "unauthorized", "Missing KALSHI-ACCESS-KEY")
+
+        account = self.accounts.get(api_key)
+        if account is None or api_key == HOUSE_ACCOUNT:
+            if not self.config.auto_create_accounts or api_key == HOUSE_ACCOUNT:
+                raise SimulatorError(401, "unauthorized", "Unknown API key")
+            account = self.add_account(api_key)
+
+        if not self.config.verify_signatures or account.public_key is None:
+            return account
+
+        try:
+            age = abs(time.time() * 1000 - int(timestamp))
+        except ValueError:
+            raise SimulatorError(401, "unauthorized", "Invalid KALSHI-ACCESS-TIMESTAMP")
+        if age > self.config.signature_max_age_ms:
+            raise SimulatorError(401, "unauthorized", "Request timestamp outside allowed window")
+
+        message = f"{timestamp}{method.upper()}{path}".encode()
+        try:
+            account.public_key.verify(
+                base64.b64decode(signature),
+                message,
+                padding.PSS(
+                    mgf=padding.MGF1(hashes.SHA256()),
+                    salt_length=padding.PSS.DIGEST_LENGTH
+                ),
+                hashes.SHA256()
+            )
+        except (InvalidSignature, ValueError):
+            raise SimulatorError(401, "unauthorized", "Invalid request signature")
+        return account
+
+    def _check_rate_limit(self, account: SimAccount) -> None:
+        rate = self.config.rate_limit_per_second
+        if not rate:
+            return
+        now = time.monotonic()
+        if account.tokens_updated == 0.0:
+            account.tokens = rate
+        else:
+            account.tokens = min(rate, account.tokens + (now - account.tokens_updated) * rate)
+        account.tokens_updated = now
+        if account.tokens < 1:
+            raise SimulatorError(429, "too_many_requests", "Rate limit exceeded")
+        account.tokens -= 1
+
+    def _route(
+        self,
+        method: str,
+        route: str,
+        query: dict[str, str],
+        payload: dict[str, Any],
+        account: SimAccount,
+    ) -> tuple[int, dict[str, Any]]:
+        parts = route.strip("/").split("/")
+
+        if method == "GET" and parts == ["markets"]:
+            return 200, self._list_markets(query)
+        if method == "GET" and len(parts) == 2 and parts[0] == "markets":
+            return 200, {"market": self._get_market(parts[1]).to_dict()}
+        if method == "GET" and len(parts) == 3 and parts[0] == "markets" and parts[2] == "orderbook":
+            book = self._get_market(parts[1]).book
+            # NO bids mirror YES asks
+            no_levels = [[100 - p, q] for p, q in book.depth(False)]
+            return 200, {"orderbook": {"yes": book.depth(True), "no": no_levels}}
+
+        if parts[:1] != ["portfolio"] or len(parts) < 2:
+            raise SimulatorError(404, "not_found", f"Unknown route {method} {route}")
+        resource = parts[1]
+
+        if method == "GET" and resource == "balance" and len(parts) == 2:
+            return 200, {"balance": account.balance}
+        if method == "GET" and resource == "positions" and len(parts) == 2:
+            return 200, self._list_positions(account, query)
+        if method == "GET" and resource == "fills" and len(parts) == 2:
+            fills = account.fills
+            if query.get("ticker"):
+                fills = [f for f in fills if f["ticker"] == query["ticker"]]
+            return 200, self._paginate("fills", list(reversed(fills)), query)
+        if method == "GET" and resource == "settlements" and len(parts) == 2:
+            return 200, {"settlements": [], "cursor": ""}
+
+        if resource == "orders":
+            if len(parts) == 2 and method == "GET":
+                orders = list(account.orders.values())
+                if query.get("ticker"):
+                    orders = [o for o in orders if o.ticker == query["ticker"]]
+                if query.get("status"):
+                    orders = [o for o in orders if o.status == query["status"]]
+                return 200, self._paginate("orders", [o.to_dict() for o in reversed(orders)], query)
+            if len(parts) == 2 and method == "POST":
+                return 201, {"order": self._submit(account, payload).to_dict()}
+            if len(parts) == 3 and parts[2] == "batched" and method == "POST":
+                return 201, {"orders": self._submit_batch(account, payload)}
+            if len(parts) == 3 and method == "GET":
+                order = account.orders.get(parts[2])
+                if order is None:
+                    raise SimulatorError(404, "not_found", f"Order {parts[2]} not found")
+                return 200, {"order": order.to_dict()}
+            if len(parts) == 3 and method == "DELETE":
+                order = self._cancel(account, parts[2])
+                return 200, {"order": order.to_dict(), "reduced_by": order.remaining}
+
+        raise SimulatorError(404, "not_found", f"Unknown route {method} {route}")
+
+    def _submit_batch(self, account: SimAccount, payload: dict[str, Any]) -> list[dict[str, Any]]:
+        results = []
+        for order_payload in payload.get("orders", []):
+            try:
+                order = self._submit(account, order_payload)
+                results.append({"order": order.to_dict(), "error": None})
+            except SimulatorError as e:
+                results.append({"order": None, "error": {"code": e.code, "message": e.message}})
+        return results
+
+    def _list_markets(self, query: dict[str, str]) -> dict[str, Any]:
+        markets = list(self.markets.values())
+        status = query.get("status")
+        if status:
+            wanted = {"active", "open"} if status in ("active", "open") else {status}
+            markets = [m for m in markets if m.status in wanted]
+        if query.get("tickers"):
+            tickers = set(query["tickers"].split(","))
+            markets = [m for m in markets if m.ticker in tickers]
+        if query.get("event_ticker"):
+            markets = [m for m in markets if m.event_ticker == query["event_ticker"]]
+        if query.get("series_ticker"):
+            markets = [m for m in markets if m.ticker.startswith(query["series_ticker"])]
+        return self._paginate("markets", [m.to_dict() for m in markets], query)
+
+    def _list_positions(self, account: SimAccount, query: dict[str, str]) -> dict[str, Any]:
+        resting: dict[str, int] = {}
+        for order in account.orders.values():
+            if order.status == "resting":
+                resting[order.ticker] = resting.get(order.ticker, 0) + 1
+        positions = [
+            pos.to_dict(ticker, resting.get(ticker, 0))
+            for ticker, pos in account.positions.items()
+        ]
+        if query.get("ticker"):
+            positions = [p for p in positions if p["ticker"] == query["ticker"]]
+        return {"market_positions": positions, "event_positions": [], "cursor": ""}
+
+    @staticmethod
+    def _paginate(key: str, items: list[Any], query: dict[str, str]) -> dict[str, Any]:
+        try:
+            limit = max(1, min(1000, int(query.get("limit", 100))))
+            offset = int(query.get("cursor") or 0)
+        except ValueError:
+            raise SimulatorError(400, "invalid_parameters", "Invalid limit or cursor")
+        page = items[offset:offset + limit]
+        next_offset = offset + limit
+        return {key: page, "cursor": str(next_offset) if next_offset < len(items) else ""}
+
+    # =========================================================================
+    # Transports
+    # =========================================================================
+
+    def transport(self) -> httpx.AsyncBaseTransport:
+        """httpx transport that routes requests to this simulator in process."""
+        return _SimulatorTransport(self)
+
+    def create_client(self, api_key: str, private_key_pem: str, clock: Clock | None = None) -> KalshiClient:
+        """
+        Create a KalshiClient wired to this simulator.
+
+        The API key is registered with the matching public key if it is not
+        already known, so every request is signature-verified.
+        """
+        if api_key not in self.accounts:
+            self.add_account_from_private_key(api_key, private_key_pem)
+        return KalshiClient(api_key, private_key_pem, transport=self.transport(), clock=clock)
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        """ASGI entrypoint so the simulator can be served on localhost."""
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        path = scope["path"]
+        if scope.get("query_string"):
+            path += "?" + scope["query_string"].decode()
+        headers = {k.decode(): v.decode() for k, v in scope["headers"]}
+
+        status_code, data, extra = await self.handle(scope["method"], path, headers, body)
+        content = json.dumps(data).encode()
+        response_headers = [(b"content-type", b"application/json"),
+                            (b"content-length", str(len(content)).encode())]
+        response_headers.extend((k.lower().encode(), v.encode()) for k, v in extra.items())
+        await send({"type": "http.response.start", "status": status_code, "headers": response_headers})
+        await send({"type": "http.response.body", "body": content})
+
+
+class _SimulatorTransport(httpx.AsyncBaseTransport):
+    """Routes httpx requests straight into a KalshiExchangeSimulator."""
+
+    def __init__(self, simulator: KalshiExchangeSimulator):
+        self.simulator = simulator
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        path = request.url.raw_path.decode()
+        status_code, data, extra = await self.simulator.handle(
+            request.method, path, dict(request.headers), body
+        )
+        return httpx.Response(status_code, json=data, headers=extra, request=request)
+
+
+# Module-level instance for `uvicorn src.services.kalshi_simulator:app`.
+# Unknown API keys are accepted on first use so existing bot credentials work.
+app = KalshiExchangeSimulator(SimulatorConfig(auto_create_accounts=True))
@@ -6,11 +6,13 @@ Provides fast access to recent price data for analytics and backtesting.
 import asyncio
 from collections import defaultdict
 from dataclasses import dataclass, field
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Iterator
 import logging
 
+from src.core.clock import Clock, system_clock
+
 
 logger = logging.getLogger(__name__)
 
@@ -88,12 +90,14 @@ class PriceHistoryCache:
         self,
         ttl_hours: int = DEFAULT_TTL_HOURS,
         max_snapshots: int = MAX_SNAPSHOTS_PER_MARKET,
+        clock: Clock | None = None,
     ):
+        self._clock = clock or system_clock
         self._ttl = timedelta(hours=ttl_hours)
         self._max_snapshots = max_snapshots
         self._cache: dict[str, list[PriceSnapshot]] = defaultdict(list)
         self._lock = asyncio.Lock()
-        self._last_cleanup = datetime.now(timezone.utc)
+        self._last_cleanup = self._clock.now()
         self._stats = {
             "hits": 0,
             "misses": 0,
@@ -123,7 +127,7 @@ class PriceHistoryCache:
             volume: Trade volume
             source: Data source identifier
         """
-        ts = timestamp or datetime.now(timezone.utc)
+        ts = timestamp or self._clock.now()
         snapshot = PriceSnapshot(
             price=price,
             timestamp=ts,
@@ -194,7 +198,7 @@ class PriceHistoryCache:
         Returns:
             List of PriceSnapshot within range
         """
-        end = end_time or datetime.now(timezone.utc)
+        end = end_time or self._clock.now()
         
         async with self._lock:
             cache_list = self._cache.get(market_id, [])
@@ -225,7 +229,7 @@ class PriceHistoryCache:
         Returns:
             PriceStats or None if no data
         """
-        end_time = datetime.now(timezone.utc)
+        end_time = self._clock.now()
         start_time = end_time - timedelta(minutes=period_minutes)
         
         snapshots = await self.get_range(market_id, start_time, end_time)
@@ -298,7 +302,7 @@ class PriceHistoryCache:
         Returns:
             Baseline price or None
         """
-        start_time = datetime.now(timezone.utc) - timedelta(minutes=lookback_minutes)
+        start_time = self._clock.now() - timedelta(minutes=lookback_minutes)
         snapshots = await self.get_range(market_id, start_time)
         
         if snapshots:
@@ -331,7 +335,7 @@ class PriceHistoryCache:
     
     async def _maybe_cleanup(self) -> None:
         """Run cleanup if enough time has passed."""
-        now = datetime.now(timezone.utc)
+        now = self._clock.now()
         if (now - self._last_cleanup).total_seconds() < self.CLEANUP_INTERVAL_SECONDS:
             return
         
@@ -340,7 +344,7 @@ class PriceHistoryCache:
     
     async def _cleanup_expired(self) -> None:
         """Remove expired snapshots from all markets."""
-        cutoff = datetime.now(timezone.utc) - self._ttl
+        cutoff = self._clock.now() - self._ttl
         total_removed = 0
         
         async with self._lock:
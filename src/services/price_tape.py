@@ -0,0 +1,449 @@
+"""
+Durable, compressed price tape.
+
+Every quote observed by the price pollers is appended to an in-memory
+buffer (never touching disk on the caller's path). A background task
+flushes the buffer to per-ticker, per-UTC-day segment files:
+
+    <root>/<ticker>/<YYYYMMDD>.tape
+
+A segment is a sequence of blocks. Each block is a fixed header followed by
+zlib-compressed fixed-width records:
+
+    header  <4sIIqq   magic, payload bytes, record count, first ts, last ts
+    record  <qiiid    ts (epoch microseconds), bid, ask, last (micro-units), volume
+
+Readers memory-map a segment and use the block headers to skip blocks
+outside the requested time range, so only overlapping blocks are
+decompressed. A torn block at the end of a segment (crash mid-write) is
+ignored by readers and cut off before the first append to that segment
+in this process, so new blocks never land behind it. Flushes write one
+small block per ticker. Once a UTC day has
+passed, its segments are compacted into large blocks, which compress much
+better.
+
+Uses: chart range reads, rebuilding PriceHistoryCache after a restart, and
+backtesting input (iter_quotes).
+"""
+
+import asyncio
+import logging
+import mmap
+import os
+import re
+import shutil
+import struct
+import zlib
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+from src.config import settings
+from src.core.clock import Clock, system_clock
+from src.services.price_cache import PriceHistoryCache, PriceSnapshot
+
+
+logger = logging.getLogger(__name__)
+
+_BLOCK_MAGIC = b"PTB1"
+_HEADER = struct.Struct("<4sIIqq")
+_RECORD = struct.Struct("<qiiid")
+_PRICE_SCALE = 1_000_000
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class TapeQuote(NamedTuple):
+    """One observed quote."""
+    timestamp: datetime
+    bid: float
+    ask: float
+    last: float
+    volume: float
+
+
+def _to_micros(ts: datetime) -> int:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return (ts - _EPOCH) // timedelta(microseconds=1)
+
+
+def _from_micros(us: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=us)
+
+
+def _utc_day(ts: datetime) -> date:
+    return ts.astimezone(timezone.utc).date() if ts.tzinfo else ts.date()
+
+
+def _to_quote(record: tuple) -> "TapeQuote":
+    ts, bid, ask, last, volume = record
+    return TapeQuote(
+        _from_micros(ts), bid / _PRICE_SCALE, ask / _PRICE_SCALE, last / _PRICE_SCALE, volume
+    )
+
+
+def _safe_name(ticker: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
+
+
+def _encode_block(records: list[tuple]) -> bytes:
+    payload = zlib.compress(b"".join(_RECORD.pack(*r) for r in records), 6)
+    header = _HEADER.pack(_BLOCK_MAGIC, len(payload), len(records), records[0][0], records[-1][0])
+    return header + payload
+
+
+def _iter_headers(buf) -> Iterator[tuple[int, int, int, int]]:
+    """Yields (payload offset, payload bytes, first ts, last ts) per block of buf."""
+    offset, size = 0, len(buf)
+    while offset + _HEADER.size <= size:
+        magic, length, count, first_us, last_us = _HEADER.unpack_from(buf, offset)
+        body = offset + _HEADER.size
+        if magic != _BLOCK_MAGIC or body + length > size:
+            break  # torn or foreign tail
+        offset = body + length
+        yield body, length, first_us, last_us
+
+
+def _iter_blocks(buf, start_us: int, end_us: int) -> Iterator[tuple]:
+    """Yields records from the blocks of buf overlapping [start_us, end_us]."""
+    for body, length, first_us, last_us in _iter_headers(buf):
+        if last_us < start_us or first_us > end_us:
+            continue
+        try:
+            payload = zlib.decompress(buf[body:body + length])
+        except zlib.error:
+            return  # torn payload, e.g. zero-filled after a crash
+        for record in _RECORD.iter_unpack(payload):
+            if start_us <= record[0] <= end_us:
+                yield record
+
+
+def _valid_length(buf) -> int:
+    """Bytes of buf taken up by complete, decompressible blocks."""
+    end = 0
+    for body, length, _, _ in _iter_headers(buf):
+        try:
+            zlib.decompress(buf[body:body + length])
+        except zlib.error:
+            break
+        end = body + length
+    return end
+
+
+class PriceTape:
+    """
+    Append-only quote store with batched background writes.
+    """
+
+    DEFAULT_FLUSH_INTERVAL = 15.0
+    DEFAULT_MAX_BUFFERED = 200_000
+    COMPACT_BLOCK_RECORDS = 4096
+
+    def __init__(
+        self,
+        root: str | os.PathLike,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_buffered: int = DEFAULT_MAX_BUFFERED,
+        retention_days: int | None = None,
+        clock: Clock | None = None,
+    ):
+        self._root = Path(root)
+        self._retention_days = retention_days
+        self._flush_interval = flush_interval
+        self._max_buffered = max_buffered
+        self._clock = clock or system_clock
+        self._buffer: dict[str, list[tuple]] = defaultdict(list)
+        self._in_flight: dict[str, list[tuple]] = {}
+        self._buffered = 0
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._compacted_through: str | None = None
+        # Segments whose tail was checked before this process first appended to them
+        self._checked_segments: set[Path] = set()
+        self._stats = {
+            "appended": 0, "written": 0, "dropped": 0, "blocks": 0, "failed_flushes": 0, "repaired_segments": 0,
+        }
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def append(
+        self,
+        ticker: str,
+        bid: float,
+        ask: float,
+        last: float,
+        volume: float = 0.0,
+        timestamp: datetime | None = None,
+    ) -> None:
+        """
+        Buffers a quote for the next flush. Never blocks.
+
+        When max_buffered quotes are already waiting (disk stalled), the
+        quote is dropped and counted.
+        """
+        if self._buffered >= self._max_buffered:
+            self._stats["dropped"] += 1
+            if self._stats["dropped"] == 1 or self._stats["dropped"] % 10000 == 0:
+                logger.warning(f"Price tape buffer full; {self._stats['dropped']} quotes dropped so far")
+            return
+        self._buffer[ticker].append((
+            _to_micros(timestamp or self._clock.now()),
+            round(float(bid) * _PRICE_SCALE),
+            round(float(ask) * _PRICE_SCALE),
+            round(float(last) * _PRICE_SCALE),
+            float(volume),
+        ))
+        self._buffered += 1
+        self._stats["appended"] += 1
+
+    async def flush(self) -> int:
+        """
+        Writes everything buffered so far.
+
+        Returns:
+            Number of quotes written
+        """
+        async with self._flush_lock:
+            if not self._buffered:
+                return 0
+            batch, self._buffer = self._buffer, defaultdict(list)
+            count, self._buffered = self._buffered, 0
+            # Stays visible to read_range until it is on disk
+            self._in_flight = batch
+            try:
+                blocks = await asyncio.to_thread(self._write_batch, batch)
+            except Exception as e:
+                self._stats["failed_flushes"] += 1
+                self._stats["dropped"] += count
+                logger.error(f"Price tape flush failed, {count} quotes lost: {e}")
+                return 0
+            finally:
+                self._in_flight = {}
+            self._stats["written"] += count
+            self._stats["blocks"] += blocks
+            return count
+
+    async def start(self) -> None:
+        """Start the background flush task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="price_tape_writer")
+
+    async def stop(self) -> None:
+        """Stop the flush task and write whatever is still buffered."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+    async def read_range(
+        self,
+        ticker: str,
+        start: datetime,
+        end: datetime | None = None,
+    ) -> list[TapeQuote]:
+        """
+        Returns quotes for ticker in [start, end] in timestamp order,
+        including ones not flushed yet.
+        """
+        end = end or self._clock.now()
+        quotes = await asyncio.to_thread(lambda: list(self.iter_quotes(ticker, start, end)))
+        start_us, end_us = _to_micros(start), _to_micros(end)
+        pending = [
+            _to_quote(r)
+            for buffer in (self._in_flight, self._buffer)
+            for r in buffer.get(ticker, ())
+            if start_us <= r[0] <= end_us
+        ]
+        if pending:
+            # A batch finishing its flush mid-read can be seen twice
+            quotes = sorted(set(quotes).union(pending))
+        return quotes
+
+    def iter_quotes(self, ticker: str, start: datetime, end: datetime) -> Iterator[TapeQuote]:
+        """
+        Yields flushed quotes for ticker in [start, end] in timestamp order.
+
+        Synchronous and streaming (one segment in memory at a time), for
+        backtests and scripts.
+        """
+        start_us, end_us = _to_micros(start), _to_micros(end)
+        day, last_day = _utc_day(start), _utc_day(end)
+        while day <= last_day:
+            path = self._segment_path(ticker, day.strftime("%Y%m%d"))
+            for record in sorted(self._read_segment(path, start_us, end_us)):
+                yield _to_quote(record)
+            day += timedelta(days=1)
+
+    async def get_baseline(self, ticker: str, since: datetime) -> float | None:
+        """
+        Returns the first observed price at or after since (last trade,
+        falling back to ask), e.g. to rebuild a pregame baseline after a restart.
+        """
+        for quote in await self.read_range(ticker, since):
+            price = quote.last or quote.ask
+            if price > 0:
+                return price
+        return None
+
+    async def restore_cache(self, cache: PriceHistoryCache, ticker: str, since: datetime) -> int:
+        """
+        Loads ticker's quotes since the given time into a PriceHistoryCache.
+
+        Returns:
+            Number of snapshots restored
+        """
+        quotes = await self.read_range(ticker, since)
+        if quotes:
+            await cache.add_batch(ticker, [quote_to_snapshot(q) for q in quotes])
+        return len(quotes)
+
+    async def prune(self, retention_days: int) -> int:
+        """
+        Deletes segments for UTC days older than retention_days.
+
+        Returns:
+            Number of segment files removed
+        """
+        cutoff = (self._clock.now() - timedelta(days=retention_days)).strftime("%Y%m%d")
+        async with self._flush_lock:
+            return await asyncio.to_thread(self._prune, cutoff)
+
+    def get_stats(self) -> dict:
+        """Writer counters plus the current buffer depth."""
+        return {**self._stats, "buffered": self._buffered}
+
+    async def _run(self) -> None:
+        while True:
+            await self._clock.sleep(self._flush_interval)
+            try:
+                await self.flush()
+                today = self._clock.now().strftime("%Y%m%d")
+                if self._compacted_through != today:
+                    # Earlier days no longer receive writes; rewrite them as large
+                    # blocks. A late quote for one of them is flushed to it, so
+                    # never rewrite a segment while a flush is appending to it.
+                    async with self._flush_lock:
+                        await asyncio.to_thread(self._compact_before, today)
+                    if self._retention_days:
+                        await self.prune(self._retention_days)
+                    self._compacted_through = today
+            except Exception as e:
+                logger.error(f"Price tape maintenance failed: {e}")
+
+    def _segment_path(self, ticker: str, day: str) -> Path:
+        return self._root / _safe_name(ticker) / f"{day}.tape"
+
+    def _write_batch(self, batch: dict[str, list[tuple]]) -> int:
+        blocks = 0
+        for ticker, records in batch.items():
+            by_day: dict[str, list[tuple]] = defaultdict(list)
+            for record in records:
+                by_day[_from_micros(record[0]).strftime("%Y%m%d")].append(record)
+            for day, day_records in by_day.items():
+                day_records.sort()
+                path = self._segment_path(ticker, day)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                if path not in self._checked_segments:
+                    self._truncate_torn_tail(path)
+                    self._checked_segments.add(path)
+                try:
+                    with open(path, "ab") as f:
+                        f.write(_encode_block(day_records))
+                except Exception:
+                    # May have left a partial block; check again before the next append
+                    self._checked_segments.discard(path)
+                    raise
+                blocks += 1
+        return blocks
+
+    def _truncate_torn_tail(self, path: Path) -> None:
+        """Cuts a segment back to its last complete block."""
+        try:
+            with open(path, "r+b") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:
+                    return
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    valid = _valid_length(buf)
+                if valid < size:
+                    logger.warning(f"Price tape segment {path} has a torn tail; dropping {size - valid} bytes")
+                    f.truncate(valid)
+                    self._stats["repaired_segments"] += 1
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _read_segment(path: Path, start_us: int, end_us: int) -> list[tuple]:
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return []
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    return list(_iter_blocks(buf, start_us, end_us))
+        except FileNotFoundError:
+            return []
+
+    def _compact_before(self, day: str) -> int:
+        compacted = 0
+        if not self._root.exists():
+            return 0
+        for path in self._root.glob("*/*.tape"):
+            if path.stem < day and self._compact_segment(path):
+                compacted += 1
+        return compacted
+
+    def _compact_segment(self, path: Path) -> bool:
+        records = sorted(self._read_segment(path, 0, 2**63 - 1))
+        blocks_needed = -(-len(records) // self.COMPACT_BLOCK_RECORDS)
+        if not records or _count_blocks(path) <= blocks_needed:
+            return False
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            for i in range(0, len(records), self.COMPACT_BLOCK_RECORDS):
+                f.write(_encode_block(records[i:i + self.COMPACT_BLOCK_RECORDS]))
+        os.replace(tmp, path)
+        return True
+
+    def _prune(self, cutoff_day: str) -> int:
+        removed = 0
+        if not self._root.exists():
+            return 0
+        for path in self._root.glob("*/*.tape"):
+            if path.stem < cutoff_day:
+                path.unlink()
+                self._checked_segments.discard(path)
+                removed += 1
+        for ticker_dir in self._root.iterdir():
+            if ticker_dir.is_dir() and not any(ticker_dir.iterdir()):
+                shutil.rmtree(ticker_dir, ignore_errors=True)
+        return removed
+
+
+def _count_blocks(path: Path) -> int:
+    with open(path, "rb") as f:
+        data = f.read()
+    return sum(1 for _ in _iter_headers(data))
+
+
+def quote_to_snapshot(quote: TapeQuote) -> PriceSnapshot:
+    """Converts a tape quote to a PriceHistoryCache snapshot."""
+    return PriceSnapshot(
+        price=Decimal(str(quote.last or quote.ask)),
+        timestamp=quote.timestamp,
+        bid=Decimal(str(quote.bid)),
+        ask=Decimal(str(quote.ask)),
+        volume=Decimal(str(quote.volume)),
+        source="tape",
+    )
+
+
+# Global tape instance fed by the bot's price pollers
+price_tape = PriceTape(settings.price_tape_dir, retention_days=settings.price_tape_retention_days)
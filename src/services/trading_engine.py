@@ -9,13 +9,12 @@ from typing import Any, Optional, Union
 from datetime import datetime
 from uuid import UUID
 
-from src.services.types import TradeSignal
+from src.services.types import TradeSignal, MarketView
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.sport_config import SportConfig
 from src.models.market_config import MarketConfig
-from src.models.tracked_market import TrackedMarket
 from src.models.global_settings import GlobalSettings
 from src.db.crud.position import PositionCRUD
 from src.db.crud.tracked_market import TrackedMarketCRUD
@@ -253,7 +252,7 @@ class TradingEngine:
         )
         return 0.5
     
-    def _get_effective_config(self, market: TrackedMarket, overrides: dict[str, Any] | None = None) -> EffectiveConfig | None:
+    def _get_effective_config(self, market: MarketView, overrides: dict[str, Any] | None = None) -> EffectiveConfig | None:
         """
         Gets effective configuration for a market.
         Combines sport config with any market-specific overrides.
@@ -274,7 +273,7 @@ class TradingEngine:
     
     async def evaluate_entry(
         self,
-        market: TrackedMarket,
+        market: MarketView,
         game_state: dict[str, Any],
         overrides: dict[str, Any] | None = None
     ) -> dict[str, Any] | None:
@@ -285,7 +284,7 @@ class TradingEngine:
         Includes confidence scoring and optional Kelly sizing.
         
         Args:
-            market: Tracked market to evaluate
+            market: Market view to evaluate (TrackedMarket or GameMarketView)
             game_state: Current game state from ESPN
         
         Returns:
@@ -379,13 +378,16 @@ class TradingEngine:
     
     def _check_price_conditions(
         self,
-        market: TrackedMarket,
+        market: MarketView,
         config: EffectiveConfig
     ) -> dict[str, Any] | None:
         """
         Checks if price conditions warrant an entry.
         Uses effective config which may include market-specific overrides.
         
+        Prices are compared as floats so both Decimal (ORM) and float
+        (GameMarketView) market views are accepted.
+        
         Returns entry signal if either:
         1. Price dropped from baseline by threshold percentage
         2. Price is below absolute entry threshold
@@ -393,10 +395,10 @@ class TradingEngine:
         if not market.baseline_price_yes or not market.current_price_yes:
             return None
         
-        baseline_yes = market.baseline_price_yes
-        current_yes = market.current_price_yes
-        baseline_no = market.baseline_price_no or (Decimal("1") - baseline_yes)
-        current_no = market.current_price_no or (Decimal("1") - current_yes)
+        baseline_yes = float(market.baseline_price_yes)
+        current_yes = float(market.current_price_yes)
+        baseline_no = float(market.baseline_price_no or (1.0 - baseline_yes))
+        current_no = float(market.current_price_no or (1.0 - current_yes))
 
         # New: Check Pregame Probability Threshold
         # ----------------------------------------
@@ -410,16 +412,16 @@ class TradingEngine:
         if min_pregame_prob and min_pregame_prob > 0:
             # Baseline price is 0-1 (Decimal), threshold is 0-100 (float)
             # Use baseline_yes for Home team concept (usually YES side)
-            baseline_pct = float(baseline_yes) * 100
+            baseline_pct = baseline_yes * 100
             if baseline_pct < min_pregame_prob:
                 # logger.debug(f"Entry set aside: Baseline {baseline_pct:.1f}% < Min Pregame {min_pregame_prob}%")
                 return None
         
-        yes_drop = (baseline_yes - current_yes) / baseline_yes if baseline_yes > 0 else Decimal("0")
-        no_drop = (baseline_no - current_no) / baseline_no if baseline_no > 0 else Decimal("0")
+        yes_drop = (baseline_yes - current_yes) / baseline_yes if baseline_yes > 0 else 0.0
+        no_drop = (baseline_no - current_no) / baseline_no if baseline_no > 0 else 0.0
         
-        threshold = config.entry_threshold_pct
-        absolute = config.absolute_entry_price
+        threshold = float(config.entry_threshold_pct)
+        absolute = float(config.absolute_entry_price)
         
         if yes_drop >= threshold or current_yes <= absolute:
             # CHECK: Single position per team limit
@@ -433,8 +435,8 @@ class TradingEngine:
             return {
                 "side": "YES",
                 "token_id": market.token_id_yes,
-                "price": float(current_yes),
-                "reason": f"YES price drop: {float(yes_drop)*100:.1f}% (threshold: {float(threshold)*100:.1f}%)",
+                "price": current_yes,
+                "reason": f"YES price drop: {yes_drop*100:.1f}% (threshold: {threshold*100:.1f}%)",
                 "position_size": float(config.default_position_size_usdc),
                 "team": market.home_team
             }
@@ -443,8 +445,8 @@ class TradingEngine:
             return {
                 "side": "NO",
                 "token_id": market.token_id_no,
-                "price": float(current_no),
-                "reason": f"NO price drop: {float(no_drop)*100:.1f}% (threshold: {float(threshold)*100:.1f}%)",
+                "price": current_no,
+                "reason": f"NO price drop: {no_drop*100:.1f}% (threshold: {threshold*100:.1f}%)",
                 "position_size": float(config.default_position_size_usdc),
                 "team": market.away_team
             }
@@ -453,7 +455,7 @@ class TradingEngine:
     
     def _calculate_confidence(
         self,
-        market: TrackedMarket,
+        market: MarketView,
         game_state: dict[str, Any],
         config: EffectiveConfig,
     ) -> ConfidenceResult:
@@ -468,8 +470,8 @@ class TradingEngine:
         Returns:
             ConfidenceResult with overall score and factor breakdown
         """
-        current_price = market.current_price_yes or Decimal("0.5")
-        baseline_price = market.baseline_price_yes or Decimal("0.5")
+        current_price = Decimal(str(market.current_price_yes or "0.5"))
+        baseline_price = Decimal(str(market.baseline_price_yes or "0.5"))
         
         time_remaining = game_state.get("time_remaining_seconds", 0)
         total_period = game_state.get("total_period_seconds", 720)
@@ -494,7 +496,7 @@ class TradingEngine:
         self,
         config: EffectiveConfig,
         confidence: ConfidenceResult,
-        market: TrackedMarket,
+        market: MarketView,
     ) -> float:
         """
         Calculate optimal position size using Kelly criterion or default.
@@ -516,7 +518,7 @@ class TradingEngine:
             balance = await self.client.get_balance()
             bankroll = Decimal(str(balance.get("balance", 1000) if isinstance(balance, dict) else balance or 1000))
             
-            current_price = market.current_price_yes or Decimal("0.5")
+            current_price = Decimal(str(market.current_price_yes or "0.5"))
             
             win_prob = 0.5 + (confidence.overall_score - 0.5) * 0.3
             
@@ -547,7 +549,7 @@ class TradingEngine:
     async def evaluate_exit(
         self,
         position: Any,
-        market: TrackedMarket,
+        market: MarketView,
         game_state: dict[str, Any],
         overrides: dict[str, Any] | None = None
     ) -> dict[str, Any] | None:
@@ -556,7 +558,7 @@ class TradingEngine:
         
         Args:
             position: The open position to evaluate
-            market: Tracked market details
+            market: Market view (TrackedMarket or GameMarketView)
             game_state: Current game state
             overrides: Optional runtime overrides
         
@@ -581,21 +583,22 @@ class TradingEngine:
         if not current_price:
             return None
         
-        entry_price = position.entry_price
-        pnl_pct = (current_price - entry_price) / entry_price if entry_price > 0 else Decimal("0")
+        current_price = float(current_price)
+        entry_price = float(position.entry_price)
+        pnl_pct = (current_price - entry_price) / entry_price if entry_price > 0 else 0.0
         
-        if pnl_pct >= config.take_profit_pct:
+        if pnl_pct >= float(config.take_profit_pct):
             return {
                 "reason": "take_profit",
-                "message": f"Take profit triggered: {float(pnl_pct)*100:.1f}% gain",
-                "exit_price": float(current_price),
+                "message": f"Take profit triggered: {pnl_pct*100:.1f}% gain",
+                "exit_price": current_price,
             }
         
-        if pnl_pct <= -config.stop_loss_pct:
+        if pnl_pct <= -float(config.stop_loss_pct):
             return {
                 "reason": "stop_loss",
-                "message": f"Stop loss triggered: {float(abs(pnl_pct))*100:.1f}% loss",
-                "exit_price": float(current_price),
+                "message": f"Stop loss triggered: {abs(pnl_pct)*100:.1f}% loss",
+                "exit_price": current_price,
             }
         
         segment = game_state.get("segment", "")
@@ -603,14 +606,14 @@ class TradingEngine:
             return {
                 "reason": "restricted_segment",
                 "message": f"Exiting before restricted segment: {segment}",
-                "exit_price": float(current_price),
+                "exit_price": current_price,
             }
         
         return None
     
     async def execute_entry(
         self,
-        market: TrackedMarket,
+        market: MarketView,
         entry_signal: dict[str, Any]
     ) -> dict[str, Any]:
         """
@@ -1,9 +1,12 @@
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from decimal import Decimal
 from uuid import UUID
-from typing import Any
+from typing import Any, Protocol
 
 from src.services.market_discovery import DiscoveredMarket
+from src.services.game_clock import GameClock, parse_ticker_start_time
 
 @dataclass
 class TrackedGame:
@@ -25,6 +28,149 @@ class TrackedGame:
     position_id: UUID | None = None
     # Which team to bet on: "home", "away", or "both"
     selected_side: str = "home"
+    # Derived clock state, recomputed by GameTrackerService on each ESPN update
+    game_clock: GameClock | None = field(default=None, repr=False)
+
+    @property
+    def clock_state(self) -> GameClock:
+        """Cached clock state, computed on first access if no update has run yet."""
+        return self.game_clock or self.refresh_clock()
+
+    def refresh_clock(self, now: datetime | None = None) -> GameClock:
+        """
+        Recompute derived clock state from the current ESPN fields.
+
+        The scheduled start time only depends on the market, so it is
+        carried over from the previous snapshot instead of re-parsed.
+
+        Args:
+            now: Computation timestamp (defaults to current UTC time)
+        """
+        if self.game_clock is not None:
+            start_time = self.game_clock.start_time
+        else:
+            start_time = self.market.game_start_time or parse_ticker_start_time(self.market.ticker)
+        self.game_clock = GameClock.compute(
+            self.sport, self.game_status, self.period, self.clock, start_time, now
+        )
+        return self.game_clock
+
+
+class MarketView(Protocol):
+    """
+    Read-only market fields TradingEngine needs to evaluate entries and exits.
+
+    Satisfied both by the TrackedMarket ORM model (Decimal prices) and by
+    GameMarketView (float prices), so evaluation never requires building
+    ORM objects.
+    """
+
+    @property
+    def id(self) -> UUID | None: ...
+    @property
+    def condition_id(self) -> str: ...
+    @property
+    def token_id_yes(self) -> str: ...
+    @property
+    def token_id_no(self) -> str: ...
+    @property
+    def question(self) -> str: ...
+    @property
+    def sport(self) -> str: ...
+    @property
+    def home_team(self) -> str | None: ...
+    @property
+    def away_team(self) -> str | None: ...
+    @property
+    def baseline_price_yes(self) -> float | Decimal | None: ...
+    @property
+    def baseline_price_no(self) -> float | Decimal | None: ...
+    @property
+    def current_price_yes(self) -> float | Decimal | None: ...
+    @property
+    def current_price_no(self) -> float | Decimal | None: ...
+
+
+class GameMarketView:
+    """
+    Float-based MarketView backed directly by a TrackedGame and its market.
+
+    Holds references only, so it always reflects the latest polled prices
+    and costs a single slotted allocation per evaluation.
+    """
+
+    __slots__ = ("_game", "_market")
+
+    def __init__(self, game: TrackedGame):
+        self._game = game
+        self._market = game.market
+
+    @property
+    def id(self) -> UUID | None:
+        return self._game.position_id
+
+    @property
+    def condition_id(self) -> str:
+        return self._market.condition_id or self._market.ticker or ""
+
+    @property
+    def token_id_yes(self) -> str:
+        return self._market.token_id_yes or ""
+
+    @property
+    def token_id_no(self) -> str:
+        return self._market.token_id_no or ""
+
+    @property
+    def question(self) -> str:
+        return self._market.question or ""
+
+    @property
+    def sport(self) -> str:
+        return self._game.sport
+
+    @property
+    def home_team(self) -> str:
+        return self._game.home_team
+
+    @property
+    def away_team(self) -> str:
+        return self._game.away_team
+
+    @property
+    def is_live(self) -> bool:
+        return self._game.game_status == "in"
+
+    @property
+    def current_period(self) -> int:
+        return self._game.period
+
+    @property
+    def baseline_price_yes(self) -> float | None:
+        # Use market's discovery price if no baseline was captured
+        baseline = self._game.baseline_price
+        if baseline is None:
+            return self._market.current_price_yes
+        return baseline
+
+    @property
+    def baseline_price_no(self) -> float | None:
+        baseline = self.baseline_price_yes
+        return None if baseline is None else 1.0 - baseline
+
+    @property
+    def current_price_yes(self) -> float | None:
+        current = self._game.current_price
+        if current is None:
+            current = self._market.current_price_yes
+        if current is None:
+            return self.baseline_price_yes
+        return current
+
+    @property
+    def current_price_no(self) -> float | None:
+        current = self.current_price_yes
+        return None if current is None else 1.0 - current
 
 
 @dataclass
@@ -41,6 +187,43 @@ class SportStats:
     max_exposure: float = 200.0
 
 
+@dataclass
+class LoopMetrics:
+    """Rolling iteration timings for one BotRunner background loop."""
+    iterations: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_seconds: float = 0.0
+    samples: deque = field(default_factory=lambda: deque(maxlen=512), repr=False)
+
+    def record(self, seconds: float) -> None:
+        self.iterations += 1
+        self.total_seconds += seconds
+        self.last_seconds = seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+        self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> float:
+        """Percentile (0-100) over the most recent samples, in seconds."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def to_dict(self) -> dict[str, float | int]:
+        mean = self.total_seconds / self.iterations if self.iterations else 0.0
+        return {
+            "iterations": self.iterations,
+            "mean_ms": round(mean * 1000, 3),
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p95_ms": round(self.percentile(95) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+            "max_ms": round(self.max_seconds * 1000, 3),
+        }
+
+
 from typing import TypedDict
 
 class TradeSignal(TypedDict):
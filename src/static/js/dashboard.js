@@ -105,6 +105,9 @@ class SSEManager {
         this.reconnectDelay = 1000;
         this.handlers = new Map();
         this.isConnected = false;
+        // Last applied stream state and its event id (for resume)
+        this.state = null;
+        this.lastEventId = null;
     }
 
     connect() {
@@ -116,7 +119,8 @@ class SSEManager {
             return;
         }
 
-        this.eventSource = new EventSource(`/api/v1/dashboard/stream?token=${token}`);
+        const resume = this.lastEventId ? `&last_event_id=${encodeURIComponent(this.lastEventId)}` : '';
+        this.eventSource = new EventSource(`/api/v1/dashboard/stream?token=${token}${resume}`);
 
         this.eventSource.onopen = () => {
             console.log('SSE connected');
@@ -134,9 +138,36 @@ class SSEManager {
             this._scheduleReconnect();
         };
 
-        ['status', 'games', 'positions', 'heartbeat', 'error'].forEach(type => {
+        ['heartbeat', 'error'].forEach(type => {
             this.eventSource.addEventListener(type, (e) => this._handleEvent(type, e));
         });
+        ['snapshot', 'patch'].forEach(type => {
+            this.eventSource.addEventListener(type, (e) => this._handleFrame(type, e));
+        });
+    }
+
+    _handleFrame(type, event) {
+        try {
+            const frame = JSON.parse(event.data);
+            const previous = this.state;
+            if (type === 'snapshot') {
+                this.state = frame.state;
+            } else if (this.state) {
+                this.state = applyPatch(this.state, frame.ops);
+            } else {
+                return; // patch without a base; the server resends a snapshot on reconnect
+            }
+            this.lastEventId = event.lastEventId || this.lastEventId;
+            // Re-emit changed sections in the per-section event shape
+            ['status', 'games', 'positions'].forEach(section => {
+                const value = this.state[section];
+                if (previous && JSON.stringify(previous[section]) === JSON.stringify(value)) return;
+                const data = section === 'status' ? value : Object.values(value || {});
+                (this.handlers.get(section) || []).forEach(h => h({ type: section, data }));
+            });
+        } catch (e) {
+            console.error(`SSE ${type} frame error:`, e);
+        }
     }
 
     on(eventType, handler) {
@@ -172,6 +203,25 @@ class SSEManager {
     }
 }
 
+/** Apply JSON-Patch ops (add/remove/replace) from a dashboard stream frame. */
+function applyPatch(state, ops) {
+    const copy = JSON.parse(JSON.stringify(state));
+    let root = copy;
+    for (const op of ops) {
+        const keys = op.path.split('/').slice(1).map(k => k.replace(/~1/g, '/').replace(/~0/g, '~'));
+        if (keys.length === 0) {
+            root = op.value;
+            continue;
+        }
+        let target = root;
+        for (const key of keys.slice(0, -1)) target = target[key];
+        const last = keys[keys.length - 1];
+        if (op.op === 'remove') delete target[last];
+        else target[last] = op.value;
+    }
+    return root;
+}
+
 const sseManager = new SSEManager();
 
 // ============================================================================
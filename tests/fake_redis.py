@@ -0,0 +1,143 @@
+"""
+In-process stand-in for the async Redis client, for tests.
+
+Implements the commands the Redis rate limiter uses, with key expiry
+against time.time() (so tests can patch the clock) and an optional
+simulated network latency per round trip. Lua can't run here, so
+EVALSHA dispatches to Python emulations of the scripts registered in
+SCRIPTS.
+"""
+
+import asyncio
+import hashlib
+import math
+import time
+from typing import Any, Callable
+
+from src.core.redis_rate_limiter import RedisRateLimiter
+
+
+def _lease_script(redis: "FakeRedis", keys: list[str], args: list[Any]) -> list[int]:
+    """Python version of RedisRateLimiter.LEASE_SCRIPT."""
+    key, stats_key = keys
+    now, window, limit, requested = float(args[0]), float(args[1]), int(args[2]), int(args[3])
+    name = str(args[4])
+
+    bucket = math.floor(now / window)
+    current_key = f"{key}:{bucket}"
+    previous = int(redis._get(f"{key}:{bucket - 1}") or 0)
+    current = int(redis._get(current_key) or 0)
+
+    elapsed = now / window - bucket
+    available = math.floor(limit - previous * (1 - elapsed) - current + 1e-9)
+    granted = max(0, min(requested, available))
+
+    if granted > 0:
+        if current == 0:
+            clients_key = f"{stats_key}:clients:{name}:{bucket}"
+            redis._incrby(clients_key, 1)
+            redis._expire(clients_key, math.ceil(window) + 1)
+        redis._incrby(current_key, granted)
+        redis._expire(current_key, math.ceil(window * 2) + 1)
+        redis._hincrby(stats_key, f"granted:{name}", granted)
+    else:
+        redis._hincrby(stats_key, f"refused:{name}", 1)
+    return [granted, previous, current]
+
+
+SCRIPTS: dict[str, Callable] = {
+    RedisRateLimiter.LEASE_SCRIPT: _lease_script,
+}
+
+
+class FakeRedis:
+    """Async Redis client backed by dicts."""
+
+    def __init__(self, latency: float = 0.0):
+        """
+        Args:
+            latency: Seconds each round trip sleeps
+        """
+        self.latency = latency
+        self.round_trips = 0
+        self._data: dict[str, Any] = {}
+        self._expires: dict[str, float] = {}
+        self._scripts = {self._sha(source): handler for source, handler in SCRIPTS.items()}
+
+    @staticmethod
+    def _sha(source: str) -> str:
+        return hashlib.sha1(source.encode()).hexdigest()
+
+    async def _round_trip(self) -> None:
+        self.round_trips += 1
+        await asyncio.sleep(self.latency)
+
+    def _get(self, key: str) -> Any:
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= time.time():
+            self._data.pop(key, None)
+            del self._expires[key]
+        return self._data.get(key)
+
+    def _incrby(self, key: str, amount: int) -> int:
+        value = int(self._get(key) or 0) + amount
+        self._data[key] = value
+        return value
+
+    def _expire(self, key: str, seconds: float) -> None:
+        if key in self._data:
+            self._expires[key] = time.time() + seconds
+
+    def _hincrby(self, key: str, field: str, amount: int) -> int:
+        hash_ = self._data.setdefault(key, {})
+        hash_[field] = hash_.get(field, 0) + amount
+        return hash_[field]
+
+    async def ping(self) -> bool:
+        await self._round_trip()
+        return True
+
+    async def script_load(self, source: str) -> str:
+        await self._round_trip()
+        sha = self._sha(source)
+        if sha not in self._scripts:
+            raise ValueError("FakeRedis has no emulation for this script")
+        return sha
+
+    async def evalsha(self, sha: str, numkeys: int, *keys_and_args: Any) -> Any:
+        await self._round_trip()
+        keys = [str(k) for k in keys_and_args[:numkeys]]
+        return self._scripts[sha](self, keys, list(keys_and_args[numkeys:]))
+
+    async def get(self, key: str) -> bytes | None:
+        await self._round_trip()
+        value = self._get(key)
+        return None if value is None else str(value).encode()
+
+    async def mget(self, keys: list[str]) -> list[bytes | None]:
+        await self._round_trip()
+        values = [self._get(key) for key in keys]
+        return [None if value is None else str(value).encode() for value in values]
+
+    async def incrby(self, key: str, amount: int = 1) -> int:
+        await self._round_trip()
+        return self._incrby(key, amount)
+
+    async def expire(self, key: str, seconds: float) -> bool:
+        await self._round_trip()
+        self._expire(key, seconds)
+        return key in self._data
+
+    async def delete(self, *keys: str) -> int:
+        await self._round_trip()
+        deleted = 0
+        for key in keys:
+            if self._get(key) is not None:
+                deleted += 1
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return deleted
+
+    async def hgetall(self, key: str) -> dict[bytes, bytes]:
+        await self._round_trip()
+        return {k.encode(): str(v).encode() for k, v in (self._get(key) or {}).items()}
@@ -0,0 +1,167 @@
+"""
+Tests for the batched background ActivityLog writer.
+"""
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.core.shutdown import BotShutdownManager, ShutdownHandler
+from src.db.activity_log_writer import ActivityLogWriter
+from src.db.crud.activity_log import ActivityLogCRUD
+from src.models.activity_log import ActivityLog
+
+USER_ID = uuid.uuid4()
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(ActivityLog.__table__.create)
+    inserts: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _record_inserts(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT"):
+            inserts.append(statement)
+
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    factory.inserts = inserts
+    yield factory
+    await engine.dispose()
+
+
+async def count_rows(factory) -> int:
+    async with factory() as session:
+        return (await session.execute(select(func.count()).select_from(ActivityLog))).scalar()
+
+
+class TestBatching:
+    """Tests for queueing and batched INSERTs."""
+
+    async def test_flush_writes_in_batches(self, session_factory):
+        writer = ActivityLogWriter(session_factory, batch_size=3)
+        for i in range(7):
+            assert await writer.put(USER_ID, "INFO", "BOT", f"entry {i}")
+
+        written = await writer.flush()
+
+        assert written == 7
+        assert await count_rows(session_factory) == 7
+        assert writer.get_stats()["batches"] == 3
+        async with session_factory() as session:
+            rows = (await session.execute(select(ActivityLog).order_by(ActivityLog.created_at))).scalars().all()
+        assert [r.message for r in rows] == [f"entry {i}" for i in range(7)]
+
+    async def test_batch_is_one_insert_statement(self, session_factory):
+        writer = ActivityLogWriter(session_factory, batch_size=50)
+        for i in range(20):
+            await writer.put(USER_ID, "INFO", "BOT", f"entry {i}")
+
+        await writer.flush()
+
+        assert len(session_factory.inserts) == 1
+
+    async def test_running_writer_flushes_when_batch_fills(self, session_factory):
+        writer = ActivityLogWriter(session_factory, batch_size=5, flush_interval=60)
+        await writer.start()
+        try:
+            for i in range(5):
+                await writer.put(USER_ID, "INFO", "BOT", f"entry {i}")
+            for _ in range(100):
+                if writer.get_stats()["written"] == 5:
+                    break
+                await asyncio.sleep(0.01)
+            assert writer.get_stats()["written"] == 5
+        finally:
+            await writer.stop()
+
+    async def test_failed_batch_is_counted(self):
+        failing = MagicMock(side_effect=RuntimeError("db down"))
+        writer = ActivityLogWriter(failing)
+        await writer.put(USER_ID, "ERROR", "TRADE", "boom")
+
+        assert await writer.flush() == 0
+        assert writer.get_stats()["failed"] == 1
+
+
+class TestBackpressure:
+    """Tests for the bounded queue and drop accounting."""
+
+    async def test_full_queue_drops_and_records_summary(self, session_factory):
+        writer = ActivityLogWriter(session_factory, max_queue_size=2, put_timeout=0.01)
+        await writer.put(USER_ID, "INFO", "BOT", "one")
+        await writer.put(USER_ID, "INFO", "BOT", "two")
+
+        assert await writer.put(USER_ID, "INFO", "BOT", "three") is False
+        assert writer.get_stats()["dropped"] == 1
+
+        await writer.flush()
+        async with session_factory() as session:
+            rows = (await session.execute(select(ActivityLog))).scalars().all()
+        messages = {r.message for r in rows}
+        assert messages == {"one", "two", "1 activity log entries dropped (log queue full)"}
+
+    async def test_put_waits_for_writer_to_make_room(self, session_factory):
+        writer = ActivityLogWriter(session_factory, max_queue_size=2, flush_interval=60, put_timeout=1.0)
+        await writer.start()
+        try:
+            await writer.put(USER_ID, "INFO", "BOT", "one")
+            await writer.put(USER_ID, "INFO", "BOT", "two")
+
+            assert await writer.put(USER_ID, "INFO", "BOT", "three") is True
+            assert writer.get_stats()["dropped"] == 0
+        finally:
+            await writer.stop()
+        assert await count_rows(session_factory) == 3
+
+
+class TestIntegration:
+    """Tests for the CRUD entry points and shutdown hook."""
+
+    async def test_crud_enqueues_without_touching_session(self, session_factory):
+        writer = ActivityLogWriter(session_factory, flush_interval=60)
+        db = AsyncMock()
+        await writer.start()
+        try:
+            with patch("src.db.crud.activity_log.activity_log_writer", writer):
+                await ActivityLogCRUD.error(db, USER_ID, "TRADING", "loop failed", {"loop": "trading"})
+            db.add.assert_not_called()
+            db.commit.assert_not_awaited()
+            assert writer.get_stats()["queue_depth"] == 1
+        finally:
+            await writer.stop()
+        assert await count_rows(session_factory) == 1
+
+    async def test_crud_falls_back_to_direct_write_when_not_running(self):
+        writer = ActivityLogWriter(MagicMock())
+        db = MagicMock()
+        db.commit = AsyncMock()
+        db.refresh = AsyncMock()
+        with patch("src.db.crud.activity_log.activity_log_writer", writer):
+            await ActivityLogCRUD.info(db, USER_ID, "BOT", "started")
+
+        db.add.assert_called_once()
+        db.commit.assert_awaited_once()
+
+    async def test_shutdown_manager_flushes_queue(self, session_factory):
+        writer = ActivityLogWriter(session_factory, flush_interval=60)
+        await writer.start()
+        await writer.put(USER_ID, "INFO", "BOT", "stopping")
+
+        handler = ShutdownHandler()
+        BotShutdownManager(handler).register_log_flusher(writer.stop)
+        await handler._execute_shutdown()
+
+        assert not writer.is_running
+        assert await count_rows(session_factory) == 1
@@ -0,0 +1,329 @@
+"""
+Tests for the incrementally maintained analytics rollups and the streamed
+analytics reads built on them.
+"""
+
+import json
+import uuid
+from datetime import datetime, timezone, timedelta
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import src.models  # noqa: F401  (registers all tables on Base.metadata)
+from src.api.deps import get_current_user, get_session_factory
+from src.api.routes import analytics as analytics_routes
+from src.db.crud.analytics_rollup import AnalyticsRollupCRUD
+from src.db.crud.position import PositionCRUD
+from src.db.database import Base
+from src.models.analytics_rollup import ALL_SPORTS, DailyPnLRollup, EquityPoint, TradeStatsRollup
+from src.models.position import Position
+from src.services.analytics_service import AnalyticsService
+
+USER_ID = uuid.uuid4()
+START = datetime(2026, 2, 1, 18, 0, tzinfo=timezone.utc)
+
+# (sport, realized P&L, days after START)
+HISTORY = [
+    ("nba", "4.00", 0),
+    ("nba", "-2.00", 0),
+    ("nfl", "3.00", 1),
+    ("nba", "-1.00", 1),
+    ("nba", "-1.50", 2),
+    ("nfl", "5.00", 3),
+    (None, "0.50", 3),
+]
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    statements: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    factory.statements = statements
+    yield factory
+    await engine.dispose()
+
+
+async def add_closed_history(db, record: bool) -> list[Position]:
+    """Adds HISTORY as closed positions, optionally rolling each one up as it closes."""
+    positions = []
+    for i, (sport, pnl, day) in enumerate(HISTORY):
+        closed_at = START + timedelta(days=day, minutes=i)
+        position = Position(
+            user_id=USER_ID, condition_id=f"c{i}", token_id="t", side="YES", sport=sport,
+            entry_price=Decimal("0.50"), entry_size=Decimal("10"), entry_cost_usdc=Decimal("5"),
+            status="closed", realized_pnl_usdc=Decimal(pnl),
+            opened_at=closed_at - timedelta(hours=2), closed_at=closed_at,
+        )
+        db.add(position)
+        await db.flush()
+        if record:
+            await AnalyticsRollupCRUD.record_closed_position(db, position)
+        positions.append(position)
+    await db.commit()
+    return positions
+
+
+def stats_snapshot(stats: TradeStatsRollup) -> dict:
+    return {
+        column.name: getattr(stats, column.name)
+        for column in TradeStatsRollup.__table__.columns
+        if column.name not in ("id", "updated_at", "last_closed_at")
+    }
+
+
+class TestIncrementalRollups:
+    """Tests for rollups maintained as positions close."""
+
+    async def test_close_position_updates_rollups(self, session_factory):
+        async with session_factory() as db:
+            position = await PositionCRUD.create(
+                db, USER_ID, "c1", "t1", "YES", Decimal("0.40"), Decimal("10"), Decimal("4"), sport="nba"
+            )
+            await PositionCRUD.close_position(db, position.id, Decimal("0.70"), Decimal("10"), Decimal("7"), "take_profit")
+
+            stats = await AnalyticsRollupCRUD.get_trade_stats(db, USER_ID)
+            nba = await AnalyticsRollupCRUD.get_trade_stats(db, USER_ID, "NBA")
+            daily = (await db.execute(select(DailyPnLRollup))).scalars().all()
+            point = (await db.execute(select(EquityPoint))).scalar_one()
+
+        assert (stats.trades, stats.wins, stats.cumulative_pnl) == (1, 1, Decimal("3"))
+        assert nba.trades == 1
+        assert [(d.sport, d.realized_pnl) for d in daily] == [("nba", Decimal("3"))]
+        assert point.position_id == position.id
+        assert point.trade_number == 1
+
+    async def test_missing_rows_created_without_select_then_add(self, session_factory):
+        async with session_factory() as db:
+            position = await PositionCRUD.create(
+                db, USER_ID, "c1", "t1", "YES", Decimal("0.40"), Decimal("10"), Decimal("4"), sport="nba"
+            )
+            session_factory.statements.clear()
+            await PositionCRUD.close_position(db, position.id, Decimal("0.70"), Decimal("10"), Decimal("7"), "take_profit")
+
+        inserts = [s for s in session_factory.statements if s.startswith("INSERT INTO analytics_")]
+        assert len(inserts) == 3
+        assert all("ON CONFLICT" in s and "DO NOTHING" in s for s in inserts[:2])
+
+    async def test_rollup_failure_does_not_block_close(self, session_factory):
+        async with session_factory() as db:
+            position = await PositionCRUD.create(
+                db, USER_ID, "c1", "t1", "YES", Decimal("0.40"), Decimal("10"), Decimal("4"), sport="nba"
+            )
+            with patch.object(AnalyticsRollupCRUD, "apply_trade", side_effect=RuntimeError("boom")):
+                closed = await PositionCRUD.close_position(
+                    db, position.id, Decimal("0.70"), Decimal("10"), Decimal("7"), "take_profit"
+                )
+
+        async with session_factory() as db:
+            stored = await PositionCRUD.get_by_id(db, position.id)
+            stats = (await db.execute(select(TradeStatsRollup))).scalars().all()
+
+        assert closed.status == stored.status == "closed"
+        assert stored.realized_pnl_usdc == Decimal("3")
+        assert stats == []
+
+    async def test_recording_twice_is_ignored(self, session_factory):
+        async with session_factory() as db:
+            positions = await add_closed_history(db, record=True)
+            assert await AnalyticsRollupCRUD.record_closed_position(db, positions[0]) is False
+            await db.commit()
+
+            stats = await AnalyticsRollupCRUD.get_trade_stats(db, USER_ID)
+        assert stats.trades == len(HISTORY)
+
+    async def test_incremental_matches_backfill(self, session_factory):
+        async with session_factory() as db:
+            await add_closed_history(db, record=True)
+            incremental = {
+                s.sport: stats_snapshot(s)
+                for s in (await db.execute(select(TradeStatsRollup))).scalars().all()
+            }
+            incremental_points = [
+                (p.position_id, p.trade_number, p.cumulative_pnl)
+                for p in await AnalyticsRollupCRUD.get_equity_points(db, USER_ID)
+            ]
+
+        async with session_factory() as db:
+            count = await AnalyticsRollupCRUD.rebuild_for_user(db, USER_ID, batch_size=3)
+
+        async with session_factory() as db:
+            rebuilt = {
+                s.sport: stats_snapshot(s)
+                for s in (await db.execute(select(TradeStatsRollup))).scalars().all()
+            }
+            rebuilt_points = [
+                (p.position_id, p.trade_number, p.cumulative_pnl)
+                for p in await AnalyticsRollupCRUD.get_equity_points(db, USER_ID)
+            ]
+
+        assert count == len(HISTORY)
+        assert rebuilt == incremental
+        assert rebuilt_points == incremental_points
+        assert set(rebuilt) == {ALL_SPORTS, "nba", "nfl", "unknown"}
+
+
+class TestAnalyticsFromRollups:
+    """Tests for AnalyticsService reading the rollups."""
+
+    @pytest.fixture
+    async def analytics(self, session_factory):
+        async with session_factory() as db:
+            await add_closed_history(db, record=False)
+            await AnalyticsRollupCRUD.rebuild_for_user(db, USER_ID)
+        session_factory.statements.clear()
+        async with session_factory() as db:
+            yield AnalyticsService(db, USER_ID)
+
+    async def test_performance_metrics(self, analytics, session_factory):
+        metrics = await analytics.get_performance_metrics()
+
+        assert metrics.total_trades == 7
+        assert (metrics.winning_trades, metrics.losing_trades) == (4, 3)
+        assert metrics.total_pnl == 8.0
+        assert metrics.gross_profit == 12.5
+        assert metrics.gross_loss == 4.5
+        assert metrics.largest_win == 5.0
+        assert metrics.largest_loss == 2.0
+        assert metrics.current_streak == 2
+        assert (metrics.max_win_streak, metrics.max_lose_streak) == (2, 2)
+        # Equity 4, 2, 5, 4, 2.5 -> deepest fall is 5 -> 2.5
+        assert metrics.max_drawdown == 50.0
+        assert metrics.avg_trade_duration_hours == 2.0
+        assert not any("FROM positions" in s for s in session_factory.statements)
+
+    async def test_sport_filter_reads_sport_row(self, analytics):
+        metrics = await analytics.get_performance_metrics(sport="nba")
+
+        assert metrics.total_trades == 4
+        assert metrics.total_pnl == -0.5
+        assert metrics.current_streak == -3
+
+    async def test_date_bounded_metrics(self, analytics):
+        metrics = await analytics.get_performance_metrics(
+            start_date=START + timedelta(days=1), end_date=START + timedelta(days=2, hours=1)
+        )
+
+        assert metrics.total_trades == 3
+        assert metrics.total_pnl == 0.5
+        assert metrics.max_lose_streak == 2
+
+    async def test_sport_breakdown(self, analytics):
+        breakdown = {s.sport: s for s in await analytics.get_sport_breakdown()}
+
+        assert set(breakdown) == {"nba", "nfl", "unknown"}
+        assert breakdown["nfl"].total_trades == 2
+        assert breakdown["nfl"].win_rate == 1.0
+        assert breakdown["nfl"].total_pnl == 8.0
+
+    async def test_equity_curve_rebases_at_start_date(self, analytics):
+        full = await analytics.get_equity_curve(initial_capital=100)
+        later = await analytics.get_equity_curve(start_date=START + timedelta(days=3), initial_capital=100)
+
+        assert [p.equity for p in full] == [104, 102, 105, 104, 102.5, 107.5, 108]
+        assert [p.equity for p in later] == [105, 105.5]
+        assert full[3].drawdown == round((105 - 104) / 105 * 100, 2)
+
+    async def test_daily_pnl_sums_sports(self, analytics):
+        days = (datetime.now(timezone.utc) - START).days + 1
+        daily = await analytics.get_daily_pnl(days=days)
+
+        assert daily == [
+            {"date": "2026-02-01", "pnl": 2.0},
+            {"date": "2026-02-02", "pnl": 2.0},
+            {"date": "2026-02-03", "pnl": -1.5},
+            {"date": "2026-02-04", "pnl": 5.5},
+        ]
+
+    async def test_no_history(self, session_factory):
+        async with session_factory() as db:
+            analytics = AnalyticsService(db, uuid.uuid4())
+            metrics = await analytics.get_performance_metrics()
+            curve = await analytics.get_equity_curve()
+
+        assert metrics.total_trades == 0
+        assert curve == []
+
+
+class TestStreaming:
+    """Tests for the streamed, column-projected equity point reads."""
+
+    @pytest.fixture
+    async def history(self, session_factory):
+        async with session_factory() as db:
+            await add_closed_history(db, record=True)
+        session_factory.statements.clear()
+        return session_factory
+
+    async def test_stream_selects_only_needed_columns(self, history):
+        async with history() as db:
+            rows = [r async for r in AnalyticsRollupCRUD.stream_equity_points(db, USER_ID, batch_size=2)]
+
+        assert [r.trade_number for r in rows] == list(range(1, len(HISTORY) + 1))
+        assert not any("FROM positions" in s for s in history.statements)
+        assert not any("entry_confidence_breakdown" in s for s in history.statements)
+
+    async def test_date_bounded_metrics_fold_stream(self, history):
+        async with history() as db:
+            analytics = AnalyticsService(db, USER_ID)
+            with patch.object(AnalyticsRollupCRUD, "get_equity_points", side_effect=AssertionError):
+                metrics = await analytics.get_performance_metrics(start_date=START)
+
+        assert metrics.total_trades == len(HISTORY)
+
+    @pytest.fixture
+    def client(self):
+        def make(session_factory, user_id=USER_ID):
+            app = FastAPI()
+            app.include_router(analytics_routes.router)
+            app.dependency_overrides[get_session_factory] = lambda: session_factory
+            app.dependency_overrides[get_current_user] = lambda: MagicMock(id=user_id)
+            return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+        return make
+
+    async def test_equity_curve_route_streams_json_array(self, history, client):
+        with patch.object(analytics_routes, "EQUITY_CURVE_CHUNK_SIZE", 3):
+            response = await analytics_routes.get_equity_curve(
+                start_date=None, initial_capital=100, current_user=MagicMock(id=USER_ID),
+                session_factory=history,
+            )
+            chunks = [chunk async for chunk in response.body_iterator]
+            async with client(history) as http:
+                served = await http.get("/analytics/equity-curve", params={"initial_capital": 100})
+
+        body = json.loads("".join(chunks))
+        async with history() as db:
+            expected = await AnalyticsService(db, USER_ID).get_equity_curve(initial_capital=100)
+
+        assert response.media_type == "application/json"
+        # "[" + three chunks of up to 3 points + "]"
+        assert len(chunks) == 5
+        assert [p["equity"] for p in body] == [p.equity for p in expected]
+        assert body[0]["trade_id"] == expected[0].trade_id
+        assert served.status_code == 200
+        assert served.json() == body
+
+    async def test_equity_curve_route_empty(self, session_factory, client):
+        async with client(session_factory, user_id=uuid.uuid4()) as http:
+            response = await http.get("/analytics/equity-curve")
+
+        assert response.status_code == 200
+        assert response.json() == []
@@ -321,6 +321,46 @@ class TestPollingIntervals:
         Test health check interval is set correctly.
         """
         assert BotRunner.HEALTH_CHECK_INTERVAL == 60.0
+    
+    def test_price_and_trading_intervals(self):
+        """
+        Test price poll and trading loop intervals are overridable class attributes.
+        """
+        assert BotRunner.PRICE_POLL_INTERVAL == 10.0
+        assert BotRunner.TRADING_LOOP_INTERVAL == 1.0
+
+
+class TestLoopMetrics:
+    """Tests for per-loop iteration timing."""
+    
+    def test_percentiles_and_summary(self):
+        """
+        Test LoopMetrics aggregates samples into millisecond percentiles.
+        """
+        from src.services.types import LoopMetrics
+        
+        metrics = LoopMetrics()
+        for ms in range(1, 101):
+            metrics.record(ms / 1000)
+        
+        summary = metrics.to_dict()
+        assert summary["iterations"] == 100
+        assert summary["p50_ms"] == pytest.approx(50, abs=1)
+        assert summary["p99_ms"] == pytest.approx(99, abs=1)
+        assert summary["max_ms"] == pytest.approx(100)
+    
+    def test_runner_records_iterations_in_status(self):
+        """
+        Test BotRunner exposes recorded loop timings through get_status.
+        """
+        import time
+        
+        runner = BotRunner(MagicMock(), MagicMock(), MagicMock())
+        runner._record_loop_iteration("trading", time.perf_counter())
+        runner._record_loop_iteration("trading", time.perf_counter())
+        
+        status = runner.get_status()
+        assert status["loop_metrics"]["trading"]["iterations"] == 2
 
 
 class TestBotConfiguration:
@@ -0,0 +1,194 @@
+"""
+Tests for warm-restart snapshots of BotRunner state.
+"""
+
+import gzip
+import uuid
+from datetime import datetime, timezone, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import src.models  # noqa: F401  (registers all tables on Base.metadata)
+from src.core.clock import Clock
+from src.db.database import Base
+from src.models.position import Position
+from src.models.tracked_market import TrackedMarket
+from src.services import bot_runner as bot_runner_module
+from src.services.bot_runner import BotRunner, BotState, save_bot_snapshots
+from src.services.bot_snapshot import BotSnapshotStore, game_from_dict, game_to_dict
+from src.services.market_discovery import DiscoveredMarket
+from src.services.types import SportStats, TrackedGame
+
+USER_ID = uuid.uuid4()
+T0 = datetime(2026, 2, 9, 20, 0, tzinfo=timezone.utc)
+
+
+class FakeClock(Clock):
+    def __init__(self, now: datetime):
+        self.current = now
+
+    def now(self) -> datetime:
+        return self.current
+
+
+@pytest.fixture
+def clock():
+    return FakeClock(T0)
+
+
+@pytest.fixture
+def store(tmp_path, clock):
+    return BotSnapshotStore(tmp_path / "snapshots", max_age_seconds=600, clock=clock)
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+def make_game(ticker: str, event_id: str, position_id: uuid.UUID | None = None) -> TrackedGame:
+    market = DiscoveredMarket(
+        condition_id=ticker, token_id_yes=f"{ticker}_YES", token_id_no=f"{ticker}_NO",
+        question=f"{ticker}?", sport="nba", volume_24h=1000, liquidity=500,
+        current_price_yes=0.55, current_price_no=0.45, spread=0.02, ticker=ticker,
+        game_start_time=T0 - timedelta(hours=1),
+    )
+    return TrackedGame(
+        espn_event_id=event_id, sport="nba", home_team="Lakers", away_team="Celtics",
+        market=market, baseline_price=0.6, current_price=0.55, game_status="in",
+        period=3, clock="4:12", home_score=70, away_score=66, last_update=T0,
+        has_position=position_id is not None, position_id=position_id,
+    )
+
+
+def make_runner(clock, store, quotes: dict | None = None) -> BotRunner:
+    client = MagicMock()
+    client.get_markets_by_tickers = AsyncMock(return_value=quotes or {})
+    client.get_order_status = AsyncMock(side_effect=lambda order_id: {
+        "order": {"status": "resting" if order_id == "open-order" else "canceled"}
+    })
+    runner = BotRunner(client, MagicMock(), MagicMock(), clock=clock, price_tape=None, snapshot_store=store)
+    runner.user_id = USER_ID
+    runner.sport_stats["nba"] = SportStats(sport="nba")
+    return runner
+
+
+class TestSnapshotStore:
+    """Tests for the on-disk snapshot file."""
+
+    def test_game_round_trip(self):
+        game = make_game("KXNBA-LAL", "e1", uuid.uuid4())
+
+        restored = game_from_dict(game_to_dict(game))
+
+        assert restored.market == game.market
+        assert (restored.position_id, restored.last_update) == (game.position_id, game.last_update)
+        assert (restored.baseline_price, restored.home_score, restored.clock) == (0.6, 70, "4:12")
+
+    async def test_save_and_load(self, store):
+        size = await store.save(USER_ID, {"trades_today": 3})
+
+        state = await store.load(USER_ID)
+
+        assert state == {"trades_today": 3, "saved_at": T0}
+        assert size == store.path_for(USER_ID).stat().st_size
+        assert [p.name for p in store.root.iterdir()] == [f"{USER_ID}.snap"]
+
+    async def test_stale_corrupt_and_missing_are_ignored(self, store, clock):
+        assert await store.load(USER_ID) is None
+
+        await store.save(USER_ID, {"trades_today": 3})
+        clock.current += timedelta(minutes=11)
+        assert await store.load(USER_ID) is None
+
+        store.path_for(USER_ID).write_bytes(gzip.compress(b"{not json"))
+        assert await store.load(USER_ID) is None
+
+    async def test_discard(self, store):
+        await store.save(USER_ID, {})
+        await store.discard(USER_ID)
+        await store.discard(USER_ID)
+
+        assert not store.path_for(USER_ID).exists()
+
+
+class TestWarmRestart:
+    """Tests for BotRunner snapshot and restore."""
+
+    async def test_restore_reconciles_with_db_and_exchange(self, session_factory, store, clock):
+        still_open, closed_since = uuid.uuid4(), uuid.uuid4()
+        async with session_factory() as db:
+            for ticker, position_id, status in [("KXNBA-LAL", still_open, "open"), ("KXNBA-BOS", closed_since, "closed")]:
+                db.add(TrackedMarket(
+                    user_id=USER_ID, condition_id=ticker, token_id_yes=f"{ticker}_YES",
+                    token_id_no=f"{ticker}_NO", sport="nba",
+                ))
+                db.add(Position(
+                    id=position_id, user_id=USER_ID, condition_id=ticker, token_id=f"{ticker}_YES",
+                    side="YES", entry_price=Decimal("0.5"), entry_size=Decimal("10"),
+                    entry_cost_usdc=Decimal("5"), status=status, opened_at=T0,
+                ))
+            await db.commit()
+
+        before = make_runner(clock, store)
+        for game in [make_game("KXNBA-LAL", "e1", still_open), make_game("KXNBA-BOS", "e2", closed_since)]:
+            before.tracked_games[game.espn_event_id] = game
+            before.token_to_game[game.market.token_id_yes] = game.espn_event_id
+        before.pending_orders = {"open-order": {"action": "BUY"}, "gone-order": {"action": "SELL"}}
+        before.trades_today, before.daily_pnl = 4, -12.5
+        before.sport_stats["nba"].trades_today = 4
+        await before.save_snapshot()
+
+        clock.current += timedelta(minutes=2)
+        after = make_runner(clock, store, quotes={"KXNBA-LAL": {"ticker": "KXNBA-LAL", "yes_ask": 48}})
+        async with session_factory() as db:
+            assert await after._restore_snapshot()
+            await after._recover_positions(db)
+
+        lal, bos = after.tracked_games["e1"], after.tracked_games["e2"]
+        assert set(after.game_tracker.tracked_games) == {"e1", "e2"}
+        assert after.token_to_game == before.token_to_game
+        assert lal.baseline_price == 0.6 and lal.current_price == 0.48
+        assert lal.has_position and lal.position_id == still_open
+        assert not bos.has_position and bos.position_id is None
+        assert list(after.pending_orders) == ["open-order"]
+        assert (after.trades_today, after.daily_pnl, after.sport_stats["nba"].trades_today) == (4, -12.5, 4)
+        assert after.sport_stats["nba"].open_positions == 1
+        # Quotes for restored games come from the same single batched fetch
+        after.trading_client.get_markets_by_tickers.assert_awaited_once()
+
+    async def test_daily_counters_reset_on_a_new_day(self, store, clock):
+        clock.current = datetime(2026, 2, 9, 23, 58, tzinfo=timezone.utc)
+        before = make_runner(clock, store)
+        before.trades_today = 4
+        await before.save_snapshot()
+
+        clock.current += timedelta(minutes=4)
+        after = make_runner(clock, store)
+
+        assert await after._restore_snapshot()
+        assert after.trades_today == 0
+
+    async def test_save_bot_snapshots_only_running_bots(self, store, clock):
+        running, stopped = make_runner(clock, store), make_runner(clock, store)
+        running.state = BotState.RUNNING
+        stopped.user_id = uuid.uuid4()
+        instances = {running.user_id: running, stopped.user_id: stopped}
+
+        with patch.dict(bot_runner_module._bot_instances, instances, clear=True):
+            assert await save_bot_snapshots() == 1
+
+        assert store.path_for(USER_ID).exists()
+        assert not store.path_for(stopped.user_id).exists()
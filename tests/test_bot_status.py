@@ -0,0 +1,212 @@
+"""
+Tests for versioned, cached bot status snapshots.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.api.deps import get_db, require_onboarding_complete
+from src.api.routes.bot import router as bot_router
+from src.core.clock import Clock
+from src.services import bot_runner as bot_runner_module
+from src.services.bot_runner import BotRunner, BotState
+from src.services.market_discovery import DiscoveredMarket
+from src.services.types import TrackedGame
+
+USER_ID = uuid.uuid4()
+
+
+def make_game(event_id: str, sport: str = "nba") -> TrackedGame:
+    market = DiscoveredMarket(
+        condition_id=event_id, token_id_yes=f"{event_id}_YES", token_id_no=f"{event_id}_NO",
+        question=f"{event_id}?", sport=sport, volume_24h=1000, liquidity=500,
+        current_price_yes=0.55, current_price_no=0.45, spread=0.02, ticker=event_id,
+    )
+    return TrackedGame(
+        espn_event_id=event_id, sport=sport, home_team="Lakers", away_team="Celtics",
+        market=market, baseline_price=0.6, current_price=0.55, game_status="in",
+        period=3, home_score=70, away_score=66,
+    )
+
+
+class FakeClock(Clock):
+    def __init__(self):
+        self.elapsed = 0.0
+
+    def now(self) -> datetime:
+        return datetime(2026, 2, 9, 20, 0, tzinfo=timezone.utc)
+
+    def monotonic(self) -> float:
+        return self.elapsed
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def runner(clock):
+    runner = BotRunner(MagicMock(), MagicMock(), MagicMock(), clock=clock, price_tape=None, snapshot_store=None)
+    runner.websocket = None
+    for event_id in ("g1", "g2"):
+        runner.tracked_games[event_id] = make_game(event_id)
+    return runner
+
+
+class TestStatusSnapshots:
+    """Tests for publishing and versioning the status document."""
+
+    def test_reads_share_one_publish(self, runner):
+        first = runner.get_status()
+        second = runner.get_status()
+
+        assert runner.status_publisher.get_stats()["publishes"] == 1
+        assert first["games"] is second["games"]
+        assert first["status_version"] == second["status_version"] == 1
+        assert first["tracked_games"] == 2
+        assert first["games"][0]["score"] == "66-70"
+
+    def test_version_only_bumps_on_change(self, runner):
+        first = runner.publish_status()
+        same = runner.publish_status()
+        runner.tracked_games["g2"].current_price = 0.5
+        changed = runner.publish_status()
+
+        assert same.version == first.version
+        assert changed.version == first.version + 1
+        # The untouched game's row is shared between versions
+        assert changed.document["games"][0] is first.document["games"][0]
+        assert changed.document["games"][1]["current_price"] == 0.5
+
+    def test_state_change_seen_on_next_read(self, runner):
+        assert runner.get_status()["state"] == "stopped"
+
+        runner.state = BotState.PAUSED
+
+        assert runner.get_status()["state"] == "paused"
+
+    def test_republished_when_stale_on_runner_clock(self, runner, clock):
+        runner.get_status()
+        clock.elapsed += runner.STATUS_PUBLISH_INTERVAL
+        runner.get_status()
+        clock.elapsed += runner.STATUS_PUBLISH_INTERVAL * 2
+        runner.get_status()
+
+        assert runner.status_publisher.get_stats()["publishes"] == 2
+
+    def test_sport_stats_counts(self, runner):
+        runner.tracked_games["g3"] = make_game("g3", sport="NFL")
+        runner.sport_stats = {"nfl": MagicMock(trades_today=1, daily_pnl=2.0, open_positions=0)}
+
+        document = runner.publish_status().document
+
+        assert document["sport_breakdown"] == {"nba": {"games": 2, "positions": 0}, "nfl": {"games": 1, "positions": 0}}
+        assert document["sport_stats"]["nfl"]["tracked_games"] == 1
+
+    async def test_wait_for_newer_version(self, runner):
+        version = runner.publish_status().version
+
+        waiter = asyncio.create_task(runner.wait_for_status(version, timeout=5))
+        await asyncio.sleep(0)
+        runner.tracked_games.pop("g1")
+        runner.publish_status()
+
+        assert (await waiter).version == version + 1
+        assert await runner.wait_for_status(version + 1, timeout=0.01) is None
+
+    async def test_stop_wakes_waiters(self, runner):
+        runner.state = BotState.RUNNING
+        version = runner.status_snapshot().version
+
+        waiter = asyncio.create_task(runner.wait_for_status(version, timeout=5))
+        await asyncio.sleep(0)
+        with patch.object(bot_runner_module, "discord_notifier", AsyncMock()):
+            await runner.stop(MagicMock())
+        snapshot = await waiter
+
+        assert snapshot.document["state"] in ("stopping", "stopped")
+        assert runner.status_snapshot().document["state"] == "stopped"
+        assert runner.status_snapshot().document["tracked_games"] == 0
+
+    async def test_emergency_stop_wakes_waiters(self, runner):
+        runner.state = BotState.RUNNING
+        version = runner.status_snapshot().version
+
+        waiter = asyncio.create_task(runner.wait_for_status(version, timeout=5))
+        await asyncio.sleep(0)
+        with patch.object(bot_runner_module, "discord_notifier", AsyncMock()):
+            await runner.emergency_shutdown(MagicMock(), close_positions=False)
+        snapshot = await waiter
+
+        assert snapshot.document["emergency_stop"] is True
+        assert runner.status_snapshot().document["state"] == "stopped"
+
+
+@pytest.fixture
+async def client(runner):
+    app = FastAPI()
+    app.include_router(bot_router)
+
+    class Session:
+        async def close(self):
+            pass
+
+    app.dependency_overrides[get_db] = lambda: Session()
+    app.dependency_overrides[require_onboarding_complete] = lambda: MagicMock(id=USER_ID)
+    bot_runner_module._bot_instances[USER_ID] = runner
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            yield client
+    finally:
+        bot_runner_module._bot_instances.pop(USER_ID, None)
+
+
+class TestLiveStatusRoute:
+    """Tests for GET /bot/status/live."""
+
+    async def test_not_modified_until_changed(self, client, runner):
+        first = await client.get("/bot/status/live")
+        etag = first.headers["etag"]
+        unchanged = await client.get("/bot/status/live", headers={"if-none-match": etag})
+        runner.state = BotState.RUNNING
+        changed = await client.get("/bot/status/live", headers={"if-none-match": etag})
+
+        assert first.status_code == 200
+        assert first.json()["status_version"] == 1
+        assert unchanged.status_code == 304
+        assert changed.status_code == 200
+        assert changed.json()["state"] == "running"
+        assert changed.headers["etag"] != etag
+
+    async def test_long_poll(self, client, runner):
+        etag = (await client.get("/bot/status/live")).headers["etag"]
+
+        async def change_soon():
+            await asyncio.sleep(0.05)
+            runner.tracked_games["g1"].home_score = 72
+            runner.publish_status()
+
+        changer = asyncio.create_task(change_soon())
+        response = await client.get("/bot/status/live", params={"wait": 5}, headers={"if-none-match": etag})
+        await changer
+        timed_out = await client.get(
+            "/bot/status/live", params={"wait": 0.05}, headers={"if-none-match": response.headers["etag"]},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["games"][0]["score"] == "66-72"
+        assert timed_out.status_code == 304
+
+    async def test_no_bot(self, client):
+        bot_runner_module._bot_instances.pop(USER_ID)
+
+        response = await client.get("/bot/status/live")
+
+        assert response.json() == {"state": "stopped", "status_version": 0}
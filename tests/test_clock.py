@@ -0,0 +1,272 @@
+"""
+Tests for the injectable clock, the VirtualClock scheduler and game replay.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from src.core.clock import SystemClock, VirtualClock
+from src.services.bot_runner import BotRunner
+from src.services.game_replay import GameRecording, GameReplay, ReplayESPNService
+from src.services.kalshi_client import KalshiClient
+from src.services.kalshi_simulator import KalshiExchangeSimulator
+from src.services.market_discovery import DiscoveredMarket
+from src.services.price_cache import PriceHistoryCache
+from src.services.types import TrackedGame
+
+START = datetime(2026, 2, 7, 3, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture(scope="module")
+def private_key_pem() -> str:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.TraditionalOpenSSL,
+        serialization.NoEncryption(),
+    ).decode()
+
+
+class TestSystemClock:
+    """Tests for the wall-clock implementation."""
+
+    async def test_now_is_utc(self):
+        clock = SystemClock()
+        assert clock.now().tzinfo == timezone.utc
+        assert abs((clock.now() - datetime.now(timezone.utc)).total_seconds()) < 1
+
+
+class TestVirtualClock:
+    """Tests for virtual time scheduling."""
+
+    async def test_sleep_advances_virtual_time_only(self):
+        clock = VirtualClock(START)
+        woke = []
+
+        async def sleeper():
+            await clock.sleep(3600)
+            woke.append(clock.now())
+
+        task = asyncio.create_task(sleeper())
+        started = time.perf_counter()
+        await clock.advance(7200)
+        await task
+
+        assert woke == [START + timedelta(hours=1)]
+        assert clock.now() == START + timedelta(hours=2)
+        assert clock.monotonic() == 7200
+        assert time.perf_counter() - started < 1
+
+    async def test_interleaving_is_deterministic(self):
+        clock = VirtualClock(START)
+        events = []
+
+        async def loop(name: str, interval: float):
+            while True:
+                events.append((clock.monotonic(), name))
+                await clock.sleep(interval)
+
+        tasks = [
+            asyncio.create_task(loop("fast", 2)),
+            asyncio.create_task(loop("slow", 3)),
+        ]
+        await clock.advance(6)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert events == [
+            (0, "fast"), (0, "slow"),
+            (2, "fast"),
+            (3, "slow"),
+            (4, "fast"),
+            # Equal wake times fire in the order the sleeps were scheduled
+            (6, "slow"), (6, "fast"),
+        ]
+
+    async def test_callbacks_fire_in_schedule_order(self):
+        clock = VirtualClock(START)
+        fired = []
+        clock.call_at(START + timedelta(seconds=10), lambda: fired.append("b"))
+        clock.call_at(START + timedelta(seconds=5), lambda: fired.append("a"))
+        clock.call_at(START + timedelta(seconds=10), lambda: fired.append("c"))
+        clock.call_later(30, lambda: fired.append("late"))
+
+        await clock.advance(10)
+
+        assert fired == ["a", "b", "c"]
+        assert clock.next_wakeup() == START + timedelta(seconds=30)
+
+    async def test_waits_for_busy_tasks_before_advancing(self):
+        clock = VirtualClock(START)
+        seen = []
+
+        async def worker():
+            # Real (non-virtual) work, like a database round trip
+            await asyncio.sleep(0.01)
+            seen.append(clock.monotonic())
+            await clock.sleep(5)
+            seen.append(clock.monotonic())
+
+        task = asyncio.create_task(worker())
+        await clock.advance(10)
+        await task
+
+        assert seen == [0, 5]
+
+    async def test_settle_timeout_names_busy_task(self):
+        clock = VirtualClock(START, settle_timeout=0.05)
+        blocker = asyncio.create_task(asyncio.Event().wait(), name="stuck")
+        try:
+            with pytest.raises(TimeoutError, match="stuck"):
+                await clock.advance(1)
+            clock.ignore_task(blocker)
+            await clock.advance(1)
+        finally:
+            blocker.cancel()
+
+
+class TestClockInjection:
+    """Tests for services that take a clock."""
+
+    async def test_wait_for_fill_times_out_in_virtual_time(self, private_key_pem):
+        clock = VirtualClock(START)
+        exchange = KalshiExchangeSimulator()
+        exchange.add_market("KXNBAGAME-26FEB07AWYHOM-HOM", 45, 47)
+        client = exchange.create_client("key-1", private_key_pem, clock=clock)
+        order = await client.place_order("KXNBAGAME-26FEB07AWYHOM-HOM", "buy", "yes", 0.40, 5)
+
+        task = asyncio.create_task(client.wait_for_fill(order["order"]["order_id"], timeout=60))
+        await clock.advance(120)
+
+        assert task.result() == "timeout"
+        assert clock.now() == START + timedelta(seconds=120)
+
+    async def test_retry_backoff_sleeps_on_client_clock(self, private_key_pem):
+        clock = VirtualClock(START)
+        statuses = [503, 503, 200]
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(statuses.pop(0), json={"balance": 1000})
+
+        client = KalshiClient("key-1", private_key_pem, transport=httpx.MockTransport(respond), clock=clock)
+        task = asyncio.create_task(client._authenticated_request("GET", "/portfolio/balance"))
+        await clock.advance(3)
+
+        assert task.result() == {"balance": 1000}
+        # Backoff of 1s then 2s, all in virtual time
+        assert clock.now() == START + timedelta(seconds=3)
+        await client.close()
+
+    async def test_price_cache_uses_clock(self):
+        clock = VirtualClock(START)
+        cache = PriceHistoryCache(clock=clock)
+        await cache.add("m1", Decimal("0.50"))
+        await clock.advance(600)
+        await cache.add("m1", Decimal("0.60"))
+
+        baseline = await cache.get_baseline("m1", lookback_minutes=5)
+
+        assert baseline == Decimal("0.60")
+        assert (await cache.get_latest("m1")).timestamp == START + timedelta(seconds=600)
+
+    def test_live_by_schedule_uses_runner_clock(self):
+        runner = BotRunner(MagicMock(), MagicMock(), MagicMock(), clock=VirtualClock(START))
+        market = DiscoveredMarket(
+            condition_id="c", token_id_yes="y", token_id_no="n", question="q",
+            sport="nba", volume_24h=0, liquidity=0, current_price_yes=0.5,
+            current_price_no=0.5, spread=0.02, game_start_time=START,
+            ticker="KXNBAGAME-26FEB07AWYHOM-HOM",
+        )
+        game = TrackedGame(
+            espn_event_id="e", sport="nba", home_team="Home", away_team="Away", market=market
+        )
+        game.refresh_clock()
+
+        # The wall clock is far past this game; the runner's clock is not
+        assert runner._is_game_live_by_kalshi(game) is True
+
+
+class TestGameReplay:
+    """Tests for replaying a recorded game through BotRunner loops."""
+
+    def test_recording_round_trip(self, tmp_path):
+        recording = GameRecording.synthetic(START, duration_hours=0.1, seed=3)
+        path = tmp_path / "game.json"
+        recording.save(path)
+
+        loaded = GameRecording.load(path)
+
+        assert loaded.to_dict() == recording.to_dict()
+        assert loaded.end_time == START + timedelta(hours=0.1)
+        assert loaded.frames[-2].data["state"] == "post"
+
+    async def test_three_hour_game_replays_in_seconds(self, private_key_pem):
+        recording = GameRecording.synthetic(START, duration_hours=3.0, seed=7)
+        clock = VirtualClock(START - timedelta(minutes=1))
+        exchange = KalshiExchangeSimulator()
+        espn = ReplayESPNService()
+        replay = GameReplay(recording, clock, exchange, espn)
+        replay.schedule()
+
+        client = exchange.create_client("replay", private_key_pem, clock=clock)
+        runner = BotRunner(client, MagicMock(), espn, clock=clock)
+        market = DiscoveredMarket(
+            condition_id=recording.ticker, token_id_yes="y", token_id_no="n",
+            question="Will Home win?", sport="nba", volume_24h=0, liquidity=0,
+            current_price_yes=None, current_price_no=None, spread=0.02,
+            game_start_time=START, ticker=recording.ticker,
+        )
+        game = TrackedGame(
+            espn_event_id=recording.event_id, sport="nba", home_team="Home",
+            away_team="Away", market=market,
+        )
+        runner.tracked_games[game.espn_event_id] = game
+        runner.game_tracker.add_game(game)
+
+        observed = []
+        original_update = runner.game_tracker.update_all_games
+
+        async def recording_update():
+            finished = await original_update()
+            observed.append((clock.now(), game.period, game.current_price))
+            return finished
+
+        @asynccontextmanager
+        async def no_db():
+            yield MagicMock()
+
+        runner.game_tracker.update_all_games = recording_update
+        started = time.perf_counter()
+        with patch("src.services.bot_runner.async_session_factory", no_db), \
+             patch.object(runner, "_handle_game_finished", AsyncMock()):
+            tasks = [
+                asyncio.create_task(runner._espn_poll_loop(), name="espn_poll"),
+                asyncio.create_task(runner._price_poll_loop(), name="price_poll"),
+            ]
+            await replay.run()
+            runner._stop_event.set()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 30
+        assert replay.frames_applied == len(recording.frames)
+        # ESPN polled every 5 virtual seconds for the whole game, in order
+        times = [t for t, _, _ in observed]
+        assert times == sorted(times)
+        assert len(observed) >= 3 * 3600 // runner.ESPN_POLL_INTERVAL
+        assert game.game_status == "post"
+        assert game.period == 4
+        assert game.current_price == recording.frames[-1].data["yes_ask"] / 100
+        assert runner.loop_metrics["price_poll"].iterations >= 3 * 3600 // runner.PRICE_POLL_INTERVAL
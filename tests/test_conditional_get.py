@@ -0,0 +1,169 @@
+"""
+Tests for ETag / conditional GET on versioned settings resources.
+"""
+
+import uuid
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import src.models  # noqa: F401  (registers all tables on Base.metadata)
+from src.api.deps import get_current_user, get_db
+from src.api.routes.market_config import router as market_config_router
+from src.api.routes.settings import router as settings_router
+from src.core.resource_versions import ResourceVersions, etag_matches, resource_versions
+from src.db.crud.market_config import MarketConfigCRUD
+from src.db.crud.sport_config import SportConfigCRUD
+from src.db.database import Base
+from src.schemas.settings import SportConfigResponse
+
+USER_ID = uuid.uuid4()
+OTHER_USER_ID = uuid.uuid4()
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    selects: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _record_selects(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT"):
+            selects.append(statement)
+
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    factory.selects = selects
+    async with factory() as db:
+        await SportConfigCRUD.create(db, USER_ID, "nba")
+        await SportConfigCRUD.create(db, OTHER_USER_ID, "nba")
+        await MarketConfigCRUD.create(db, USER_ID, "KXNBA-LAL", sport="nba")
+    selects.clear()
+    yield factory
+    await engine.dispose()
+
+
+@pytest.fixture
+async def client(session_factory):
+    app = FastAPI()
+    app.include_router(settings_router)
+    app.include_router(market_config_router)
+
+    async def db_override():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = db_override
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(
+        id=USER_ID, is_active=True, onboarding_completed=True
+    )
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+class TestResourceVersions:
+    """Tests for version stamps and ETag matching."""
+
+    def test_etag_changes_with_scope_version_and_generation(self):
+        versions = ResourceVersions()
+        first = versions.etag(["sport_configs"], USER_ID)
+
+        versions.bump("sport_configs", OTHER_USER_ID)
+        assert versions.etag(["sport_configs"], USER_ID) == first
+
+        versions.bump("sport_configs", USER_ID)
+        second = versions.etag(["sport_configs"], USER_ID)
+        versions.bump("sport_configs")
+        third = versions.etag(["sport_configs"], USER_ID)
+
+        assert len({first, second, third}) == 3
+        assert versions.etag(["sport_configs"], USER_ID, variant="?sport=nba") != third
+        assert ResourceVersions().etag(["sport_configs"], USER_ID) != first
+
+    def test_if_none_match_parsing(self):
+        assert etag_matches('"a", "b"', '"b"')
+        assert etag_matches('W/"b"', '"b"')
+        assert etag_matches("*", '"b"')
+        assert not etag_matches('"a"', '"b"')
+        assert not etag_matches(None, '"b"')
+
+
+class TestConditionalGet:
+    """Tests for 304 responses on the settings routes."""
+
+    async def test_hit_skips_query_and_serialization(self, client, session_factory):
+        first = await client.get("/settings/sports")
+        etag = first.headers["etag"]
+        session_factory.selects.clear()
+
+        with patch.object(SportConfigResponse, "model_validate", wraps=SportConfigResponse.model_validate) as validate:
+            second = await client.get("/settings/sports", headers={"If-None-Match": etag})
+
+        assert first.status_code == 200 and len(first.json()) == 1
+        assert first.headers["cache-control"] == "private, no-cache"
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+        assert session_factory.selects == []
+        validate.assert_not_called()
+
+    async def test_commit_bumps_only_the_owner(self, client, session_factory):
+        etag = (await client.get("/settings/sports")).headers["etag"]
+
+        async with session_factory() as db:
+            other = await SportConfigCRUD.get_by_user_and_sport(db, OTHER_USER_ID, "nba")
+            await SportConfigCRUD.update(db, other.id, enabled=True)
+        assert (await client.get("/settings/sports", headers={"If-None-Match": etag})).status_code == 304
+
+        async with session_factory() as db:
+            mine = await SportConfigCRUD.get_by_user_and_sport(db, USER_ID, "nba")
+            await SportConfigCRUD.update(db, mine.id, enabled=True)
+        refreshed = await client.get("/settings/sports", headers={"If-None-Match": etag})
+
+        assert refreshed.status_code == 200
+        assert refreshed.json()[0]["enabled"] is True
+        assert refreshed.headers["etag"] != etag
+
+    async def test_rollback_does_not_bump(self, client, session_factory):
+        etag = (await client.get("/settings/sports")).headers["etag"]
+
+        async with session_factory() as db:
+            mine = await SportConfigCRUD.get_by_user_and_sport(db, USER_ID, "nba")
+            mine.enabled = True
+            await db.flush()
+            await db.rollback()
+
+        assert (await client.get("/settings/sports", headers={"If-None-Match": etag})).status_code == 304
+
+    async def test_bulk_delete_bumps_every_user(self, client, session_factory):
+        etag = (await client.get("/market-configs")).headers["etag"]
+        filtered = (await client.get("/market-configs", params={"sport": "nba"})).headers["etag"]
+        assert filtered != etag
+
+        async with session_factory() as db:
+            await MarketConfigCRUD.delete_by_condition_id(db, OTHER_USER_ID, "KXNBA-OTHER")
+
+        response = await client.get("/market-configs", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+
+    async def test_static_catalog_is_public(self, client):
+        first = await client.get("/settings/sports/progress-config")
+        second = await client.get(
+            "/settings/sports/progress-config", headers={"If-None-Match": first.headers["etag"]}
+        )
+
+        assert first.headers["cache-control"] == "public, max-age=300"
+        assert "vary" not in first.headers
+        assert second.status_code == 304
+        assert resource_versions.get_stats()["not_modified"] >= 1
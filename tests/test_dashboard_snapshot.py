@@ -0,0 +1,219 @@
+"""
+Tests for the cached dashboard snapshot service.
+"""
+
+import uuid
+from datetime import datetime, timezone, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import src.models  # noqa: F401  (registers all tables on Base.metadata)
+from src.core.cache import InMemoryCache
+from src.db.crud.position import PositionCRUD
+from src.db.database import Base
+from src.models.activity_log import ActivityLog
+from src.models.global_settings import GlobalSettings
+from src.models.position import Position
+from src.models.tracked_market import TrackedMarket
+from src.services.dashboard_snapshot import DashboardSnapshotService
+
+USER_ID = uuid.uuid4()
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    selects: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _record_selects(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT"):
+            selects.append(statement)
+
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    factory.selects = selects
+    async with factory() as db:
+        await seed(db)
+    selects.clear()
+    yield factory
+    await engine.dispose()
+
+
+async def seed(db) -> None:
+    now = datetime.now(timezone.utc)
+    db.add(GlobalSettings(user_id=USER_ID, bot_enabled=True))
+    db.add(TrackedMarket(
+        user_id=USER_ID, condition_id="c-marked", token_id_yes="y", token_id_no="n",
+        sport="nba", current_price_yes=Decimal("0.60"), current_price_no=Decimal("0.40"),
+    ))
+    db.add(TrackedMarket(
+        user_id=USER_ID, condition_id="c-done", token_id_yes="y2", token_id_no="n2",
+        sport="nba", is_finished=True,
+    ))
+    db.add_all([
+        Position(
+            user_id=USER_ID, condition_id="c-marked", token_id="y", side="YES", team="Home",
+            entry_price=Decimal("0.50"), entry_size=Decimal("10"), entry_cost_usdc=Decimal("5"),
+            status="open", opened_at=now - timedelta(minutes=5),
+        ),
+        Position(
+            user_id=USER_ID, condition_id="c-unmarked", token_id="n", side="NO", team="Away",
+            entry_price=Decimal("0.30"), entry_size=Decimal("20"), entry_cost_usdc=Decimal("6"),
+            status="open", opened_at=now - timedelta(minutes=1),
+        ),
+        Position(
+            user_id=USER_ID, condition_id="c-old", token_id="y", side="YES",
+            entry_price=Decimal("0.40"), entry_size=Decimal("10"), entry_cost_usdc=Decimal("4"),
+            status="closed", realized_pnl_usdc=Decimal("2.50"), closed_at=now,
+        ),
+        Position(
+            user_id=USER_ID, condition_id="c-old", token_id="y", side="YES",
+            entry_price=Decimal("0.40"), entry_size=Decimal("10"), entry_cost_usdc=Decimal("4"),
+            status="closed", realized_pnl_usdc=Decimal("-1.00"), closed_at=now - timedelta(days=2),
+        ),
+        # Another user's rows must not leak into the snapshot
+        Position(
+            user_id=uuid.uuid4(), condition_id="c-marked", token_id="y", side="YES",
+            entry_price=Decimal("0.50"), entry_size=Decimal("10"), entry_cost_usdc=Decimal("99"),
+            status="open",
+        ),
+    ])
+    for i in range(12):
+        db.add(ActivityLog(
+            user_id=USER_ID, level="INFO", category="BOT", message=f"entry {i}",
+            created_at=now - timedelta(seconds=60 - i),
+        ))
+    await db.commit()
+
+
+@pytest.fixture
+def service():
+    return DashboardSnapshotService(snapshots=InMemoryCache(), balances=InMemoryCache())
+
+
+class TestSnapshotQueries:
+    """Tests for building a snapshot from the database."""
+
+    async def test_matches_per_figure_queries(self, session_factory, service):
+        async with session_factory() as db:
+            stats = await service.build(db, USER_ID)
+
+            assert stats.open_positions_count == 2
+            assert stats.open_positions_value == await PositionCRUD.get_open_exposure(db, USER_ID)
+            assert stats.total_pnl_today == await PositionCRUD.get_daily_pnl(db, USER_ID)
+            assert stats.total_pnl_all_time == await PositionCRUD.get_total_pnl(db, USER_ID)
+            assert stats.win_rate == await PositionCRUD.get_win_rate(db, USER_ID)
+        assert stats.total_pnl_today == Decimal("2.50")
+        assert stats.win_rate == 50.0
+        assert stats.active_markets_count == 1
+        assert stats.bot_status == "running"
+        assert stats.balance_usdc == Decimal("0")
+
+    async def test_marks_come_from_joined_market(self, session_factory, service):
+        async with session_factory() as db:
+            stats = await service.build(db, USER_ID)
+
+        unmarked, marked = stats.open_positions
+        assert marked.current_price == Decimal("0.60")
+        assert marked.unrealized_pnl == Decimal("1.00")
+        assert unmarked.current_price is None
+        assert unmarked.unrealized_pnl is None
+        assert [a.message for a in stats.recent_activity] == [f"entry {i}" for i in range(11, 1, -1)]
+
+    async def test_build_runs_three_statements(self, session_factory, service):
+        await service._balances.set(str(USER_ID), Decimal("123.45"))
+        async with session_factory() as db:
+            stats = await service.build(db, USER_ID)
+
+        assert len(session_factory.selects) == 3
+        assert stats.balance_usdc == Decimal("123.45")
+
+    async def test_empty_user(self, session_factory, service):
+        async with session_factory() as db:
+            stats = await service.build(db, uuid.uuid4())
+
+        assert stats.open_positions_count == 0
+        assert stats.total_pnl_all_time == Decimal("0")
+        assert stats.win_rate == 0.0
+        assert stats.bot_status == "stopped"
+
+
+class TestSnapshotCache:
+    """Tests for the per-user cache and its invalidation."""
+
+    async def test_cache_hit_skips_database(self, session_factory, service):
+        async with session_factory() as db:
+            first = await service.get_stats(db, USER_ID)
+            session_factory.selects.clear()
+            second = await service.get_stats(db, USER_ID)
+
+        assert second is first
+        assert session_factory.selects == []
+        assert service.get_cache_stats()["hits"] == 1
+
+    async def test_position_commit_invalidates_user(self, session_factory, service):
+        async with session_factory() as db:
+            await service.get_stats(db, USER_ID)
+            await service._snapshots.set("other-user", object())
+            with patch("src.services.dashboard_snapshot.dashboard_snapshots", service):
+                position = await PositionCRUD.get_open_for_user(db, USER_ID)
+                position[0].status = "closed"
+                await db.commit()
+
+            assert await service._snapshots.get(str(USER_ID)) is None
+            assert await service._snapshots.get("other-user") is not None
+            assert (await service.get_stats(db, USER_ID)).open_positions_count == 1
+
+    async def test_settings_commit_invalidates_user(self, session_factory, service):
+        async with session_factory() as db:
+            await service.get_stats(db, USER_ID)
+            with patch("src.services.dashboard_snapshot.dashboard_snapshots", service):
+                await db.execute(update(GlobalSettings).values(bot_enabled=False))
+                await db.commit()
+
+            assert (await service.get_stats(db, USER_ID)).bot_status == "stopped"
+
+    async def test_rollback_keeps_snapshot(self, session_factory, service):
+        async with session_factory() as db:
+            await service.get_stats(db, USER_ID)
+            with patch("src.services.dashboard_snapshot.dashboard_snapshots", service):
+                position = await PositionCRUD.get_open_for_user(db, USER_ID)
+                position[0].status = "closed"
+                await db.flush()
+                await db.rollback()
+
+        assert await service._snapshots.get(str(USER_ID)) is not None
+
+
+class TestBalanceCache:
+    """Tests for the cached exchange balance."""
+
+    async def test_balance_fetched_once_per_ttl(self, session_factory, service):
+        fetch = AsyncMock(return_value=(Decimal("50"), True))
+        async with session_factory() as db:
+            with patch.object(service, "_fetch_balance", fetch):
+                assert await service.get_balance(db, USER_ID) == Decimal("50")
+                assert await service.get_balance(db, USER_ID) == Decimal("50")
+
+        fetch.assert_awaited_once()
+
+    async def test_failed_fetch_uses_short_ttl(self, session_factory, service):
+        fetch = AsyncMock(return_value=(Decimal("0"), False))
+        async with session_factory() as db:
+            with patch.object(service, "_fetch_balance", fetch):
+                await service.get_balance(db, USER_ID)
+
+        entry = service._balances._cache[str(USER_ID)]
+        remaining = entry.expires_at - datetime.now(timezone.utc).timestamp()
+        assert remaining <= service.BALANCE_ERROR_TTL_SECONDS
@@ -0,0 +1,152 @@
+"""
+Tests for the shared per-user dashboard SSE stream hub.
+"""
+
+import asyncio
+import json
+import uuid
+
+from src.services.dashboard_stream import DashboardStreamHub, apply_patch, diff_state
+
+USER_ID = uuid.uuid4()
+
+
+def state(pnl: float = 0.0, games: dict | None = None) -> dict:
+    return {
+        "status": {"state": "running", "daily_pnl": pnl},
+        "games": games if games is not None else {"e1": {"price": 0.5}},
+        "positions": {},
+    }
+
+
+class FakeBuilder:
+    """State builder that returns queued states and counts calls (never returns if given none)."""
+
+    def __init__(self, *states: dict):
+        self.states = list(states)
+        self.calls = 0
+
+    async def __call__(self, user_id: uuid.UUID) -> dict:
+        self.calls += 1
+        if not self.states:
+            await asyncio.Event().wait()
+        return self.states[min(self.calls, len(self.states)) - 1]
+
+
+def decode(frame) -> tuple[str, dict]:
+    return frame.event, json.loads(frame.data)
+
+
+class TestDiff:
+    """Tests for JSON-Patch diffing."""
+
+    def test_round_trip(self):
+        old = {"a": 1, "b": {"c": [1, 2], "d/e": "x", "gone": 1}, "f": None}
+        new = {"a": 2, "b": {"c": [1, 2, 3], "d/e": "y", "new~": True}, "f": None}
+
+        ops = diff_state(old, new)
+
+        assert apply_patch(json.loads(json.dumps(old)), ops) == new
+        assert {"op": "remove", "path": "/b/gone"} in ops
+        assert {"op": "replace", "path": "/b/d~1e", "value": "y"} in ops
+        assert {"op": "add", "path": "/b/new~0", "value": True} in ops
+        assert diff_state(new, new) == []
+
+
+class TestHub:
+    """Tests for fan-out, delta frames and resume."""
+
+    async def test_tabs_share_one_producer(self):
+        builder = FakeBuilder(state())
+        hub = DashboardStreamHub(builder, interval=0.01)
+
+        async with hub.subscribe(USER_ID) as tab1, hub.subscribe(USER_ID) as tab2, hub.subscribe(USER_ID) as tab3:
+            frames = [await tab.get(timeout=1) for tab in (tab1, tab2, tab3)]
+            await asyncio.sleep(0.05)
+
+            # Unchanged state publishes nothing more
+            assert await tab1.get(timeout=0.02) is None
+            calls = builder.calls
+
+        assert len({id(frame) for frame in frames}) == 1
+        assert decode(frames[0]) == ("snapshot", {"version": 1, "state": state()})
+        # One build per tick for the user, not one per tab
+        assert 3 <= calls <= 10
+        assert hub.get_stats()["subscribers"] == 0
+
+    async def test_changes_are_sent_as_patches(self):
+        hub = DashboardStreamHub(FakeBuilder(state(), state(pnl=5.0)), interval=0.01)
+
+        async with hub.subscribe(USER_ID) as tab:
+            snapshot = await tab.get(timeout=1)
+            patch = await tab.get(timeout=1)
+
+        event, body = decode(patch)
+        assert event == "patch"
+        assert body == {
+            "version": 2, "base": 1,
+            "ops": [{"op": "replace", "path": "/status/daily_pnl", "value": 5.0}],
+        }
+        assert patch.encode().startswith(f"id: {patch.id}\nevent: patch\ndata: ")
+        assert apply_patch(json.loads(snapshot.data)["state"], body["ops"]) == state(pnl=5.0)
+
+    async def test_periodic_keyframes(self):
+        hub = DashboardStreamHub(FakeBuilder(), interval=60)
+        hub.KEYFRAME_EVERY = 3
+        async with hub.subscribe(USER_ID):
+            stream = hub._streams[USER_ID]
+            events = [hub.publish(stream, state(pnl=i)).event for i in range(7)]
+
+        assert events == ["snapshot", "patch", "snapshot", "patch", "patch", "snapshot", "patch"]
+
+    async def test_resume_replays_missed_patches(self):
+        hub = DashboardStreamHub(FakeBuilder(), interval=60)
+        async with hub.subscribe(USER_ID):
+            stream = hub._streams[USER_ID]
+            first = hub.publish(stream, state(pnl=1))
+            for i in range(2, 5):
+                hub.publish(stream, state(pnl=i))
+
+        async with hub.subscribe(USER_ID, last_event_id=first.id) as resumed:
+            replayed = [await resumed.get(timeout=0.1) for _ in range(3)]
+            assert await resumed.get(timeout=0.01) is None
+        async with hub.subscribe(USER_ID, last_event_id="stale-1") as fresh:
+            event, body = decode(await fresh.get(timeout=0.1))
+
+        assert [frame.version for frame in replayed] == [2, 3, 4]
+        assert (event, body["version"], body["state"]) == ("snapshot", 4, state(pnl=4))
+
+    async def test_slow_subscriber_resyncs_from_snapshot(self):
+        hub = DashboardStreamHub(FakeBuilder(), interval=60)
+        hub.SUBSCRIBER_QUEUE_SIZE = 2
+        async with hub.subscribe(USER_ID) as tab:
+            stream = hub._streams[USER_ID]
+            for i in range(5):
+                hub.publish(stream, state(pnl=i))
+
+            event, body = decode(await tab.get(timeout=0.1))
+            assert hub.get_stats()["resyncs"] >= 1
+
+        assert event == "snapshot"
+        assert body["state"]["status"]["daily_pnl"] >= 2
+
+    async def test_producer_stops_with_last_subscriber(self):
+        hub = DashboardStreamHub(FakeBuilder(state()), interval=0.01)
+
+        async with hub.subscribe(USER_ID) as tab:
+            await tab.get(timeout=1)
+            task = hub._streams[USER_ID].task
+
+        await asyncio.sleep(0)
+        assert task.cancelled() or task.done()
+
+    async def test_build_errors_reach_subscribers(self):
+        async def failing(user_id):
+            raise RuntimeError("db down")
+
+        hub = DashboardStreamHub(failing, interval=0.01)
+        async with hub.subscribe(USER_ID) as tab:
+            frame = await tab.get(timeout=1)
+
+        assert decode(frame) == ("error", {"error": "db down"})
+        assert frame.encode().startswith("event: error\n")
@@ -0,0 +1,198 @@
+"""
+Tests for the fused middleware pipeline against the separate middleware stack.
+"""
+
+import gzip
+
+import httpx
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.responses import StreamingResponse
+
+from src.core.logging_service import RequestLoggingMiddleware
+from src.core.middleware import FusedMiddleware
+from src.core.rate_limiter import RateLimitConfig, RateLimitMiddleware
+from src.core.security_headers import SecurityHeadersMiddleware, create_security_headers_config
+from src.core.validation import RequestValidationMiddleware, ValidationConfig
+
+CORS = dict(
+    allow_origins=["https://app.example.com"],
+    allow_credentials=True,
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type"],
+)
+BIG = {"markets": [{"id": i, "question": f"Will team {i} win?"} for i in range(100)]}
+
+
+def rate_limit_config() -> RateLimitConfig:
+    return RateLimitConfig(burst_limit=3, exempt_paths=["/health"])
+
+
+def build_app(fused: bool, gzip_minimum_size: int | None = None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/bot/status")
+    async def status() -> dict:
+        return {"state": "running"}
+
+    @app.get("/api/v1/settings/global")
+    async def cached(response: Response) -> dict:
+        response.headers["Cache-Control"] = "private, no-cache"
+        response.headers["Vary"] = "Authorization"
+        return BIG
+
+    @app.post("/api/v1/echo")
+    async def echo(body: dict) -> dict:
+        return body
+
+    @app.get("/api/v1/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks():
+            for _ in range(3):
+                yield b"data: " + b"x" * 600 + b"\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    @app.get("/health")
+    async def health() -> dict:
+        return {"status": "ok"}
+
+    @app.get("/static/app.js")
+    async def static() -> dict:
+        return {}
+
+    security = create_security_headers_config(allowed_origins=CORS["allow_origins"])
+    if fused:
+        app.add_middleware(
+            FusedMiddleware,
+            rate_limit=rate_limit_config(),
+            security_headers=security,
+            cors=CORS,
+            validation=ValidationConfig(),
+            gzip_minimum_size=gzip_minimum_size,
+        )
+    else:
+        app.add_middleware(RequestValidationMiddleware, config=ValidationConfig())
+        app.add_middleware(CORSMiddleware, **CORS)
+        app.add_middleware(SecurityHeadersMiddleware, config=security)
+        app.add_middleware(RateLimitMiddleware, config=rate_limit_config())
+        app.add_middleware(RequestLoggingMiddleware)
+    return app
+
+
+def client(app: FastAPI, **kwargs) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test", **kwargs)
+
+
+async def both(method: str, url: str, **kwargs) -> tuple[httpx.Response, httpx.Response]:
+    """Sends the same request to fresh stacked and fused apps."""
+    responses = []
+    for fused in (False, True):
+        async with client(build_app(fused)) as http:
+            responses.append(await http.request(method, url, **kwargs))
+    return responses[0], responses[1]
+
+
+ORIGIN = {"origin": "https://app.example.com", "x-correlation-id": "abc123"}
+
+
+class TestParity:
+    """The fused middleware responds exactly like the separate stack."""
+
+    @pytest.mark.parametrize("method,url,kwargs", [
+        ("GET", "/api/v1/bot/status", {}),
+        ("GET", "/api/v1/bot/status", {"headers": ORIGIN}),
+        ("GET", "/api/v1/settings/global", {"headers": ORIGIN}),
+        ("POST", "/api/v1/echo", {"json": {"a": 1}, "headers": ORIGIN}),
+        ("POST", "/api/v1/echo", {"json": {"q": "1 UNION SELECT 2"}, "headers": ORIGIN}),
+        ("GET", "/api/v1/bot/%2e%2e/status", {"headers": ORIGIN}),
+        ("OPTIONS", "/api/v1/echo", {"headers": {**ORIGIN, "access-control-request-method": "POST"}}),
+        ("OPTIONS", "/api/v1/echo", {"headers": {"origin": "https://evil.example", "access-control-request-method": "POST"}}),
+        ("GET", "/health", {"headers": ORIGIN}),
+        ("GET", "/static/app.js", {"headers": ORIGIN}),
+        ("GET", "/missing", {"headers": ORIGIN}),
+    ])
+    async def test_same_response(self, method, url, kwargs):
+        stacked, fused = await both(method, url, **kwargs)
+
+        assert fused.status_code == stacked.status_code
+        assert fused.content == stacked.content
+        if "x-correlation-id" in kwargs.get("headers", {}):
+            assert fused.headers.multi_items() == stacked.headers.multi_items()
+        else:
+            strip = lambda r: [h for h in r.headers.multi_items() if h[0] != "x-correlation-id"]
+            assert strip(fused) == strip(stacked)
+            assert len(fused.headers["x-correlation-id"]) == 8
+
+    async def test_rate_limited_response(self):
+        results = []
+        for fused in (False, True):
+            async with client(build_app(fused)) as http:
+                for _ in range(3):
+                    await http.get("/api/v1/bot/status", headers=ORIGIN)
+                results.append(await http.get("/api/v1/bot/status", headers=ORIGIN))
+        stacked, fused = results
+        ignore = {"x-ratelimit-reset"}
+
+        assert fused.status_code == stacked.status_code == 429
+        assert fused.json() == stacked.json()
+        assert [h for h in fused.headers.multi_items() if h[0] not in ignore] == \
+            [h for h in stacked.headers.multi_items() if h[0] not in ignore]
+        assert "x-frame-options" not in fused.headers
+
+    async def test_logs_completion(self, caplog):
+        async with client(build_app(True)) as http:
+            with caplog.at_level("INFO", logger="api.requests"):
+                await http.get("/missing")
+
+        messages = [r.getMessage() for r in caplog.records if r.name == "api.requests"]
+        assert messages == ["Request started: GET /missing", "Request completed: GET /missing -> 404"]
+
+    async def test_websocket_scope_passes_through(self):
+        seen = []
+
+        async def app(scope, receive, send):
+            seen.append(scope["type"])
+
+        await FusedMiddleware(app, rate_limit=rate_limit_config())({"type": "websocket", "path": "/ws"}, None, None)
+
+        assert seen == ["websocket"]
+
+
+class TestCompression:
+    """Tests for the optional gzip stage."""
+
+    async def test_large_body_compressed_with_merged_vary(self):
+        async with client(build_app(True, gzip_minimum_size=500)) as http:
+            response = await http.get("/api/v1/settings/global", headers={"accept-encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Authorization, Accept-Encoding"
+        assert int(response.headers["content-length"]) < len(str(BIG))
+        assert response.json() == BIG
+
+    async def test_small_or_unaccepted_not_compressed(self):
+        async with client(build_app(True, gzip_minimum_size=500)) as http:
+            small = await http.get("/api/v1/bot/status", headers={"accept-encoding": "gzip"})
+            identity = await http.get("/api/v1/settings/global", headers={"accept-encoding": "identity"})
+
+        assert "content-encoding" not in small.headers
+        assert "content-encoding" not in identity.headers
+        assert identity.json() == BIG
+
+    async def test_streamed_body_not_compressed(self):
+        async with client(build_app(True, gzip_minimum_size=500)) as http:
+            response = await http.get("/api/v1/stream", headers={"accept-encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.content.count(b"data: ") == 3
+
+    def test_gzip_roundtrip(self):
+        middleware = FusedMiddleware(None, request_logging=False, gzip_minimum_size=10)
+        start = {"type": "http.response.start", "status": 200, "headers": [(b"content-length", b"100")]}
+
+        start, body = middleware._compress(start, {"type": "http.response.body", "body": b"a" * 100})
+
+        assert gzip.decompress(body) == b"a" * 100
+        assert dict(start["headers"])[b"content-length"] == str(len(body)).encode()
@@ -0,0 +1,190 @@
+"""
+Tests for the sport rules registry and derived GameClock state.
+"""
+
+from datetime import datetime, timezone, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.models.sport_config import SportConfig
+from src.services.game_clock import (
+    SOCCER_HALVES,
+    SOCCER_LEAGUES,
+    GameClock,
+    get_sport_rules,
+    is_past_segment,
+    parse_clock_seconds,
+    parse_ticker_start_time,
+)
+from src.services.espn_service import ESPNService
+from src.services.game_tracker_service import GameTrackerService
+from src.services.market_discovery import DiscoveredMarket
+from src.services.types import TrackedGame
+
+
+def _market(ticker: str | None = "KXNBAGAME-26FEB07GSWLAL-LAL", start: datetime | None = None) -> DiscoveredMarket:
+    return DiscoveredMarket(
+        condition_id="cond-1",
+        token_id_yes="yes-1",
+        token_id_no="no-1",
+        question="Will the Lakers win?",
+        sport="nba",
+        volume_24h=0,
+        liquidity=0,
+        current_price_yes=0.6,
+        current_price_no=0.4,
+        spread=0.02,
+        ticker=ticker,
+        game_start_time=start,
+    )
+
+
+class TestSportRules:
+    """Tests for the shared sport rules registry."""
+
+    def test_nba_structure(self):
+        rules = get_sport_rules("NBA")
+        assert rules.period_seconds == 720
+        assert rules.total_periods == 4
+        assert rules.segment_for(3) == "q3"
+        assert rules.segment_for(5) == "ot"
+        assert rules.segment_for(0) == "pre"
+
+    def test_innings_use_template(self):
+        rules = get_sport_rules("mlb")
+        assert rules.segment_for(7) == "inning_7"
+        assert rules.total_periods == 9
+
+    def test_soccer_leagues_use_halves(self):
+        rules = get_sport_rules("epl")
+        assert rules.clock_counts_up is True
+        assert rules.segment_for(2) == "h2"
+        assert "epl" in ESPNService.CLOCK_COUNTUP_SPORTS
+
+    def test_every_espn_soccer_league_has_rules(self):
+        catalog = {
+            league
+            for category, leagues in ESPNService.SPORT_CATEGORIES.items()
+            if category.startswith("soccer_")
+            for league in leagues
+        }
+        assert catalog == set(SOCCER_LEAGUES)
+        assert all(get_sport_rules(league) is SOCCER_HALVES for league in catalog)
+
+    def test_overtime_entries_blocked_unless_ot_is_max_segment(self):
+        ot = get_sport_rules("nba").segment_for(5)
+        assert ot not in SportConfig(sport="nba", max_entry_segment="q3").allowed_entry_segments
+        assert ot not in SportConfig(sport="nba", max_entry_segment="q4").allowed_entry_segments
+        assert SportConfig(sport="nba", max_entry_segment="ot").allowed_entry_segments == [
+            "q1", "q2", "q3", "q4", "ot"
+        ]
+        assert SportConfig(sport="nhl", max_entry_segment="ot").allowed_entry_segments == [
+            "p1", "p2", "p3", "ot"
+        ]
+
+    def test_unknown_sport_falls_back(self):
+        rules = get_sport_rules("curling")
+        assert rules.period_seconds == 0
+        assert rules.segment_for(2) == "period_2"
+
+
+class TestParsing:
+    """Tests for clock and ticker parsing helpers."""
+
+    def test_parse_clock(self):
+        assert parse_clock_seconds("5:42") == 342
+        assert parse_clock_seconds(" 12:00 ") == 720
+        assert parse_clock_seconds("") is None
+        assert parse_clock_seconds("45'") is None
+
+    def test_parse_ticker_start_time(self):
+        start = parse_ticker_start_time("KXNBAGAME-26FEB07GSWLAL-LAL")
+        assert start == datetime(2026, 2, 7, tzinfo=timezone.utc)
+        assert parse_ticker_start_time("NOPE") is None
+        assert parse_ticker_start_time(None) is None
+
+
+class TestSegmentOrdering:
+    """Tests for exit-before-segment comparisons."""
+
+    def test_past_segment(self):
+        assert is_past_segment("q4", "q4_2min") is True
+        assert is_past_segment("q3", "q4") is False
+        assert is_past_segment("ot", "q4") is True
+        assert is_past_segment("set_3", "set_2") is True
+
+    def test_unknown_threshold_never_triggers(self):
+        assert is_past_segment("q4", "whenever") is False
+
+
+class TestGameClock:
+    """Tests for GameClock computation."""
+
+    def test_nba_time_remaining(self):
+        clock = GameClock.compute("nba", "in", 3, "5:42")
+        # 342s left in Q3 plus one full quarter
+        assert clock.seconds_remaining == 342 + 720
+        assert clock.segment == "q3"
+        assert clock.is_live_espn is True
+        assert clock.elapsed_fraction == pytest.approx(1 - 1062 / 2880)
+
+    def test_soccer_clock_counts_up(self):
+        clock = GameClock.compute("epl", "in", 1, "30:00")
+        assert clock.seconds_remaining == (45 - 30) * 60 + 45 * 60
+
+    def test_missing_clock(self):
+        clock = GameClock.compute("nba", "pre", 0, "")
+        assert clock.seconds_remaining is None
+        assert clock.segment == "pre"
+        assert clock.elapsed_fraction == 0.0
+
+    def test_schedule_based_live_window(self):
+        start = datetime(2026, 2, 7, 0, 0, tzinfo=timezone.utc)
+        clock = GameClock.compute("nba", "pre", 0, "", start_time=start)
+
+        assert clock.is_live(start + timedelta(hours=1)) is True
+        assert clock.is_live(start - timedelta(minutes=4)) is True
+        assert clock.is_live(start - timedelta(hours=1)) is False
+        assert clock.is_live(start + timedelta(hours=3, minutes=1)) is False
+
+
+class TestTrackedGameClockCache:
+    """Tests for clock caching on TrackedGame via GameTrackerService."""
+
+    def test_add_game_computes_clock(self):
+        tracker = GameTrackerService(AsyncMock())
+        game = TrackedGame("evt1", "nba", "Lakers", "Warriors", _market())
+
+        tracker.add_game(game)
+
+        assert game.game_clock is not None
+        assert game.game_clock.start_time == datetime(2026, 2, 7, tzinfo=timezone.utc)
+
+    def test_market_start_time_preferred_over_ticker(self):
+        start = datetime(2026, 2, 7, 3, 30, tzinfo=timezone.utc)
+        game = TrackedGame("evt1", "nba", "Lakers", "Warriors", _market(start=start))
+        assert game.clock_state.start_time == start
+
+    @pytest.mark.asyncio
+    async def test_update_refreshes_clock_once(self):
+        espn = AsyncMock()
+        espn.get_game_summary = AsyncMock(return_value={
+            "status": {"type": {"state": "in"}, "period": 2, "displayClock": "6:00"},
+            "competitions": [{"competitors": [
+                {"homeAway": "home", "score": "50"},
+                {"homeAway": "away", "score": "48"},
+            ]}],
+        })
+        tracker = GameTrackerService(espn)
+        game = TrackedGame("evt1", "nba", "Lakers", "Warriors", _market())
+        tracker.add_game(game)
+        before = game.game_clock
+
+        await tracker.update_all_games()
+
+        assert game.game_clock is not before
+        assert game.game_clock.segment == "q2"
+        assert game.game_clock.seconds_remaining == 360 + 2 * 720
+        # Evaluations read the cached snapshot rather than recomputing
+        assert game.clock_state is game.game_clock
@@ -0,0 +1,242 @@
+"""
+Tests for the local Kalshi exchange simulator.
+
+Most tests drive the simulator through a real KalshiClient over the
+in-process transport so signing, routing and response shapes are exercised
+end to end.
+"""
+
+import base64
+import time
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+from src.api.deps import get_db, require_onboarding_complete
+from src.api.routes import trading as trading_routes
+from src.services import kalshi_client as kalshi_client_module
+from src.services.kalshi_simulator import KalshiExchangeSimulator, SimulatorConfig
+
+TICKER = "KXNBAGAME-26FEB07GSWLAL-LAL"
+
+
+@pytest.fixture(scope="module")
+def private_key_pem() -> str:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.TraditionalOpenSSL,
+        serialization.NoEncryption(),
+    ).decode()
+
+
+@pytest.fixture
+def exchange() -> KalshiExchangeSimulator:
+    sim = KalshiExchangeSimulator(SimulatorConfig(seed=1))
+    sim.add_market(TICKER, yes_bid=45, yes_ask=47, depth=100)
+    return sim
+
+
+@pytest.fixture
+def client(exchange, private_key_pem):
+    return exchange.create_client("key-1", private_key_pem)
+
+
+class TestMarketData:
+    """Tests for market endpoints."""
+
+    async def test_get_market(self, client):
+        data = await client.get_market(TICKER)
+        assert data["market"]["yes_bid"] == 45
+        assert data["market"]["yes_ask"] == 47
+        assert data["market"]["no_ask"] == 55
+
+    async def test_list_markets_filters(self, exchange, client):
+        exchange.add_market("KXNBAGAME-26FEB07BOSNYK-NYK", 30, 32, status="closed")
+        data = await client.get_markets(status="open")
+        assert [m["ticker"] for m in data["markets"]] == [TICKER]
+
+
+class TestOrders:
+    """Tests for order placement and matching."""
+
+    async def test_crossing_buy_fills_at_resting_price(self, client):
+        resp = await client.place_order(TICKER, "buy", "yes", 0.50, 10)
+        order = resp["order"]
+
+        assert order["status"] == "executed"
+        assert order["filled_count"] == 10
+        assert order["average_fill_price"] == 47
+
+        balance = await client.get_balance()
+        assert balance["balance"] == pytest.approx(1000.0 - 4.70)
+
+        positions = await client.get_positions()
+        assert positions["market_positions"][0]["position"] == 10
+
+    async def test_non_crossing_order_rests_and_cancels(self, client):
+        resp = await client.place_order(TICKER, "buy", "yes", 0.40, 5)
+        order_id = resp["order"]["order_id"]
+        assert resp["order"]["status"] == "resting"
+
+        await client.cancel_order(order_id)
+        status = await client.get_order_status(order_id)
+        assert status["order"]["status"] == "canceled"
+
+    async def test_price_time_priority(self, exchange, client, private_key_pem):
+        other = exchange.create_client("key-2", private_key_pem)
+        first = (await client.place_order(TICKER, "buy", "yes", 0.46, 5))["order"]
+        second = (await other.place_order(TICKER, "buy", "yes", 0.46, 5))["order"]
+
+        # Quote drops through both bids but only has depth for the first
+        exchange.set_quote(TICKER, None, 46, depth=5)
+
+        assert (await client.get_order_status(first["order_id"]))["order"]["status"] == "executed"
+        assert (await other.get_order_status(second["order_id"]))["order"]["status"] == "resting"
+
+    async def test_sell_closes_position_and_realizes_pnl(self, exchange, client):
+        await client.place_order(TICKER, "buy", "yes", 0.47, 10)
+        exchange.set_quote(TICKER, 60, 62)
+
+        await client.place_order(TICKER, "sell", "yes", 0.60, 10)
+
+        position = (await client.get_positions(status="all"))["market_positions"]
+        assert position == []  # client filters out closed positions
+        account = exchange.accounts["key-1"]
+        assert account.positions[TICKER].realized_pnl == (60 - 47) * 10
+        assert account.balance == 100_000 + (60 - 47) * 10
+
+    async def test_insufficient_balance_rejected(self, exchange, private_key_pem):
+        exchange.add_account_from_private_key("poor", private_key_pem, balance_cents=100)
+        poor = exchange.create_client("poor", private_key_pem)
+        with pytest.raises(httpx.HTTPStatusError) as exc:
+            await poor.place_order(TICKER, "buy", "yes", 0.50, 10)
+        assert exc.value.response.status_code == 400
+
+    async def test_batched_orders(self, client):
+        resp = await client.batch_orders([
+            {"ticker": TICKER, "action": "buy", "side": "yes", "count": 1, "yes_price": 47},
+            {"ticker": "NOPE", "action": "buy", "side": "yes", "count": 1, "yes_price": 47},
+        ])
+        assert resp["orders"][0]["order"]["status"] == "executed"
+        assert resp["orders"][1]["error"]["code"] == "market_not_found"
+
+    async def test_fills_reported(self, client):
+        # KalshiClient always sends yes_price, so NO at 55c is yes_price 45
+        await client.place_order(TICKER, "buy", "no", 0.45, 3)
+        fills = await client.get_fills(ticker=TICKER)
+        assert fills["fills"][0]["side"] == "no"
+        assert fills["fills"][0]["count"] == 3
+
+
+class TestAuthentication:
+    """Tests for RSA-PSS signature verification."""
+
+    async def test_bad_signature_rejected(self, exchange, private_key_pem):
+        exchange.add_account_from_private_key("key-1", private_key_pem)
+        other_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        timestamp = str(int(time.time() * 1000))
+        signature = other_key.sign(
+            f"{timestamp}GET/trade-api/v2/portfolio/balance".encode(),
+            padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH),
+            hashes.SHA256(),
+        )
+
+        status, body, _ = await exchange.handle("GET", "/trade-api/v2/portfolio/balance", {
+            "KALSHI-ACCESS-KEY": "key-1",
+            "KALSHI-ACCESS-TIMESTAMP": timestamp,
+            "KALSHI-ACCESS-SIGNATURE": base64.b64encode(signature).decode(),
+        })
+
+        assert status == 401
+        assert body["error"]["code"] == "unauthorized"
+
+    async def test_unknown_key_rejected(self, exchange):
+        status, _, _ = await exchange.handle("GET", "/trade-api/v2/portfolio/balance", {
+            "KALSHI-ACCESS-KEY": "who",
+        })
+        assert status == 401
+
+
+class TestFaultInjection:
+    """Tests for injected errors, rate limits and partial fills."""
+
+    async def test_forced_server_error_is_retried(self, exchange, client, monkeypatch):
+        async def no_sleep(_):
+            return None
+        monkeypatch.setattr(client.clock, "sleep", no_sleep)
+        exchange.fail_next(503)
+
+        data = await client.get_market(TICKER)
+
+        assert data["market"]["ticker"] == TICKER
+        assert exchange.request_count == 2
+
+    async def test_rate_limit_returns_429(self, private_key_pem):
+        sim = KalshiExchangeSimulator(SimulatorConfig(rate_limit_per_second=1, verify_signatures=False))
+        sim.add_account("key-1")
+        headers = {"KALSHI-ACCESS-KEY": "key-1"}
+
+        first, _, _ = await sim.handle("GET", "/trade-api/v2/portfolio/balance", headers)
+        second, _, extra = await sim.handle("GET", "/trade-api/v2/portfolio/balance", headers)
+
+        assert first == 200
+        assert second == 429
+        assert "Retry-After" in extra
+
+    async def test_partial_fill_leaves_remainder_resting(self, private_key_pem):
+        sim = KalshiExchangeSimulator(SimulatorConfig(partial_fill_rate=1.0))
+        sim.add_market(TICKER, 45, 47, depth=100)
+        client = sim.create_client("key-1", private_key_pem)
+
+        order = (await client.place_order(TICKER, "buy", "yes", 0.50, 10))["order"]
+
+        assert order["status"] == "resting"
+        assert order["filled_count"] == 5
+        assert order["remaining_count"] == 5
+
+
+class TestPaperTradingRoutes:
+    """Tests that user-facing routes honour the paper-trading simulator URL."""
+
+    async def test_manual_order_reaches_simulator(self, exchange, private_key_pem):
+        exchange.add_account_from_private_key("key-1", private_key_pem)
+        hosts = []
+        simulator_transport = exchange.transport()
+
+        class RecordingTransport(httpx.AsyncBaseTransport):
+            async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+                hosts.append(request.url.host)
+                return await simulator_transport.handle_async_request(request)
+
+        real_client = httpx.AsyncClient
+
+        def client_with_transport(**kwargs):
+            return real_client(**{**kwargs, "transport": RecordingTransport()})
+
+        app = FastAPI()
+        app.include_router(trading_routes.router)
+        app.dependency_overrides[get_db] = lambda: MagicMock()
+        app.dependency_overrides[require_onboarding_complete] = lambda: MagicMock(id=uuid.uuid4())
+        credentials = {"api_key": "key-1", "api_secret": private_key_pem}
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            with patch.object(kalshi_client_module.settings, "kalshi_simulator_url", "http://simulator.test/trade-api/v2"), \
+                    patch.object(kalshi_client_module.httpx, "AsyncClient", client_with_transport), \
+                    patch.object(trading_routes.AccountCRUD, "get_decrypted_credentials", AsyncMock(return_value=credentials)), \
+                    patch.object(trading_routes.ActivityLogCRUD, "info", AsyncMock()):
+                response = await http.post(
+                    "/trading/order",
+                    json={"token_id": f"{TICKER}_YES", "side": "BUY", "price": "0.50", "size": "3"},
+                )
+
+        body = response.json()
+        assert body["success"] is True, body
+        assert body["order_id"]
+        assert hosts == ["simulator.test"]
+        assert exchange.request_count == 1
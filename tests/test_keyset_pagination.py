@@ -0,0 +1,228 @@
+"""
+Tests for keyset (cursor) pagination of logs, positions and trades.
+"""
+
+import uuid
+from datetime import datetime, timezone, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import src.models  # noqa: F401  (registers all tables on Base.metadata)
+from src.api.deps import get_db, require_onboarding_complete
+from src.api.routes.logs import router as logs_router
+from src.api.routes.logs import get_activity_logs_page
+from src.api.routes.trading import get_positions_page, get_trades_page, router as trading_router
+from src.core.cache import count_cache
+from src.core.exceptions import ValidationError
+from src.db.crud.activity_log import ActivityLogCRUD
+from src.db.crud.position import PositionCRUD
+from src.db.database import Base
+from src.db.pagination import _planner_estimate, decode_cursor, encode_cursor
+from src.models.activity_log import ActivityLog
+from src.models.position import Position
+from src.models.trade import Trade
+
+USER_ID = uuid.uuid4()
+NOW = datetime(2026, 2, 7, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    selects: list[tuple[str, tuple]] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _record_selects(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT"):
+            selects.append((statement, tuple(parameters)))
+
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    factory.selects = selects
+    async with factory() as db:
+        for i in range(25):
+            # Pairs of rows share a timestamp so the id tie-breaker matters
+            db.add(ActivityLog(
+                user_id=USER_ID, level="ERROR" if i % 5 == 0 else "INFO",
+                category="TRADE" if i % 2 else "BOT", message=f"entry {i}",
+                created_at=NOW - timedelta(seconds=i // 2),
+            ))
+        db.add(ActivityLog(user_id=uuid.uuid4(), level="INFO", category="BOT", message="other user"))
+        for i in range(7):
+            position = Position(
+                user_id=USER_ID, condition_id=f"c{i}", token_id="t", side="YES",
+                entry_price=Decimal("0.5"), entry_size=Decimal("10"), entry_cost_usdc=Decimal("5"),
+                status="closed" if i < 4 else "open", opened_at=NOW - timedelta(minutes=i),
+            )
+            db.add(position)
+            await db.flush()
+            db.add(Trade(
+                user_id=USER_ID, position_id=position.id, action="BUY", side="YES",
+                price=Decimal("0.5"), size=Decimal("10"), total_usdc=Decimal("5"),
+                status="filled", created_at=NOW - timedelta(minutes=i),
+            ))
+        await db.commit()
+    selects.clear()
+    await count_cache.clear()
+    yield factory
+    await engine.dispose()
+
+
+async def collect_logs(db, limit: int, **filters) -> tuple[list[str], int]:
+    messages, pages, cursor = [], 0, None
+    while True:
+        logs, cursor = await ActivityLogCRUD.get_page(db, USER_ID, limit=limit, cursor=cursor, **filters)
+        messages.extend(log.message for log in logs)
+        pages += 1
+        if cursor is None:
+            return messages, pages
+
+
+class TestCursor:
+    """Tests for the opaque cursor encoding."""
+
+    def test_round_trip(self):
+        row_id = uuid.uuid4()
+        cursor = encode_cursor(NOW, row_id)
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == (NOW, row_id)
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", encode_cursor(NOW, uuid.uuid4())[:-4]])
+    def test_malformed_cursor_rejected(self, cursor):
+        with pytest.raises(ValidationError):
+            decode_cursor(cursor)
+
+
+class TestKeysetPages:
+    """Tests for walking pages with cursors."""
+
+    async def test_pages_cover_every_row_once_in_order(self, session_factory):
+        async with session_factory() as db:
+            messages, pages = await collect_logs(db, limit=4)
+            logs = await ActivityLogCRUD.get_recent_paginated(db, USER_ID, limit=100)
+            expected = [
+                log.message
+                for log in sorted(logs, key=lambda log: (log.created_at, log.id), reverse=True)
+            ]
+
+        assert pages == 7
+        assert len(messages) == 25
+        assert len(set(messages)) == 25
+        assert messages == expected
+
+    async def test_filters_apply_to_every_page(self, session_factory):
+        async with session_factory() as db:
+            messages, _ = await collect_logs(db, limit=2, category="TRADE")
+
+        assert sorted(messages) == sorted(f"entry {i}" for i in range(25) if i % 2)
+
+    async def test_deep_page_uses_keyset_not_offset(self, session_factory):
+        async with session_factory() as db:
+            await collect_logs(db, limit=3)
+
+        assert len(session_factory.selects) == 9
+        # SQLite always renders "LIMIT ? OFFSET ?"; every page must bind offset 0
+        for statement, parameters in session_factory.selects:
+            assert statement.rstrip().endswith("LIMIT ? OFFSET ?")
+            assert parameters[-2:] == (4, 0)
+
+    async def test_positions_page_by_status(self, session_factory):
+        async with session_factory() as db:
+            first, cursor = await PositionCRUD.get_page_for_user(db, USER_ID, status="closed", limit=3)
+            second, end = await PositionCRUD.get_page_for_user(db, USER_ID, status="closed", limit=3, cursor=cursor)
+
+        assert [p.condition_id for p in first + second] == ["c0", "c1", "c2", "c3"]
+        assert end is None
+        # Trades are loaded with the page so responses can be built outside a lazy load
+        assert len(first[0].trades) == 1
+
+
+class TestCounts:
+    """Tests for the optional approximate totals."""
+
+    async def test_count_is_cached(self, session_factory):
+        async with session_factory() as db:
+            assert await ActivityLogCRUD.estimate_count(db, USER_ID, level="ERROR") == 5
+            session_factory.selects.clear()
+            assert await ActivityLogCRUD.estimate_count(db, USER_ID, level="ERROR") == 5
+
+        assert session_factory.selects == []
+
+    async def test_planner_estimate_binds_filter_values(self):
+        sport = "nba' OR '1'='1"
+        db = MagicMock()
+        db.bind.dialect = asyncpg.dialect()
+        db.begin_nested.return_value.__aenter__ = AsyncMock()
+        db.begin_nested.return_value.__aexit__ = AsyncMock(return_value=False)
+        db.execute = AsyncMock(return_value=MagicMock(scalar=lambda: [{"Plan": {"Plan Rows": 42}}]))
+
+        count = await _planner_estimate(db, select(Position).where(Position.sport == sport))
+
+        compiled = db.execute.call_args.args[0].compile(dialect=db.bind.dialect)
+        assert count == 42
+        assert str(compiled).startswith("EXPLAIN (FORMAT JSON) SELECT")
+        assert sport not in str(compiled)
+        assert sport in compiled.params.values()
+
+
+class TestRoutes:
+    """Tests for the cursor endpoints."""
+
+    async def test_logs_route(self, session_factory):
+        user = MagicMock(id=USER_ID)
+        async with session_factory() as db:
+            page = await get_activity_logs_page(db, user, limit=10, cursor=None, level="all",
+                                                category=None, include_total=True)
+            last = await get_activity_logs_page(db, user, limit=10, cursor=page.next_cursor, level=None,
+                                                category=None, include_total=False)
+
+        assert len(page.items) == 10
+        assert page.has_more is True
+        assert (page.total, page.total_is_estimate) == (25, True)
+        assert last.total is None
+        assert {page.items[0].message, page.items[1].message} == {"entry 0", "entry 1"}
+
+    async def test_positions_and_trades_routes(self, session_factory):
+        user = MagicMock(id=USER_ID)
+        async with session_factory() as db:
+            positions = await get_positions_page(db, user, status_filter="open", limit=10, cursor=None,
+                                                 include_total=False)
+            trades = await get_trades_page(db, user, limit=5, cursor=None, include_total=True)
+
+        assert [p.condition_id for p in positions.items] == ["c4", "c5", "c6"]
+        assert positions.has_more is False
+        assert len(trades.items) == 5
+        assert trades.total == 7
+        assert trades.next_cursor is not None
+
+    @pytest.mark.parametrize("path", ["/logs/cursor", "/trading/positions/cursor", "/trading/trades/cursor"])
+    async def test_malformed_cursor_is_client_error(self, session_factory, path):
+        app = FastAPI()
+        app.include_router(logs_router)
+        app.include_router(trading_router)
+
+        async def override_db():
+            async with session_factory() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = override_db
+        app.dependency_overrides[require_onboarding_complete] = lambda: MagicMock(id=USER_ID)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get(path, params={"cursor": "garbage"})
+
+        assert response.status_code == 400
+        assert response.json() == {"detail": "Invalid pagination cursor"}
@@ -0,0 +1,221 @@
+"""
+Tests for time-range partitioning of the log tables and partition-drop retention.
+"""
+
+import ast
+import importlib.util
+import uuid
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import UniqueConstraint, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import src.models  # noqa: F401  (registers all tables on Base.metadata)
+from src.core.audit_db import AuditEventModel
+from src.db import partitioning
+from src.db.crud.activity_log import ActivityLogCRUD
+from src.db.database import Base
+from src.db.partitioning import (
+    ACTIVITY_LOGS,
+    AUDIT_EVENTS,
+    PartitionMaintainer,
+    create_partition_sql,
+    enforce_retention,
+    ensure_partitions,
+    expired_partitions,
+    parse_partition_name,
+    partition_name,
+    partition_ranges,
+)
+from src.models.activity_log import ActivityLog
+
+NOW = datetime(2026, 12, 30, 15, 30, tzinfo=timezone.utc)
+MIGRATION = Path(__file__).resolve().parents[1] / "alembic" / "versions" / "019_partition_log_tables.py"
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+def fake_pg_session(partitions: list[str]) -> MagicMock:
+    """AsyncSession stand-in for a migrated PostgreSQL database."""
+    db = MagicMock()
+    db.bind.dialect.name = "postgresql"
+    db.commit = AsyncMock()
+    result = MagicMock()
+    result.scalar.return_value = 100
+    result.rowcount = 2
+    db.execute = AsyncMock(return_value=result)
+    db.partitions = partitions
+    return db
+
+
+def executed_sql(db: MagicMock) -> list[str]:
+    return [str(call.args[0]) for call in db.execute.call_args_list]
+
+
+class TestPartitionRanges:
+    """Tests for partition bounds and naming."""
+
+    def test_daily_ranges(self):
+        ranges = partition_ranges(ACTIVITY_LOGS, NOW, NOW + timedelta(days=2))
+
+        assert [partition_name(ACTIVITY_LOGS, lower) for lower, _ in ranges] == [
+            "activity_logs_p20261230", "activity_logs_p20261231", "activity_logs_p20270101",
+        ]
+        assert ranges[0] == (datetime(2026, 12, 30, tzinfo=timezone.utc), datetime(2026, 12, 31, tzinfo=timezone.utc))
+
+    def test_monthly_ranges_cross_year(self):
+        ranges = partition_ranges(AUDIT_EVENTS, NOW, NOW + timedelta(days=40))
+
+        assert [partition_name(AUDIT_EVENTS, lower) for lower, _ in ranges] == [
+            "audit_events_p202612", "audit_events_p202701", "audit_events_p202702",
+        ]
+        assert ranges[0][1] == datetime(2027, 1, 1, tzinfo=timezone.utc)
+
+    def test_name_round_trip(self):
+        lower = datetime(2026, 2, 9, tzinfo=timezone.utc)
+
+        assert parse_partition_name(ACTIVITY_LOGS, partition_name(ACTIVITY_LOGS, lower)) == lower
+        assert parse_partition_name(ACTIVITY_LOGS, "activity_logs_default") is None
+        assert parse_partition_name(ACTIVITY_LOGS, "audit_events_p202602") is None
+
+    def test_partition_ddl(self):
+        sql = create_partition_sql(AUDIT_EVENTS, datetime(2026, 2, 1, tzinfo=timezone.utc))
+
+        assert sql == (
+            "CREATE TABLE IF NOT EXISTS audit_events_p202602 PARTITION OF audit_events "
+            "FOR VALUES FROM ('2026-02-01T00:00:00+00:00') TO ('2026-03-01T00:00:00+00:00')"
+        )
+
+    def test_expired_partitions_only_whole_ranges(self):
+        names = [
+            "activity_logs_p20261130", "activity_logs_default",
+            "activity_logs_p20261128", "activity_logs_p20261129",
+        ]
+
+        # The cutoff falls inside the 29th, so that partition is kept
+        cutoff = datetime(2026, 11, 29, 12, tzinfo=timezone.utc)
+        assert expired_partitions(ACTIVITY_LOGS, names, cutoff) == ["activity_logs_p20261128"]
+
+
+class TestPartitionedRetention:
+    """Tests for partition maintenance on a partitioned (PostgreSQL) table."""
+
+    @pytest.fixture(autouse=True)
+    def partitioned(self):
+        async def list_partitions(db, spec):
+            return db.partitions
+
+        with patch.object(partitioning, "is_partitioned", AsyncMock(return_value=True)), \
+             patch.object(partitioning, "list_partitions", list_partitions):
+            yield
+
+    async def test_ensure_creates_missing_partitions_ahead(self):
+        db = fake_pg_session(["activity_logs_p20261230", "activity_logs_default"])
+
+        created = await ensure_partitions(db, ACTIVITY_LOGS, NOW)
+
+        assert len(created) == ACTIVITY_LOGS.premake
+        assert created[0] == "activity_logs_p20261231"
+        assert created[-1] == "activity_logs_p20270106"
+        assert not any("DEFAULT" in sql for sql in executed_sql(db))
+
+    async def test_retention_drops_partitions_instead_of_deleting(self):
+        db = fake_pg_session(["activity_logs_p20261101", "activity_logs_p20261102", "activity_logs_p20261130"])
+
+        removed = await enforce_retention(db, ACTIVITY_LOGS, datetime(2026, 11, 30, tzinfo=timezone.utc))
+
+        sql = executed_sql(db)
+        assert "ALTER TABLE activity_logs DETACH PARTITION activity_logs_p20261101" in sql
+        assert "DROP TABLE activity_logs_p20261102" in sql
+        assert not any("activity_logs_p20261130" in s for s in sql)
+        # Only the default partition is trimmed row by row
+        deletes = [s for s in sql if s.startswith("DELETE")]
+        assert len(deletes) == 1 and deletes[0].startswith("DELETE FROM activity_logs_default ")
+        assert removed == 2 * 100 + 2
+
+
+class TestSQLiteFallback:
+    """Tests for plain (unpartitioned) tables."""
+
+    async def test_delete_old_logs_deletes_rows(self, session_factory):
+        user_id = uuid.uuid4()
+        now = datetime.now(timezone.utc)
+        async with session_factory() as db:
+            for days in (1, 10, 40, 50):
+                db.add(ActivityLog(user_id=user_id, level="INFO", category="BOT",
+                                   message=f"{days}d", created_at=now - timedelta(days=days)))
+            await db.commit()
+
+            removed = await ActivityLogCRUD.delete_old_logs(db, days=30)
+            remaining = await db.execute(select(ActivityLog.message).order_by(ActivityLog.created_at))
+
+        assert removed == 2
+        assert list(remaining.scalars().all()) == ["10d", "1d"]
+
+    async def test_ensure_partitions_is_noop(self, session_factory):
+        async with session_factory() as db:
+            assert await ensure_partitions(db, ACTIVITY_LOGS) == []
+
+    async def test_maintainer_skips_unpartitioned_tables(self, session_factory):
+        async with session_factory() as db:
+            db.add(ActivityLog(user_id=uuid.uuid4(), level="INFO", category="BOT", message="old",
+                               created_at=NOW - timedelta(days=365)))
+            await db.commit()
+
+        summary = await PartitionMaintainer(session_factory).run_once(NOW)
+
+        async with session_factory() as db:
+            count = (await db.execute(select(func.count(ActivityLog.id)))).scalar()
+        assert summary == {}
+        assert count == 1
+
+
+class TestMigration:
+    """Tests for migration 019 and the models it must agree with."""
+
+    def test_migration_does_not_import_application_code(self):
+        tree = ast.parse(MIGRATION.read_text())
+        modules = [
+            alias.name for node in ast.walk(tree) if isinstance(node, ast.Import) for alias in node.names
+        ] + [node.module for node in ast.walk(tree) if isinstance(node, ast.ImportFrom)]
+
+        assert not [m for m in modules if m and m.split(".")[0] == "src"]
+
+    def test_frozen_ddl_matches_partitioning_at_this_revision(self):
+        spec = importlib.util.spec_from_file_location("migration_019", MIGRATION)
+        migration = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(migration)
+
+        for frozen, current in ((migration.ACTIVITY_LOGS, ACTIVITY_LOGS), (migration.AUDIT_EVENTS, AUDIT_EVENTS)):
+            assert tuple(frozen) == (
+                current.table, current.column, current.interval, current.premake, current.retention_days,
+            )
+            lower = partition_ranges(current, NOW, NOW)[0][0]
+            assert migration._partition_start(frozen, NOW) == lower
+            assert migration._create_partition_sql(frozen, lower) == create_partition_sql(current, lower)
+
+    def test_audit_event_id_unique_with_partition_key(self):
+        table = AuditEventModel.__table__
+        unique = [
+            [column.name for column in constraint.columns]
+            for constraint in table.constraints if isinstance(constraint, UniqueConstraint)
+        ]
+
+        assert unique == [["event_id", "timestamp"]]
+        assert not table.c.event_id.unique
+        assert not [index for index in table.indexes if index.unique]
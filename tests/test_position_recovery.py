@@ -0,0 +1,123 @@
+"""
+Tests for startup recovery of open positions.
+"""
+
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import src.models  # noqa: F401  (registers all tables on Base.metadata)
+from src.db.crud.position import PositionCRUD
+from src.db.database import Base
+from src.models.position import Position
+from src.models.tracked_market import TrackedMarket
+from src.services.bot_runner import BotRunner
+
+USER_ID = uuid.uuid4()
+NOW = datetime(2026, 2, 9, 20, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    selects: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _record_selects(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT"):
+            selects.append(statement)
+
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    factory.selects = selects
+    async with factory() as db:
+        for i, ticker in enumerate(["KXNBA-LAL", "KXNBA-BOS"]):
+            db.add(TrackedMarket(
+                user_id=USER_ID, condition_id=ticker, token_id_yes=f"{ticker}_YES",
+                token_id_no=f"{ticker}_NO", sport="nba", espn_event_id=f"e{i}",
+                home_team="Home", away_team="Away", current_price_yes=Decimal("0.45"),
+                baseline_price_yes=Decimal("0.5"),
+            ))
+        for ticker in ["KXNBA-LAL", "KXNBA-BOS", "KXNBA-GONE"]:
+            db.add(Position(
+                user_id=USER_ID, condition_id=ticker, token_id=f"{ticker}_YES", side="YES",
+                entry_price=Decimal("0.5"), entry_size=Decimal("10"), entry_cost_usdc=Decimal("5"),
+                status="open", opened_at=NOW,
+            ))
+        db.add(Position(
+            user_id=USER_ID, condition_id="KXNBA-LAL", token_id="t", side="YES",
+            entry_price=Decimal("0.5"), entry_size=Decimal("10"), entry_cost_usdc=Decimal("5"),
+            status="closed", opened_at=NOW,
+        ))
+        await db.commit()
+    selects.clear()
+    yield factory
+    await engine.dispose()
+
+
+def make_runner(quotes: dict | Exception) -> BotRunner:
+    client = MagicMock()
+    if isinstance(quotes, Exception):
+        client.get_markets_by_tickers = AsyncMock(side_effect=quotes)
+    else:
+        client.get_markets_by_tickers = AsyncMock(return_value=quotes)
+    runner = BotRunner(client, MagicMock(), MagicMock(), price_tape=None)
+    runner.user_id = USER_ID
+    return runner
+
+
+class TestRecoverPositions:
+    """Tests for BotRunner._recover_positions."""
+
+    async def test_one_query_and_one_quote_fetch(self, session_factory):
+        runner = make_runner({"KXNBA-LAL": {"ticker": "KXNBA-LAL", "yes_ask": 62, "yes_bid": 60}})
+
+        async with session_factory() as db:
+            await runner._recover_positions(db)
+
+        assert len(session_factory.selects) == 1
+        runner.trading_client.get_markets_by_tickers.assert_awaited_once()
+        (tickers,) = runner.trading_client.get_markets_by_tickers.await_args.args
+        assert sorted(tickers) == ["KXNBA-BOS", "KXNBA-LAL"]
+
+        assert set(runner.tracked_games) == {"e0", "e1"}
+        assert set(runner.game_tracker.tracked_games) == {"e0", "e1"}
+        lal, bos = runner.tracked_games["e0"], runner.tracked_games["e1"]
+        # Live quote where Kalshi returned one, persisted price otherwise
+        assert lal.current_price == 0.62
+        assert bos.current_price == 0.45
+        assert lal.market.ticker == "KXNBA-LAL"
+        assert lal.has_position and lal.position_id is not None
+        assert runner.token_to_game["KXNBA-BOS_YES"] == "e1"
+
+    async def test_quote_failure_falls_back_to_stored_prices(self, session_factory):
+        runner = make_runner(RuntimeError("kalshi down"))
+
+        async with session_factory() as db:
+            await runner._recover_positions(db)
+
+        assert {g.current_price for g in runner.tracked_games.values()} == {0.45}
+
+
+class TestOpenWithMarkets:
+    """Tests for PositionCRUD.get_open_with_markets."""
+
+    async def test_orphaned_position_has_no_market(self, session_factory):
+        async with session_factory() as db:
+            rows = await PositionCRUD.get_open_with_markets(db, USER_ID)
+
+        by_ticker = {position.condition_id: market for position, market in rows}
+        assert len(rows) == 3
+        assert by_ticker["KXNBA-GONE"] is None
+        assert by_ticker["KXNBA-LAL"].espn_event_id == "e0"
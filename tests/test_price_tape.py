@@ -0,0 +1,230 @@
+"""
+Tests for the durable compressed price tape.
+"""
+
+import asyncio
+import struct
+import zlib
+from datetime import datetime, timezone, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.api.routes import analytics as analytics_routes
+from src.core.clock import Clock
+from src.services import price_tape as price_tape_module
+from src.services.bot_runner import BotRunner
+from src.services.price_cache import PriceHistoryCache
+from src.services.price_tape import PriceTape
+
+T0 = datetime(2026, 2, 9, 23, 50, tzinfo=timezone.utc)
+
+
+class FakeClock(Clock):
+    def __init__(self, now: datetime):
+        self.current = now
+
+    def now(self) -> datetime:
+        return self.current
+
+
+@pytest.fixture
+def clock():
+    return FakeClock(T0)
+
+
+@pytest.fixture
+def tape(tmp_path, clock):
+    return PriceTape(tmp_path / "tape", clock=clock)
+
+
+def fill(tape: PriceTape, ticker: str, start: datetime, count: int, step_seconds: int = 60) -> None:
+    for i in range(count):
+        price = 0.40 + i / 100
+        tape.append(ticker, price - 0.01, price + 0.01, price, 10 * i, timestamp=start + timedelta(seconds=step_seconds * i))
+
+
+class TestWriteAndRead:
+    """Tests for buffering, flushing and range reads."""
+
+    async def test_append_does_not_touch_disk_until_flush(self, tape):
+        fill(tape, "KXNBA-LAL", T0, 3)
+
+        assert not tape.root.exists()
+        assert tape.get_stats()["buffered"] == 3
+        assert await tape.flush() == 3
+        assert [p.name for p in (tape.root / "KXNBA-LAL").iterdir()] == ["20260209.tape"]
+
+    async def test_round_trip_is_exact(self, tape):
+        tape.append("KXNBA-LAL", 0.56, 0.58, 0.57, 1234.5, timestamp=T0)
+        await tape.flush()
+
+        (quote,) = await tape.read_range("KXNBA-LAL", T0 - timedelta(minutes=1), T0)
+
+        assert quote.timestamp == T0
+        assert (quote.bid, quote.ask, quote.last, quote.volume) == (0.56, 0.58, 0.57, 1234.5)
+
+    async def test_range_spans_days_and_includes_unflushed(self, tape):
+        fill(tape, "KXNBA-LAL", T0, 20)
+        await tape.flush()
+        tape.append("KXNBA-LAL", 0.7, 0.72, 0.71, 0, timestamp=T0 + timedelta(hours=1))
+
+        quotes = await tape.read_range("KXNBA-LAL", T0 + timedelta(minutes=5), T0 + timedelta(hours=2))
+
+        assert len(quotes) == 15 + 1
+        assert quotes[0].timestamp == T0 + timedelta(minutes=5)
+        assert quotes[-1].last == 0.71
+        assert sorted(p.name for p in (tape.root / "KXNBA-LAL").iterdir()) == ["20260209.tape", "20260210.tape"]
+
+    async def test_reads_skip_blocks_outside_range(self, tape):
+        for hour in range(4):
+            fill(tape, "KXNBA-LAL", T0 - timedelta(hours=hour + 1), 5)
+            await tape.flush()
+
+        decompress = MagicMock(side_effect=zlib.decompress)
+        with patch.object(price_tape_module.zlib, "decompress", decompress):
+            quotes = await tape.read_range("KXNBA-LAL", T0 - timedelta(hours=1), T0 - timedelta(minutes=50))
+
+        assert len(quotes) == 5
+        assert decompress.call_count == 1
+
+    async def test_torn_tail_is_ignored(self, tape):
+        fill(tape, "KXNBA-LAL", T0 - timedelta(minutes=10), 5)
+        await tape.flush()
+        segment = tape.root / "KXNBA-LAL" / "20260209.tape"
+        with open(segment, "ab") as f:
+            f.write(b"PTB1\xff\xff")
+
+        assert len(await tape.read_range("KXNBA-LAL", T0 - timedelta(hours=1), T0)) == 5
+
+    async def test_torn_tail_cut_before_next_append(self, tape):
+        fill(tape, "KXNBA-LAL", T0 - timedelta(minutes=10), 5)
+        await tape.flush()
+        segment = tape.root / "KXNBA-LAL" / "20260209.tape"
+        intact_size = segment.stat().st_size
+        with open(segment, "ab") as f:
+            f.write(b"PTB1\xff\xff")
+
+        # A new tape (process restart) appending to the same segment
+        restarted = PriceTape(tape.root, clock=tape._clock)
+        fill(restarted, "KXNBA-LAL", T0 - timedelta(minutes=4), 3)
+        await restarted.flush()
+
+        assert len(await restarted.read_range("KXNBA-LAL", T0 - timedelta(hours=1), T0)) == 8
+        assert price_tape_module._count_blocks(segment) == 2
+        assert segment.stat().st_size > intact_size
+        assert restarted.get_stats()["repaired_segments"] == 1
+
+    async def test_zero_filled_tail_is_ignored(self, tape):
+        fill(tape, "KXNBA-LAL", T0 - timedelta(minutes=10), 5)
+        await tape.flush()
+        segment = tape.root / "KXNBA-LAL" / "20260209.tape"
+        # Header made it to disk, payload did not
+        us = price_tape_module._to_micros(T0)
+        with open(segment, "ab") as f:
+            f.write(struct.pack("<4sIIqq", b"PTB1", 64, 2, us, us) + bytes(64))
+
+        assert len(await tape.read_range("KXNBA-LAL", T0 - timedelta(hours=1), T0)) == 5
+
+        restarted = PriceTape(tape.root, clock=tape._clock)
+        fill(restarted, "KXNBA-LAL", T0 - timedelta(minutes=3), 1)
+        await restarted.flush()
+
+        assert len(await restarted.read_range("KXNBA-LAL", T0 - timedelta(hours=1), T0)) == 6
+
+    async def test_buffer_limit_drops_instead_of_blocking(self, tmp_path, clock):
+        tape = PriceTape(tmp_path, max_buffered=2, clock=clock)
+        fill(tape, "KXNBA-LAL", T0, 5)
+
+        assert tape.get_stats()["buffered"] == 2
+        assert tape.get_stats()["dropped"] == 3
+
+
+class TestMaintenance:
+    """Tests for compaction and retention."""
+
+    async def test_compaction_merges_small_blocks(self, tape):
+        for i in range(6):
+            fill(tape, "KXNBA-LAL", T0 - timedelta(hours=6 - i), 3)
+            await tape.flush()
+        segment = tape.root / "KXNBA-LAL" / "20260209.tape"
+        before = await tape.read_range("KXNBA-LAL", T0 - timedelta(days=1), T0)
+        size_before = segment.stat().st_size
+
+        assert tape._compact_before("20260210") == 1
+        assert tape._compact_before("20260210") == 0
+        assert price_tape_module._count_blocks(segment) == 1
+        assert segment.stat().st_size < size_before
+        assert await tape.read_range("KXNBA-LAL", T0 - timedelta(days=1), T0) == before
+
+    async def test_compaction_holds_flush_lock(self, tape, clock):
+        lock_held = []
+        tape._compact_before = lambda day: lock_held.append(tape._flush_lock.locked())
+        clock.sleep = AsyncMock(side_effect=[None, asyncio.CancelledError()])
+
+        with pytest.raises(asyncio.CancelledError):
+            await tape._run()
+
+        assert lock_held == [True]
+
+    async def test_prune_removes_old_days(self, tape, clock):
+        fill(tape, "KXNBA-LAL", T0 - timedelta(days=40), 2)
+        fill(tape, "KXNBA-LAL", T0, 2)
+        fill(tape, "KXNFL-DAL", T0 - timedelta(days=40), 2)
+        await tape.flush()
+
+        assert await tape.prune(retention_days=30) == 2
+        assert not (tape.root / "KXNFL-DAL").exists()
+        assert [p.name for p in (tape.root / "KXNBA-LAL").iterdir()] == ["20260209.tape"]
+
+
+class TestRestore:
+    """Tests for rebuilding in-memory state from the tape."""
+
+    async def test_restore_cache_and_baseline(self, tape, clock):
+        fill(tape, "KXNBA-LAL", T0 - timedelta(minutes=30), 10)
+        await tape.flush()
+        cache = PriceHistoryCache(clock=clock)
+
+        restored = await tape.restore_cache(cache, "KXNBA-LAL", T0 - timedelta(hours=1))
+        baseline = await tape.get_baseline("KXNBA-LAL", T0 - timedelta(minutes=25))
+
+        assert restored == 10
+        assert (await cache.get_latest("KXNBA-LAL")).price == Decimal("0.49")
+        assert await cache.get_baseline("KXNBA-LAL", lookback_minutes=60) == Decimal("0.4")
+        assert baseline == 0.45
+
+    async def test_bot_poll_feeds_tape_and_restores_once(self, tape, clock):
+        fill(tape, "KXNBA-LAL", T0 - timedelta(minutes=30), 3)
+        await tape.flush()
+        runner = BotRunner(MagicMock(), MagicMock(), MagicMock(), clock=clock, price_tape=tape)
+        game = MagicMock(baseline_price=None)
+        game.market.ticker = "KXNBA-LAL"
+        quote = {"yes_bid": 55, "yes_ask": 57, "last_price": 56, "volume": 300}
+
+        with patch.object(tape, "restore_cache", wraps=tape.restore_cache) as restore:
+            await runner._record_quote(game, quote)
+            clock.current += timedelta(seconds=10)
+            await runner._record_quote(game, quote)
+
+        quotes = await tape.read_range("KXNBA-LAL", T0 - timedelta(hours=1))
+        assert restore.call_count == 1
+        assert game.baseline_price == 0.4
+        assert [q.last for q in quotes[-2:]] == [0.56, 0.56]
+        assert quotes[-1].volume == 300
+
+
+class TestPriceHistoryRoute:
+    """Tests for the chart endpoint."""
+
+    async def test_downsamples_keeping_latest(self, tape):
+        fill(tape, "KXNBA-LAL", T0 - timedelta(hours=2), 100)
+        with patch.object(analytics_routes, "price_tape", tape):
+            quotes = await analytics_routes.get_price_history(
+                "KXNBA-LAL", start=T0 - timedelta(hours=3), end=T0, max_points=10, current_user=MagicMock()
+            )
+
+        assert len(quotes) == 10
+        assert quotes[-1].last == pytest.approx(1.39)
+        assert quotes == sorted(quotes, key=lambda q: q.timestamp)
@@ -0,0 +1,205 @@
+"""
+Tests for the principal cache behind the auth dependencies.
+"""
+
+import uuid
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import src.models  # noqa: F401  (registers all tables on Base.metadata)
+from src.api.deps import _resolve_principal, get_current_user_record
+from src.core.principal_cache import Principal, PrincipalCache, principal_cache
+from src.core.security import create_access_token
+from src.db.crud.refresh_token import RefreshTokenCRUD
+from src.db.crud.user import UserCRUD
+from src.db.database import Base
+from src.models.user import User
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    selects: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _record_selects(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT") and "FROM users" in statement:
+            selects.append(statement)
+
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    factory.selects = selects
+    principal_cache.invalidate_all()
+    yield factory
+    principal_cache.invalidate_all()
+    await engine.dispose()
+
+
+@pytest.fixture
+async def user(session_factory):
+    async with session_factory() as db:
+        user = await UserCRUD.create(db, "alice", "alice@example.com", "correct-horse-battery")
+    session_factory.selects.clear()
+    return user
+
+
+def token_for(user: User, **claims) -> str:
+    return create_access_token({"sub": str(user.id), **claims})
+
+
+async def resolve(session_factory, token: str) -> Principal:
+    async with session_factory() as db:
+        return await _resolve_principal(token, db)
+
+
+class TestResolvePrincipal:
+    """Tests for token resolution through the cache."""
+
+    async def test_cache_hit_skips_user_query(self, session_factory, user):
+        token = token_for(user)
+
+        first = await resolve(session_factory, token)
+        second = await resolve(session_factory, token)
+
+        assert first == second == Principal.from_user(user)
+        assert len(session_factory.selects) == 1
+
+    async def test_distinct_tokens_cached_separately(self, session_factory, user):
+        await resolve(session_factory, token_for(user, jti="a"))
+        await resolve(session_factory, token_for(user, jti="b"))
+
+        assert len(session_factory.selects) == 2
+
+    async def test_user_update_invalidates_on_commit(self, session_factory, user):
+        token = token_for(user)
+        await resolve(session_factory, token)
+
+        async with session_factory() as db:
+            row = await UserCRUD.get_by_id(db, user.id)
+            row.onboarding_step = 3
+            await db.flush()
+            # Not committed yet: still served from the cache
+            assert (await resolve(session_factory, token)).onboarding_step == 0
+            await db.commit()
+
+        assert (await resolve(session_factory, token)).onboarding_step == 3
+
+    async def test_rolled_back_update_keeps_entries(self, session_factory, user):
+        token = token_for(user)
+        await resolve(session_factory, token)
+
+        async with session_factory() as db:
+            row = await UserCRUD.get_by_id(db, user.id)
+            row.onboarding_step = 3
+            await db.flush()
+            await db.rollback()
+        session_factory.selects.clear()
+
+        assert (await resolve(session_factory, token)).onboarding_step == 0
+        assert session_factory.selects == []
+
+    async def test_bulk_deactivation_invalidates_and_forbids(self, session_factory, user):
+        token = token_for(user)
+        await resolve(session_factory, token)
+
+        async with session_factory() as db:
+            await db.execute(update(User).values(is_active=False))
+            await db.commit()
+
+        with pytest.raises(HTTPException) as exc:
+            await resolve(session_factory, token)
+        assert exc.value.status_code == 403
+
+    async def test_refresh_token_revocation_invalidates(self, session_factory, user):
+        token = token_for(user)
+        await resolve(session_factory, token)
+
+        async with session_factory() as db:
+            await RefreshTokenCRUD.create(db, user.id)
+            await RefreshTokenCRUD.revoke_all_for_user(db, user.id)
+        session_factory.selects.clear()
+        await resolve(session_factory, token)
+
+        assert len(session_factory.selects) == 1
+
+    async def test_unknown_user_and_bad_token(self, session_factory, user):
+        with pytest.raises(HTTPException) as missing:
+            await resolve(session_factory, create_access_token({"sub": str(uuid.uuid4())}))
+        with pytest.raises(HTTPException) as expired:
+            await resolve(session_factory, create_access_token({"sub": str(user.id)}, timedelta(seconds=-1)))
+
+        assert missing.value.status_code == expired.value.status_code == 401
+
+    async def test_user_record_loads_orm_row(self, session_factory, user):
+        principal = await resolve(session_factory, token_for(user))
+
+        async with session_factory() as db:
+            record = await get_current_user_record(principal, db)
+
+        assert isinstance(record, User)
+        assert record.id == user.id
+
+
+class TestPrincipalCache:
+    """Tests for the cache itself."""
+
+    def principal(self) -> Principal:
+        return Principal(
+            id=uuid.uuid4(), username="bob", email="bob@example.com", is_active=True,
+            onboarding_completed=True, onboarding_step=5, created_at=None,
+        )
+
+    def test_stale_generation_not_cached(self):
+        cache = PrincipalCache()
+        principal = self.principal()
+
+        generation = cache.generation(principal.id)
+        cache.invalidate(principal.id)
+        cache.put(principal, "t", generation)
+
+        assert cache.get(principal.id, "t") is None
+        assert cache.get_stats()["stale_reads"] == 1
+
+    def test_invalidate_all_rejects_earlier_reads(self):
+        cache = PrincipalCache()
+        principal = self.principal()
+
+        generation = cache.generation(principal.id)
+        cache.invalidate_all()
+        cache.put(principal, "t", generation)
+
+        assert cache.get(principal.id, "t") is None
+
+    def test_entries_expire(self):
+        cache = PrincipalCache(ttl_seconds=30)
+        principal = self.principal()
+        cache.put(principal, "t", cache.generation(principal.id))
+
+        with patch("src.core.principal_cache.time.monotonic", return_value=10**9):
+            assert cache.get(principal.id, "t") is None
+
+    def test_zero_ttl_disables(self):
+        cache = PrincipalCache(ttl_seconds=0)
+        principal = self.principal()
+        cache.put(principal, "t", cache.generation(principal.id))
+
+        assert cache.get(principal.id, "t") is None
+
+    def test_size_bounded(self):
+        cache = PrincipalCache(max_entries=10)
+        for _ in range(25):
+            principal = self.principal()
+            cache.put(principal, "t", cache.generation(principal.id))
+
+        assert len(cache._entries) <= 10
@@ -0,0 +1,125 @@
+"""
+Tests for the sliding-window rate limiter.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.core.rate_limiter import RateLimitConfig, RateLimiter, WindowCounter
+
+
+class Clock:
+    """Stands in for time.time in the rate limiter module."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = Clock()
+    with patch("src.core.rate_limiter.time.time", clock):
+        yield clock
+
+
+class TestWindowCounter:
+    """Tests for the two-bucket estimate."""
+
+    def test_previous_bucket_decays_linearly(self):
+        counter = WindowCounter(60.0)
+        counter.estimate(0.0)
+        counter.current = 30
+
+        assert counter.estimate(60.0) == 30
+        assert counter.estimate(75.0) == pytest.approx(22.5)
+        assert counter.estimate(119.9) == pytest.approx(0.05)
+        assert counter.estimate(120.0) == 0
+
+    def test_gap_of_two_windows_clears_previous(self):
+        counter = WindowCounter(60.0)
+        counter.estimate(0.0)
+        counter.current = 30
+
+        assert counter.estimate(180.0) == 0
+        assert counter.previous == 0
+
+    def test_retry_after_lands_on_first_free_slot(self):
+        counter = WindowCounter(60.0)
+        counter.estimate(0.0)
+        counter.current = 10
+
+        # Full bucket: wait for it to become the previous one and decay to 9
+        wait = counter.retry_after(30.0, 10)
+        assert wait == pytest.approx(30.0 + 6.0)
+        assert counter.estimate(30.0 + wait) == pytest.approx(9)
+
+        # Partially decayed previous bucket
+        counter.estimate(60.0)
+        counter.current = 4
+        wait = counter.retry_after(60.0, 10)
+        assert counter.estimate(60.0 + wait) == pytest.approx(9)
+
+
+class TestRateLimiter:
+    """Tests for the limiter's windows, headers info and expiry."""
+
+    async def test_minute_limit_slides(self, clock):
+        limiter = RateLimiter(RateLimitConfig(requests_per_minute=10, burst_limit=100))
+        clock.now = 60 * 20_000.0
+        for _ in range(10):
+            clock.now += 0.5
+            assert (await limiter.check_rate_limit("a"))[0]
+
+        allowed, info = await limiter.check_rate_limit("a")
+        assert not allowed
+        assert info["exceeded"] == "minute"
+
+        clock.now += info["retry_after"]
+        allowed, info = await limiter.check_rate_limit("a")
+        assert allowed
+        assert info["remaining_minute"] == 0
+
+    async def test_hour_limit_and_counts(self, clock):
+        limiter = RateLimiter(RateLimitConfig(requests_per_minute=100, requests_per_hour=3, burst_limit=100))
+        results = [await limiter.check_rate_limit("a") for _ in range(4)]
+
+        assert [allowed for allowed, _ in results] == [True, True, True, False]
+        assert results[1][1]["hour_count"] == 1
+        assert results[1][1]["remaining_hour"] == 1
+        assert results[3][1]["exceeded"] == "hour"
+        assert 1 <= results[3][1]["retry_after"] <= 7200
+        assert limiter.get_client_stats("a") == {"minute_count": 3, "hour_count": 3, "burst_count": 3}
+
+    async def test_burst_window_from_config(self, clock):
+        limiter = RateLimiter(RateLimitConfig(burst_limit=2, burst_window_seconds=5.0))
+        clock.now = 5 * 200_000.0
+        await limiter.check_rate_limit("a")
+        await limiter.check_rate_limit("a")
+
+        clock.now += 2.0
+        allowed, info = await limiter.check_rate_limit("a")
+        assert not allowed
+        assert info["retry_after"] == 5.0
+
+        clock.now += 8.0
+        assert (await limiter.check_rate_limit("a"))[0]
+
+    async def test_idle_clients_expire_shard_by_shard(self, clock):
+        limiter = RateLimiter(RateLimitConfig(), shards=4)
+        for i in range(100):
+            await limiter.check_rate_limit(f"ip:{i}")
+        assert limiter.get_stats() == {"clients": 100}
+
+        clock.now += 3 * 3600
+        sizes = []
+        for _ in range(4):
+            clock.now += limiter._sweep_interval
+            await limiter.check_rate_limit("ip:active")
+            sizes.append(limiter.get_stats()["clients"])
+
+        assert sizes[-1] == 1
+        assert sizes == sorted(sizes, reverse=True)
@@ -0,0 +1,184 @@
+"""
+Tests for the Redis rate limiter and its local token leases, against an
+in-process fake Redis.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from src.core.redis_rate_limiter import RedisRateLimitConfig, RedisRateLimiter
+from tests.fake_redis import FakeRedis
+
+
+class Clock:
+    """Stands in for time.time."""
+
+    def __init__(self, now: float = 3600.0 * 1000):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = Clock()
+    with patch("time.time", clock):
+        yield clock
+
+
+def config(**overrides) -> RedisRateLimitConfig:
+    values = dict(requests_per_minute=100, requests_per_hour=1000, burst_limit=1000)
+    values.update(overrides)
+    return RedisRateLimitConfig(**values)
+
+
+async def settle() -> None:
+    """Lets background refills finish."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestWithoutLeases:
+    """lease_size=0: one round trip per window per request."""
+
+    async def test_limits_enforced_in_redis(self, clock):
+        redis = FakeRedis()
+        limiter = RedisRateLimiter(redis, config(burst_limit=3))
+
+        results = [await limiter.check_rate_limit("ip:1") for _ in range(4)]
+
+        assert [allowed for allowed, _ in results] == [True, True, True, False]
+        assert results[0][1]["minute_remaining"] == 99
+        assert results[3][1]["exceeded"] == "burst"
+        assert results[3][1]["retry_after"] >= 0.1
+
+    async def test_shared_across_workers(self, clock):
+        redis = FakeRedis()
+        workers = [RedisRateLimiter(redis, config(requests_per_minute=4)) for _ in range(2)]
+
+        allowed = [(await workers[i % 2].check_rate_limit("ip:1"))[0] for i in range(6)]
+
+        assert allowed == [True, True, True, True, False, False]
+
+    async def test_minute_retry_after_from_counters(self, clock):
+        limiter = RedisRateLimiter(FakeRedis(), config(requests_per_minute=2))
+        clock.now += 30
+        await limiter.check_rate_limit("ip:1")
+        await limiter.check_rate_limit("ip:1")
+
+        allowed, info = await limiter.check_rate_limit("ip:1")
+
+        assert not allowed
+        # Full current bucket: 30s until it becomes the previous one, then half of it must decay
+        assert info["retry_after"] == pytest.approx(60.0)
+
+
+class TestLeases:
+    """Tests for locally spent token leases."""
+
+    async def test_no_round_trip_per_request(self, clock):
+        redis = FakeRedis()
+        limiter = RedisRateLimiter(redis, config(lease_size=10))
+
+        for _ in range(50):
+            assert (await limiter.check_rate_limit("ip:1"))[0]
+            await settle()
+
+        # Each window refills once per ~5 requests of a 10-token lease
+        assert redis.round_trips < 50
+        stats = (await limiter.get_global_stats())["local"]
+        assert stats["local_grants"] > stats["round_trips"]
+
+    async def test_lease_capped_by_fraction_of_limit(self, clock):
+        limiter = RedisRateLimiter(FakeRedis(), config(lease_size=50, burst_limit=20, lease_max_fraction=0.25))
+
+        assert [size for *_, size in limiter._windows] == [5, 25, 50]
+
+    async def test_never_over_limit_across_workers(self, clock):
+        redis = FakeRedis()
+        lease_size = 5
+        workers = [
+            RedisRateLimiter(redis, config(requests_per_minute=50, lease_size=lease_size, lease_max_fraction=1.0))
+            for _ in range(3)
+        ]
+
+        admitted = 0
+        for i in range(150):
+            admitted += (await workers[i % 3].check_rate_limit("ip:1"))[0]
+            await settle()
+
+        assert 50 - 3 * lease_size <= admitted <= 50
+
+    async def test_background_refill_before_running_out(self, clock):
+        redis = FakeRedis(latency=0.001)
+        limiter = RedisRateLimiter(redis, config(lease_size=10, lease_max_fraction=1.0))
+        await limiter.check_rate_limit("ip:1")
+
+        lease = limiter._leases[("ip:1", "minute")]
+        for _ in range(4):
+            await limiter.check_rate_limit("ip:1")
+        assert lease.refill is not None
+        await lease.refill
+
+        assert lease.tokens == 15
+        assert (await limiter.get_global_stats())["local"]["background_refills"] == 3
+
+    async def test_refusal_cached_locally(self, clock):
+        redis = FakeRedis()
+        limiter = RedisRateLimiter(redis, config(requests_per_minute=2, lease_size=2, lease_max_fraction=1.0))
+        await limiter.check_rate_limit("ip:1")
+        await limiter.check_rate_limit("ip:1")
+        assert not (await limiter.check_rate_limit("ip:1"))[0]
+
+        trips = redis.round_trips
+        allowed, info = await limiter.check_rate_limit("ip:1")
+
+        assert not allowed
+        assert info["exceeded"] == "minute"
+        # Burst and hour leases still served locally, minute refused locally
+        assert redis.round_trips == trips
+
+    async def test_tokens_not_spent_after_bucket_ends(self, clock):
+        redis = FakeRedis()
+        limiter = RedisRateLimiter(redis, config(lease_size=10, lease_max_fraction=1.0))
+        await limiter.check_rate_limit("ip:1")
+
+        clock.now += 60
+        await limiter.check_rate_limit("ip:1")
+
+        lease = limiter._leases[("ip:1", "minute")]
+        assert lease.bucket == int(clock.now // 60)
+        assert lease.tokens == 9
+        await limiter.close()
+
+
+class TestStats:
+    """Tests for client status and the maintained global counters."""
+
+    async def test_global_stats_without_key_scans(self, clock):
+        redis = FakeRedis()
+        limiter = RedisRateLimiter(redis, config(burst_limit=1))
+        await limiter.check_rate_limit("ip:1")
+        await limiter.check_rate_limit("ip:2")
+        await limiter.check_rate_limit("ip:2")
+
+        stats = await limiter.get_global_stats()
+
+        assert not hasattr(redis, "scan")
+        assert stats["active_clients"] == {"burst": 2, "minute": 2, "hour": 2}
+        assert stats["granted"]["burst"] == 2
+        assert stats["refused"]["burst"] == 1
+
+    async def test_client_status_and_reset(self, clock):
+        limiter = RedisRateLimiter(FakeRedis(), config())
+        for _ in range(3):
+            await limiter.check_rate_limit("ip:1")
+
+        status = await limiter.get_client_status("ip:1")
+        await limiter.reset_client("ip:1")
+
+        assert status["minute"] == {"count": 3, "limit": 100, "remaining": 97}
+        assert (await limiter.get_client_status("ip:1"))["hour"]["count"] == 0
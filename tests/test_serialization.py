@@ -0,0 +1,159 @@
+"""
+Tests for the fast JSON serialization layer and its stdlib fallback.
+"""
+
+import json
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from enum import Enum
+from unittest.mock import patch
+
+import pytest
+
+from src.core import serialization
+from src.core.logging_service import JSONFormatter
+from src.core.serialization import FastJSONResponse, dumps, dumps_bytes, loads
+from src.core.websocket import WebSocketEventType, WebSocketMessage
+
+ID = uuid.UUID("12345678-1234-5678-1234-567812345678")
+NOW = datetime(2026, 2, 9, 20, 0, 1, 250000, tzinfo=timezone.utc)
+
+
+class Side(str, Enum):
+    YES = "YES"
+
+
+@dataclass
+class Point:
+    equity: float
+    at: date
+
+
+PAYLOAD = {
+    "id": ID,
+    "price": Decimal("0.55"),
+    "opened_at": NOW,
+    "day": date(2026, 2, 9),
+    "side": Side.YES,
+    "tags": {"nba"},
+    "point": Point(1000.5, date(2026, 2, 9)),
+    "team": "Atlético",
+    "nested": [{"size": Decimal("10")}, None, True],
+}
+EXPECTED = {
+    "id": str(ID),
+    "price": "0.55",
+    "opened_at": "2026-02-09T20:00:01.250000+00:00",
+    "day": "2026-02-09",
+    "side": "YES",
+    "tags": ["nba"],
+    "point": {"equity": 1000.5, "at": "2026-02-09"},
+    "team": "Atlético",
+    "nested": [{"size": "10"}, None, True],
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request):
+    """Runs a test against orjson (if installed) and the stdlib fallback."""
+    if request.param == "orjson":
+        if serialization.orjson is None:
+            pytest.skip("orjson not installed")
+        yield request.param
+    else:
+        with patch.object(serialization, "orjson", None):
+            yield request.param
+
+
+class TestSerialization:
+    """Tests for dumps/loads on both backends."""
+
+    def test_extended_types(self, backend):
+        encoded = dumps_bytes(PAYLOAD)
+
+        assert loads(encoded) == EXPECTED
+        assert b'"Atl\xc3\xa9tico"' in encoded
+        assert b": " not in encoded and b", " not in encoded
+
+    def test_backends_agree(self):
+        if serialization.orjson is None:
+            pytest.skip("orjson not installed")
+
+        fast = dumps(PAYLOAD)
+        with patch.object(serialization, "orjson", None):
+            assert dumps(PAYLOAD) == fast
+
+    def test_non_str_keys(self, backend):
+        encoded = dumps({1: "a", ID: "b", Side.YES: "c", date(2026, 2, 9): "d", 2.5: "e", None: "f"})
+
+        assert loads(encoded) == {"1": "a", str(ID): "b", "YES": "c", "2026-02-09": "d", "2.5": "e", "null": "f"}
+
+    def test_non_finite_floats_become_null(self, backend):
+        value = {
+            "edge": float("nan"),
+            "limits": [float("inf"), -float("inf"), 1.5],
+            "point": Point(float("nan"), date(2026, 2, 9)),
+        }
+
+        assert loads(dumps(value)) == {
+            "edge": None,
+            "limits": [None, None, 1.5],
+            "point": {"equity": None, "at": "2026-02-09"},
+        }
+
+    def test_backends_agree_on_keys_and_nan(self):
+        if serialization.orjson is None:
+            pytest.skip("orjson not installed")
+        value = {7: float("nan"), ID: {Side.YES: [float("inf")]}, "at": {NOW: 1}}
+
+        fast = dumps(value)
+        with patch.object(serialization, "orjson", None):
+            assert dumps(value) == fast
+
+    def test_unsupported_types(self, backend):
+        with pytest.raises(TypeError):
+            dumps({"value": object()})
+
+        assert loads(dumps({"value": object()}, default=lambda o: "obj"))["value"] == "obj"
+
+    def test_response_class(self, backend):
+        response = FastJSONResponse({"price": Decimal("0.55"), "id": ID})
+
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == {"price": "0.55", "id": str(ID)}
+
+
+class TestFrames:
+    """Tests for the WebSocket and log serializers."""
+
+    def test_websocket_message_with_raw_values(self, backend):
+        message = WebSocketMessage(
+            event_type=WebSocketEventType.POSITION_UPDATED,
+            data={"position_id": ID, "pnl": Decimal("-1.25"), "at": NOW},
+            timestamp="t",
+        )
+
+        assert json.loads(message.to_json()) == {
+            "event": "position_updated",
+            "data": {"position_id": str(ID), "pnl": "-1.25", "at": NOW.isoformat()},
+            "timestamp": "t",
+            "correlation_id": None,
+        }
+
+    def test_log_formatter_extras(self, backend):
+        record = logging.LogRecord("bot", logging.INFO, __file__, 1, "filled", None, None)
+        record.price = Decimal("0.55")
+        record.user_id = ID
+        record.order = {"id": "o1", "size": 10}
+        record.client = object()
+        formatter = JSONFormatter(include_source=False, redact_sensitive_data=False)
+
+        extra = json.loads(formatter.format(record))["extra"]
+
+        assert extra["price"] == "0.55"
+        assert extra["user_id"] == str(ID)
+        assert extra["order"] == {"id": "o1", "size": 10}
+        assert extra["client"].startswith("<object object")
@@ -0,0 +1,217 @@
+"""
+Tests for batched tracked-market persistence (bulk upsert + coalesced state updates).
+"""
+
+import uuid
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import src.models  # noqa: F401  (registers all tables on Base.metadata)
+from src.db.crud.tracked_market import TrackedMarketCRUD
+from src.db.database import Base
+from src.db.tracked_market_batch import TrackedMarketBatch
+from src.models.tracked_market import TrackedMarket
+from src.models.user import User
+from src.services.bot_runner import BotRunner
+
+USER_ID = uuid.uuid4()
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    writes: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _record_writes(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith(("INSERT", "UPDATE")):
+            writes.append(statement)
+
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    factory.writes = writes
+    async with factory() as db:
+        db.add(User(id=USER_ID, username="bulk", email="bulk@example.com", password_hash="x"))
+        await db.commit()
+    writes.clear()
+    yield factory
+    await engine.dispose()
+
+
+def market_fields(i: int, **overrides) -> dict:
+    return {
+        "token_id_yes": f"yes-{i}",
+        "token_id_no": f"no-{i}",
+        "sport": "nba",
+        "question": f"Game {i}",
+        "baseline_price_yes": Decimal("0.5"),
+        "current_price_yes": Decimal("0.5"),
+        **overrides,
+    }
+
+
+async def load_markets(factory) -> dict[str, TrackedMarket]:
+    async with factory() as db:
+        result = await db.execute(select(TrackedMarket))
+        return {m.condition_id: m for m in result.scalars().all()}
+
+
+class TestBulkUpsert:
+    """Tests for TrackedMarketCRUD.bulk_upsert."""
+
+    async def test_many_markets_one_statement(self, session_factory):
+        async with session_factory() as db:
+            rows = [{"user_id": USER_ID, "condition_id": f"c{i}", **market_fields(i)} for i in range(30)]
+            assert await TrackedMarketCRUD.bulk_upsert(db, rows) == 30
+            await db.commit()
+
+        assert len(session_factory.writes) == 1
+        assert len(await load_markets(session_factory)) == 30
+
+    async def test_conflict_updates_but_preserves_selection_and_baseline(self, session_factory):
+        async with session_factory() as db:
+            await TrackedMarketCRUD.bulk_upsert(db, [
+                {"user_id": USER_ID, "condition_id": "c1", **market_fields(1)},
+            ])
+            await db.commit()
+            await TrackedMarketCRUD.unselect_by_condition_id(db, USER_ID, "c1")
+            original_id = (await load_markets(session_factory))["c1"].id
+
+            await TrackedMarketCRUD.bulk_upsert(db, [
+                {
+                    "user_id": USER_ID, "condition_id": "c1",
+                    **market_fields(1, question="Renamed", baseline_price_yes=Decimal("0.9"),
+                                    current_price_yes=Decimal("0.61")),
+                },
+            ])
+            await db.commit()
+
+        market = (await load_markets(session_factory))["c1"]
+        assert market.id == original_id
+        assert market.question == "Renamed"
+        assert market.current_price_yes == Decimal("0.61")
+        assert market.baseline_price_yes == Decimal("0.5")
+        assert market.is_user_selected is False
+
+
+class TestBulkUpdateState:
+    """Tests for TrackedMarketCRUD.bulk_update_state."""
+
+    async def test_groups_by_changed_columns(self, session_factory):
+        async with session_factory() as db:
+            await TrackedMarketCRUD.bulk_upsert(
+                db, [{"user_id": USER_ID, "condition_id": f"c{i}", **market_fields(i)} for i in range(4)]
+            )
+            await db.commit()
+            session_factory.writes.clear()
+
+            updated = await TrackedMarketCRUD.bulk_update_state(db, USER_ID, {
+                "c0": {"current_price_yes": Decimal("0.55")},
+                "c1": {"current_price_yes": Decimal("0.45")},
+                "c2": {"home_score": 10, "is_live": True},
+                "missing": {"current_price_yes": Decimal("0.1")},
+            })
+            await db.commit()
+
+        markets = await load_markets(session_factory)
+        assert updated == 3
+        # Two column sets -> two statements
+        assert len(session_factory.writes) == 2
+        assert markets["c0"].current_price_yes == Decimal("0.55")
+        assert markets["c1"].current_price_yes == Decimal("0.45")
+        assert (markets["c2"].home_score, markets["c2"].is_live) == (10, True)
+        assert markets["c3"].current_price_yes == Decimal("0.5")
+
+    def test_postgres_statement_updates_from_values(self):
+        db = MagicMock()
+        db.bind.dialect.name = "postgresql"
+        captured = []
+
+        async def execute(stmt, *args):
+            captured.append(stmt)
+            return MagicMock(rowcount=2)
+
+        db.execute = execute
+        import asyncio
+        asyncio.run(TrackedMarketCRUD.bulk_update_state(db, USER_ID, {
+            "c0": {"current_price_yes": Decimal("0.55"), "is_live": True},
+            "c'1": {"current_price_yes": Decimal("0.45"), "is_live": False},
+        }))
+
+        (stmt,) = captured
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "UPDATE tracked_markets SET" in sql
+        assert "FROM (VALUES ('c0', 0.55, true), ('c''1', 0.45, false)) AS changes" in sql
+        assert "CAST(changes.current_price_yes AS NUMERIC(5, 4))" in sql
+
+
+class TestTrackedMarketBatch:
+    """Tests for per-cycle staging."""
+
+    async def test_flush_coalesces_and_skips_unchanged(self, session_factory):
+        batch = TrackedMarketBatch()
+        for i in range(5):
+            batch.stage_upsert(USER_ID, f"c{i}", **market_fields(i))
+        # State staged before the first flush rides along with the insert
+        batch.stage_state(USER_ID, "c0", current_price_yes=Decimal("0.52"))
+        async with session_factory() as db:
+            assert await batch.flush(db) == {"upserted": 5, "updated": 0}
+
+        assert len(session_factory.writes) == 1
+        session_factory.writes.clear()
+
+        for i in range(5):
+            batch.stage_state(USER_ID, f"c{i}", current_price_yes=Decimal("0.52"), home_score=0)
+        batch.stage_state(USER_ID, "c4", current_price_yes=Decimal("0.52"), home_score=3)
+        async with session_factory() as db:
+            result = await batch.flush(db)
+
+        markets = await load_markets(session_factory)
+        assert markets["c0"].current_price_yes == Decimal("0.52")
+        assert markets["c4"].home_score == 3
+        # c0 price unchanged since the insert; home_score is new for everyone
+        assert result == {"upserted": 0, "updated": 5}
+        assert batch.pending == 0
+
+        batch.stage_state(USER_ID, "c4", current_price_yes=Decimal("0.52"), home_score=3)
+        assert batch.pending == 0
+
+    async def test_failed_flush_keeps_staged_writes(self, session_factory):
+        batch = TrackedMarketBatch()
+        batch.stage_upsert(USER_ID, "c1", token_id_yes="y", token_id_no="n", sport=None)
+        async with session_factory() as db:
+            with pytest.raises(Exception):
+                await batch.flush(db)
+
+        assert batch.pending == 1
+        batch.stage_upsert(USER_ID, "c1", sport="nba")
+        async with session_factory() as db:
+            assert (await batch.flush(db))["upserted"] == 1
+
+    async def test_bot_stages_game_state(self, session_factory):
+        runner = BotRunner(MagicMock(), MagicMock(), MagicMock(), price_tape=None)
+        runner.user_id = USER_ID
+        game = MagicMock(game_status="in", period=2, home_score=40, away_score=38, current_price=0.615)
+        game.market.condition_id = "c1"
+        runner.tracked_games = {"e1": game}
+        runner.market_batch.stage_upsert(USER_ID, "c1", **market_fields(1))
+
+        runner._stage_market_state()
+        async with session_factory() as db:
+            await runner.market_batch.flush(db)
+
+        market = (await load_markets(session_factory))["c1"]
+        assert (market.is_live, market.current_period, market.home_score) == (True, 2, 40)
+        assert market.current_price_yes == Decimal("0.615")
+        assert market.current_price_no == Decimal("0.385")
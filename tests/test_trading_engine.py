@@ -398,3 +398,97 @@ class TestDecimalPrecision:
         effective = EffectiveConfig(sport_config)
         
         assert effective.default_position_size_usdc == Decimal("25.50")
+
+
+class TestGameMarketView:
+    """Tests for evaluating TrackedGame-backed market views without ORM objects."""
+    
+    @staticmethod
+    def _game(baseline: float | None = 0.60, current: float | None = 0.45):
+        from src.services.market_discovery import DiscoveredMarket
+        from src.services.types import TrackedGame
+        
+        market = DiscoveredMarket(
+            condition_id="cond-123",
+            token_id_yes="yes-1",
+            token_id_no="no-1",
+            question="Will the Lakers win?",
+            sport="nba",
+            volume_24h=0,
+            liquidity=0,
+            current_price_yes=0.55,
+            current_price_no=0.45,
+            spread=0.02,
+        )
+        return TrackedGame(
+            "evt1", "nba", "Lakers", "Warriors", market,
+            baseline_price=baseline, current_price=current, game_status="in",
+        )
+    
+    @staticmethod
+    def _engine():
+        return TradingEngine(
+            db=AsyncMock(),
+            user_id="test-user",
+            trading_client=AsyncMock(),
+            global_settings=MockGlobalSettings(),
+            sport_configs={"nba": MockSportConfig(sport="nba")}
+        )
+    
+    def test_view_reads_through_to_game(self):
+        """
+        Test that the view reflects the latest polled price without rebuilding.
+        """
+        from src.services.types import GameMarketView
+        
+        game = self._game()
+        view = GameMarketView(game)
+        
+        assert view.condition_id == "cond-123"
+        assert view.current_price_no == pytest.approx(0.55)
+        
+        game.current_price = 0.50
+        assert view.current_price_yes == 0.50
+    
+    def test_view_falls_back_to_discovery_price(self):
+        """
+        Test that missing baseline/current prices fall back to the market.
+        """
+        from src.services.types import GameMarketView
+        
+        view = GameMarketView(self._game(baseline=None, current=None))
+        
+        assert view.baseline_price_yes == 0.55
+        assert view.current_price_yes == 0.55
+    
+    def test_price_conditions_with_float_view(self):
+        """
+        Test that float prices trigger the same drop signal as Decimal ones.
+        """
+        from src.services.types import GameMarketView
+        
+        engine = self._engine()
+        view = GameMarketView(self._game(baseline=0.60, current=0.45))
+        config = engine._get_effective_config(view)
+        
+        signal = engine._check_price_conditions(view, config)
+        
+        assert signal is not None
+        assert signal["side"] == "YES"
+        assert signal["price"] == 0.45
+    
+    @pytest.mark.asyncio
+    async def test_exit_with_float_view_and_decimal_entry(self):
+        """
+        Test take profit when the view is float and the position is Decimal.
+        """
+        from src.services.types import GameMarketView
+        
+        engine = self._engine()
+        view = GameMarketView(self._game(current=0.66))
+        position = MagicMock(side="YES", entry_price=Decimal("0.50"))
+        
+        exit_signal = await engine.evaluate_exit(position, view, {"segment": "q2"})
+        
+        assert exit_signal["reason"] == "take_profit"
+        assert exit_signal["exit_price"] == 0.66
@@ -0,0 +1,156 @@
+"""
+Tests for WebSocket fan-out through per-connection writer queues.
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from starlette.websockets import WebSocketState
+
+from src.core.websocket import ConnectionManager, WebSocketEventType, WebSocketMessage
+
+
+class FakeWebSocket:
+    """Records sent text; sends block while `gate` is cleared."""
+
+    def __init__(self, blocked: bool = False):
+        self.client_state = WebSocketState.CONNECTED
+        self.sent: list[dict] = []
+        self.gate = asyncio.Event()
+        if not blocked:
+            self.gate.set()
+        self.close_code: int | None = None
+
+    async def accept(self):
+        self.client_state = WebSocketState.CONNECTED
+
+    async def send_text(self, text: str):
+        await self.gate.wait()
+        self.sent.append(json.loads(text))
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+        self.client_state = WebSocketState.DISCONNECTED
+
+    def events(self) -> list[str]:
+        return [m["event"] for m in self.sent if m["event"] != "connection_established"]
+
+
+def message(event: WebSocketEventType, **data) -> WebSocketMessage:
+    return WebSocketMessage(event_type=event, data=data)
+
+
+async def drain():
+    """Let writer tasks run (shorter than the send timeout)."""
+    await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+async def manager():
+    manager = ConnectionManager(max_queue=4, send_timeout=0.05)
+    yield manager
+    for conns in list(manager._connections.values()):
+        for conn in list(conns):
+            await manager.disconnect(conn.websocket, conn.user_id)
+
+
+class TestFanOut:
+    """Tests for publishing and delivery."""
+
+    async def test_broadcast_serializes_once(self, manager):
+        sockets = [FakeWebSocket() for _ in range(6)]
+        for i, ws in enumerate(sockets):
+            await manager.connect(ws, f"user-{i % 3}")
+
+        with patch.object(WebSocketMessage, "to_json", autospec=True, side_effect=WebSocketMessage.to_json) as to_json:
+            assert await manager.broadcast(message(WebSocketEventType.BOT_STARTED)) == 6
+        await drain()
+
+        assert to_json.call_count == 1
+        assert all(ws.events() == ["bot_started"] for ws in sockets)
+
+    async def test_slow_socket_does_not_block_publisher_or_peers(self, manager):
+        slow, fast = FakeWebSocket(blocked=True), FakeWebSocket()
+        await manager.connect(slow, "u1")
+        await manager.connect(fast, "u1")
+
+        sent = await asyncio.wait_for(
+            manager.send_to_user("u1", message(WebSocketEventType.TRADE_EXECUTED, id="t1")), timeout=0.01
+        )
+        await drain()
+
+        assert sent == 2
+        assert fast.events() == ["trade_executed"]
+        assert slow.sent == []
+
+    async def test_superseded_updates_are_coalesced(self, manager):
+        ws = FakeWebSocket(blocked=True)
+        await manager.connect(ws, "u1")
+        await drain()
+
+        await manager.send_to_user("u1", message(WebSocketEventType.TRADE_EXECUTED, id="t1"))
+        for pnl in range(5):
+            await manager.send_to_user("u1", message(WebSocketEventType.POSITION_UPDATED, position_id="p1", pnl=pnl))
+        await manager.send_to_user("u1", message(WebSocketEventType.POSITION_UPDATED, position_id="p2", pnl=9))
+        ws.gate.set()
+        await drain()
+
+        updates = [(m["data"]["position_id"], m["data"]["pnl"]) for m in ws.sent if m["event"] == "position_updated"]
+        assert ws.events() == ["trade_executed", "position_updated", "position_updated"]
+        assert updates == [("p1", 4), ("p2", 9)]
+        assert manager.get_stats()["coalesced"] == 4
+
+    async def test_full_queue_drops_droppable_then_closes(self, manager):
+        ws = FakeWebSocket(blocked=True)
+        await manager.connect(ws, "u1")
+        await drain()
+
+        await manager.send_to_user("u1", message(WebSocketEventType.PRICE_UPDATE, ticker="A"))
+        for i in range(3):
+            await manager.send_to_user("u1", message(WebSocketEventType.TRADE_EXECUTED, id=i))
+        # Queue full: the price update is dropped to make room
+        assert await manager.send_to_user("u1", message(WebSocketEventType.TRADE_EXECUTED, id=3)) == 1
+        # Nothing left to drop: the connection is closed instead of growing
+        assert await manager.send_to_user("u1", message(WebSocketEventType.TRADE_EXECUTED, id=4)) == 0
+        # The writer closes the socket once its in-flight send gives up
+        await asyncio.sleep(0.1)
+
+        stats = manager.get_stats()
+        assert (stats["dropped"], stats["closed_slow"]) == (1, 1)
+        assert manager.get_connection_count("u1") == 0
+        assert ws.close_code == 1013
+
+    async def test_stalled_send_times_out_and_closes(self, manager):
+        ws = FakeWebSocket(blocked=True)
+        await manager.connect(ws, "u1")
+
+        await asyncio.sleep(0.1)
+
+        assert manager.get_connection_count() == 0
+        assert ws.close_code == 1013
+
+
+class TestSubscriptions:
+    """Tests for per-connection event filtering."""
+
+    async def test_only_subscribed_events_are_delivered(self, manager):
+        filtered, everything = FakeWebSocket(), FakeWebSocket()
+        await manager.connect(filtered, "u1")
+        await manager.connect(everything, "u1")
+
+        assert manager.set_subscriptions(filtered, ["trade_executed"]) == ["trade_executed"]
+        for event in (WebSocketEventType.TRADE_EXECUTED, WebSocketEventType.POSITION_UPDATED, WebSocketEventType.ERROR):
+            await manager.send_to_user("u1", message(event))
+        await drain()
+
+        assert filtered.events() == ["trade_executed", "error"]
+        assert everything.events() == ["trade_executed", "position_updated", "error"]
+
+    async def test_unknown_events_are_rejected(self, manager):
+        ws = FakeWebSocket()
+        await manager.connect(ws, "u1")
+
+        with pytest.raises(ValueError, match="bogus"):
+            manager.set_subscriptions(ws, ["trade_executed", "bogus"])